@@ -1,17 +1,28 @@
 """
 HR-AI Interview Simulation Platform - Hugging Face Spaces Version
 Gradio-based UI for AI-powered interview simulation
+
+Deploying this file on its own: upload backend/json_stream.py next to it
+(as huggingface-space/ does for its app.py), together with requirements_hf.txt.
 """
 
 import gradio as gr
 import os
-import json
+import sys
 import re
 from datetime import datetime
 from groq import Groq
 from PyPDF2 import PdfReader
 import io
 
+# The JSON scanner is shared with the Flask backend: a deployed copy next to this file
+# is used first, and in the repository it is imported from backend/
+try:
+    from json_stream import extract_json_value
+except ImportError:
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backend'))
+    from json_stream import extract_json_value
+
 # Configuration
 GROQ_API_KEY = os.getenv('GROQ_API_KEY', '')
 GROQ_MODEL = 'llama-3.3-70b-versatile'
@@ -46,24 +57,8 @@ def extract_text_from_pdf(pdf_file):
 
 
 def extract_json_from_response(text):
-    """Extract JSON from AI response"""
-    # Try markdown code block
-    match = re.search(r'```(?:json)?\s*([\s\S]*?)\s*```', text)
-    if match:
-        try:
-            return json.loads(match.group(1))
-        except:
-            pass
-    
-    # Try direct JSON
-    if '{' in text:
-        try:
-            start = text.find('{')
-            end = text.rfind('}') + 1
-            return json.loads(text[start:end])
-        except:
-            pass
-    return None
+    """Extract JSON from AI response (shared scanner, json_stream.py)"""
+    return extract_json_value(text)
 
 def call_groq_api(prompt):
     """Call Groq API for AI responses"""
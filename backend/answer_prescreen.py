@@ -0,0 +1,216 @@
+"""
+Deterministic pre-screen for interview answers.
+
+The scoring prompt makes the model apply fixed rules to hopeless answers:
+gibberish scores 0-10, and empty, "I don't know" or very short answers
+(fewer than PRESCREEN_MIN_WORDS words) score 0-20. This module applies
+those rules locally so such answers never reach Groq. A short answer only
+counts as too short when it is made of everyday words; one that names
+something technical or contains code ("Use a hash map.", "O(n log n)") can
+be right and is left to the model. An answer is
+gibberish when few of its words are common English words and most of its
+tokens look like keyboard mash or have letter pairs that rarely occur in
+real words (capitalised names only count when they are mash), or when its letters are very repetitive (low entropy). Every
+other answer is left to the model.
+
+The evaluation has the same {technicalScore, communicationScore,
+relevanceScore, feedback} shape as the model's. stats() reports how many
+answers were settled here. On /submit_answer each one is a Groq call saved,
+and on /submit_answers each one is an answer left out of the scoring batches.
+"""
+import math
+import os
+import re
+import threading
+from collections import Counter
+
+ANSWER_PRESCREEN_ENABLED = os.getenv('ANSWER_PRESCREEN_ENABLED', '1') not in ('0', 'false', 'False')
+PRESCREEN_MIN_WORDS = int(os.getenv('PRESCREEN_MIN_WORDS', '10'))
+
+# Gibberish needs both: few dictionary words and mostly implausible tokens
+GIBBERISH_MAX_DICTIONARY_RATIO = 0.2
+GIBBERISH_MIN_IMPLAUSIBLE_RATIO = 0.5
+# Letter entropy in bits; English prose is around 4.1, "asdf asdf asdf" is 2.0
+LOW_ENTROPY_BITS = 2.5
+ENTROPY_MIN_LETTERS = 20
+# Tokens whose letter pairs are mostly outside COMMON_BIGRAMS do not look like words
+MIN_BIGRAM_COVERAGE = 0.5
+MASH_MIN_LENGTH = 5
+MASH_MIN_ADJACENT_RATIO = 0.75
+
+WORD_RE = re.compile(r"[a-z0-9]+(?:'[a-z]+)?")
+# Words written with a capital letter ("Kafka", "gRPC", "CQRS") are names, not mash
+NAME_RE = re.compile(r"\b[a-z0-9]*[A-Z][A-Za-z0-9]*")
+VOWELS = frozenset('aeiouy')
+KEYBOARD_ROWS = ('qwertyuiop', 'asdfghjkl', 'zxcvbnm')
+_KEY_POSITIONS = {key: (row, column) for row, keys in enumerate(KEYBOARD_ROWS) for column, key in enumerate(keys)}
+
+# The most frequent letter pairs in English words (together, about 80% of all pairs)
+COMMON_BIGRAMS = frozenset("""
+th he in er an re on at en nd ti es or te of ed is it al ar st to nt ng se ha as ou io le ve co me de hi ri
+ro ic ne ea ra ce li ch ll be ma si om ur ca el ta la ns di fo ho pe ec pr no ct us ac ot il tr ly nc et ut
+ss so rs un lo wa ge ie wh ee wi em ad ol rt po we na ul ni ts mo ow pa im mi ai sh ir su id os iv ia am fi
+ci vi pl ig tu ev ld ry mp fe bl ab gh ty op wo sa ay ex ke fr oo av ag if ap gr od bo sp rd do uc bu ei ov
+by rm ep tt oc fa ef cu rn sc gi da yo cr cl du ga qu ue ff ba ey ls va um pp ua up lu go ht ru ug ds lt pi
+rc rr eg au ck ew mu br bi pt ak pu
+""".split())
+
+# Everyday English words. A short answer made only of these says nothing technical
+GENERAL_WORDS = frozenset("""
+a about above after again against all also always am an and any are as at be because been before being
+below between both but by can could did do does doing done down during each either else even every few for
+from further get gets getting give given go goes going good got had has have having he her here hers him his
+how however i if in into is it its itself just keep know known like likely make makes many may me might more
+most much must my need needs never new no nor not now of off often on once one only or other our out over own
+per rather really same see she should since so some such than that the their them then there these they
+thing things think this those though through thus to too under until up upon us use used uses using usually
+very want was way we well were what when where whether which while who whom why will with within without
+would yes yet you your
+able across add added allow allows already another answer approach around ask based basic best better big
+both build built call called case cases change check choose clear come common complete consider could create
+data day define depends design different does easy end ensure error errors example experience fact fast
+find first fix follow form full general great group handle happen hard help high however idea important
+improve include information instead issue issues large last later lead learn least less level line list
+little long look low main manage mean means method might mostly move name next number order part people
+performance person place point possible problem problems process project provide question quick quickly
+read real reason result results right run running save second set should show side simple single small
+solution solve something sometimes start state step still store structure sure system take team test
+tests than three time times together tool tools try two type understand user users value values version
+view what work worked working works write written wrong year years
+ok okay maybe dont doesnt cant isnt im ive
+""".split())
+
+# Everyday technical vocabulary
+TECHNICAL_WORDS = frozenset("""
+algorithm api application applications array arrays backend bug bugs cache class classes client code
+coding column compile complexity component components computer concurrency database databases debug
+deploy deployment developer development element elements file files frontend function functions index
+input interface key keys library loop memory model network node object objects output package query queue
+request requests response return returns server service services software sort sql stack string strings
+table thread threads variable variables web
+""".split())
+
+COMMON_WORDS = GENERAL_WORDS | TECHNICAL_WORDS
+
+# Code or notation: brackets, operators, digits, dotted or snake_case names ("O(n)", "x = 1", "os.path")
+NOTATION_RE = re.compile(r"[(){}\[\]=<>+*/%|&^~#@$]|\d|\w[._]\w")
+
+DONT_KNOW_RE = re.compile(
+    r"(?:(?:sorry|um+|uh+|hmm+|well|honestly)\s+)*"
+    r"(?:i\s+(?:really\s+)?(?:don't|dont|do\s+not)\s+know(?:\s+(?:this|that|it|the\s+answer))?"
+    r"|(?:i\s+(?:have\s+)?)?no\s+(?:idea|clue)"
+    r"|(?:i'm|i\s+am)?\s*not\s+sure"
+    r"|i\s+(?:can't|cannot)\s+answer(?:\s+(?:this|that|it))?"
+    r"|idk|pass|skip|nothing|no\s+answer|n\s+a)"
+    r"(?:\s+sorry)?"
+)
+
+# (technicalScore, communicationScore, relevanceScore, feedback) per reason; too_short scales with length
+PRESCREEN_SCORES = {
+    'empty': (0, 0, 0, 'No answer was given.'),
+    'dont_know': (5, 10, 5, 'The candidate did not attempt to answer the question.'),
+    'gibberish': (5, 0, 0, 'The response contains random characters with no meaningful content. This does not answer the question.'),
+}
+PRESCREEN_REASONS = ('empty', 'dont_know', 'gibberish', 'too_short')
+
+
+def letter_entropy(text):
+    """Shannon entropy of the letter distribution in bits, or None for fewer than ENTROPY_MIN_LETTERS letters."""
+    letters = [c for c in text.lower() if c.isalpha()]
+    if len(letters) < ENTROPY_MIN_LETTERS:
+        return None
+    total = len(letters)
+    return -sum(count / total * math.log2(count / total) for count in Counter(letters).values())
+
+
+def is_keyboard_mash(token):
+    """True if most neighbouring letters are the same key or adjacent keys on one keyboard row ("sdfsdf", "jhgfjhg")."""
+    if len(token) < MASH_MIN_LENGTH:
+        return False
+    adjacent = 0
+    for a, b in zip(token, token[1:]):
+        pa, pb = _KEY_POSITIONS.get(a), _KEY_POSITIONS.get(b)
+        if pa and pb and pa[0] == pb[0] and abs(pa[1] - pb[1]) <= 1:
+            adjacent += 1
+    return adjacent / (len(token) - 1) >= MASH_MIN_ADJACENT_RATIO
+
+
+def is_implausible_token(token):
+    if token in COMMON_WORDS or len(token) < 4:
+        return False
+    if is_keyboard_mash(token) or not VOWELS.intersection(token):
+        return True
+    pairs = [token[i:i + 2] for i in range(len(token) - 1)]
+    return sum(pair in COMMON_BIGRAMS for pair in pairs) / len(pairs) < MIN_BIGRAM_COVERAGE
+
+
+def has_technical_content(text, words):
+    """True if the answer contains code or notation, or any word outside GENERAL_WORDS ("hash", "mutex")."""
+    return bool(NOTATION_RE.search(text)) or any(word.replace("'", '') not in GENERAL_WORDS for word in words)
+
+
+def classify_answer(response_text, min_words=PRESCREEN_MIN_WORDS):
+    """Returns the PRESCREEN_REASONS entry that settles the answer, or None if it needs the model."""
+    text = (response_text or '').strip()
+    words = WORD_RE.findall(text.lower())
+    if not words:
+        return 'empty'
+    if DONT_KNOW_RE.fullmatch(' '.join(words)):
+        return 'dont_know'
+
+    letter_tokens = [word.replace("'", '') for word in words if not any(c.isdigit() for c in word)]
+    if letter_tokens:
+        names = {name.lower() for name in NAME_RE.findall(text)}
+        dictionary_ratio = sum(token in COMMON_WORDS for token in letter_tokens) / len(letter_tokens)
+        implausible_ratio = sum(is_implausible_token(token) and (token not in names or is_keyboard_mash(token))
+                                for token in letter_tokens) / len(letter_tokens)
+        if dictionary_ratio < GIBBERISH_MAX_DICTIONARY_RATIO and implausible_ratio >= GIBBERISH_MIN_IMPLAUSIBLE_RATIO:
+            return 'gibberish'
+    entropy = letter_entropy(text)
+    if entropy is not None and entropy < LOW_ENTROPY_BITS:
+        return 'gibberish'
+
+    if len(words) < min_words and not has_technical_content(text, words):
+        return 'too_short'
+    return None
+
+
+def prescreen_evaluation(reason, response_text):
+    """The evaluation for an answer settled by `reason`, in the same shape the model returns."""
+    if reason == 'too_short':
+        word_count = len(WORD_RE.findall((response_text or '').lower()))
+        score = min(20, 2 * word_count)
+        feedback = f'The response is too short ({word_count} words) to demonstrate understanding of the question.'
+        return {'technicalScore': score, 'communicationScore': score, 'relevanceScore': score, 'feedback': feedback}
+    technical, communication, relevance, feedback = PRESCREEN_SCORES[reason]
+    return {'technicalScore': technical, 'communicationScore': communication, 'relevanceScore': relevance, 'feedback': feedback}
+
+
+class AnswerPrescreen:
+    def __init__(self, enabled=ANSWER_PRESCREEN_ENABLED, min_words=PRESCREEN_MIN_WORDS):
+        self.enabled = enabled
+        self.min_words = min_words
+        self._lock = threading.Lock()
+        self._counters = {'screened': 0, 'sent_to_llm': 0, **{reason: 0 for reason in PRESCREEN_REASONS}}
+
+    def screen(self, response_text):
+        """Returns a deterministic evaluation, or None if the answer must be scored by the model."""
+        if not self.enabled:
+            return None
+        reason = classify_answer(response_text, self.min_words)
+        with self._lock:
+            self._counters['screened'] += 1
+            self._counters[reason or 'sent_to_llm'] += 1
+        return prescreen_evaluation(reason, response_text) if reason else None
+
+    def stats(self):
+        with self._lock:
+            counters = dict(self._counters)
+        hits = counters['screened'] - counters['sent_to_llm']
+        return {
+            'enabled': self.enabled,
+            'min_words': self.min_words,
+            **counters,
+            'prescreened': hits,
+            'hit_ratio': round(hits / counters['screened'], 4) if counters['screened'] else 0.0,
+        }
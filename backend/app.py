@@ -1,18 +1,49 @@
 import os
-from flask import Flask, request, jsonify, send_from_directory
+from flask import Flask, request, jsonify, send_from_directory, Response, stream_with_context, g
 from flask_cors import CORS
-from groq import Groq
+from groq import Groq, APIConnectionError, InternalServerError, RateLimitError
+import math
 import json
 import uuid
-import re
 from datetime import datetime
-from PyPDF2 import PdfReader
 from dotenv import load_dotenv
 import requests
+import time
+from collections import namedtuple
+
+from app_logging import get_logger, logging_stats
+from evaluation_pipeline import Stage, run_stages
+from session_store import create_session_backend
+from resume_cache import ResumeCache, hash_pdf_bytes, hash_resume_text
+from pdf_extraction import PdfExtractionEngine
+from llm_cache import LLMResponseCache, make_cache_key
+from question_bank import QuestionBank, QUESTION_BANK_SEED_ROLES
+from json_stream import TopLevelFieldParser, extract_json_value
+from ai_detector import AI_DETECTION_MODE, AI_DETECTION_CONFIRM_THRESHOLD, detect_ai_content_local
+from zerogpt_client import ZeroGPTClient, CircuitOpenError
+from session_aggregates import ensure_aggregates, format_duration, progress_summary, record_response, reset_responses
+from metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, MetricsRegistry
+from groq_scheduler import (GROQ_COMPLETION_TOKEN_ESTIMATE, PRIORITY_BULK, PRIORITY_NAMES, GroqScheduler,
+                            SchedulerBusyError, task_priority)
+from llm_policy import AttemptSkipped, LLMCallPolicy
+from llm_tasks import GROQ_MODEL, TASKS, sampling_params, task_config
+from prompt_budget import compact_json, compact_profile, estimate_tokens, fit_texts, prompt_token_budget
+from answer_prescreen import AnswerPrescreen
+from code_sandbox import CodeSandbox, evaluation_from_report, normalize_tests
+from batch_scoring import BATCH_SUBMIT_MAX_ANSWERS, chunk_answers, parse_batch_evaluations, validate_evaluation
+from bulk_ingest import BULK_BUSY_RETRIES, BULK_MAX_TOTAL_BYTES, BULK_STREAM_HEARTBEAT_SECONDS, BulkFileError, BulkIngestor, BulkUploadError, collect_batch
 
 # Load environment variables from .env file
 load_dotenv()
 
+# Per-subsystem loggers (LOG_LEVEL, LOG_LEVEL_<SUBSYSTEM>, LOG_FORMAT); records are written off-thread
+log = get_logger('app')
+pdf_log = get_logger('pdf')
+groq_log = get_logger('groq')
+zerogpt_log = get_logger('zerogpt')
+session_log = get_logger('session')
+security_log = get_logger('security')
+
 # Build an absolute path to the frontend/public directory. This is more reliable.
 basedir = os.path.abspath(os.path.dirname(__file__))
 static_folder_path = os.path.join(basedir, '..', 'frontend', 'public')
@@ -21,33 +52,168 @@ static_folder_path = os.path.join(basedir, '..', 'frontend', 'public')
 app = Flask(__name__, static_folder=static_folder_path, static_url_path='')
 CORS(app)
 
+# Largest request body accepted: a full bulk batch plus multipart framing
+MAX_REQUEST_BYTES = int(os.getenv('MAX_REQUEST_BYTES', str(BULK_MAX_TOTAL_BYTES + 1024 * 1024)))
+app.config['MAX_CONTENT_LENGTH'] = MAX_REQUEST_BYTES
+
 # --- Groq API Configuration ---
 # Get the API key from environment variables
 API_KEY = os.getenv('GROQ_API_KEY')
 if not API_KEY or 'gsk_' not in API_KEY:
     raise ValueError("GROQ_API_KEY is not set or invalid. Please add it to your .env file.")
 
-# ZeroGPT API Key (optional - add to .env if you have one)
-ZEROGPT_API_KEY = os.getenv('ZEROGPT_API_KEY', '')
-
-client = Groq(api_key=API_KEY)
-# --- Updated to currently supported model ---
-# Using llama-3.3-70b-versatile (recommended replacement)
-GROQ_MODEL = 'llama-3.3-70b-versatile'
-
-# --- Global State (in-memory session management) ---
-sessions = {}
+# GROQ_BASE_URL points the client at a local stand-in server for offline testing.
+# The SDK's own retries are off; retries, hedging and fallback follow llm_policy.py.
+GROQ_BASE_URL = os.getenv('GROQ_BASE_URL') or None
+client = Groq(api_key=API_KEY, base_url=GROQ_BASE_URL, max_retries=0)
+# Model, max_tokens, temperature and timeout per task (llm_tasks.py); GROQ_MODEL is the default model
+
+# --- Global State (bounded session storage; SESSION_BACKEND=sqlite shares it across workers) ---
+sessions = create_session_backend()
+
+# Resume analysis results keyed by PDF hash and normalized text hash
+resume_cache = ResumeCache()
+
+# Groq responses keyed by model, prompts and sampling params (LLM_CACHE_DB adds a disk tier)
+llm_cache = LLMResponseCache()
+
+# Pre-generated questions per role and skill signature, topped up in the background
+# (the refresher hook is defined further down, so it is looked up lazily)
+question_bank = QuestionBank(generate_fn=lambda *args: refresh_question_bank_set(*args))
+
+# Keep-alive, circuit-broken ZeroGPT client (ZEROGPT_API_URL, ZEROGPT_API_KEY, ZEROGPT_*_TIMEOUT)
+zerogpt_client = ZeroGPTClient()
+
+# Rate-limit buckets and priority queue in front of every Groq call (GROQ_RPM_LIMIT, GROQ_TPM_LIMIT, GROQ_SCHEDULER_*)
+groq_scheduler = GroqScheduler()
+
+# Local scoring of empty, "I don't know", gibberish and very short answers (ANSWER_PRESCREEN_ENABLED, PRESCREEN_MIN_WORDS)
+answer_prescreen = AnswerPrescreen()
+
+# Runs coding submissions against each question's test cases in rlimited child processes (SANDBOX_*)
+code_sandbox = CodeSandbox()
+
+# Bounded PDF text extraction (PDF_BACKEND, PDF_MAX_PAGES, PDF_MAX_CHARS, PDF_EXTRACT_TIMEOUT)
+pdf_engine = PdfExtractionEngine()
+
+# Bulk resume jobs: parallel extraction, then bounded Groq analysis (BULK_*; the stage hooks are defined further down)
+bulk_ingestor = BulkIngestor(lambda pdf_bytes: bulk_extract_resume(pdf_bytes), lambda context: bulk_analyze_resume(context))
+
+# --- Prometheus metrics (served at /metrics, per process) ---
+metrics = MetricsRegistry()
+http_request_seconds = metrics.histogram(
+    'hr_ai_http_request_duration_seconds', 'Request latency by route; time to first byte for streamed responses',
+    ('route', 'method', 'status'))
+groq_request_seconds = metrics.histogram(
+    'hr_ai_groq_request_duration_seconds', 'Groq call latency by task, routed model and outcome (ok, error, throttled, cache_hit)',
+    ('task', 'model', 'outcome'))
+groq_tokens_total = metrics.counter(
+    'hr_ai_groq_tokens_total', 'Tokens reported in Groq usage by task, model and kind (prompt, completion)', ('task', 'model', 'kind'))
+groq_completion_cap_ratio = metrics.histogram(
+    'hr_ai_groq_completion_cap_ratio', 'Completion tokens used as a fraction of the task max_tokens', ('task',),
+    buckets=(0.1, 0.25, 0.5, 0.75, 0.9, 1.0))
+metrics.gauge('hr_ai_groq_task_config', 'Routing per task (always 1; the configuration is in the labels)',
+              ('task', 'model', 'max_tokens', 'temperature', 'timeout'),
+              callback=lambda: {(task, *map(str, config)): 1 for task, config in TASKS.items()})
+zerogpt_request_seconds = metrics.histogram(
+    'hr_ai_zerogpt_request_duration_seconds', 'ZeroGPT call latency by outcome', ('outcome',))
+zerogpt_failures_total = metrics.counter(
+    'hr_ai_zerogpt_failures_total', 'ZeroGPT calls that produced no verdict, by reason', ('reason',))
+metrics.gauge('hr_ai_zerogpt_circuit_state', 'ZeroGPT circuit state (0 closed, 1 half-open, 2 open)',
+              callback=lambda: zerogpt_client.breaker.stats()['state_code'])
+pdf_extraction_seconds = metrics.histogram(
+    'hr_ai_pdf_extraction_duration_seconds', 'PDF text extraction time by backend', ('backend',))
+pdf_pages = metrics.histogram(
+    'hr_ai_pdf_pages', 'Pages extracted per resume', buckets=(1, 2, 3, 5, 10, 20, 50, 100))
+pdf_extraction_failures_total = metrics.counter(
+    'hr_ai_pdf_extraction_failures_total', 'PDF extractions that raised an error')
+groq_attempts_total = metrics.counter(
+    'hr_ai_groq_attempts_total', 'Groq attempts by task, kind (primary, retry, hedge, fallback), model and outcome',
+    ('task', 'kind', 'model', 'outcome'))
+groq_attempt_seconds = metrics.histogram(
+    'hr_ai_groq_attempt_duration_seconds', 'Latency of individual Groq attempts', ('task', 'kind', 'model'))
+groq_scheduler_wait_seconds = metrics.histogram(
+    'hr_ai_groq_scheduler_wait_seconds', 'Time Groq calls waited for rate-limit capacity', ('priority',))
+groq_scheduler_rejections_total = metrics.counter(
+    'hr_ai_groq_scheduler_rejections_total', 'Groq calls rejected with 429 by the scheduler', ('priority',))
+metrics.gauge('hr_ai_groq_scheduler_queued', 'Groq calls waiting for rate-limit capacity', ('priority',),
+              callback=lambda: {(name,): count for name, count in groq_scheduler.stats()['queued'].items()})
+prompt_tokens = metrics.histogram(
+    'hr_ai_prompt_tokens', 'Estimated prompt size before (raw) and after (sent) compaction', ('task', 'stage'),
+    buckets=(250, 500, 1000, 2000, 4000, 6000, 8000, 16000, 32000))
+metrics.counter('hr_ai_answer_prescreen_total', 'Answers settled by the local pre-screen, by reason, or sent to the LLM',
+                ('outcome',), callback=lambda: {(name,): value for name, value in answer_prescreen.stats().items()
+                                                if name in ('sent_to_llm', 'empty', 'dont_know', 'gibberish', 'too_short')})
+code_evaluations_total = metrics.counter(
+    'hr_ai_code_evaluations_total', 'Coding submissions evaluated, by engine (sandbox, llm)', ('engine',))
+# Stats that several callbacks read are fetched once per scrape
+sandbox_stats_source = metrics.per_scrape(lambda: code_sandbox.stats())
+bulk_stats_source = metrics.per_scrape(lambda: bulk_ingestor.stats())
+session_stats_source = metrics.per_scrape(lambda: sessions.stats())
+metrics.counter('hr_ai_sandbox_cases_total', 'Sandboxed test cases by result', ('status',),
+                callback=lambda: {(status,): sandbox_stats_source()[key] for status, key in
+                                  (('passed', 'passed'), ('failed', 'failed'), ('error', 'errors'), ('timeout', 'timeouts'))})
+metrics.counter('hr_ai_bulk_resumes_total', 'Resumes processed by bulk jobs, by outcome (done, failed, cached)', ('outcome',),
+                callback=lambda: {(name,): value for name, value in bulk_stats_source().items() if name in ('done', 'failed', 'cached')})
+metrics.gauge('hr_ai_bulk_jobs_running', 'Bulk resume jobs in progress', callback=lambda: bulk_stats_source()['jobs_running'])
+metrics.gauge('hr_ai_sessions', 'Sessions currently stored', callback=lambda: session_stats_source()['entries'])
+metrics.gauge('hr_ai_session_bytes', 'Approximate size of the stored sessions', callback=lambda: session_stats_source()['bytes'])
+metrics.counter('hr_ai_session_events_total', 'Session store lookups, creations and evictions', ('event',),
+                callback=lambda: {(name,): value for name, value in session_stats_source().items()
+                                  if name in ('hits', 'misses', 'created', 'evicted_ttl', 'evicted_lru', 'evicted_memory')})
+
+def record_groq_usage(task, model, usage):
+    """
+    Adds the token counts from a Groq `usage` object (absent on some responses)
+    to the metrics and returns their total, or None without usage.
+    """
+    if usage is None:
+        return None
+    total = 0
+    for kind in ('prompt', 'completion'):
+        tokens = getattr(usage, f'{kind}_tokens', None)
+        if tokens:
+            groq_tokens_total.inc(tokens, task=task, model=model, kind=kind)
+            total += tokens
+    completion_tokens = getattr(usage, 'completion_tokens', None)
+    if completion_tokens is not None:
+        groq_completion_cap_ratio.observe(completion_tokens / task_config(task).max_tokens, task=task)
+    return total
+
+def record_groq_attempt(task, kind, model, outcome, seconds):
+    groq_attempts_total.inc(task=task, kind=kind, model=model, outcome=outcome)
+    if outcome != 'skipped':
+        groq_attempt_seconds.observe(seconds, task=task, kind=kind, model=model)
+
+# Retries with jittered backoff, optional hedging and the fallback model (GROQ_RETRY_*, GROQ_HEDGE_*, GROQ_FALLBACK_MODEL, GROQ_LATENCY_SLO)
+llm_policy = LLMCallPolicy(GROQ_MODEL, on_attempt=record_groq_attempt)
+
+@app.errorhandler(SchedulerBusyError)
+def groq_busy(e):
+    """Rate-limited Groq calls reach the client as 429 with a Retry-After hint instead of a generic 500."""
+    retry_after = max(1, math.ceil(e.retry_after))
+    return jsonify({'error': 'The AI service is busy. Please retry shortly.', 'retry_after': retry_after}), 429, {'Retry-After': str(retry_after)}
+
+@app.errorhandler(413)
+def request_too_large(e):
+    return jsonify({'error': f"The request body is larger than {app.config['MAX_CONTENT_LENGTH']} bytes"}), 413
+
+@app.before_request
+def start_request_timer():
+    g.request_started = time.perf_counter()
+
+@app.after_request
+def observe_request_latency(response):
+    started = g.pop('request_started', None)
+    if started is not None:
+        # The rule template, not the path, keeps label cardinality bounded
+        route = request.url_rule.rule if request.url_rule else 'unmatched'
+        http_request_seconds.observe(time.perf_counter() - started, route=route, method=request.method,
+                                     status=response.status_code)
+    return response
 
 def get_or_create_session(session_id):
-    if session_id not in sessions:
-        sessions[session_id] = {
-            'candidate_profile': None,
-            'interview_questions': [],
-            'interview_responses': [],
-            'interview_start_time': None,
-            'interview_end_time': None
-        }
-    return sessions[session_id]
+    return sessions.get_or_create(session_id)
 
 # --- Static File Server ---
 # This new route will serve your index.html file
@@ -59,127 +225,352 @@ def serve_index():
 
 def extract_text_from_pdf(pdf_file):
     """
-    Extracts text from an uploaded PDF file using PyPDF2.
-    Returns the extracted text as a string.
+    Extracts text from an uploaded PDF (raw bytes or a file object) using the
+    bounded extraction engine (pdftotext or PyPDF2 in a worker process).
+    Returns the extracted text as a string, capped at PDF_MAX_PAGES / PDF_MAX_CHARS.
     """
-    text = ""
+    pdf_bytes = pdf_file if isinstance(pdf_file, bytes) else pdf_file.read()
     try:
-        reader = PdfReader(pdf_file)
-        for page in reader.pages:
-            text += page.extract_text() or ""
-        return text
+        extraction = pdf_engine.extract(pdf_bytes)
+        pdf_extraction_seconds.observe(extraction.elapsed_ms / 1000, backend=extraction.backend)
+        pdf_pages.observe(extraction.pages)
+        pdf_log.info("Extracted %d chars from %d pages with %s in %sms (truncated=%s)", len(extraction.text), extraction.pages, extraction.backend, extraction.elapsed_ms, extraction.truncated)
+        return extraction.text
     except Exception as e:
-        print(f"Error extracting text from PDF: {e}")
+        pdf_extraction_failures_total.inc()
+        pdf_log.error("Error extracting text from PDF: %s", e)
         return ""
 
 def extract_json_from_response(text):
     """
-    Extracts a JSON object or array from a string, handling markdown code blocks.
+    Extracts the first JSON object or array from a string, handling markdown code
+    blocks and surrounding prose, in a single linear scan (see json_stream.py).
     """
-    # Regex to find JSON wrapped in markdown or just the JSON itself
-    match = re.search(r'```(?:json)?\s*([\s\S]*?)\s*```|({\s*".*?"[\s\S]*})|(\[\s*[\s\S]*\])', text, re.DOTALL)
-    
-    if match:
-        json_str = match.group(1) or match.group(2) or match.group(3)
-        if json_str:
-            try:
-                # Try parsing the extracted string
-                return json.loads(json_str)
-            except json.JSONDecodeError:
-                print(f"DEBUG: Failed to decode extracted JSON: {json_str}")
-                pass # Fall through to broader search if strict parse fails
-    
-    # Fallback: find the first '{' and last '}' or first '[' and last ']'
-    json_str = None
-    if '{' in text and '}' in text:
-        try:
-            json_str = text[text.find('{') : text.rfind('}')+1]
-            return json.loads(json_str)
-        except json.JSONDecodeError as e:
-            print(f"DEBUG: Fallback JSON object parsing failed: {e}")
-            print(f"DEBUG: Substring was: {json_str}")
-    
-    if '[' in text and ']' in text:
-        try:
-            json_str = text[text.find('[') : text.rfind(']')+1]
-            return json.loads(json_str)
-        except json.JSONDecodeError as e:
-            print(f"DEBUG: Fallback JSON array parsing failed: {e}")
-            print(f"DEBUG: Substring was: {json_str}")
+    json_data = extract_json_value(text)
+    if json_data is None:
+        groq_log.warning("No valid JSON found in response (%d chars)", len(text or ''))
+    return json_data
+
+GROQ_SYSTEM_PROMPT = "You are a helpful assistant that strictly follows instructions. You MUST return JSON objects as requested by the user. Do not add any explanatory text, apologies, or markdown formatting before or after the JSON object. Just return the raw JSON object and nothing else."
+
+def reserve_groq_capacity(estimate, task, priority):
+    """Waits for rate-limit capacity for one Groq call; raises SchedulerBusyError when there is none in time."""
+    try:
+        reservation = groq_scheduler.acquire(estimate, priority)
+    except SchedulerBusyError as e:
+        record_groq_rejection(e, task, priority)
+        raise
+    groq_scheduler_wait_seconds.observe(reservation.waited_seconds, priority=PRIORITY_NAMES[priority])
+    return reservation
+
+def record_groq_rejection(error, task, priority):
+    groq_scheduler_rejections_total.inc(priority=PRIORITY_NAMES[priority])
+    groq_log.warning("Groq %s call for task %s rejected, retry after %.1fs: %s", PRIORITY_NAMES[priority], task, error.retry_after, error)
+
+def groq_request_estimate(messages, config):
+    """Tokens a call holds in the tokens-per-minute bucket until its real usage is known."""
+    # A tight max_tokens also shrinks what the call holds
+    return sum(estimate_tokens(m['content']) for m in messages) + min(config.max_tokens, GROQ_COMPLETION_TOKEN_ESTIMATE)
+
+def upstream_busy_error(error):
+    """Records a 429 from Groq with the scheduler and converts it to SchedulerBusyError."""
+    try:
+        retry_after = float(error.response.headers.get('retry-after'))
+    except (AttributeError, TypeError, ValueError):
+        retry_after = 60 / groq_scheduler.rpm
+    groq_scheduler.throttled_upstream(retry_after)
+    return SchedulerBusyError('Groq rate limit reached', retry_after)
 
-    print("DEBUG: No valid JSON found in response.")
-    return None
+def is_retryable_groq_error(error):
+    """Connection problems, timeouts and 5xx replies are worth another attempt; 4xx and 429 are not."""
+    return isinstance(error, (APIConnectionError, InternalServerError))
 
-def generate_content_with_groq(prompt):
+def send_groq_request(messages, model, kind, task, priority, stream=False):
+    """
+    One attempt under the call policy: reserves rate-limit capacity and calls
+    Groq with `model` and the task's sampling parameters and timeout. Returns
+    the completion, or (stream, reservation) for streams, whose reservation the
+    caller settles once the stream is consumed.
+    """
+    config = task_config(task)
+    estimate = groq_request_estimate(messages, config)
+    if kind in ('hedge', 'fallback'):
+        # Extra attempts only use spare capacity; they never queue behind other calls
+        reservation = groq_scheduler.try_acquire(estimate, priority)
+        if reservation is None:
+            raise AttemptSkipped('No rate-limit headroom for an extra attempt')
+    else:
+        reservation = reserve_groq_capacity(estimate, task, priority)
+    groq_log.debug("Sending %s attempt for task %s to Groq with model %s", kind, task, model)
+    try:
+        response = client.chat.completions.create(
+            messages=messages,
+            model=model,
+            stop=None,
+            stream=stream,
+            timeout=config.timeout,
+            # response_format={"type": "json_object"}, # Removing this for manual parsing
+            **sampling_params(config)
+        )
+    except RateLimitError as e:
+        raise upstream_busy_error(e) from e
+    if stream:
+        return response, reservation
+    reservation.used_tokens = record_groq_usage(task, model, getattr(response, 'usage', None))
+    groq_scheduler.settle(reservation)
+    return response
+
+def groq_messages(prompt):
+    return [
+        {"role": "system", "content": GROQ_SYSTEM_PROMPT},
+        {"role": "user", "content": prompt}
+    ]
+
+def generate_content_with_groq(prompt, task='default', use_cache=True, priority=None):
     """
     Helper to generate content safely with Groq, including error handling.
     This version does NOT use response_format and parses JSON manually.
+    Byte-identical requests are served from the LLM response cache using the
+    TTL configured for `task`; pass use_cache=False for calls that must stay fresh.
+    The model, output cap, temperature and timeout come from the task's entry
+    in the routing registry (llm_tasks.py).
+    Calls go through the rate-limit scheduler at the task's priority (or
+    `priority`) and the retry/hedge/fallback policy (llm_policy.py).
+    SchedulerBusyError is raised, not swallowed, so routes answer 429.
     """
-    system_prompt = "You are a helpful assistant that strictly follows instructions. You MUST return JSON objects as requested by the user. Do not add any explanatory text, apologies, or markdown formatting before or after the JSON object. Just return the raw JSON object and nothing else."
+    config = task_config(task)
+    started = time.perf_counter()
+    cache_key, cached_response = llm_cache_lookup(prompt, task, use_cache, started)
+    if cached_response is not None:
+        return cached_response
     
+    priority = task_priority(task) if priority is None else priority
+    messages = groq_messages(prompt)
     try:
-        print(f"DEBUG: Sending prompt to Groq with model {GROQ_MODEL}.")
-        chat_completion = client.chat.completions.create(
-            messages=[
-                {
-                    "role": "system",
-                    "content": system_prompt,
-                },
-                {
-                    "role": "user",
-                    "content": prompt,
-                }
-            ],
-            model=GROQ_MODEL,
-            temperature=0.7,
-            max_tokens=4096,
-            top_p=1,
-            stop=None,
-            stream=False,
-            # response_format={"type": "json_object"}, # Removing this for manual parsing
+        policy_result = llm_policy.call(
+            lambda model, kind: send_groq_request(messages, model, kind, task, priority),
+            task=task, model=config.model, is_retryable=is_retryable_groq_error
         )
-        
-        response_content = chat_completion.choices[0].message.content
+    except SchedulerBusyError:
+        groq_request_seconds.observe(time.perf_counter() - started, task=task, model=config.model, outcome='throttled')
+        raise
+    except Exception as e:
+        groq_request_seconds.observe(time.perf_counter() - started, task=task, model=config.model, outcome='error')
+        groq_log.error("Error calling Groq API: %s", e)
+        return None
+    groq_request_seconds.observe(time.perf_counter() - started, task=task, model=config.model, outcome='ok')
+    return groq_json_content(policy_result, task, cache_key)
+
+def llm_cache_lookup(prompt, task, use_cache, started):
+    """
+    Returns (cache_key, cached_response) for a Groq call. The key is None when
+    the call must not be cached; a hit is recorded in the latency metrics.
+    """
+    if not (use_cache and llm_cache.is_active(task)):
+        llm_cache.record_bypass()
+        return None, None
+    config = task_config(task)
+    cache_key = make_cache_key(config.model, GROQ_SYSTEM_PROMPT, prompt, sampling_params(config))
+    cached_response = llm_cache.get(cache_key)
+    if cached_response is not None:
+        groq_log.debug("LLM cache hit for task %s", task)
+        groq_request_seconds.observe(time.perf_counter() - started, task=task, model=config.model, outcome='cache_hit')
+    return cache_key, cached_response
+
+def groq_json_content(policy_result, task, cache_key):
+    """
+    The JSON object in a completed Groq call, re-serialized, or None if there
+    is none. It is cached under `cache_key` unless the fallback model answered.
+    """
+    try:
+        response_content = policy_result.value.choices[0].message.content
         
         if response_content:
-            print(f"DEBUG: Raw Groq response: {response_content}")
+            groq_log.debug("Raw Groq response: %s", response_content)
             # Try to extract JSON from the raw response
             json_data = extract_json_from_response(response_content)
             
             if json_data:
                 # Re-serialize it to a string to match the original function's output type
-                return json.dumps(json_data)
+                result = json.dumps(json_data)
+                # Answers from the fallback model are used once but not cached in place of the task model's
+                if cache_key and policy_result.model == task_config(task).model:
+                    llm_cache.put(cache_key, result, task)
+                return result
             else:
-                print("DEBUG: Failed to extract JSON from Groq response.")
+                groq_log.warning("Failed to extract JSON from Groq response")
                 return None
         else:
-            print("DEBUG: Groq response was empty or malformed.")
+            groq_log.warning("Groq response was empty or malformed")
             return None
     except Exception as e:
-        print(f"DEBUG: Error calling Groq API: {e}")
+        groq_log.error("Error reading Groq response: %s", e)
         return None
 
+def stream_content_with_groq(prompt, task='default', use_cache=True, priority=None):
+    """
+    Streaming counterpart of generate_content_with_groq: yields text deltas as
+    Groq produces them. A cached response is yielded as a single delta, and a
+    complete streamed response is added to the cache. Opening the stream is
+    retried under the call policy (no hedging or fallback: a stream cannot be
+    swapped once it has started). Errors are raised to the caller.
+    """
+    config = task_config(task)
+    started = time.perf_counter()
+    cache_key, cached_response = llm_cache_lookup(prompt, task, use_cache, started)
+    if cached_response is not None:
+        yield cached_response
+        return
+
+    priority = task_priority(task) if priority is None else priority
+    messages = groq_messages(prompt)
+    reservation = None
+    chunks = []
+    try:
+        policy_result = llm_policy.call(
+            lambda model, kind: send_groq_request(messages, model, kind, task, priority, stream=True),
+            task=task, model=config.model, is_retryable=is_retryable_groq_error, hedge=False, fallback=False
+        )
+        stream, reservation = policy_result.value
+        for chunk in stream:
+            delta = stream_chunk_delta(chunk, task, config.model, reservation)
+            if delta:
+                chunks.append(delta)
+                yield delta
+    except SchedulerBusyError:
+        groq_request_seconds.observe(time.perf_counter() - started, task=task, model=config.model, outcome='throttled')
+        raise
+    except Exception:
+        groq_request_seconds.observe(time.perf_counter() - started, task=task, model=config.model, outcome='error')
+        raise
+    finally:
+        if reservation is not None:
+            groq_scheduler.settle(reservation)
+    groq_request_seconds.observe(time.perf_counter() - started, task=task, model=config.model, outcome='ok')
+    cache_streamed_content(cache_key, chunks, task)
+
+def stream_chunk_delta(chunk, task, model, reservation):
+    """The text in one stream chunk. Groq reports usage on the final chunk under x_groq; it goes on the reservation."""
+    x_groq = getattr(chunk, 'x_groq', None)
+    used_tokens = record_groq_usage(task, model, getattr(x_groq, 'usage', None))
+    if used_tokens is not None:
+        reservation.used_tokens = used_tokens
+    return chunk.choices[0].delta.content if chunk.choices else None
+
+def cache_streamed_content(cache_key, chunks, task):
+    if cache_key:
+        json_data = extract_json_from_response("".join(chunks))
+        if json_data:
+            llm_cache.put(cache_key, json.dumps(json_data), task)
+
+SSE_HEADERS = {'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+
+def sse_event(event, data):
+    """Formats one Server-Sent Event with a JSON payload."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+def ai_reply_error(error, route, purpose, activity, ai_response_text, unexpected='An unexpected error occurred'):
+    """
+    The 500 response for a route whose Groq reply could not be used: invalid
+    JSON, a ValueError while reading it, or any other error. Call it from the
+    except block so unexpected errors are logged with their traceback.
+    """
+    if isinstance(error, json.JSONDecodeError):
+        log.error("JSON Decode Error in %s: %s", route, error)
+        groq_log.debug("Raw AI response that caused error: %s", ai_response_text)
+        return jsonify({'error': f'Failed to parse AI response as JSON for {purpose}: {error}. Raw AI response: {ai_response_text}'}), 500
+    if isinstance(error, ValueError):
+        log.error("Value Error in %s: %s", route, error)
+        return jsonify({'error': f'{str(error)}. Raw AI response: {ai_response_text}'}), 500
+    log.exception("Error during %s in %s: %s", activity, route, error)
+    return jsonify({'error': f'{unexpected}: {str(error)}'}), 500
+
+def resume_processed_response(session_id, candidate_profile, cached=False):
+    """Stores the profile on the session and builds the /upload_resume success response."""
+    sessions.update(session_id, lambda s: s.update(candidate_profile=candidate_profile))
+    return jsonify({
+        'message': 'Resume processed successfully',
+        'candidate_profile': candidate_profile,
+        'session_id': session_id,
+        'cached': cached
+    }), 200
+
 # --- API Endpoints ---
 
 @app.route('/upload_resume', methods=['POST'])
 def upload_resume():
     session_id = request.headers.get('X-User-Session-Id', str(uuid.uuid4()))
-    session = get_or_create_session(session_id)
+    get_or_create_session(session_id)
 
+    early_response, context = prepare_resume_analysis(session_id)
+    if early_response:
+        return early_response
+
+    ai_response_text = None
+    try:
+        ai_response_text = generate_content_with_groq(context['prompt'], task='resume')
+        
+        if ai_response_text:
+            return finish_resume_analysis(session_id, context, ai_response_text)
+        else:
+            return jsonify({'error': 'AI failed to parse resume or returned empty response.'}), 500
+
+    except SchedulerBusyError:
+        raise # Answered with 429 by groq_busy
+    except Exception as e:
+        return ai_reply_error(e, '/upload_resume', 'resume upload', 'resume processing', ai_response_text,
+                              'An unexpected error occurred during AI processing')
+
+def prepare_resume_analysis(session_id):
+    """
+    Reads the uploaded PDF and does everything before the Groq call: text
+    extraction and both resume cache lookups. Returns (response, None) for
+    errors and cache hits, otherwise (None, context) with the prompt and hashes.
+    Extraction blocks, so the async server runs this in a thread.
+    """
     if 'resume' not in request.files:
-        return jsonify({'error': 'No resume file provided'}), 400
+        return (jsonify({'error': 'No resume file provided'}), 400), None
     
     file = request.files['resume']
     if file.filename == '':
-        return jsonify({'error': 'No selected file'}), 400
+        return (jsonify({'error': 'No selected file'}), 400), None
     
-    if file:
-        resume_content = extract_text_from_pdf(file)
-        
-        if not resume_content.strip():
-            return jsonify({'error': 'Could not extract text from the provided PDF. Please ensure it is a text-based PDF or its text is extractable.'}), 400
+    cached_profile, context = resume_analysis_context(file.read())
+    if cached_profile is not None:
+        return resume_processed_response(session_id, cached_profile, cached=True), None
+    if context is None:
+        return (jsonify({'error': 'Could not extract text from the provided PDF. Please ensure it is a text-based PDF or its text is extractable.'}), 400), None
+    return None, context
+
+def resume_analysis_context(pdf_bytes):
+    """
+    Both resume cache lookups and the text extraction for one PDF. Returns
+    (cached_profile, None) on a cache hit, (None, None) if no text could be
+    extracted, otherwise (None, context) with the prompt and hashes.
+    """
+    pdf_hash = hash_pdf_bytes(pdf_bytes)
+
+    # Identical re-uploads skip both PDF parsing and the Groq call
+    cached_profile = resume_cache.get_by_pdf(pdf_hash)
+    if cached_profile is not None:
+        return cached_profile, None
+
+    resume_content = extract_text_from_pdf(pdf_bytes)
+    
+    if not resume_content.strip():
+        return None, None
+
+    # Same resume content in a different file (e.g. re-exported PDF) skips the Groq call
+    text_hash = hash_resume_text(resume_content)
+    cached_profile = resume_cache.get_by_text(text_hash)
+    if cached_profile is not None:
+        resume_cache.put(cached_profile, pdf_hash=pdf_hash)
+        return cached_profile, None
+
+    return None, {'prompt': build_resume_prompt(resume_content), 'pdf_hash': pdf_hash, 'text_hash': text_hash}
 
-        prompt = f"""Analyze the following resume text and extract the candidate's name, email, total years of experience (if quantifiable, otherwise a brief summary like "2 roles (5 years)"), a list of key skills, and an inferred primary job role/position.
+def build_resume_prompt(resume_content):
+    return f"""Analyze the following resume text and extract the candidate's name, email, total years of experience (if quantifiable, otherwise a brief summary like "2 roles (5 years)"), a list of key skills, and an inferred primary job role/position.
         
         Ensure the 'key_skills' is always a JSON array of strings, even if empty.
         
@@ -201,62 +592,201 @@ def upload_resume():
         {resume_content}
         ---
         """
-        
+
+def finish_resume_analysis(session_id, context, ai_response_text):
+    """Parses the profile from Groq's reply, caches it and stores it on the session. Raises JSONDecodeError on bad JSON."""
+    return resume_processed_response(session_id, parse_resume_profile(context, ai_response_text))
+
+def parse_resume_profile(context, ai_response_text):
+    """The candidate profile in Groq's reply, with key_skills normalized to a list, stored in the resume cache."""
+    groq_log.debug("Raw Groq response for resume_analyzer: %s", ai_response_text)
+    candidate_profile = json.loads(ai_response_text)
+    
+    if not isinstance(candidate_profile.get('key_skills'), list):
+        if isinstance(candidate_profile.get('key_skills'), str):
+            candidate_profile['key_skills'] = [s.strip() for s in candidate_profile['key_skills'].split(',') if s.strip()]
+        else:
+            candidate_profile['key_skills'] = []
+    
+    resume_cache.put(candidate_profile, pdf_hash=context['pdf_hash'], text_hash=context['text_hash'])
+    return candidate_profile
+
+@app.route('/bulk_upload_resumes', methods=['POST'])
+def bulk_upload_resumes():
+    """
+    Starts a bulk resume job and answers 202 right away (see bulk_ingest.py).
+    Multipart body: any number of files, each a PDF or a ZIP of PDFs.
+    Follow the job with /bulk_job_status or /bulk_job_stream.
+    """
+    try:
+        entries = collect_batch((file.filename, file.stream) for _, file in request.files.items(multi=True))
+        job = bulk_ingestor.submit(entries)
+    except BulkUploadError as e:
+        return jsonify({'error': str(e)}), e.status
+    return jsonify({
+        'message': 'Bulk resume job accepted',
+        **job,
+        'status_url': f"/bulk_job_status?job_id={job['job_id']}",
+        'stream_url': f"/bulk_job_stream?job_id={job['job_id']}",
+    }), 202
+
+def bulk_extract_resume(pdf_bytes):
+    """Extract stage of a bulk job: cache lookups and text extraction, in the PDF engine's worker processes."""
+    cached_profile, context = resume_analysis_context(pdf_bytes)
+    if cached_profile is None and context is None:
+        raise BulkFileError('Could not extract text from the PDF. It may be scanned or image-only.')
+    return cached_profile, context
+
+def bulk_analyze_resume(context):
+    """Analyze stage of a bulk job: Groq profile extraction at bulk priority, waiting out a busy scheduler."""
+    for attempt in range(BULK_BUSY_RETRIES + 1):
         try:
-            ai_response_text = generate_content_with_groq(prompt)
-            
-            if ai_response_text:
-                print(f"DEBUG: Raw Groq response for resume_analyzer: {ai_response_text}")
-                candidate_profile = json.loads(ai_response_text)
-                
-                if not isinstance(candidate_profile.get('key_skills'), list):
-                    if isinstance(candidate_profile.get('key_skills'), str):
-                        candidate_profile['key_skills'] = [s.strip() for s in candidate_profile['key_skills'].split(',') if s.strip()]
-                    else:
-                        candidate_profile['key_skills'] = []
-                
-                session['candidate_profile'] = candidate_profile
-                return jsonify({'message': 'Resume processed successfully', 'candidate_profile': candidate_profile, 'session_id': session_id}), 200
-            else:
-                return jsonify({'error': 'AI failed to parse resume or returned empty response.'}), 500
-
-        except json.JSONDecodeError as e:
-            print(f"DEBUG: JSON Decode Error in /upload_resume: {e}")
-            print(f"DEBUG: Raw AI response that caused error: {ai_response_text}")
-            return jsonify({'error': f'Failed to parse AI response as JSON for resume upload: {e}. Raw AI response: {ai_response_text}'}), 500
-        except ValueError as e: 
-             print(f"DEBUG: Value Error in /upload_resume: {e}")
-             return jsonify({'error': f'{str(e)}. Raw AI response: {ai_response_text}'}), 500
-        except Exception as e:
-            print(f"DEBUG: Error during resume processing in /upload_resume: {e}")
-            return jsonify({'error': f'An unexpected error occurred during AI processing: {str(e)}'}), 500
+            ai_response_text = generate_content_with_groq(context['prompt'], task='resume', priority=PRIORITY_BULK)
+            break
+        except SchedulerBusyError as e:
+            if attempt == BULK_BUSY_RETRIES:
+                raise BulkFileError('The AI service stayed busy; resubmit this file later.')
+            time.sleep(max(1.0, e.retry_after))
+    if not ai_response_text:
+        raise BulkFileError('AI failed to parse resume or returned empty response.')
+    try:
+        return parse_resume_profile(context, ai_response_text)
+    except (json.JSONDecodeError, AttributeError):
+        raise BulkFileError('AI returned an invalid resume profile.')
+
+@app.route('/bulk_job_status', methods=['GET'])
+def bulk_job_status():
+    """Progress of a bulk job (?job_id=) with every file's status, profile or error."""
+    status = bulk_ingestor.status(request.args.get('job_id'))
+    if status is None:
+        return jsonify({'error': 'Unknown or expired bulk job'}), 404
+    return jsonify(status), 200
+
+def bulk_job_events(update):
+    """
+    The SSE events for one BulkIngestor.changes_since() result, and whether the
+    stream is over: a `file` event per changed file, then `complete` once every
+    file is settled, else `progress` (or a heartbeat comment if nothing changed).
+    """
+    summary, changed, _ = update
+    events = [sse_event('file', record) for record in changed]
+    if summary['status'] == 'completed':
+        return events + [sse_event('complete', summary)], True
+    events.append(sse_event('progress', summary) if changed else ': heartbeat\n\n')
+    return events, False
+
+@app.route('/bulk_job_stream', methods=['GET'])
+def bulk_job_stream():
+    """Server-Sent Events variant of /bulk_job_status; the first events replay the current state of every file."""
+    job_id = request.args.get('job_id')
+    if bulk_ingestor.status(job_id) is None:
+        return jsonify({'error': 'Unknown or expired bulk job'}), 404
+
+    def generate_events():
+        version = -1
+        while True:
+            update = bulk_ingestor.changes_since(job_id, version, BULK_STREAM_HEARTBEAT_SECONDS)
+            if update is None:
+                yield sse_event('error', {'error': 'Unknown or expired bulk job'})
+                return
+            events, finished = bulk_job_events(update)
+            yield from events
+            if finished:
+                return
+            version = update[2]
+
+    return Response(stream_with_context(generate_events()), mimetype='text/event-stream', headers=SSE_HEADERS)
 
 @app.route('/setup_interview', methods=['POST'])
 def setup_interview():
     session_id = request.headers.get('X-User-Session-Id')
-    if not session_id or session_id not in sessions:
+    session = sessions.get(session_id)
+    if session is None:
         return jsonify({'error': 'Invalid or missing session ID'}), 400
-    session = sessions[session_id]
 
-    data = request.get_json()
+    error_response, context = prepare_interview(session_id, session, request.get_json())
+    if error_response:
+        return error_response
+
+    questions = context['questions']
+    question_source = 'bank'
+    ai_response_text = None
+
+    try:
+        if questions is None:
+            question_source = 'live'
+            questions, ai_response_text = generate_interview_questions(
+                context['position_role'], context['key_skills'], context['experience'], context['is_coding_role'],
+                candidate_name=context['candidate_name']
+            )
+            # Live generations feed the bank so later candidates for this role are served instantly
+            question_bank.add(context['position_role'], context['key_skills'], context['experience'], context['is_coding_role'], questions)
+
+        if questions:
+            return interview_started_response(session_id, questions, context['is_coding_role'], question_source)
+        else:
+            return jsonify({'error': 'AI failed to generate questions or returned empty response.'}), 500
+
+    except SchedulerBusyError:
+        raise # Answered with 429 by groq_busy
+    except Exception as e:
+        return ai_reply_error(e, '/setup_interview', 'interview setup', 'question generation', ai_response_text)
+
+CODING_ROLE_KEYWORDS = ('developer', 'engineer', 'programmer', 'software', 'backend', 'frontend', 'fullstack', 'full-stack', 'devops', 'data scientist', 'ml engineer', 'ai engineer', 'sre', 'qa automation', 'tech lead', 'architect')
+CODING_SKILL_KEYWORDS = ('python', 'java', 'javascript', 'c++', 'react', 'node', 'django', 'flask', 'spring')
+
+def is_coding_role(position_role, skills):
+    """True for a coding/technical role, judged by keywords in the role title or the comma-joined skills."""
+    role, skills = position_role.lower(), skills.lower()
+    return any(keyword in role for keyword in CODING_ROLE_KEYWORDS) or any(keyword in skills for keyword in CODING_SKILL_KEYWORDS)
+
+def prepare_interview(session_id, session, data):
+    """
+    Validates a /setup_interview request, records the role on the session and
+    draws a question set from the bank. Returns (error_response, None) or
+    (None, context); context['questions'] is None when they must be generated.
+    """
     position_role = data.get('position_role')
     candidate_profile = session.get('candidate_profile') 
 
     if not position_role or not candidate_profile:
-        return jsonify({'error': 'Position role and candidate profile are required'}), 400
-    
-    session['candidate_profile']['position'] = position_role
+        return (jsonify({'error': 'Position role and candidate profile are required'}), 400), None
 
     skills = ", ".join(candidate_profile.get('key_skills', []))
-    experience = candidate_profile.get('experience', 'N/A')
-    candidate_name = candidate_profile.get('name', 'Candidate')
+    coding_role = is_coding_role(position_role, skills)
     
-    # Detect if this is a coding/technical role
-    coding_keywords = ['developer', 'engineer', 'programmer', 'software', 'backend', 'frontend', 'fullstack', 'full-stack', 'devops', 'data scientist', 'ml engineer', 'ai engineer', 'sre', 'qa automation', 'tech lead', 'architect']
-    is_coding_role = any(keyword in position_role.lower() for keyword in coding_keywords) or any(keyword in skills.lower() for keyword in ['python', 'java', 'javascript', 'c++', 'react', 'node', 'django', 'flask', 'spring'])
+    def record_role(s):
+        s['candidate_profile']['position'] = position_role
+        s['is_coding_role'] = coding_role
+    sessions.update(session_id, record_role)
     
-    session['is_coding_role'] = is_coding_role
+    # Serve a randomized set from the question bank when it has enough depth for this role
+    key_skills = candidate_profile.get('key_skills', [])
+    return None, {
+        'position_role': position_role,
+        'key_skills': key_skills,
+        'experience': candidate_profile.get('experience', 'N/A'),
+        'candidate_name': candidate_profile.get('name', 'Candidate'),
+        'is_coding_role': coding_role,
+        'questions': question_bank.sample(position_role, key_skills, coding_role),
+    }
+
+def interview_started_response(session_id, questions, is_coding_role, question_source):
+    def start_interview(s):
+        s['interview_questions'] = questions
+        reset_responses(s) # Clear old responses and their aggregates
+        s['interview_start_time'] = datetime.now().isoformat()
+    sessions.update(session_id, start_interview)
     
+    return jsonify({
+        'message': 'Interview questions generated', 
+        'questions': [public_question(q) for q in questions],
+        'is_coding_role': is_coding_role,
+        'question_source': question_source
+    }), 200
+
+def build_question_prompt(candidate_name, position_role, experience, skills, is_coding_role):
+    """Builds the question generation prompt used by /setup_interview and the question bank."""
     coding_questions_text = ""
     if is_coding_role:
         coding_questions_text = """- 2 Coding Challenge questions (IMPORTANT: These MUST be simple, self-contained problems that can run in a browser without external libraries, databases, or file systems)
@@ -269,6 +799,12 @@ CODING QUESTION RULES:
 5. ONLY use: basic math, strings, arrays/lists, loops, conditionals, functions
 6. Problems should be solvable in 5-10 lines of code
 7. Must have clear input/output that can be tested with print statements
+8. The question MUST ask for one Python function and name it with its parameters (e.g. "Write a function reverse_string(s) that returns the string reversed")
+
+For each coding question, also add a `tests` object used to run the candidate's code:
+- `function_name`: the function named in the question
+- `reference_solution`: a correct Python implementation of that function
+- `cases`: 4-6 objects {"args": [...positional arguments...], "expected": <return value>}, using only JSON values and covering normal and edge cases
 
 GOOD EXAMPLES:
 - Write a function to reverse a string
@@ -323,47 +859,74 @@ BAD EXAMPLES (DO NOT USE):
     
     You MUST return ONLY the JSON object. Do not add any other text.
     """
-    
-    try:
-        ai_response_text = generate_content_with_groq(prompt)
-
-        if ai_response_text:
-            print(f"DEBUG: Raw Groq response for question_generator: {ai_response_text}")
-            response_data = json.loads(ai_response_text)
-            questions = response_data.get("questions", [])
+    return prompt
 
-            if not questions:
-                 raise ValueError("AI response did not contain a 'questions' array.")
+def public_question(question):
+    """The question as sent to the browser: test cases and expected outputs stay on the server."""
+    return {key: value for key, value in question.items() if key != 'tests'}
 
-            session['interview_questions'] = questions
-            session['interview_responses'] = [] # Clear old responses
-            session['interview_start_time'] = datetime.now().isoformat()
-            
-            # Check if coding role
-            is_coding_role = session.get('is_coding_role', False)
-            
-            return jsonify({
-                'message': 'Interview questions generated', 
-                'questions': questions,
-                'is_coding_role': is_coding_role
-            }), 200
-        else:
-            return jsonify({'error': 'AI failed to generate questions or returned empty response.'}), 500
+def attach_test_sets(questions):
+    """
+    Verifies the generated test set of each coding question against its
+    reference solution in the sandbox. The solution is discarded and cases it
+    fails are dropped; questions left without a usable set are reviewed by the LLM.
+    """
+    for question in questions:
+        tests = question.pop('tests', None)
+        if tests is None or not code_sandbox.enabled:
+            continue
+        verified = code_sandbox.verify_tests(normalize_tests(tests))
+        if verified:
+            question['tests'] = verified
+
+def generate_interview_questions(position_role, skills, experience, is_coding_role, candidate_name='the candidate', use_cache=True, priority=None):
+    """
+    Generates a question set with Groq. Returns (questions, raw_ai_response_text);
+    raises ValueError if the response has no questions. Coding questions keep
+    their verified test cases under 'tests'.
+    """
+    prompt = build_question_prompt(candidate_name, position_role, experience, ", ".join(skills), is_coding_role)
+    ai_response_text = generate_content_with_groq(prompt, task='questions', use_cache=use_cache, priority=priority)
+    if not ai_response_text:
+        return None, None
+    questions = parse_interview_questions(ai_response_text)
+    attach_test_sets(questions)
+    return questions, ai_response_text
+
+def parse_interview_questions(ai_response_text):
+    groq_log.debug("Raw Groq response for question_generator: %s", ai_response_text)
+    questions = json.loads(ai_response_text).get("questions", [])
+    if not questions:
+        raise ValueError("AI response did not contain a 'questions' array.")
+    return questions
+
+def refresh_question_bank_set(position_role, skills, experience, is_coding_role):
+    """Background refresher hook: always generates fresh questions, bypassing the LLM cache, as bulk work."""
+    questions, _ = generate_interview_questions(position_role, skills, experience, is_coding_role, use_cache=False, priority=PRIORITY_BULK)
+    return questions
+
+def evaluate_code(code, question_obj):
+    """
+    Evaluates a coding submission. Questions with a verified test set are run
+    in the sandbox and scored by the share of cases passed; others (older
+    bank entries, sets that failed verification, no sandbox) fall back to LLM review.
+    """
+    if code_sandbox.enabled and question_obj.get('tests'):
+        code_evaluations_total.inc(engine='sandbox')
+        return evaluation_from_report(code_sandbox.run_tests(code, question_obj['tests']))
+    code_evaluations_total.inc(engine='llm')
+    return review_code_with_llm(code, question_obj['question'])
 
-    except json.JSONDecodeError as e:
-        print(f"DEBUG: JSON Decode Error in /setup_interview: {e}")
-        print(f"DEBUG: Raw AI response that caused error: {ai_response_text}")
-        return jsonify({'error': f'Failed to parse AI response as JSON for interview setup: {e}. Raw AI response: {ai_response_text}'}), 500
-    except ValueError as e:
-        print(f"DEBUG: Value Error in /setup_interview: {e}")
-        return jsonify({'error': f'{str(e)}. Raw AI response: {ai_response_text}'}), 500
+def review_code_with_llm(code, question):
+    """Evaluate submitted code using AI to check correctness"""
+    try:
+        return code_review_result(generate_content_with_groq(build_code_review_prompt(code, question), task='code_evaluation'))
     except Exception as e:
-        print(f"DEBUG: Error during question generation in /setup_interview: {e}")
-        return jsonify({'error': f'An unexpected error occurred: {str(e)}'}), 500
+        groq_log.error("Code evaluation error: %s", e)
+        return {'correctness': 0, 'logic': 0, 'syntax': 0, 'overall_score': 0, 'feedback': f'Evaluation error: {str(e)}', 'has_errors': True}
 
-def evaluate_code(code, question):
-    """Evaluate submitted code using AI to check correctness"""
-    prompt = f"""You are a code evaluator. Analyze the following code submission for a coding question.
+def build_code_review_prompt(code, question):
+    return f"""You are a code evaluator. Analyze the following code submission for a coding question.
 
 Question: {question}
 
@@ -392,17 +955,42 @@ Return ONLY a JSON object:
 
 If the code has syntax errors or won't run, set has_errors to true and give low scores.
 """
-    
-    try:
-        ai_response = generate_content_with_groq(prompt)
-        if ai_response:
-            return json.loads(ai_response)
-        return {'correctness': 0, 'logic': 0, 'syntax': 0, 'overall_score': 0, 'feedback': 'Failed to evaluate code', 'has_errors': True}
-    except Exception as e:
-        print(f"DEBUG: Code evaluation error: {e}")
-        return {'correctness': 0, 'logic': 0, 'syntax': 0, 'overall_score': 0, 'feedback': f'Evaluation error: {str(e)}', 'has_errors': True}
+
+def code_review_result(ai_response):
+    """The review in Groq's reply; raises JSONDecodeError on bad JSON."""
+    if ai_response:
+        return json.loads(ai_response)
+    return {'correctness': 0, 'logic': 0, 'syntax': 0, 'overall_score': 0, 'feedback': 'Failed to evaluate code', 'has_errors': True}
 
 def detect_ai_content(text):
+    """
+    Detect if text is AI-generated with the engine selected by AI_DETECTION_MODE:
+    'remote' (ZeroGPT), 'local' (statistical detector) or 'local_first', which
+    only asks ZeroGPT to confirm suspicious answers and keeps the local verdict
+    when ZeroGPT is unavailable.
+    Returns: dict with 'is_ai_generated' (bool), 'ai_percentage' (float), 'confidence' (str)
+    """
+    if AI_DETECTION_MODE == 'local':
+        return detect_ai_content_local(text)
+    if AI_DETECTION_MODE == 'local_first':
+        local_result = detect_ai_content_local(text)
+        if not needs_remote_confirmation(local_result):
+            return local_result
+        return confirmed_detection(local_result, detect_ai_content_remote(text))
+    return detect_ai_content_remote(text)
+
+def needs_remote_confirmation(local_result):
+    """local_first: only answers the local detector finds suspicious are sent to ZeroGPT."""
+    return 'error' not in local_result and local_result['ai_percentage'] >= AI_DETECTION_CONFIRM_THRESHOLD
+
+def confirmed_detection(local_result, remote_result):
+    """local_first: ZeroGPT's verdict on a suspicious answer, or the local one if ZeroGPT gave none."""
+    if 'error' in remote_result:
+        zerogpt_log.warning("ZeroGPT confirmation failed (%s), keeping local verdict", remote_result['error'])
+        return dict(local_result, remote_error=remote_result['error'])
+    return dict(remote_result, source='remote', local_ai_percentage=local_result['ai_percentage'])
+
+def detect_ai_content_remote(text):
     """
     Detect if text is AI-generated using ZeroGPT API
     Returns: dict with 'is_ai_generated' (bool), 'ai_percentage' (float), 'confidence' (str)
@@ -410,97 +998,75 @@ def detect_ai_content(text):
     if not text or len(text.strip()) < 10:
         return {'is_ai_generated': False, 'ai_percentage': 0, 'confidence': 'N/A', 'error': 'Text too short'}
     
+    started = time.perf_counter()
+    response = None
     try:
-        # ZeroGPT API endpoint (free public endpoint)
-        url = "https://api.zerogpt.com/api/detect/detectText"
-        
-        payload = {
-            "input_text": text
-        }
-        
-        headers = {
-            'Content-Type': 'application/json'
-        }
-        
-        print(f"DEBUG: Calling ZeroGPT API with text length: {len(text)}")
-        response = requests.post(url, json=payload, headers=headers, timeout=10)
-        print(f"DEBUG: ZeroGPT Response Status: {response.status_code}")
-        print(f"DEBUG: ZeroGPT Response: {response.text[:500]}")
-        
-        if response.status_code == 200:
-            result = response.json()
-            
-            # Parse ZeroGPT response - check multiple possible response formats
-            data = result.get('data', result)  # Some APIs return data directly
-            
-            # Try different field names
-            ai_percentage = (
-                data.get('fakePercentage') or 
-                data.get('ai_percentage') or 
-                data.get('isHuman', 100) - 100 or  # If isHuman is 20, AI is 80
-                0
-            )
-            
-            # If isHuman field exists, convert it
-            if 'isHuman' in data:
-                ai_percentage = 100 - float(data['isHuman'])
-            
-            is_ai = ai_percentage > 50  # Consider >50% as AI-generated
-            
-            confidence = 'High' if ai_percentage > 70 else 'Medium' if ai_percentage > 40 else 'Low'
-            
-            return {
-                'is_ai_generated': is_ai,
-                'ai_percentage': round(ai_percentage, 2),
-                'confidence': confidence,
-                'details': data,
-                'raw_response': result
-            }
-        else:
-            print(f"DEBUG: ZeroGPT API error: {response.status_code} - {response.text}")
-            return {'is_ai_generated': False, 'ai_percentage': 0, 'confidence': 'N/A', 'error': f'API error: {response.status_code}'}
-            
+        zerogpt_log.debug("Calling ZeroGPT API with text length %d", len(text))
+        response = zerogpt_client.detect(text)
+        return zerogpt_verdict(response, started)
+    except CircuitOpenError:
+        zerogpt_log.debug("ZeroGPT circuit open, skipping AI detection")
+        return zerogpt_failure('circuit_open', 'Detector unavailable (circuit open)')
     except requests.exceptions.Timeout:
-        print(f"DEBUG: ZeroGPT API timeout")
-        return {'is_ai_generated': False, 'ai_percentage': 0, 'confidence': 'N/A', 'error': 'API timeout'}
+        zerogpt_log.warning("ZeroGPT API timeout")
+        return zerogpt_failure('timeout', 'API timeout', started)
     except Exception as e:
-        print(f"DEBUG: AI detection error: {type(e).__name__}: {e}")
-        return {'is_ai_generated': False, 'ai_percentage': 0, 'confidence': 'N/A', 'error': str(e)}
+        zerogpt_log.error("AI detection error: %s: %s", type(e).__name__, e)
+        return zerogpt_failure('error', str(e), None if response is not None else started)
 
-@app.route('/submit_answer', methods=['POST'])
-def submit_answer():
-    session_id = request.headers.get('X-User-Session-Id')
-    if not session_id or session_id not in sessions:
-        return jsonify({'error': 'Invalid or missing session ID'}), 400
-    session = sessions[session_id]
-
-    data = request.get_json()
-    question_id = data.get('question_id')
-    response_text = data.get('response_text')
-    code_submission = data.get('code_submission', '')
-    is_coding_question = data.get('is_coding_question', False)
-    duration = data.get('duration')
-
-    if not question_id or (response_text is None and not code_submission): # Allow empty string "" but not null
-        return jsonify({'error': 'Question ID and response text are required'}), 400
-
-    question_obj = next((q for q in session['interview_questions'] if q['id'] == question_id), None)
-    if not question_obj:
-        return jsonify({'error': 'Question not found in current session'}), 404
-    
-    # For coding questions, evaluate the code
-    code_evaluation = None
-    if is_coding_question and code_submission:
-        code_evaluation = evaluate_code(code_submission, question_obj['question'])
-        print(f"DEBUG: Code Evaluation Result: {code_evaluation}")
+def zerogpt_verdict(response, started):
+    """
+    Builds the detection result from a ZeroGPT response (requests or httpx)
+    and records the call's latency.
+    """
+    zerogpt_request_seconds.observe(time.perf_counter() - started, outcome='ok' if response.status_code == 200 else 'http_error')
+    zerogpt_log.debug("ZeroGPT response %d: %s", response.status_code, response.text)
     
-    # Detect AI-generated content
-    ai_detection = detect_ai_content(response_text) if response_text else {'is_ai_generated': False, 'ai_percentage': 0}
-    print(f"DEBUG: AI Detection Result: {ai_detection}")
+    if response.status_code == 200:
+        result = response.json()
+        
+        # Parse ZeroGPT response - check multiple possible response formats
+        data = result.get('data', result)  # Some APIs return data directly
+        
+        # Try different field names
+        ai_percentage = (
+            data.get('fakePercentage') or 
+            data.get('ai_percentage') or 
+            data.get('isHuman', 100) - 100 or  # If isHuman is 20, AI is 80
+            0
+        )
+        
+        # If isHuman field exists, convert it
+        if 'isHuman' in data:
+            ai_percentage = 100 - float(data['isHuman'])
+        
+        is_ai = ai_percentage > 50  # Consider >50% as AI-generated
+        
+        confidence = 'High' if ai_percentage > 70 else 'Medium' if ai_percentage > 40 else 'Low'
+        
+        return {
+            'is_ai_generated': is_ai,
+            'ai_percentage': round(ai_percentage, 2),
+            'confidence': confidence,
+            'details': data,
+            'raw_response': result
+        }
+    else:
+        zerogpt_failures_total.inc(reason='http_error')
+        zerogpt_log.warning("ZeroGPT API error %d: %s", response.status_code, response.text)
+        return {'is_ai_generated': False, 'ai_percentage': 0, 'confidence': 'N/A', 'error': f'API error: {response.status_code}'}
 
-    prompt = f"""You are a STRICT AI interviewer. Evaluate the following candidate's response to an interview question.
+def zerogpt_failure(reason, error, started=None):
+    """
+    Records a ZeroGPT call that produced no verdict and returns the neutral
+    result for it. `started` is given when the call's latency is still unrecorded.
+    """
+    if started is not None:
+        zerogpt_request_seconds.observe(time.perf_counter() - started, outcome=reason)
+    zerogpt_failures_total.inc(reason=reason)
+    return {'is_ai_generated': False, 'ai_percentage': 0, 'confidence': 'N/A', 'error': error}
 
-CRITICAL EVALUATION RULES:
+ANSWER_SCORING_RULES = """CRITICAL EVALUATION RULES:
 1. If the response contains random letters, gibberish, or nonsense (e.g., "tdciyctiyt", "asdfgh"), give 0-10 scores
 2. If the response is empty, very short (less than 10 words), or just says "I don't know", give 0-20 scores
 3. If the response is completely irrelevant to the question, give 0-30 scores
@@ -512,7 +1078,15 @@ Provide a score out of 100 for:
 - Communication clarity (0-100): How clear and well-articulated is the response?
 - Relevance to question (0-100): How relevant is the answer to the specific question asked?
 
-Also provide brief, honest feedback explaining the scores.
+Also provide brief, honest feedback explaining the scores."""
+
+CODE_EVALUATION_FALLBACK = {'correctness': 0, 'logic': 0, 'syntax': 0, 'overall_score': 0, 'feedback': 'Code evaluation timed out', 'has_errors': True}
+AI_DETECTION_FALLBACK = {'is_ai_generated': False, 'ai_percentage': 0, 'confidence': 'N/A', 'error': 'Detection timed out'}
+
+def build_answer_scoring_prompt(question, response_text):
+    return f"""You are a STRICT AI interviewer. Evaluate the following candidate's response to an interview question.
+
+{ANSWER_SCORING_RULES}
 
 Format the output strictly as a JSON object with the following keys:
 - `technicalScore`: (integer 0-100)
@@ -538,61 +1112,193 @@ Example for BAD/GIBBERISH response:
 
 You MUST return ONLY the JSON object. Do not add any other text.
 
-Question: "{question_obj['question']}"
+Question: "{question}"
 Candidate's Response: "{response_text}"
 """
+
+def build_batch_scoring_prompt(batch):
+    """Prompt that scores every (question_id, question, response) in `batch` with one call."""
+    answers = [{'question_id': qid, 'question': question, 'response': response_text or ''} for qid, question, response_text in batch]
+    return f"""You are a STRICT AI interviewer. Evaluate each of the following candidate's responses to interview questions. Judge every answer independently of the others.
+
+{ANSWER_SCORING_RULES}
+
+Format the output strictly as a JSON object with a single key `evaluations`: an array with exactly one object per answer, in the same order as the answers, each with the following keys:
+- `question_id`: (string, copied exactly from the answer)
+- `technicalScore`: (integer 0-100)
+- `communicationScore`: (integer 0-100)
+- `relevanceScore`: (integer 0-100)
+- `feedback`: (string)
+
+Example:
+{{
+  "evaluations": [
+    {{"question_id": "tech_1", "technicalScore": 85, "communicationScore": 90, "relevanceScore": 88, "feedback": "Technically sound and clearly communicated."}},
+    {{"question_id": "tech_2", "technicalScore": 5, "communicationScore": 0, "relevanceScore": 0, "feedback": "Random characters with no meaningful content."}}
+  ]
+}}
+
+You MUST return ONLY the JSON object. Do not add any other text.
+
+Answers:
+{json.dumps(answers, indent=2)}
+"""
+
+def combine_evaluation(evaluation, code_evaluation, ai_detection):
+    """Adds the overall score, code evaluation and AI-detection penalty to an answer evaluation."""
+    # For coding questions, combine code evaluation with explanation evaluation
+    if code_evaluation:
+        # Weight: 70% code correctness, 30% explanation
+        code_score = code_evaluation.get('overall_score', 0)
+        explanation_score = (evaluation.get('technicalScore', 0) + evaluation.get('communicationScore', 0) + evaluation.get('relevanceScore', 0)) / 3
+        overall_q_score = (code_score * 0.7) + (explanation_score * 0.3)
+        
+        evaluation['code_evaluation'] = code_evaluation
+        evaluation['code_score'] = code_score
+        evaluation['explanation_score'] = round(explanation_score)
+    else:
+        overall_q_score = (evaluation.get('technicalScore', 0) + evaluation.get('communicationScore', 0) + evaluation.get('relevanceScore', 0)) / 3
+    
+    evaluation['score'] = round(overall_q_score)
+    
+    # Add AI detection results to evaluation
+    evaluation['ai_detection'] = ai_detection
+    
+    # Penalize score if AI-generated content detected
+    if ai_detection.get('is_ai_generated', False):
+        penalty = ai_detection.get('ai_percentage', 0) * 0.5  # Up to 50% penalty
+        evaluation['score'] = max(0, round(evaluation['score'] - penalty))
+        evaluation['ai_warning'] = f"AI-generated content detected ({ai_detection.get('ai_percentage', 0)}%). Score adjusted."
+    return evaluation
+
+def session_with_aggregates(session_id, session):
+    """
+    The session with its running aggregates. Sessions that predate them are
+    rebuilt once through sessions.update(), so the rebuild is stored and never
+    done on a snapshot (or a live dict outside the store lock).
+    """
+    if 'aggregates' in session:
+        return session
+
+    def rebuild(s):
+        ensure_aggregates(s)
+        return s
+    return sessions.update(session_id, rebuild)
+
+def record_responses(session_id, response_records):
+    """
+    Stores evaluated answers in one session update, replacing earlier answers to
+    the same questions, and keeps the session's running aggregates in step.
+    """
+    def record(s):
+        for new_response_data in response_records:
+            record_response(s, new_response_data)
+    sessions.update(session_id, record)
+
+def build_response_record(question_obj, response_text, duration, evaluation):
+    return {
+        'question_id': question_obj['id'],
+        'question': question_obj['question'],
+        'tags': question_obj['tags'],
+        'response': response_text,
+        'duration': duration,
+        'evaluation': evaluation
+    }
+
+# The calls evaluation stages make; the async server (asgi.py) substitutes coroutine versions
+StageCalls = namedtuple('StageCalls', ['generate', 'evaluate_code', 'detect_ai_content'])
+BLOCKING_CALLS = StageCalls(generate_content_with_groq, evaluate_code, detect_ai_content)
+
+def answer_side_stages(name_suffix, question_obj, response_text, code_submission, is_coding_question, calls=BLOCKING_CALLS):
+    """Code-evaluation and AI-detection stages for one answer; they do not depend on scoring."""
+    stages = []
+    if is_coding_question and code_submission:
+        stages.append(Stage(
+            'code_evaluation' + name_suffix, calls.evaluate_code, code_submission, question_obj,
+            fallback=CODE_EVALUATION_FALLBACK
+        ))
+    if response_text:
+        stages.append(Stage(
+            'ai_detection' + name_suffix, calls.detect_ai_content, response_text,
+            fallback=AI_DETECTION_FALLBACK
+        ))
+    return stages
+
+@app.route('/submit_answer', methods=['POST'])
+def submit_answer():
+    session_id = request.headers.get('X-User-Session-Id')
+    session = sessions.get(session_id)
+    if session is None:
+        return jsonify({'error': 'Invalid or missing session ID'}), 400
+
+    error_response, context = prepare_answer(session, request.get_json())
+    if error_response:
+        return error_response
+
+    stage_results, stage_timings = run_stages(answer_stages(context))
+    return answer_evaluated_response(session_id, context, stage_results, stage_timings)
+
+def prepare_answer(session, data):
+    """
+    Validates a /submit_answer request and pre-screens the answer. Returns
+    (error_response, None) or (None, context); context['prescreened'] is the
+    local evaluation, or None if the answer needs the model.
+    """
+    question_id = data.get('question_id')
+    response_text = data.get('response_text')
+    code_submission = data.get('code_submission', '')
+
+    if not question_id or (response_text is None and not code_submission): # Allow empty string "" but not null
+        return (jsonify({'error': 'Question ID and response text are required'}), 400), None
+
+    question_obj = next((q for q in session['interview_questions'] if q['id'] == question_id), None)
+    if not question_obj:
+        return (jsonify({'error': 'Question not found in current session'}), 404), None
     
+    return None, {
+        'question_obj': question_obj,
+        'response_text': response_text,
+        'code_submission': code_submission,
+        'is_coding_question': data.get('is_coding_question', False),
+        'duration': data.get('duration'),
+        # Empty, "I don't know", gibberish and very short answers are scored locally without a Groq call
+        'prescreened': answer_prescreen.screen(response_text),
+    }
+
+def answer_stages(context, calls=BLOCKING_CALLS):
+    """Code evaluation, AI detection and answer scoring are independent, so they run concurrently."""
+    stages = []
+    if context['prescreened'] is None:
+        prompt = build_answer_scoring_prompt(context['question_obj']['question'], context['response_text'])
+        stages.append(Stage('answer_scoring', calls.generate, prompt, 'evaluation', reraise=(SchedulerBusyError,)))
+    stages += answer_side_stages('', context['question_obj'], context['response_text'], context['code_submission'],
+                                 context['is_coding_question'], calls)
+    return stages
+
+def answer_evaluated_response(session_id, context, stage_results, stage_timings):
+    """Combines the stage results into the evaluation, records it and builds the /submit_answer response."""
+    prescreened = context['prescreened']
+    if prescreened is not None:
+        stage_results['answer_scoring'] = json.dumps(prescreened)
+        stage_timings['answer_scoring'] = {'status': 'prescreened', 'duration_ms': 0.0}
+    code_evaluation = stage_results.get('code_evaluation')
+    ai_detection = stage_results.get('ai_detection') or {'is_ai_generated': False, 'ai_percentage': 0}
+    log.debug("Code evaluation result: %s", code_evaluation)
+    log.debug("AI detection result: %s", ai_detection)
+    log.debug("Evaluation stage timings: %s", stage_timings)
+
     try:
-        ai_response_text = generate_content_with_groq(prompt)
+        ai_response_text = stage_results.get('answer_scoring')
         
         if ai_response_text:
-            print(f"DEBUG: Raw Groq response for submit_answer: {ai_response_text}")
-            evaluation = json.loads(ai_response_text)
-            
-            # For coding questions, combine code evaluation with explanation evaluation
-            if code_evaluation:
-                # Weight: 70% code correctness, 30% explanation
-                code_score = code_evaluation.get('overall_score', 0)
-                explanation_score = (evaluation.get('technicalScore', 0) + evaluation.get('communicationScore', 0) + evaluation.get('relevanceScore', 0)) / 3
-                overall_q_score = (code_score * 0.7) + (explanation_score * 0.3)
-                
-                evaluation['code_evaluation'] = code_evaluation
-                evaluation['code_score'] = code_score
-                evaluation['explanation_score'] = round(explanation_score)
-            else:
-                overall_q_score = (evaluation.get('technicalScore', 0) + evaluation.get('communicationScore', 0) + evaluation.get('relevanceScore', 0)) / 3
-            
-            evaluation['score'] = round(overall_q_score)
+            groq_log.debug("Raw Groq response for submit_answer: %s", ai_response_text)
+            # Checked and cleaned like the batch path, so stored evaluations have one shape
+            evaluation = validate_evaluation(json.loads(ai_response_text))
+            if evaluation is None:
+                return jsonify({'error': 'AI failed to evaluate response or returned an invalid evaluation.'}), 500
+            evaluation = combine_evaluation(evaluation, code_evaluation, ai_detection)
             
-            # Add AI detection results to evaluation
-            evaluation['ai_detection'] = ai_detection
-            
-            # Penalize score if AI-generated content detected
-            if ai_detection.get('is_ai_generated', False):
-                penalty = ai_detection.get('ai_percentage', 0) * 0.5  # Up to 50% penalty
-                evaluation['score'] = max(0, round(evaluation['score'] - penalty))
-                evaluation['ai_warning'] = f"AI-generated content detected ({ai_detection.get('ai_percentage', 0)}%). Score adjusted."
-            
-            # Find if this question was already answered and update it, otherwise append
-            existing_response_index = -1
-            for i, res in enumerate(session['interview_responses']):
-                if res['question_id'] == question_id:
-                    existing_response_index = i
-                    break
-
-            new_response_data = {
-                'question_id': question_id,
-                'question': question_obj['question'],
-                'tags': question_obj['tags'],
-                'response': response_text,
-                'duration': duration,
-                'evaluation': evaluation
-            }
-
-            if existing_response_index != -1:
-                session['interview_responses'][existing_response_index] = new_response_data
-            else:
-                session['interview_responses'].append(new_response_data)
+            record_responses(session_id, [build_response_record(context['question_obj'], context['response_text'], context['duration'], evaluation)])
             
             response_message = 'Answer submitted and evaluated'
             if ai_detection.get('is_ai_generated', False):
@@ -601,156 +1307,381 @@ Candidate's Response: "{response_text}"
             return jsonify({
                 'message': response_message, 
                 'evaluation': evaluation,
-                'ai_detection': ai_detection
+                'ai_detection': ai_detection,
+                'stage_timings': stage_timings
             }), 200
         else:
             return jsonify({'error': 'AI failed to evaluate response or returned empty response.'}), 500
 
-    except json.JSONDecodeError as e:
-        print(f"DEBUG: JSON Decode Error in /submit_answer: {e}")
-        print(f"DEBUG: Raw AI response that caused error: {ai_response_text}")
-        return jsonify({'error': f'Failed to parse AI response as JSON for answer evaluation: {e}. Raw AI response: {ai_response_text}'}), 500
-    except ValueError as e:
-        print(f"DEBUG: Value Error in /submit_answer: {e}")
-        return jsonify({'error': f'{str(e)}. Raw AI response: {ai_response_text}'}), 500
     except Exception as e:
-        print(f"DEBUG: Error during response evaluation in /submit_answer: {e}")
-        return jsonify({'error': f'An unexpected error occurred during AI processing: {str(e)}'}), 500
+        return ai_reply_error(e, '/submit_answer', 'answer evaluation', 'response evaluation', ai_response_text,
+                              'An unexpected error occurred during AI processing')
 
-@app.route('/get_assessment', methods=['GET'])
-def get_assessment():
+@app.route('/submit_answers', methods=['POST'])
+def submit_answers():
+    """
+    Batch variant of /submit_answer for "submit all at the end" flows.
+    Body: {"answers": [{question_id, response_text, code_submission, is_coding_question, duration}, ...]}
+    Answers are scored a batch at a time with one Groq call per batch; code
+    evaluation and AI detection still run per answer, all concurrently. Any
+    evaluation missing from a batch reply is rescored with the single-answer prompt.
+    Answers settled by the local pre-screen are not sent to Groq at all.
+    """
     session_id = request.headers.get('X-User-Session-Id')
-    if not session_id or session_id not in sessions:
+    session = sessions.get(session_id)
+    if session is None:
         return jsonify({'error': 'Invalid or missing session ID'}), 400
-    session = sessions[session_id]
 
+    error_response, context = prepare_answer_batch(session, request.get_json(silent=True) or {})
+    if error_response:
+        return error_response
+
+    stage_results, stage_timings = run_stages(answer_batch_stages(context))
+    missing_ids = collect_batch_evaluations(context, stage_results)
+    if missing_ids:
+        retry_results, retry_timings = run_stages(rescoring_stages(context, missing_ids))
+        stage_timings['retry'] = retry_timings
+        collect_rescored_evaluations(context, missing_ids, retry_results)
+    return answer_batch_response(session_id, context, stage_results, stage_timings)
+
+def prepare_answer_batch(session, data):
+    """
+    Validates a /submit_answers request, pre-screens its answers and splits the
+    rest into scoring batches. Returns (error_response, None) or (None, context).
+    """
+    answers = data.get('answers')
+    if not isinstance(answers, list) or not answers:
+        return (jsonify({'error': 'A non-empty "answers" list is required'}), 400), None
+    if len(answers) > BATCH_SUBMIT_MAX_ANSWERS:
+        return (jsonify({'error': f'At most {BATCH_SUBMIT_MAX_ANSWERS} answers can be submitted at once'}), 400), None
+
+    questions_by_id = {q['id']: q for q in session['interview_questions']}
+    submitted = []
+    seen_ids = set()
+    for answer in answers:
+        question_id = answer.get('question_id') if isinstance(answer, dict) else None
+        if not question_id or (answer.get('response_text') is None and not answer.get('code_submission')):
+            return (jsonify({'error': 'Every answer needs a question ID and response text'}), 400), None
+        if not isinstance(question_id, str):
+            return (jsonify({'error': 'Question IDs must be strings'}), 400), None
+        if question_id not in questions_by_id:
+            return (jsonify({'error': f'Question {question_id} not found in current session'}), 404), None
+        if question_id in seen_ids:
+            return (jsonify({'error': f'Question {question_id} is answered more than once in this batch'}), 400), None
+        seen_ids.add(question_id)
+        submitted.append(answer)
+
+    evaluations = {}
+    for answer in submitted:
+        prescreened = answer_prescreen.screen(answer.get('response_text'))
+        if prescreened is not None:
+            evaluations[answer['question_id']] = prescreened
+
+    batches = chunk_answers([(a['question_id'], questions_by_id[a['question_id']]['question'], a.get('response_text'))
+                             for a in submitted if a['question_id'] not in evaluations])
+    return None, {
+        'submitted': submitted,
+        'questions_by_id': questions_by_id,
+        'evaluations': evaluations,
+        'prescreened_count': len(evaluations),
+        'batches': batches,
+        'scoring_calls': len(batches),
+    }
+
+def answer_batch_stages(context, calls=BLOCKING_CALLS):
+    questions_by_id = context['questions_by_id']
+    stages = [
+        Stage(f'answer_scoring:batch_{i}', calls.generate, build_batch_scoring_prompt(batch), 'batch_evaluation',
+              reraise=(SchedulerBusyError,))
+        for i, batch in enumerate(context['batches'])
+    ]
+    for answer in context['submitted']:
+        stages += answer_side_stages(':' + answer['question_id'], questions_by_id[answer['question_id']],
+                                     answer.get('response_text'), answer.get('code_submission', ''), answer.get('is_coding_question', False),
+                                     calls)
+    return stages
+
+def collect_batch_evaluations(context, stage_results):
+    """Adds the valid evaluations in the batch replies to the context and returns the IDs still missing one."""
+    missing_ids = []
+    for i, batch in enumerate(context['batches']):
+        batch_ids = [item[0] for item in batch]
+        payload = extract_json_from_response(stage_results.get(f'answer_scoring:batch_{i}') or '')
+        batch_evaluations, batch_missing = parse_batch_evaluations(payload, batch_ids)
+        context['evaluations'].update(batch_evaluations)
+        missing_ids += batch_missing
+        if batch_missing:
+            groq_log.warning("Batch scoring reply %d lacked valid evaluations for %s; rescoring individually", i, batch_missing)
+    return missing_ids
+
+def rescoring_stages(context, missing_ids, calls=BLOCKING_CALLS):
+    """Single-answer scoring stages for answers a batch reply left without an evaluation; each counts as a scoring call."""
+    context['scoring_calls'] += len(missing_ids)
+    return [
+        Stage(f'answer_scoring:{qid}', calls.generate,
+              build_answer_scoring_prompt(context['questions_by_id'][qid]['question'],
+                                          next(a.get('response_text') for a in context['submitted'] if a['question_id'] == qid)),
+              'evaluation', reraise=(SchedulerBusyError,))
+        for qid in missing_ids
+    ]
+
+def collect_rescored_evaluations(context, missing_ids, retry_results):
+    for qid in missing_ids:
+        evaluation = validate_evaluation(extract_json_from_response(retry_results.get(f'answer_scoring:{qid}') or ''))
+        if evaluation is not None:
+            context['evaluations'][qid] = evaluation
+
+def answer_batch_response(session_id, context, stage_results, stage_timings):
+    """Combines every answer's results, records them in one session update and builds the /submit_answers response."""
+    submitted = context['submitted']
+    evaluations = context['evaluations']
+    results = []
+    errors = []
+    response_records = []
+    for answer in submitted:
+        qid = answer['question_id']
+        if qid not in evaluations:
+            errors.append({'question_id': qid, 'error': 'AI failed to evaluate response or returned an invalid evaluation.'})
+            continue
+        code_evaluation = stage_results.get(f'code_evaluation:{qid}')
+        ai_detection = stage_results.get(f'ai_detection:{qid}') or {'is_ai_generated': False, 'ai_percentage': 0}
+        evaluation = combine_evaluation(evaluations[qid], code_evaluation, ai_detection)
+        response_records.append(build_response_record(context['questions_by_id'][qid], answer.get('response_text'), answer.get('duration'), evaluation))
+        results.append({'question_id': qid, 'evaluation': evaluation, 'ai_detection': ai_detection})
+
+    if response_records:
+        record_responses(session_id, response_records)
+    log.info("Batch submission scored %d/%d answers with %d Groq calls (%d pre-screened)",
+             len(results), len(submitted), context['scoring_calls'], context['prescreened_count'])
+
+    return jsonify({
+        'message': f'{len(results)} of {len(submitted)} answers submitted and evaluated',
+        'results': results,
+        'errors': errors,
+        'scoring_calls': context['scoring_calls'],
+        'prescreened': context['prescreened_count'],
+        'stage_timings': stage_timings
+    }), 200 if results else 500
+
+def build_detailed_question_analysis(responses):
+    """Per-question breakdown for the assessment, built from session data rather than the LLM."""
+    detailed_analysis_from_session = []
+    for res in responses:
+        if res.get('evaluation'):
+            detailed_analysis_from_session.append({
+                "question": res['question'],
+                "response": res['response'],
+                "tags": res['tags'],
+                "score": res['evaluation'].get('score', 0),
+                "technicalScore": res['evaluation'].get('technicalScore', 0),
+                "communicationScore": res['evaluation'].get('communicationScore', 0),
+                "relevanceScore": res['evaluation'].get('relevanceScore', 0)
+            })
+    return detailed_analysis_from_session
+
+ASSESSMENT_PROMPT_TEMPLATE = """Generate a comprehensive interview assessment report based on the following candidate profile and interview responses.
+
+Candidate Profile: {profile}
+
+Interview Questions and Responses:
+{separator}
+{responses}
+{separator}
+
+Overall Interview Duration: {duration}
+
+Provide the assessment strictly as a JSON object with the following structure:
+- `overallScore`: (integer 0-100, aggregate score based on all responses)
+- `recommendation`: (string, e.g., "Highly Recommended", "Recommended", "Consider with Reservations", "Not Recommended")
+- `interviewDuration`: (string, e.g., "15m 30s")
+- `detailedScores`: (object with `technicalSkills`, `communication`, `softSkills` - each an integer 0-100, derived from the evaluations)
+- `detailedQuestionAnalysis`: (array of objects) Note: For this `detailedQuestionAnalysis` field, you MUST return an empty array `[]`. It will be populated by the server.
+- `keyStrengths`: (array of strings, summarizing positive feedback)
+- `areasForImprovement`: (array of strings, summarizing areas needing work)
+
+Example JSON output:
+{{"overallScore": 85, "recommendation": "Recommended", "interviewDuration": "12m 45s", "detailedScores": {{"technicalSkills": 88, "communication": 82, "softSkills": 85}}, "detailedQuestionAnalysis": [], "keyStrengths": ["Strong technical foundation in Python.", "Clear communication and problem-solving examples."], "areasForImprovement": ["Could provide more depth on system design topics.", "Response to behavioral question was a bit generic."]}}
+
+You MUST return ONLY the JSON object. Do not add any other text."""
+
+def format_assessment_prompt(profile_json, evaluated, answers, duration):
+    """Fills the assessment template; `answers` are the (possibly truncated) texts for `evaluated`."""
+    summary = "\n\n".join(
+        f"Q: {res['question']}\n"
+        f"A: {answer}\n"
+        f"Evaluation: Technical: {res['evaluation']['technicalScore']}%, "
+        f"Communication: {res['evaluation']['communicationScore']}%, "
+        f"Relevance: {res['evaluation']['relevanceScore']}%. "
+        f"Feedback: {res['evaluation']['feedback']}"
+        for res, answer in zip(evaluated, answers)
+    )
+    return ASSESSMENT_PROMPT_TEMPLATE.format(profile=profile_json, separator='-' * 30, responses=summary, duration=duration)
+
+def build_assessment_prompt(candidate_profile, responses, duration):
+    """
+    Builds the assessment prompt within the 'assessment' token budget
+    (PROMPT_MAX_TOKENS_ASSESSMENT). The profile is compacted and answers are
+    truncated as needed; questions, scores and feedback are always kept whole.
+    """
+    evaluated = [res for res in responses if res.get('evaluation')]  # Only include fully evaluated responses
+    if len(evaluated) < len(responses):
+        session_log.debug("Skipping %d responses without an evaluation in assessment", len(responses) - len(evaluated))
+    answers = [res['response'] or '' for res in evaluated]
+
+    tokens_before = estimate_tokens(format_assessment_prompt(json.dumps(candidate_profile, indent=2), evaluated, answers, duration))
+    budget = prompt_token_budget('assessment')
+    profile_json = compact_json(compact_profile(candidate_profile))
+    fixed_tokens = estimate_tokens(format_assessment_prompt(profile_json, evaluated, [''] * len(evaluated), duration))
+    fitted = fit_texts(answers, budget - fixed_tokens)
+    prompt = format_assessment_prompt(profile_json, evaluated, fitted.texts, duration)
+    tokens_after = estimate_tokens(prompt)
+
+    prompt_tokens.observe(tokens_before, task='assessment', stage='raw')
+    prompt_tokens.observe(tokens_after, task='assessment', stage='sent')
+    groq_log.info("Assessment prompt compacted from ~%d to ~%d tokens (budget %d, %d of %d answers truncated to %s chars)",
+                  tokens_before, tokens_after, budget, fitted.truncated, len(answers), fitted.limit_chars)
+    if tokens_after > budget:
+        groq_log.warning("Assessment prompt is ~%d tokens, over its budget of %d", tokens_after, budget)
+    return prompt
+
+def prepare_assessment(session_id, session):
+    """
+    Validates that a session can be assessed and computes everything that does
+    not come from the LLM. Returns (error_response, None) or (None, context).
+    """
     if not session.get('interview_responses'):
-        return jsonify({'error': 'No interview responses to assess'}), 400
+        return (jsonify({'error': 'No interview responses to assess'}), 400), None
     
     # Check if we have any responses at all
     if len(session['interview_responses']) == 0:
-        print(f"DEBUG: No responses submitted yet.")
-        return jsonify({'error': 'No responses submitted. Please answer at least one question.'}), 400
+        session_log.debug("No responses submitted yet")
+        return (jsonify({'error': 'No responses submitted. Please answer at least one question.'}), 400), None
     
     # Allow partial completion for assessment (at least 50% answered or all questions completed)
     min_required = max(1, len(session['interview_questions']) // 2)
     if len(session['interview_responses']) < min_required and len(session['interview_responses']) < len(session['interview_questions']):
-        print(f"DEBUG: Not enough responses. {len(session['interview_responses'])}/{len(session['interview_questions'])} answered.")
-        return jsonify({'error': f'Please answer at least {min_required} questions before requesting assessment.'}), 400
-
-    session['interview_end_time'] = datetime.now().isoformat()
-
-    candidate_profile = session['candidate_profile']
-    interview_summary = []
-    total_duration_seconds = 0
-
-    for res in session['interview_responses']:
-        if res.get('evaluation'): # Only include fully evaluated responses
-            summary_part = (
-                f"Q: {res['question']}\n"
-                f"A: {res['response']}\n"
-                f"Evaluation: Technical: {res['evaluation']['technicalScore']}%, "
-                f"Communication: {res['evaluation']['communicationScore']}%, "
-                f"Relevance: {res['evaluation']['relevanceScore']}%. "
-                f"Feedback: {res['evaluation']['feedback']}"
-            )
-            interview_summary.append(summary_part)
-            
-            try:
-                # Duration might be null if user skipped back/forth, handle this
-                if res['duration']:
-                    minutes, seconds = map(int, res['duration'].split(':'))
-                    total_duration_seconds += (minutes * 60) + seconds
-            except (ValueError, AttributeError, TypeError):
-                pass # Skip duration calculation if it's missing or malformed
-        else:
-            print(f"DEBUG: Skipping response for question ID {res['question_id']} in assessment as it has no evaluation.")
+        session_log.debug("Not enough responses: %d/%d answered", len(session['interview_responses']), len(session['interview_questions']))
+        return (jsonify({'error': f'Please answer at least {min_required} questions before requesting assessment.'}), 400), None
 
+    interview_end_time = datetime.now().isoformat()
 
-    total_minutes = total_duration_seconds // 60
-    total_remaining_seconds = total_duration_seconds % 60
-    interview_duration_str = f"{total_minutes}m {total_remaining_seconds}s"
+    def finish_interview(s):
+        s['interview_end_time'] = interview_end_time
+        # Total duration is kept as a running aggregate, so nothing is re-parsed here
+        return ensure_aggregates(s)['duration_seconds']
+    interview_duration_str = format_duration(sessions.update(session_id, finish_interview))
 
-    prompt_responses = "\n\n".join(interview_summary)
+    prompt = build_assessment_prompt(session['candidate_profile'], session['interview_responses'], interview_duration_str)
 
-    prompt = f"""Generate a comprehensive interview assessment report based on the following candidate profile and interview responses.
-    
-    Candidate Profile: {json.dumps(candidate_profile, indent=2)}
-    
-    Interview Questions and Responses:
-    {'-'*30}
-    {prompt_responses}
-    {'-'*30}
-
-    Overall Interview Duration: {interview_duration_str}
-
-    Provide the assessment strictly as a JSON object with the following structure:
-    - `overallScore`: (integer 0-100, aggregate score based on all responses)
-    - `recommendation`: (string, e.g., "Highly Recommended", "Recommended", "Consider with Reservations", "Not Recommended")
-    - `interviewDuration`: (string, e.g., "15m 30s")
-    - `detailedScores`: (object with `technicalSkills`, `communication`, `softSkills` - each an integer 0-100, derived from the evaluations)
-    - `detailedQuestionAnalysis`: (array of objects) Note: For this `detailedQuestionAnalysis` field, you MUST return an empty array `[]`. It will be populated by the server.
-    - `keyStrengths`: (array of strings, summarizing positive feedback)
-    - `areasForImprovement`: (array of strings, summarizing areas needing work)
-
-    Example JSON output:
-    {{
-      "overallScore": 85,
-      "recommendation": "Recommended",
-      "interviewDuration": "12m 45s",
-      "detailedScores": {{
-        "technicalSkills": 88,
-        "communication": 82,
-        "softSkills": 85
-      }},
-      "detailedQuestionAnalysis": [],
-      "keyStrengths": ["Strong technical foundation in Python.", "Clear communication and problem-solving examples."],
-      "areasForImprovement": ["Could provide more depth on system design topics.", "Response to behavioral question was a bit generic."]
-    }}
-    
-    You MUST return ONLY the JSON object. Do not add any other text.
-    """
+    return None, {
+        'prompt': prompt,
+        'interview_duration': interview_duration_str,
+        'detailed_question_analysis': build_detailed_question_analysis(session['interview_responses'])
+    }
 
+@app.route('/get_assessment', methods=['GET'])
+def get_assessment():
+    session_id = request.headers.get('X-User-Session-Id')
+    session = sessions.get(session_id)
+    if session is None:
+        return jsonify({'error': 'Invalid or missing session ID'}), 400
+
+    error_response, context = prepare_assessment(session_id, session)
+    if error_response:
+        return error_response
+
+    ai_response_text = None
     try:
-        ai_response_text = generate_content_with_groq(prompt)
+        ai_response_text = generate_content_with_groq(context['prompt'], task='assessment')
 
         if ai_response_text:
-            print(f"DEBUG: Raw Groq response for assessment_generator: {ai_response_text}")
-            assessment = json.loads(ai_response_text)
-
-            assessment['interviewDuration'] = interview_duration_str
-            
-            # Manually fill in the detailedQuestionAnalysis from session data
-            detailed_analysis_from_session = []
-            for res in session['interview_responses']:
-                if res.get('evaluation'):
-                    detailed_analysis_from_session.append({
-                        "question": res['question'],
-                        "response": res['response'],
-                        "tags": res['tags'],
-                        "score": res['evaluation'].get('score', 0),
-                        "technicalScore": res['evaluation'].get('technicalScore', 0),
-                        "communicationScore": res['evaluation'].get('communicationScore', 0),
-                        "relevanceScore": res['evaluation'].get('relevanceScore', 0)
-                    })
-            
-            assessment['detailedQuestionAnalysis'] = detailed_analysis_from_session
-            
-            session['interview_assessment'] = assessment
-            return jsonify({'message': 'Assessment generated', 'assessment': assessment}), 200
+            return assessment_response(session_id, context, ai_response_text)
         else:
             return jsonify({'error': 'AI failed to generate assessment or returned empty response.'}), 500
 
-    except json.JSONDecodeError as e:
-        print(f"DEBUG: JSON Decode Error in /get_assessment: {e}")
-        print(f"DEBUG: Raw AI response that caused error: {ai_response_text}")
-        return jsonify({'error': f'Failed to parse AI response as JSON for assessment generation: {e}. Raw AI response: {ai_response_text}'}), 500
-    except ValueError as e:
-        print(f"DEBUG: Value Error in /get_assessment: {e}")
-        return jsonify({'error': f'{str(e)}. Raw AI response: {ai_response_text}'}), 500
+    except SchedulerBusyError:
+        raise # Answered with 429 by groq_busy
     except Exception as e:
-        print(f"DEBUG: Error during assessment generation in /get_assessment: {e}")
-        return jsonify({'error': f'An unexpected error occurred: {str(e)}'}), 500
+        return ai_reply_error(e, '/get_assessment', 'assessment generation', 'assessment generation', ai_response_text)
+
+def assessment_response(session_id, context, ai_response_text):
+    """Completes the assessment in Groq's reply with the server-computed sections and stores it. Raises JSONDecodeError on bad JSON."""
+    groq_log.debug("Raw Groq response for assessment_generator: %s", ai_response_text)
+    assessment = json.loads(ai_response_text)
+
+    assessment['interviewDuration'] = context['interview_duration']
+    
+    # Manually fill in the detailedQuestionAnalysis from session data
+    assessment['detailedQuestionAnalysis'] = context['detailed_question_analysis']
+    
+    sessions.update(session_id, lambda s: s.update(interview_assessment=assessment))
+    return jsonify({'message': 'Assessment generated', 'assessment': assessment}), 200
+
+@app.route('/get_assessment_stream', methods=['GET'])
+def get_assessment_stream():
+    """
+    Server-Sent Events variant of /get_assessment.
+    Emits `field` events ({"key", "value"}) for the server-computed sections first,
+    then for each LLM-generated top-level field as soon as it has been parsed, and
+    finally a `complete` event carrying the same payload /get_assessment returns.
+    EventSource clients that cannot set headers may pass ?session_id= instead.
+    """
+    session_id = request.headers.get('X-User-Session-Id') or request.args.get('session_id')
+    session = sessions.get(session_id)
+    if session is None:
+        return jsonify({'error': 'Invalid or missing session ID'}), 400
+
+    error_response, context = prepare_assessment(session_id, session)
+    if error_response:
+        return error_response
+
+    server_fields = assessment_server_fields(context)
+
+    def generate_events():
+        # Server-computed sections need no LLM round trip, so they go out immediately
+        for key, value in server_fields.items():
+            yield sse_event('field', {'key': key, 'value': value})
+
+        parser = TopLevelFieldParser()
+        chunks = []
+        try:
+            for delta in stream_content_with_groq(context['prompt'], task='assessment'):
+                chunks.append(delta)
+                for key, value in parser.feed(delta):
+                    if key not in server_fields:
+                        yield sse_event('field', {'key': key, 'value': value})
+        except Exception as e:
+            yield assessment_stream_error(e)
+            return
+        yield finish_streamed_assessment(session_id, parser, chunks, server_fields)
+
+    return Response(stream_with_context(generate_events()), mimetype='text/event-stream', headers=SSE_HEADERS)
+
+def assessment_server_fields(context):
+    """Assessment sections computed from session data; they need no LLM round trip."""
+    return {
+        'interviewDuration': context['interview_duration'],
+        'detailedQuestionAnalysis': context['detailed_question_analysis']
+    }
+
+def assessment_stream_error(error):
+    """The final `error` event for a stream whose Groq call failed."""
+    if isinstance(error, SchedulerBusyError):
+        retry_after = max(1, math.ceil(error.retry_after))
+        return sse_event('error', {'error': 'The AI service is busy. Please retry shortly.', 'retry_after': retry_after})
+    log.exception("Error during streamed assessment generation: %s", error)
+    return sse_event('error', {'error': f'An unexpected error occurred: {str(error)}'})
+
+def finish_streamed_assessment(session_id, parser, chunks, server_fields):
+    """Stores the streamed assessment and returns the final `complete` event, or an `error` event if there is none."""
+    # The incremental parser gives up on malformed output; fall back to a full parse
+    assessment = dict(parser.fields) if parser.finished else extract_json_from_response("".join(chunks))
+    if not isinstance(assessment, dict) or not assessment:
+        return sse_event('error', {'error': 'AI failed to generate assessment or returned empty response.'})
+
+    assessment.update(server_fields)
+    sessions.update(session_id, lambda s: s.update(interview_assessment=assessment))
+    return sse_event('complete', {'message': 'Assessment generated', 'assessment': assessment})
 
 @app.route('/log_security', methods=['POST'])
 def log_security():
@@ -761,23 +1692,86 @@ def log_security():
     event_type = data.get('event_type', 'unknown')
     event_data = data.get('data', {})
     
-    print(f"SECURITY EVENT [{session_id}]: {event_type} - {event_data}")
+    security_log.warning("Security event %s", event_type,
+                         extra={'session_id': session_id, 'event_type': event_type, 'event_data': event_data})
     
     # Store in session if available
-    if session_id and session_id in sessions:
-        if 'security_events' not in sessions[session_id]:
-            sessions[session_id]['security_events'] = []
+    def record_event(s):
+        if 'security_events' not in s:
+            s['security_events'] = []
         
-        sessions[session_id]['security_events'].append({
+        s['security_events'].append({
             'type': event_type,
             'data': event_data,
             'timestamp': data.get('timestamp')
         })
+
+    try:
+        sessions.update(session_id, record_event)
+    except KeyError:
+        pass # Unknown or expired session
     
     return jsonify({'message': 'Security event logged'}), 200
 
+@app.route('/session_stats', methods=['GET'])
+def session_stats():
+    """Reports session store occupancy and eviction counters"""
+    return jsonify(sessions.stats()), 200
+
+@app.route('/cache_stats', methods=['GET'])
+def cache_stats():
+    """Reports hit/miss counters and occupancy for the response caches"""
+    return jsonify({'resume': resume_cache.stats(), 'llm': llm_cache.stats(), 'question_bank': question_bank.stats()}), 200
+
+@app.route('/interview_progress', methods=['GET'])
+def interview_progress():
+    """Live progress (answered count, average score per tag, duration) from the session aggregates"""
+    session_id = request.headers.get('X-User-Session-Id') or request.args.get('session_id')
+    session = sessions.get(session_id)
+    if session is None:
+        return jsonify({'error': 'Invalid or missing session ID'}), 400
+    return jsonify(progress_summary(session_with_aggregates(session_id, session))), 200
+
+@app.route('/log_stats', methods=['GET'])
+def log_stats():
+    """Reports per-subsystem log levels and the log queue depth and drop count"""
+    return jsonify(logging_stats()), 200
+
+@app.route('/detector_stats', methods=['GET'])
+def detector_stats():
+    """Reports ZeroGPT request counters, latency and circuit-breaker state"""
+    return jsonify(zerogpt_client.stats()), 200
+
+@app.route('/prescreen_stats', methods=['GET'])
+def prescreen_stats():
+    """Reports how many answers the local pre-screen scored, by reason, and the Groq calls it saved"""
+    return jsonify(answer_prescreen.stats()), 200
+
+@app.route('/sandbox_stats', methods=['GET'])
+def sandbox_stats():
+    """Reports sandboxed code runs, test case results and limits"""
+    return jsonify(code_sandbox.stats()), 200
+
+@app.route('/bulk_stats', methods=['GET'])
+def bulk_stats():
+    """Reports bulk resume jobs, per-file outcomes and stage concurrency"""
+    return jsonify(bulk_ingestor.stats()), 200
+
+@app.route('/scheduler_stats', methods=['GET'])
+def scheduler_stats():
+    """Reports Groq rate-limit bucket levels, queue depth per priority and rejection counters"""
+    return jsonify(groq_scheduler.stats()), 200
+
+@app.route('/metrics', methods=['GET'])
+def metrics_endpoint():
+    """Prometheus text exposition of request, Groq, ZeroGPT, PDF and session metrics"""
+    return Response(metrics.render(), content_type=METRICS_CONTENT_TYPE)
+
+# Pre-generate question sets for the configured roles (QUESTION_BANK_SEED_ROLES)
+question_bank.seed(QUESTION_BANK_SEED_ROLES)
+
 if __name__ == '__main__':
     port = int(os.environ.get('PORT', 5000))
     
-    print(f"Flask app running on http://127.0.0.1:{port}")
+    log.info("Flask app running on http://127.0.0.1:%d", port)
     app.run(host='127.0.0.1', port=port, debug=True)
\ No newline at end of file
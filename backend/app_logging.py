@@ -0,0 +1,161 @@
+"""
+Structured, level-gated logging for the backend.
+
+Loggers are named per subsystem (`hr_ai.pdf`, `hr_ai.groq`, `hr_ai.zerogpt`,
+`hr_ai.session`, `hr_ai.security`, plus `hr_ai.app` for everything else).
+Each subsystem has its own level: LOG_LEVEL sets the default, and
+LOG_LEVEL_<SUBSYSTEM> overrides it (e.g. LOG_LEVEL_GROQ=DEBUG). Call sites
+use %-style arguments, so a message below the level is never formatted.
+
+A record that passes the level check is rendered once, with each argument
+truncated to LOG_MAX_FIELD_CHARS, and put on a bounded in-memory queue. A
+QueueListener thread does the JSON (or text) formatting and the stdout writes,
+so request threads never wait on I/O. If the queue is full, records are dropped
+and counted rather than blocking.
+"""
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import threading
+
+LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO').upper()
+LOG_FORMAT = os.getenv('LOG_FORMAT', 'json')  # 'json' or 'text'
+LOG_MAX_FIELD_CHARS = int(os.getenv('LOG_MAX_FIELD_CHARS', '500'))
+LOG_QUEUE_SIZE = int(os.getenv('LOG_QUEUE_SIZE', '10000'))
+
+SUBSYSTEMS = ('app', 'pdf', 'groq', 'zerogpt', 'session', 'security')
+ROOT_LOGGER = 'hr_ai'
+
+# Attributes every LogRecord has; anything else came in through `extra=`
+_STANDARD_ATTRS = set(vars(logging.LogRecord('', 0, '', 0, '', None, None))) | {'message', 'asctime'}
+
+_configure_lock = threading.Lock()
+_listener = None
+_handler = None
+
+
+def truncate(value, limit=None):
+    """Shortens long strings, marking how much was cut."""
+    if value is None or isinstance(value, (int, float, bool)):
+        return value  # keeps %d / %.1f placeholders working
+    limit = LOG_MAX_FIELD_CHARS if limit is None else limit
+    text = value if isinstance(value, str) else str(value)
+    if len(text) > limit:
+        return f"{text[:limit]}...(+{len(text) - limit} chars)"
+    return text
+
+
+class _DroppingQueueHandler(logging.handlers.QueueHandler):
+    """Renders the message in the caller's thread (bounded by truncation) and never blocks."""
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record):
+        if record.args:
+            args = record.args if isinstance(record.args, tuple) else (record.args,)
+            try:
+                record.msg = str(record.msg) % tuple(truncate(arg) for arg in args)
+            except (TypeError, ValueError):
+                record.msg = f"{record.msg} {args!r}"
+            record.args = None
+        if record.exc_info:
+            # Tracebacks are rendered here because the frames may be gone by the time the listener runs
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        for key, value in list(vars(record).items()):
+            if key not in _STANDARD_ATTRS:
+                # Small containers stay structured in the JSON output; large ones become truncated text
+                if not (isinstance(value, (dict, list)) and len(str(value)) <= LOG_MAX_FIELD_CHARS):
+                    setattr(record, key, truncate(value))
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class StructuredFormatter(logging.Formatter):
+    def __init__(self, output_format=LOG_FORMAT):
+        super().__init__()
+        self.output_format = output_format
+
+    def format(self, record):
+        fields = {key: value for key, value in vars(record).items() if key not in _STANDARD_ATTRS}
+        subsystem = record.name.split('.', 1)[1] if '.' in record.name else record.name
+        message = record.getMessage()
+        if self.output_format == 'text':
+            suffix = ' ' + ' '.join(f"{k}={v}" for k, v in fields.items()) if fields else ''
+            line = f"{self.formatTime(record)} {record.levelname} [{subsystem}] {message}{suffix}"
+            return f"{line}\n{record.exc_text}" if record.exc_text else line
+        entry = {
+            'ts': round(record.created, 3),
+            'level': record.levelname,
+            'subsystem': subsystem,
+            'msg': message,
+            **fields,
+        }
+        if record.exc_text:
+            entry['exc'] = record.exc_text
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+def subsystem_level(subsystem):
+    return os.getenv(f'LOG_LEVEL_{subsystem.upper()}', LOG_LEVEL).upper()
+
+
+def configure_logging(stream=None):
+    """Installs the queue handler and starts the listener thread; safe to call more than once."""
+    global _listener, _handler
+    with _configure_lock:
+        if _listener is not None:
+            return
+        log_queue = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+        output = logging.StreamHandler(stream or sys.stdout)
+        output.setFormatter(StructuredFormatter())
+        root = logging.getLogger(ROOT_LOGGER)
+        if _handler is not None:
+            root.removeHandler(_handler)
+        _handler = _DroppingQueueHandler(log_queue)
+        root.setLevel(LOG_LEVEL)
+        root.addHandler(_handler)
+        # Our records are handled here only; the stdlib root logger may belong to someone else
+        root.propagate = False
+        for subsystem in SUBSYSTEMS:
+            logging.getLogger(f'{ROOT_LOGGER}.{subsystem}').setLevel(subsystem_level(subsystem))
+
+        _listener = logging.handlers.QueueListener(log_queue, output, respect_handler_level=False)
+        _listener.start()
+        atexit.register(shutdown_logging)
+
+
+def shutdown_logging():
+    """Flushes queued records and stops the listener thread."""
+    global _listener
+    with _configure_lock:
+        if _listener is not None:
+            _listener.stop()
+            _listener = None
+
+
+def get_logger(subsystem):
+    """Returns the logger for a subsystem, configuring the pipeline on first use."""
+    configure_logging()
+    return logging.getLogger(f'{ROOT_LOGGER}.{subsystem}')
+
+
+def logging_stats():
+    return {
+        'queued': _handler.queue.qsize() if _handler else 0,
+        'dropped': _handler.dropped if _handler else 0,
+        'levels': {subsystem: logging.getLevelName(logging.getLogger(f'{ROOT_LOGGER}.{subsystem}').getEffectiveLevel())
+                   for subsystem in SUBSYSTEMS},
+        'format': LOG_FORMAT,
+    }
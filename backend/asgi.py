@@ -0,0 +1,568 @@
+"""
+Async serving mode: the backend's API as an ASGI application.
+
+    pip install uvicorn   # optional; listed at the end of requirements.txt
+    uvicorn asgi:app --host 127.0.0.1 --port 5000
+
+The routes that wait on Groq and ZeroGPT (/upload_resume, /setup_interview,
+/submit_answer, /submit_answers, /get_assessment, /get_assessment_stream)
+run as coroutines on the event loop, and so does /bulk_job_stream, which
+polls the job instead of holding a thread while it waits. They use AsyncGroq and an httpx client
+and go through the same scheduler, call policy, caches and session store as
+the Flask routes, so a request waiting on the network holds no thread, and
+thousands of interview steps can be in flight on one process. They share
+their validation, prompts and response building with app.py, and they run
+inside a Flask request context: CORS, the 429 handler for SchedulerBusyError
+and the latency metrics all apply, and the JSON is identical.
+
+Nothing that can block runs on the loop itself. Session reads and writes
+(SQLite transactions with a busy timeout in the shared backend), rate-limit
+bucket transactions, LLM and resume cache lookups, PDF text extraction, the
+code sandbox, the local AI detector and each evaluation stage without a
+coroutine version all go to the event loop's default executor with
+asyncio.to_thread, which carries the Flask request context along. Every other
+route (static files, stats, /metrics, /log_security, CORS preflights) is
+cheap; it is passed to the Flask WSGI app, which runs in a worker thread.
+
+Request bodies are read in full before dispatch, so they are capped at the
+Flask app's MAX_CONTENT_LENGTH (MAX_REQUEST_BYTES) and a larger one gets 413
+without being buffered.
+"""
+import asyncio
+import io
+import sys
+import time
+import uuid
+
+import httpx
+from flask import Response, jsonify, request
+from groq import AsyncGroq, RateLimitError
+from werkzeug.exceptions import RequestEntityTooLarge
+
+from app import (
+    AI_DETECTION_MODE, API_KEY, BULK_STREAM_HEARTBEAT_SECONDS, GROQ_BASE_URL, PRIORITY_NAMES, SSE_HEADERS,
+    AttemptSkipped, CircuitOpenError, SchedulerBusyError, StageCalls, TopLevelFieldParser, ai_reply_error,
+    answer_batch_response, answer_batch_stages, answer_evaluated_response, answer_stages, app as flask_app,
+    assessment_response, assessment_server_fields, assessment_stream_error, attach_test_sets, bulk_ingestor,
+    bulk_job_events, build_code_review_prompt, build_question_prompt, cache_streamed_content, code_evaluations_total, code_review_result, code_sandbox, collect_batch_evaluations,
+    collect_rescored_evaluations, confirmed_detection, detect_ai_content_local, evaluation_from_report,
+    finish_resume_analysis, finish_streamed_assessment, get_or_create_session, groq_json_content, groq_log,
+    groq_messages, groq_request_estimate, groq_request_seconds, groq_scheduler, groq_scheduler_wait_seconds,
+    interview_started_response, is_retryable_groq_error, llm_cache_lookup, llm_policy, needs_remote_confirmation,
+    parse_interview_questions, prepare_answer, prepare_answer_batch, prepare_assessment, prepare_interview,
+    prepare_resume_analysis, question_bank, record_groq_rejection, record_groq_usage, rescoring_stages,
+    sampling_params, sessions, sse_event, stream_chunk_delta, task_config, task_priority, upstream_busy_error,
+    zerogpt_client, zerogpt_failure, zerogpt_log, zerogpt_verdict,
+)
+from evaluation_pipeline import run_stages_async
+
+# Same configuration as the blocking client; the SDK's retries stay off in favour of llm_policy.py
+async_client = AsyncGroq(api_key=API_KEY, base_url=GROQ_BASE_URL, max_retries=0)
+
+# How often an async /bulk_job_stream looks at its job for new file results
+BULK_STREAM_POLL_INTERVAL = 0.25
+
+# read_body() result for a body over MAX_CONTENT_LENGTH
+TOO_LARGE = object()
+
+# --- Groq ---
+
+async def reserve_groq_capacity_async(estimate, task, priority):
+    try:
+        reservation = await groq_scheduler.acquire_async(estimate, priority)
+    except SchedulerBusyError as e:
+        record_groq_rejection(e, task, priority)
+        raise
+    groq_scheduler_wait_seconds.observe(reservation.waited_seconds, priority=PRIORITY_NAMES[priority])
+    return reservation
+
+async def send_groq_request_async(messages, model, kind, task, priority, stream=False):
+    """Coroutine counterpart of send_groq_request()."""
+    config = task_config(task)
+    estimate = groq_request_estimate(messages, config)
+    if kind in ('hedge', 'fallback'):
+        reservation = await asyncio.to_thread(groq_scheduler.try_acquire, estimate, priority)
+        if reservation is None:
+            raise AttemptSkipped('No rate-limit headroom for an extra attempt')
+    else:
+        reservation = await reserve_groq_capacity_async(estimate, task, priority)
+    groq_log.debug("Sending %s attempt for task %s to Groq with model %s", kind, task, model)
+    try:
+        response = await async_client.chat.completions.create(
+            messages=messages,
+            model=model,
+            stop=None,
+            stream=stream,
+            timeout=config.timeout,
+            **sampling_params(config)
+        )
+    except RateLimitError as e:
+        raise await asyncio.to_thread(upstream_busy_error, e) from e
+    if stream:
+        return response, reservation
+    reservation.used_tokens = record_groq_usage(task, model, getattr(response, 'usage', None))
+    await asyncio.to_thread(groq_scheduler.settle, reservation)
+    return response
+
+async def generate_content_with_groq_async(prompt, task='default', use_cache=True, priority=None):
+    """Coroutine counterpart of generate_content_with_groq(), with the same cache, scheduling and policy."""
+    config = task_config(task)
+    started = time.perf_counter()
+    cache_key, cached_response = await asyncio.to_thread(llm_cache_lookup, prompt, task, use_cache, started)
+    if cached_response is not None:
+        return cached_response
+
+    priority = task_priority(task) if priority is None else priority
+    messages = groq_messages(prompt)
+    try:
+        policy_result = await llm_policy.call_async(
+            lambda model, kind: send_groq_request_async(messages, model, kind, task, priority),
+            task=task, model=config.model, is_retryable=is_retryable_groq_error
+        )
+    except SchedulerBusyError:
+        groq_request_seconds.observe(time.perf_counter() - started, task=task, model=config.model, outcome='throttled')
+        raise
+    except Exception as e:
+        groq_request_seconds.observe(time.perf_counter() - started, task=task, model=config.model, outcome='error')
+        groq_log.error("Error calling Groq API: %s", e)
+        return None
+    groq_request_seconds.observe(time.perf_counter() - started, task=task, model=config.model, outcome='ok')
+    # Stores the reply in the LLM cache
+    return await asyncio.to_thread(groq_json_content, policy_result, task, cache_key)
+
+async def stream_content_with_groq_async(prompt, task='default', use_cache=True, priority=None):
+    """Coroutine counterpart of stream_content_with_groq(): an async generator of text deltas."""
+    config = task_config(task)
+    started = time.perf_counter()
+    cache_key, cached_response = await asyncio.to_thread(llm_cache_lookup, prompt, task, use_cache, started)
+    if cached_response is not None:
+        yield cached_response
+        return
+
+    priority = task_priority(task) if priority is None else priority
+    messages = groq_messages(prompt)
+    reservation = None
+    chunks = []
+    try:
+        policy_result = await llm_policy.call_async(
+            lambda model, kind: send_groq_request_async(messages, model, kind, task, priority, stream=True),
+            task=task, model=config.model, is_retryable=is_retryable_groq_error, hedge=False, fallback=False
+        )
+        stream, reservation = policy_result.value
+        async for chunk in stream:
+            delta = stream_chunk_delta(chunk, task, config.model, reservation)
+            if delta:
+                chunks.append(delta)
+                yield delta
+    except SchedulerBusyError:
+        groq_request_seconds.observe(time.perf_counter() - started, task=task, model=config.model, outcome='throttled')
+        raise
+    except Exception:
+        groq_request_seconds.observe(time.perf_counter() - started, task=task, model=config.model, outcome='error')
+        raise
+    finally:
+        if reservation is not None:
+            await asyncio.to_thread(groq_scheduler.settle, reservation)
+    groq_request_seconds.observe(time.perf_counter() - started, task=task, model=config.model, outcome='ok')
+    await asyncio.to_thread(cache_streamed_content, cache_key, chunks, task)
+
+async def generate_interview_questions_async(position_role, skills, experience, is_coding_role, candidate_name='the candidate'):
+    prompt = build_question_prompt(candidate_name, position_role, experience, ", ".join(skills), is_coding_role)
+    ai_response_text = await generate_content_with_groq_async(prompt, task='questions')
+    if not ai_response_text:
+        return None, None
+    questions = parse_interview_questions(ai_response_text)
+    # Each reference solution runs in a sandboxed child process
+    await asyncio.to_thread(attach_test_sets, questions)
+    return questions, ai_response_text
+
+# --- Evaluation stages ---
+
+async def evaluate_code_async(code, question_obj):
+    if code_sandbox.enabled and question_obj.get('tests'):
+        code_evaluations_total.inc(engine='sandbox')
+        return evaluation_from_report(await asyncio.to_thread(code_sandbox.run_tests, code, question_obj['tests']))
+    code_evaluations_total.inc(engine='llm')
+    try:
+        ai_response = await generate_content_with_groq_async(build_code_review_prompt(code, question_obj['question']), task='code_evaluation')
+        return code_review_result(ai_response)
+    except Exception as e:
+        groq_log.error("Code evaluation error: %s", e)
+        return {'correctness': 0, 'logic': 0, 'syntax': 0, 'overall_score': 0, 'feedback': f'Evaluation error: {str(e)}', 'has_errors': True}
+
+async def detect_ai_content_async(text):
+    """Coroutine counterpart of detect_ai_content(); the local detector's NumPy work runs off the loop."""
+    if AI_DETECTION_MODE == 'local':
+        return await asyncio.to_thread(detect_ai_content_local, text)
+    if AI_DETECTION_MODE == 'local_first':
+        local_result = await asyncio.to_thread(detect_ai_content_local, text)
+        if not needs_remote_confirmation(local_result):
+            return local_result
+        return confirmed_detection(local_result, await detect_ai_content_remote_async(text))
+    return await detect_ai_content_remote_async(text)
+
+async def detect_ai_content_remote_async(text):
+    if not text or len(text.strip()) < 10:
+        return {'is_ai_generated': False, 'ai_percentage': 0, 'confidence': 'N/A', 'error': 'Text too short'}
+
+    started = time.perf_counter()
+    response = None
+    try:
+        zerogpt_log.debug("Calling ZeroGPT API with text length %d", len(text))
+        response = await zerogpt_client.detect_async(text)
+        return zerogpt_verdict(response, started)
+    except CircuitOpenError:
+        zerogpt_log.debug("ZeroGPT circuit open, skipping AI detection")
+        return zerogpt_failure('circuit_open', 'Detector unavailable (circuit open)')
+    except httpx.TimeoutException:
+        zerogpt_log.warning("ZeroGPT API timeout")
+        return zerogpt_failure('timeout', 'API timeout', started)
+    except Exception as e:
+        zerogpt_log.error("AI detection error: %s: %s", type(e).__name__, e)
+        return zerogpt_failure('error', str(e), None if response is not None else started)
+
+ASYNC_CALLS = StageCalls(generate_content_with_groq_async, evaluate_code_async, detect_ai_content_async)
+
+# --- Routes (same endpoints, names and responses as in app.py) ---
+
+async def upload_resume():
+    session_id = request.headers.get('X-User-Session-Id', str(uuid.uuid4()))
+    await asyncio.to_thread(get_or_create_session, session_id)
+
+    # Text extraction waits on the PDF worker pool
+    early_response, context = await asyncio.to_thread(prepare_resume_analysis, session_id)
+    if early_response:
+        return early_response
+
+    ai_response_text = None
+    try:
+        ai_response_text = await generate_content_with_groq_async(context['prompt'], task='resume')
+        if ai_response_text:
+            # Writes the resume cache and the session
+            return await asyncio.to_thread(finish_resume_analysis, session_id, context, ai_response_text)
+        return jsonify({'error': 'AI failed to parse resume or returned empty response.'}), 500
+    except SchedulerBusyError:
+        raise
+    except Exception as e:
+        return ai_reply_error(e, '/upload_resume', 'resume upload', 'resume processing', ai_response_text,
+                              'An unexpected error occurred during AI processing')
+
+async def setup_interview():
+    session_id = request.headers.get('X-User-Session-Id')
+    session = await asyncio.to_thread(sessions.get, session_id)
+    if session is None:
+        return jsonify({'error': 'Invalid or missing session ID'}), 400
+
+    # Records the role on the session and looks in the question bank
+    error_response, context = await asyncio.to_thread(prepare_interview, session_id, session, request.get_json())
+    if error_response:
+        return error_response
+
+    questions = context['questions']
+    question_source = 'bank'
+    ai_response_text = None
+    try:
+        if questions is None:
+            question_source = 'live'
+            questions, ai_response_text = await generate_interview_questions_async(
+                context['position_role'], context['key_skills'], context['experience'], context['is_coding_role'],
+                candidate_name=context['candidate_name']
+            )
+            await asyncio.to_thread(question_bank.add, context['position_role'], context['key_skills'], context['experience'],
+                                    context['is_coding_role'], questions)
+
+        if questions:
+            return await asyncio.to_thread(interview_started_response, session_id, questions, context['is_coding_role'], question_source)
+        return jsonify({'error': 'AI failed to generate questions or returned empty response.'}), 500
+    except SchedulerBusyError:
+        raise
+    except Exception as e:
+        return ai_reply_error(e, '/setup_interview', 'interview setup', 'question generation', ai_response_text)
+
+async def submit_answer():
+    session_id = request.headers.get('X-User-Session-Id')
+    session = await asyncio.to_thread(sessions.get, session_id)
+    if session is None:
+        return jsonify({'error': 'Invalid or missing session ID'}), 400
+
+    error_response, context = prepare_answer(session, request.get_json())
+    if error_response:
+        return error_response
+
+    stage_results, stage_timings = await run_stages_async(answer_stages(context, ASYNC_CALLS))
+    return await asyncio.to_thread(answer_evaluated_response, session_id, context, stage_results, stage_timings)
+
+async def submit_answers():
+    session_id = request.headers.get('X-User-Session-Id')
+    session = await asyncio.to_thread(sessions.get, session_id)
+    if session is None:
+        return jsonify({'error': 'Invalid or missing session ID'}), 400
+
+    error_response, context = prepare_answer_batch(session, request.get_json(silent=True) or {})
+    if error_response:
+        return error_response
+
+    stage_results, stage_timings = await run_stages_async(answer_batch_stages(context, ASYNC_CALLS))
+    missing_ids = collect_batch_evaluations(context, stage_results)
+    if missing_ids:
+        retry_results, retry_timings = await run_stages_async(rescoring_stages(context, missing_ids, ASYNC_CALLS))
+        stage_timings['retry'] = retry_timings
+        collect_rescored_evaluations(context, missing_ids, retry_results)
+    return await asyncio.to_thread(answer_batch_response, session_id, context, stage_results, stage_timings)
+
+async def get_assessment():
+    session_id = request.headers.get('X-User-Session-Id')
+    session = await asyncio.to_thread(sessions.get, session_id)
+    if session is None:
+        return jsonify({'error': 'Invalid or missing session ID'}), 400
+
+    error_response, context = await asyncio.to_thread(prepare_assessment, session_id, session)
+    if error_response:
+        return error_response
+
+    ai_response_text = None
+    try:
+        ai_response_text = await generate_content_with_groq_async(context['prompt'], task='assessment')
+        if ai_response_text:
+            return await asyncio.to_thread(assessment_response, session_id, context, ai_response_text)
+        return jsonify({'error': 'AI failed to generate assessment or returned empty response.'}), 500
+    except SchedulerBusyError:
+        raise
+    except Exception as e:
+        return ai_reply_error(e, '/get_assessment', 'assessment generation', 'assessment generation', ai_response_text)
+
+async def get_assessment_stream():
+    session_id = request.headers.get('X-User-Session-Id') or request.args.get('session_id')
+    session = await asyncio.to_thread(sessions.get, session_id)
+    if session is None:
+        return jsonify({'error': 'Invalid or missing session ID'}), 400
+
+    error_response, context = await asyncio.to_thread(prepare_assessment, session_id, session)
+    if error_response:
+        return error_response
+
+    server_fields = assessment_server_fields(context)
+
+    async def generate_events():
+        for key, value in server_fields.items():
+            yield sse_event('field', {'key': key, 'value': value})
+
+        parser = TopLevelFieldParser()
+        chunks = []
+        try:
+            async for delta in stream_content_with_groq_async(context['prompt'], task='assessment'):
+                chunks.append(delta)
+                for key, value in parser.feed(delta):
+                    if key not in server_fields:
+                        yield sse_event('field', {'key': key, 'value': value})
+        except Exception as e:
+            yield assessment_stream_error(e)
+            return
+        yield await asyncio.to_thread(finish_streamed_assessment, session_id, parser, chunks, server_fields)
+
+    # The body is an async generator; send_response() iterates it while the request context is still active
+    return Response(generate_events(), mimetype='text/event-stream', headers=SSE_HEADERS)
+
+# Keyed by the Flask endpoint the request matches
+async def bulk_job_stream():
+    job_id = request.args.get('job_id')
+    if bulk_ingestor.status(job_id) is None:
+        return jsonify({'error': 'Unknown or expired bulk job'}), 404
+
+    async def generate_events():
+        version = -1
+        quiet_since = time.monotonic()
+        while True:
+            update = bulk_ingestor.changes_since(job_id, version, 0)
+            if update is None:
+                yield sse_event('error', {'error': 'Unknown or expired bulk job'})
+                return
+            summary, changed, _ = update
+            if changed or summary['status'] == 'completed' or time.monotonic() - quiet_since >= BULK_STREAM_HEARTBEAT_SECONDS:
+                events, finished = bulk_job_events(update)
+                for event in events:
+                    yield event
+                if finished:
+                    return
+                version = update[2]
+                quiet_since = time.monotonic()
+            await asyncio.sleep(BULK_STREAM_POLL_INTERVAL)
+
+    return Response(generate_events(), mimetype='text/event-stream', headers=SSE_HEADERS)
+
+ASYNC_VIEWS = {
+    'upload_resume': upload_resume,
+    'setup_interview': setup_interview,
+    'submit_answer': submit_answer,
+    'submit_answers': submit_answers,
+    'get_assessment': get_assessment,
+    'get_assessment_stream': get_assessment_stream,
+    'bulk_job_stream': bulk_job_stream,
+}
+
+# --- ASGI plumbing ---
+
+def wsgi_environ(scope, body):
+    """The WSGI environ for an ASGI HTTP request whose body has been read."""
+    server_name, server_port = scope.get('server') or ('localhost', 80)
+    environ = {
+        'REQUEST_METHOD': scope['method'],
+        'SCRIPT_NAME': scope.get('root_path', '').encode('utf-8').decode('latin-1'),
+        'PATH_INFO': scope['path'].encode('utf-8').decode('latin-1'),
+        'QUERY_STRING': scope['query_string'].decode('latin-1'),
+        'SERVER_NAME': server_name,
+        'SERVER_PORT': str(server_port),
+        'SERVER_PROTOCOL': f"HTTP/{scope['http_version']}",
+        'REMOTE_ADDR': (scope.get('client') or ('', 0))[0],
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': scope.get('scheme', 'http'),
+        'wsgi.input': io.BytesIO(body),
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': True,
+        'wsgi.run_once': False,
+    }
+    for raw_name, raw_value in scope['headers']:
+        name = raw_name.decode('latin-1').upper().replace('-', '_')
+        value = raw_value.decode('latin-1')
+        key = name if name in ('CONTENT_TYPE', 'CONTENT_LENGTH') else 'HTTP_' + name
+        environ[key] = f"{environ[key]},{value}" if key in environ else value
+    return environ
+
+def native_view(environ):
+    """The coroutine view for a request, or None if it goes to the WSGI app."""
+    if environ['REQUEST_METHOD'] not in ('GET', 'POST'):
+        return None
+    try:
+        endpoint, _ = flask_app.url_map.bind_to_environ(environ, server_name=flask_app.config['SERVER_NAME']).match()
+    except Exception:
+        return None  # 404, 405 and redirects are Flask's to answer
+    return ASYNC_VIEWS.get(endpoint)
+
+def declared_length(scope):
+    for name, value in scope['headers']:
+        if name.lower() == b'content-length':
+            try:
+                return int(value)
+            except ValueError:
+                return None
+    return None
+
+async def read_body(scope, receive, limit):
+    """
+    The request body, None if the client went away first, or TOO_LARGE once
+    it is known to exceed `limit` bytes (MAX_CONTENT_LENGTH), without
+    buffering more than that.
+    """
+    length = declared_length(scope)
+    if length is not None and length > limit:
+        return TOO_LARGE
+    body = bytearray()
+    while True:
+        message = await receive()
+        if message['type'] == 'http.disconnect':
+            return None
+        body += message.get('body', b'')
+        if len(body) > limit:
+            return TOO_LARGE
+        if not message.get('more_body'):
+            return bytes(body)
+
+def encode_headers(headers):
+    return [(name.lower().encode('latin-1'), value.encode('latin-1')) for name, value in headers]
+
+async def send_response(send, response):
+    await send({'type': 'http.response.start', 'status': response.status_code, 'headers': encode_headers(response.headers.items())})
+    if hasattr(response.response, '__aiter__'):
+        async for chunk in response.response:
+            await send({'type': 'http.response.body', 'body': chunk.encode() if isinstance(chunk, str) else chunk, 'more_body': True})
+        await send({'type': 'http.response.body', 'body': b''})
+    else:
+        await send({'type': 'http.response.body', 'body': response.get_data()})
+
+async def dispatch_async(view, environ, send):
+    """
+    Runs a coroutine view the way Flask's wsgi_app and full_dispatch_request
+    run a blocking one, teardown_request and app-context teardown included.
+    """
+    # Flask keeps the request context in context variables, which are per task
+    ctx = flask_app.request_context(environ)
+    error = None
+    try:
+        ctx.push()
+        try:
+            try:
+                rv = flask_app.preprocess_request()
+                if rv is None:
+                    rv = await view()
+            except Exception as e:
+                rv = flask_app.handle_user_exception(e)
+            response = flask_app.finalize_request(rv)
+        except Exception as e:
+            error = e
+            response = flask_app.handle_exception(e)
+        # A streamed body is sent while the context is still pushed
+        await send_response(send, response)
+    except BaseException as e:
+        # e.g. the client went away while a stream was being sent
+        error = e
+        raise
+    finally:
+        ctx.pop(error)
+
+async def send_too_large(scope, send):
+    """Answers 413 through the Flask app's handler, so the body, CORS headers and metrics match the WSGI server's."""
+    with flask_app.request_context(wsgi_environ(scope, b'')):
+        response = flask_app.finalize_request(flask_app.handle_user_exception(RequestEntityTooLarge()))
+    await send_response(send, response)
+
+def call_wsgi(environ):
+    """Runs the Flask app for one request (in a worker thread) and returns its status, headers and body."""
+    started = {}
+
+    def start_response(status, headers, exc_info=None):
+        started['status'] = int(status.split(' ', 1)[0])
+        started['headers'] = headers
+
+    chunks = flask_app.wsgi_app(environ, start_response)
+    try:
+        body = b''.join(chunks)
+    finally:
+        if hasattr(chunks, 'close'):
+            chunks.close()
+    return started['status'], started['headers'], body
+
+async def dispatch_wsgi(environ, send):
+    status, headers, body = await asyncio.to_thread(call_wsgi, environ)
+    await send({'type': 'http.response.start', 'status': status, 'headers': encode_headers(headers)})
+    await send({'type': 'http.response.body', 'body': body})
+
+async def lifespan(receive, send):
+    while True:
+        message = await receive()
+        if message['type'] == 'lifespan.startup':
+            await send({'type': 'lifespan.startup.complete'})
+        elif message['type'] == 'lifespan.shutdown':
+            await async_client.close()
+            await zerogpt_client.aclose()
+            await send({'type': 'lifespan.shutdown.complete'})
+            return
+
+async def app(scope, receive, send):
+    if scope['type'] == 'lifespan':
+        await lifespan(receive, send)
+        return
+    if scope['type'] != 'http':
+        raise RuntimeError(f"Unsupported ASGI scope type {scope['type']!r}")
+    body = await read_body(scope, receive, flask_app.config['MAX_CONTENT_LENGTH'])
+    if body is None:
+        return  # The client went away before sending the whole request
+    if body is TOO_LARGE:
+        await send_too_large(scope, send)
+        return
+    environ = wsgi_environ(scope, body)
+    view = native_view(environ)
+    if view is not None:
+        await dispatch_async(view, environ, send)
+    else:
+        await dispatch_wsgi(environ, send)
@@ -0,0 +1,76 @@
+"""
+Helpers for scoring several interview answers with one Groq call.
+
+Answers are packed into batches bounded by answer count and by an estimated
+prompt size, so each batch fits the model's context window and its array of
+evaluations fits the completion budget. Evaluations that come back are matched
+to their answers by `question_id` and checked before use; anything missing or
+malformed is reported so the caller can rescore it with the single-answer prompt.
+"""
+import os
+
+from prompt_budget import estimate_tokens
+
+BATCH_SCORING_MAX_ANSWERS = int(os.getenv('BATCH_SCORING_MAX_ANSWERS', '10'))
+# Budget for the answer section of one prompt, in estimated tokens
+BATCH_SCORING_MAX_PROMPT_TOKENS = int(os.getenv('BATCH_SCORING_MAX_PROMPT_TOKENS', '6000'))
+# Upper bound on answers accepted by one /submit_answers request
+BATCH_SUBMIT_MAX_ANSWERS = int(os.getenv('BATCH_SUBMIT_MAX_ANSWERS', '50'))
+
+SCORE_KEYS = ('technicalScore', 'communicationScore', 'relevanceScore')
+
+
+def chunk_answers(items, max_answers=BATCH_SCORING_MAX_ANSWERS, max_tokens=BATCH_SCORING_MAX_PROMPT_TOKENS):
+    """
+    Greedily packs (question_id, question, response) items into batches. An
+    item larger than the whole budget still gets a batch of its own.
+    """
+    batches = []
+    current = []
+    current_tokens = 0
+    for item in items:
+        tokens = estimate_tokens(item[1]) + estimate_tokens(item[2] or '')
+        if current and (len(current) >= max_answers or current_tokens + tokens > max_tokens):
+            batches.append(current)
+            current = []
+            current_tokens = 0
+        current.append(item)
+        current_tokens += tokens
+    if current:
+        batches.append(current)
+    return batches
+
+
+def validate_evaluation(evaluation):
+    """Returns a clean evaluation dict, or None if required fields are missing or out of range."""
+    if not isinstance(evaluation, dict):
+        return None
+    cleaned = {}
+    for key in SCORE_KEYS:
+        value = evaluation.get(key)
+        if isinstance(value, bool) or not isinstance(value, (int, float)) or not 0 <= value <= 100:
+            return None
+        cleaned[key] = round(value)
+    feedback = evaluation.get('feedback')
+    cleaned['feedback'] = feedback if isinstance(feedback, str) else ''
+    return cleaned
+
+
+def parse_batch_evaluations(payload, expected_ids):
+    """
+    Maps a batch reply ({"evaluations": [...]}) back to question ids.
+    Returns (evaluations_by_id, missing_ids); unknown and duplicate ids are ignored.
+    """
+    entries = payload.get('evaluations') if isinstance(payload, dict) else None
+    evaluations = {}
+    for entry in entries if isinstance(entries, list) else []:
+        if not isinstance(entry, dict):
+            continue
+        question_id = entry.get('question_id')
+        if question_id not in expected_ids or question_id in evaluations:
+            continue
+        evaluation = validate_evaluation(entry)
+        if evaluation is not None:
+            evaluations[question_id] = evaluation
+    missing_ids = [question_id for question_id in expected_ids if question_id not in evaluations]
+    return evaluations, missing_ids
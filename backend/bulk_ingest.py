@@ -0,0 +1,369 @@
+"""
+Bulk resume ingestion.
+
+/bulk_upload_resumes takes a whole batch of resumes (ZIP archives and/or
+individual PDFs in one multipart request) and returns a job id straight away.
+Each file then goes through two stages:
+
+1. extract: resume-cache lookups and budgeted text extraction. This runs on
+   BULK_EXTRACT_CONCURRENCY threads, and each thread hands its PDF to the
+   extraction engine's worker processes, so PDFs are parsed in parallel.
+   Interactive uploads share those processes, so keep BULK_EXTRACT_CONCURRENCY
+   below PDF_EXTRACT_WORKERS.
+2. analyze: Groq profile extraction at bulk priority on BULK_GROQ_CONCURRENCY
+   threads.
+
+A file moves on to the next stage as soon as its own extraction is done, so
+the stages overlap. Failures are per file. An unreadable archive entry, a PDF
+without text, a Groq error or bad JSON marks that file `failed` with an
+error, and the rest of the batch carries on. Only a batch that cannot be
+accepted at all (not a ZIP, too many files, too large) is rejected with
+BulkUploadError.
+
+PDFs waiting for the extract stage are held in memory, so the bytes queued
+across all jobs are capped at BULK_MAX_QUEUED_BYTES; a batch that would go
+over it is rejected with 429 until earlier files have been extracted.
+
+Jobs live in the memory of the process that accepted them. Finished jobs are
+kept for BULK_JOB_TTL_SECONDS, and at most BULK_MAX_JOBS jobs are kept. Each
+file change bumps the job's version, and changes_since() blocks until there
+is something newer, which the streaming endpoint uses.
+"""
+import io
+import logging
+import os
+import threading
+import time
+import uuid
+import zipfile
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+BULK_MAX_FILES = int(os.getenv('BULK_MAX_FILES', '500'))
+BULK_MAX_FILE_BYTES = int(os.getenv('BULK_MAX_FILE_BYTES', str(10 * 1024 * 1024)))
+BULK_MAX_TOTAL_BYTES = int(os.getenv('BULK_MAX_TOTAL_BYTES', str(256 * 1024 * 1024)))
+# PDF bytes waiting for extraction across every job of the process
+BULK_MAX_QUEUED_BYTES = int(os.getenv('BULK_MAX_QUEUED_BYTES', str(512 * 1024 * 1024)))
+BULK_EXTRACT_CONCURRENCY = int(os.getenv('BULK_EXTRACT_CONCURRENCY', '2'))
+BULK_GROQ_CONCURRENCY = int(os.getenv('BULK_GROQ_CONCURRENCY', '4'))
+BULK_MAX_JOBS = int(os.getenv('BULK_MAX_JOBS', '50'))
+BULK_JOB_TTL_SECONDS = int(os.getenv('BULK_JOB_TTL_SECONDS', str(60 * 60)))
+# Times a file's Groq call waits out a full scheduler queue before the file fails
+BULK_BUSY_RETRIES = int(os.getenv('BULK_BUSY_RETRIES', '5'))
+BULK_STREAM_HEARTBEAT_SECONDS = float(os.getenv('BULK_STREAM_HEARTBEAT_SECONDS', '15'))
+
+log = logging.getLogger('hr_ai.pdf')
+
+FILE_STATES = ('queued', 'extracting', 'analyzing', 'done', 'failed')
+PDF_MAGIC = b'%PDF-'
+ZIP_MAGIC = b'PK\x03\x04'
+
+
+class BulkUploadError(Exception):
+    """A batch that cannot be accepted; `status` is the HTTP status to answer with."""
+
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+class BulkFileError(Exception):
+    """A per-file failure whose message is shown to the user as is."""
+
+
+def read_limited(stream, limit):
+    """Reads at most `limit` bytes; returns None if the stream holds more."""
+    data = stream.read(limit + 1)
+    return None if len(data) > limit else data
+
+
+def is_hidden_entry(name):
+    parts = name.replace('\\', '/').split('/')
+    return parts[0] == '__MACOSX' or parts[-1].startswith('.')
+
+
+def archive_entries(archive_bytes, max_file_bytes=BULK_MAX_FILE_BYTES):
+    """
+    Yields (filename, pdf_bytes, error) for every file in a ZIP archive, in
+    archive order; exactly one of pdf_bytes and error is None. Directories and
+    macOS/hidden entries are skipped. Sizes are checked against the bytes
+    actually read, not the archive's own (forgeable) header.
+    """
+    try:
+        archive = zipfile.ZipFile(io.BytesIO(archive_bytes))
+    except zipfile.BadZipFile as e:
+        raise BulkUploadError(f'Could not read the ZIP archive: {e}')
+    with archive:
+        for info in archive.infolist():
+            if info.is_dir() or is_hidden_entry(info.filename):
+                continue
+            if info.file_size > max_file_bytes:
+                yield info.filename, None, f'File is larger than {max_file_bytes} bytes'
+                continue
+            try:
+                with archive.open(info) as entry:
+                    data = read_limited(entry, max_file_bytes)
+            except (zipfile.BadZipFile, RuntimeError, NotImplementedError, OSError) as e:
+                # RuntimeError: encrypted entry; NotImplementedError: unsupported compression
+                yield info.filename, None, f'Could not read the file from the archive: {e}'
+                continue
+            if data is None:
+                yield info.filename, None, f'File is larger than {max_file_bytes} bytes'
+            else:
+                yield info.filename, data, None
+
+
+def collect_batch(uploads, max_files=BULK_MAX_FILES, max_file_bytes=BULK_MAX_FILE_BYTES,
+                  max_total_bytes=BULK_MAX_TOTAL_BYTES):
+    """
+    Expands uploaded (filename, stream) pairs into (filename, pdf_bytes, error)
+    entries. ZIP archives (recognised by content) are unpacked, and every other
+    upload is treated as a single PDF. Files that are not PDFs or are too large
+    become failed entries. Raises BulkUploadError for an empty or oversized batch.
+    """
+    entries = []
+    total_bytes = 0
+    for filename, stream in uploads:
+        data = read_limited(stream, max(max_file_bytes, max_total_bytes))
+        if data is None:
+            raise BulkUploadError(f'{filename} is larger than the batch limit of {max_total_bytes} bytes', 413)
+        if data.startswith(ZIP_MAGIC):
+            expanded = archive_entries(data, max_file_bytes)
+        elif len(data) > max_file_bytes:
+            expanded = [(filename, None, f'File is larger than {max_file_bytes} bytes')]
+        else:
+            expanded = [(filename, data, None)]
+        for name, pdf_bytes, error in expanded:
+            if pdf_bytes is not None and not pdf_bytes[:1024].lstrip().startswith(PDF_MAGIC):
+                pdf_bytes, error = None, 'Not a PDF file'
+            total_bytes += len(pdf_bytes or b'')
+            entries.append((name, pdf_bytes, error))
+            if len(entries) > max_files:
+                raise BulkUploadError(f'A batch may hold at most {max_files} files', 413)
+            if total_bytes > max_total_bytes:
+                raise BulkUploadError(f'The PDFs in a batch may total at most {max_total_bytes} bytes', 413)
+    if not entries:
+        raise BulkUploadError('No resume files provided')
+    return entries
+
+
+class BulkJob:
+    def __init__(self, entries):
+        self.id = str(uuid.uuid4())
+        self.created_at = datetime.now().isoformat()
+        self.finished_at = None
+        self.started = time.monotonic()
+        self.finished = None
+        self.version = 0
+        self.changed = threading.Condition()
+        self.files = [{
+            'index': index,
+            'filename': filename,
+            'status': 'failed' if error else 'queued',
+            'cached': False,
+            'candidate_profile': None,
+            'error': error,
+            'elapsed_ms': None,
+            '_version': 0,
+        } for index, (filename, _, error) in enumerate(entries)]
+        self.pending = sum(1 for f in self.files if f['status'] == 'queued')
+
+    def summary(self):
+        """Job status and per-state counts; call with `changed` held."""
+        counts = {state: 0 for state in FILE_STATES}
+        for f in self.files:
+            counts[f['status']] += 1
+        total = len(self.files)
+        end = self.finished if self.finished is not None else time.monotonic()
+        return {
+            'job_id': self.id,
+            'status': 'running' if self.finished is None else 'completed',
+            'created_at': self.created_at,
+            'finished_at': self.finished_at,
+            'total': total,
+            'counts': counts,
+            'percent_complete': round(100 * (counts['done'] + counts['failed']) / total, 1),
+            'elapsed_ms': round((end - self.started) * 1000, 1),
+        }
+
+
+def public_file(record):
+    return {key: value for key, value in record.items() if not key.startswith('_')}
+
+
+class BulkIngestor:
+    """
+    Runs bulk jobs. `extract_fn(pdf_bytes)` returns (cached_profile, None) or
+    (None, context); `analyze_fn(context)` returns the profile. Either may
+    raise, and BulkFileError messages are reported as is.
+    """
+
+    def __init__(self, extract_fn, analyze_fn, extract_concurrency=BULK_EXTRACT_CONCURRENCY,
+                 groq_concurrency=BULK_GROQ_CONCURRENCY, max_jobs=BULK_MAX_JOBS, ttl_seconds=BULK_JOB_TTL_SECONDS,
+                 max_queued_bytes=BULK_MAX_QUEUED_BYTES):
+        self.extract_fn = extract_fn
+        self.analyze_fn = analyze_fn
+        self.extract_concurrency = extract_concurrency
+        self.groq_concurrency = groq_concurrency
+        self.max_jobs = max_jobs
+        self.ttl_seconds = ttl_seconds
+        self.max_queued_bytes = max_queued_bytes
+        self._extract_pool = ThreadPoolExecutor(max_workers=extract_concurrency, thread_name_prefix='bulk-extract')
+        self._analyze_pool = ThreadPoolExecutor(max_workers=groq_concurrency, thread_name_prefix='bulk-analyze')
+        self._lock = threading.Lock()
+        self._jobs = OrderedDict()
+        self._queued_bytes = 0
+        self._counters = {'jobs': 0, 'rejected_jobs': 0, 'files': 0, 'done': 0, 'failed': 0, 'cached': 0}
+
+    def submit(self, entries):
+        """
+        Starts a job for collect_batch() entries and returns its summary.
+        Raises BulkUploadError if no job slot is free or the queued PDF bytes would exceed the limit.
+        """
+        job = BulkJob(entries)
+        queued_bytes = sum(len(pdf_bytes) for _, pdf_bytes, error in entries if error is None)
+        with self._lock:
+            self._prune()
+            if len(self._jobs) >= self.max_jobs:
+                self._counters['rejected_jobs'] += 1
+                raise BulkUploadError(f'Too many bulk jobs in progress (at most {self.max_jobs}). Please retry later.', 429)
+            # A batch larger than the limit on its own is still taken when nothing else is queued
+            if self._queued_bytes and self._queued_bytes + queued_bytes > self.max_queued_bytes:
+                self._counters['rejected_jobs'] += 1
+                raise BulkUploadError('Too many resumes are waiting to be processed. Please retry later.', 429)
+            self._queued_bytes += queued_bytes
+            self._jobs[job.id] = job
+            self._counters['jobs'] += 1
+            self._counters['files'] += len(entries)
+            self._counters['failed'] += len(entries) - job.pending
+        log.info("Bulk job %s accepted with %d files (%d rejected up front)", job.id, len(entries), len(entries) - job.pending)
+
+        if not job.pending:
+            self._finish(job)
+        for index, (_, pdf_bytes, error) in enumerate(entries):
+            if error is None:
+                self._extract_pool.submit(self._extract, job, index, pdf_bytes)
+        with job.changed:
+            return job.summary()
+
+    def _prune(self):
+        """Drops expired finished jobs, then the oldest finished ones while over capacity. Call with _lock held."""
+        now = time.monotonic()
+        for job_id, job in list(self._jobs.items()):
+            if job.finished is not None and now - job.finished > self.ttl_seconds:
+                del self._jobs[job_id]
+        for job_id, job in list(self._jobs.items()):
+            if len(self._jobs) < self.max_jobs:
+                break
+            if job.finished is not None:
+                del self._jobs[job_id]
+
+    def _update(self, job, index, **fields):
+        with job.changed:
+            record = job.files[index]
+            record.update(fields)
+            job.version += 1
+            record['_version'] = job.version
+            job.changed.notify_all()
+
+    def _settle(self, job, index, started, outcome, **fields):
+        """Marks a file done or failed; finishes the job with its last file."""
+        self._update(job, index, status=outcome, elapsed_ms=round((time.monotonic() - started) * 1000, 1), **fields)
+        with self._lock:
+            self._counters[outcome] += 1
+            if fields.get('cached'):
+                self._counters['cached'] += 1
+        with job.changed:
+            job.pending -= 1
+            last = job.pending == 0
+        if last:
+            self._finish(job)
+
+    def _finish(self, job):
+        with job.changed:
+            job.finished = time.monotonic()
+            job.finished_at = datetime.now().isoformat()
+            job.version += 1
+            job.changed.notify_all()
+            summary = job.summary()
+        log.info("Bulk job %s finished in %sms: %d done, %d failed", job.id, summary['elapsed_ms'],
+                 summary['counts']['done'], summary['counts']['failed'])
+
+    def _fail(self, job, index, started, stage, error):
+        if isinstance(error, BulkFileError):
+            message = str(error)
+        else:
+            log.warning("Bulk job %s: %s failed for %s: %s", job.id, stage, job.files[index]['filename'], error)
+            message = f'{stage.capitalize()} failed: {error}'
+        self._settle(job, index, started, 'failed', error=message)
+
+    def _extract(self, job, index, pdf_bytes):
+        started = time.monotonic()
+        self._update(job, index, status='extracting')
+        error = None
+        try:
+            cached_profile, context = self.extract_fn(pdf_bytes)
+        except Exception as e:
+            error = e
+        # Released before the file settles, so a finished job no longer counts against the limit
+        with self._lock:
+            self._queued_bytes -= len(pdf_bytes)
+        if error is not None:
+            self._fail(job, index, started, 'extraction', error)
+            return
+        if cached_profile is not None:
+            self._settle(job, index, started, 'done', cached=True, candidate_profile=cached_profile)
+            return
+        self._update(job, index, status='analyzing')
+        self._analyze_pool.submit(self._analyze, job, index, context, started)
+
+    def _analyze(self, job, index, context, started):
+        try:
+            profile = self.analyze_fn(context)
+        except Exception as e:
+            self._fail(job, index, started, 'analysis', e)
+            return
+        self._settle(job, index, started, 'done', candidate_profile=profile)
+
+    def _job(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def status(self, job_id):
+        """The job summary with every file's result, or None for an unknown or expired job."""
+        job = self._job(job_id)
+        if job is None:
+            return None
+        with job.changed:
+            return dict(job.summary(), files=[public_file(f) for f in job.files])
+
+    def changes_since(self, job_id, version, timeout):
+        """
+        Waits up to `timeout` seconds for the job to move past `version`.
+        Returns (summary, changed_files, new_version), where changed_files is
+        empty if nothing changed in time, or None for an unknown job.
+        """
+        job = self._job(job_id)
+        if job is None:
+            return None
+        with job.changed:
+            job.changed.wait_for(lambda: job.version > version, timeout)
+            changed = [public_file(f) for f in job.files if f['_version'] > version]
+            return job.summary(), changed, job.version
+
+    def stats(self):
+        with self._lock:
+            jobs = list(self._jobs.values())
+            counters = dict(self._counters)
+            queued_bytes = self._queued_bytes
+        return {
+            'extract_concurrency': self.extract_concurrency,
+            'groq_concurrency': self.groq_concurrency,
+            'max_jobs': self.max_jobs,
+            'queued_bytes': queued_bytes,
+            'max_queued_bytes': self.max_queued_bytes,
+            'jobs_stored': len(jobs),
+            'jobs_running': sum(1 for job in jobs if job.finished is None),
+            **counters,
+        }
@@ -0,0 +1,370 @@
+"""
+Sandboxed execution of Python submissions for coding questions.
+
+Each coding question carries a test set: the function the candidate must
+write and cases of {args, expected}. The set is generated with the question
+and verified once against the model's reference solution (see verify_tests).
+run_tests() runs every case in its own short-lived interpreter, and a
+bounded worker pool runs the cases in parallel.
+
+Isolation of each child process:
+- `python -I` in an empty working directory, with an empty environment
+- rlimits on CPU time (SANDBOX_CPU_SECONDS), address space
+  (SANDBOX_MEMORY_MB), file size (0, so nothing can be written) and open
+  files, set by the child before any submitted code runs
+- an audit hook that refuses sockets, subprocesses, fork/exec, file writes,
+  file-system changes and ctypes, and reads or directory listings outside
+  the interpreter's stdlib and site-packages directories (so /proc, the
+  parent's environment and config files cannot be read)
+- the submission runs on a worker thread, and the harness signs its report
+  with a per-run nonce that only the main thread holds; the parent ignores
+  anything else the submission prints or exits with
+- a wall-clock timeout (SANDBOX_WALL_SECONDS), after which the child is killed
+
+This keeps honest mistakes and casual abuse contained. It is not a security
+boundary against a determined attacker; run the service in a container if
+untrusted users can reach it. The `resource` module is POSIX-only, so on
+other platforms the sandbox reports itself unavailable and callers fall back
+to LLM review.
+"""
+import ast
+import json
+import logging
+import math
+import os
+import secrets
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+SANDBOX_ENABLED = os.getenv('SANDBOX_ENABLED', '1') not in ('0', 'false', 'False')
+SANDBOX_WORKERS = int(os.getenv('SANDBOX_WORKERS', str(min(4, os.cpu_count() or 1))))
+SANDBOX_CPU_SECONDS = int(os.getenv('SANDBOX_CPU_SECONDS', '2'))
+SANDBOX_MEMORY_MB = int(os.getenv('SANDBOX_MEMORY_MB', '256'))
+SANDBOX_WALL_SECONDS = float(os.getenv('SANDBOX_WALL_SECONDS', '5'))
+SANDBOX_MAX_CASES = int(os.getenv('SANDBOX_MAX_CASES', '10'))
+# A test set with fewer verified cases than this is dropped and the code goes to LLM review
+SANDBOX_MIN_CASES = int(os.getenv('SANDBOX_MIN_CASES', '2'))
+
+FLOAT_TOLERANCE = 1e-6
+MAX_ERROR_CHARS = 300
+
+log = logging.getLogger('hr_ai.app')
+
+# Runs in the child: limits first, then the audit hook, then the submission
+HARNESS = r'''
+import io, json, os, sys, sysconfig, threading, time, types
+
+# Reads are allowed only from the interpreter's library directories, so imports work
+# but nothing else (the parent's /proc/<pid>/environ, config files, keys) can be read
+READABLE_DIRS = tuple({os.path.join(os.path.realpath(path), '')
+                       for name, path in sysconfig.get_paths().items() if name in ('stdlib', 'platstdlib', 'purelib', 'platlib')})
+BLOCKED_EVENTS = ('socket.', 'subprocess.', 'os.system', 'os.exec', 'os.fork', 'os.posix_spawn', 'os.spawn',
+                  'os.kill', 'os.remove', 'os.rename', 'os.rmdir', 'os.mkdir', 'os.chmod', 'os.chown',
+                  'os.truncate', 'os.symlink', 'os.link', 'os.putenv', 'os.unsetenv', 'shutil.', 'ctypes.',
+                  # Ways to reach the main thread's frame, which holds the report nonce
+                  'sys._current_frames', 'sys.settrace', 'sys.setprofile', 'gc.get_objects', 'gc.get_referrers',
+                  'gc.get_referents')
+BLOCKED_MODULES = {'ctypes', '_ctypes', 'socket', '_socket', 'subprocess', '_posixsubprocess', 'multiprocessing'}
+WRITE_FLAGS = os.O_WRONLY | os.O_RDWR | os.O_CREAT | os.O_APPEND | os.O_TRUNC
+
+def readable(path):
+    if isinstance(path, bytes):
+        path = os.fsdecode(path)
+    return isinstance(path, str) and os.path.join(os.path.realpath(path), '').startswith(READABLE_DIRS)
+
+def guard(event, args):
+    if event.startswith(BLOCKED_EVENTS):
+        raise PermissionError(f'{event} is not allowed in the sandbox')
+    if event == 'open':
+        mode, flags = args[1], args[2]
+        if (isinstance(mode, str) and any(c in mode for c in 'wax+')) or (flags or 0) & WRITE_FLAGS:
+            raise PermissionError('Writing files is not allowed in the sandbox')
+        if not readable(args[0]):
+            raise PermissionError('Reading files is not allowed in the sandbox')
+    elif event in ('os.listdir', 'os.scandir') and not readable(args[0]):
+        raise PermissionError('Listing directories is not allowed in the sandbox')
+    elif event == 'import' and args[0].split('.')[0] in BLOCKED_MODULES:
+        raise PermissionError(f'Importing {args[0]} is not allowed in the sandbox')
+
+def run_submission(payload, result):
+    try:
+        namespace = {'__name__': '__sandbox__'}
+        exec(compile(payload['code'], '<submission>', 'exec'), namespace)
+        func = namespace.get(payload['function'])
+        if not callable(func):
+            # Accept a differently named solution when it is the only function defined
+            functions = [v for v in namespace.values() if isinstance(v, types.FunctionType)]
+            func = functions[0] if len(functions) == 1 else None
+        if func is None:
+            result['error'] = f"Function {payload['function']}() is not defined"
+            return
+        started = time.perf_counter()
+        value = func(*payload['args'])
+        result['runtime_ms'] = round((time.perf_counter() - started) * 1000, 3)
+        if isinstance(value, (set, frozenset)):
+            value = sorted(value, key=repr)
+        try:
+            result['value'] = json.loads(json.dumps(value))
+        except (TypeError, ValueError):
+            result['error'] = f'Returned a value that is not comparable: {type(value).__name__}'
+    except MemoryError:
+        result['error'] = 'MemoryError: memory limit exceeded'
+    except RecursionError:
+        result['error'] = 'RecursionError: maximum recursion depth exceeded'
+    except BaseException as e:
+        result['error'] = f'{type(e).__name__}: {e}'
+
+def main():
+    payload = json.loads(sys.stdin.read())
+    # Only this frame holds the nonce, and the submission runs on another thread, so it cannot
+    # reach it to sign a report of its own; the parent ignores output lines without it
+    nonce = payload.pop('nonce')
+    import resource
+    for name, value in payload['limits'].items():
+        resource.setrlimit(getattr(resource, name), (value, value))
+    write, fileno, dumps = os.write, sys.stdout.fileno(), json.dumps
+    sys.stdout = io.StringIO()
+    sys.stdin = io.StringIO()
+    sys.addaudithook(guard)
+    result = {}
+    worker = threading.Thread(target=run_submission, args=(payload, result), daemon=True)
+    worker.start()
+    worker.join()
+    write(fileno, ('\n' + nonce + dumps(result) + '\n').encode())
+
+main()
+'''
+
+
+def sandbox_available():
+    return SANDBOX_ENABLED and resource is not None
+
+
+def outputs_match(actual, expected):
+    """Compares JSON values; floats match within FLOAT_TOLERANCE, lists element by element."""
+    if isinstance(expected, bool) or isinstance(actual, bool):
+        return actual is expected
+    if isinstance(expected, (int, float)) and isinstance(actual, (int, float)):
+        return math.isclose(actual, expected, rel_tol=FLOAT_TOLERANCE, abs_tol=FLOAT_TOLERANCE)
+    if isinstance(expected, list) and isinstance(actual, list):
+        return len(actual) == len(expected) and all(outputs_match(a, e) for a, e in zip(actual, expected))
+    if isinstance(expected, dict) and isinstance(actual, dict):
+        return actual.keys() == expected.keys() and all(outputs_match(actual[k], expected[k]) for k in expected)
+    return actual == expected
+
+
+def normalize_tests(tests, max_cases=SANDBOX_MAX_CASES):
+    """
+    Checks a generated test set ({function_name, cases: [{args, expected}],
+    reference_solution}) and returns a clean copy, or None if it is unusable.
+    """
+    if not isinstance(tests, dict):
+        return None
+    function_name = tests.get('function_name')
+    if not isinstance(function_name, str) or not function_name.isidentifier():
+        return None
+    cases = []
+    for case in tests.get('cases') or []:
+        if not isinstance(case, dict) or 'expected' not in case:
+            continue
+        args = case.get('args', [])
+        cases.append({'args': args if isinstance(args, list) else [args], 'expected': case['expected']})
+    if not cases:
+        return None
+    reference = tests.get('reference_solution')
+    return {'function_name': function_name, 'cases': cases[:max_cases],
+            'reference_solution': reference if isinstance(reference, str) else None}
+
+
+def evaluation_from_report(report):
+    """
+    Converts a run_tests() report into the code-evaluation dict the LLM review
+    returns, with overall_score as the share of cases passed, plus the case
+    numbers and statuses under 'tests'. The evaluation goes back to the
+    candidate, so it never carries returned values, expected outputs or
+    exception text; those are logged here instead.
+    """
+    score = round(100 * report['passed'] / report['total']) if report['total'] else 0
+    problems = [case for case in report['cases'] if case['status'] != 'passed']
+    if report['syntax_error']:
+        feedback = f"The code does not compile: {report['syntax_error']}"
+    else:
+        feedback = f"Passed {report['passed']} of {report['total']} test cases."
+        if problems:
+            feedback += ' Cases not passed: ' + ', '.join(f"{case['case']} ({case['status']})" for case in problems) + '.'
+            log.info("Sandbox cases not passed: %s",
+                     '; '.join(f"case {case['case']} {case['status']}: {case['error']}" for case in problems))
+    return {
+        'correctness': score,
+        'logic': score,
+        'syntax': 0 if report['syntax_error'] else 100,
+        'overall_score': score,
+        'feedback': feedback,
+        'has_errors': any(case['status'] in ('error', 'timeout') for case in report['cases']),
+        'engine': 'sandbox',
+        'tests': {'passed': report['passed'], 'failed': report['failed'], 'total': report['total'],
+                  'cases': [{'case': case['case'], 'status': case['status']} for case in report['cases']]},
+    }
+
+
+def harness_report(stdout, nonce):
+    """
+    The result the harness wrote on its own line after `nonce`, or None if
+    there is none or it is malformed. Anything else on stdout was written by
+    the submission and is ignored.
+    """
+    lines = [line for line in stdout.splitlines() if line.startswith(nonce)]
+    if not lines:
+        return None
+    try:
+        result = json.loads(lines[-1][len(nonce):])
+    except ValueError:
+        return None
+    if not isinstance(result, dict) or not result.keys() <= {'value', 'runtime_ms', 'error'}:
+        return None
+    if 'error' in result:
+        return result if isinstance(result['error'], str) else None
+    runtime_ms = result.get('runtime_ms')
+    if 'value' not in result or isinstance(runtime_ms, bool) or not isinstance(runtime_ms, (int, float)):
+        return None
+    return result
+
+
+def _truncate(text):
+    return text if len(text) <= MAX_ERROR_CHARS else text[:MAX_ERROR_CHARS] + '...'
+
+
+class CodeSandbox:
+    def __init__(self, enabled=None, max_workers=SANDBOX_WORKERS, cpu_seconds=SANDBOX_CPU_SECONDS,
+                 memory_mb=SANDBOX_MEMORY_MB, wall_seconds=SANDBOX_WALL_SECONDS):
+        self.enabled = sandbox_available() if enabled is None else enabled and resource is not None
+        self.cpu_seconds = cpu_seconds
+        self.memory_mb = memory_mb
+        self.wall_seconds = wall_seconds
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='sandbox')
+        self._workdir = tempfile.mkdtemp(prefix='hr_ai_sandbox_')
+        self._lock = threading.Lock()
+        self._counters = {'runs': 0, 'cases': 0, 'passed': 0, 'failed': 0, 'errors': 0, 'timeouts': 0,
+                          'syntax_errors': 0, 'case_ms_total': 0.0}
+
+    def _limits(self):
+        memory = self.memory_mb * 1024 * 1024
+        return {'RLIMIT_CPU': self.cpu_seconds, 'RLIMIT_AS': memory, 'RLIMIT_FSIZE': 0, 'RLIMIT_NOFILE': 32}
+
+    def run_case(self, code, function_name, args):
+        """
+        Runs one call of `function_name(*args)` in a fresh child process.
+        Returns {'status': 'ok'|'error'|'timeout', 'value'?, 'error'?, 'runtime_ms', 'wall_ms'}.
+        """
+        nonce = secrets.token_hex(16)
+        payload = json.dumps({'code': code, 'function': function_name, 'args': args, 'limits': self._limits(), 'nonce': nonce})
+        started = time.perf_counter()
+        try:
+            completed = subprocess.run(
+                [sys.executable, '-I', '-c', HARNESS], input=payload, capture_output=True, text=True,
+                timeout=self.wall_seconds, cwd=self._workdir, env={},
+            )
+        except subprocess.TimeoutExpired:
+            return {'status': 'timeout', 'error': f'Timed out after {self.wall_seconds:g}s',
+                    'wall_ms': round(self.wall_seconds * 1000, 1)}
+        wall_ms = round((time.perf_counter() - started) * 1000, 1)
+        result = harness_report(completed.stdout, nonce)
+        if result is None:
+            # Killed by the CPU limit (SIGXCPU), crashed, or exited before the harness could report
+            reason = 'CPU time limit exceeded' if completed.returncode == -24 else f'Exited with code {completed.returncode} without a result'
+            return {'status': 'error', 'error': reason, 'wall_ms': wall_ms}
+        if 'error' in result:
+            return {'status': 'error', 'error': _truncate(result['error']), 'runtime_ms': result.get('runtime_ms'), 'wall_ms': wall_ms}
+        return {'status': 'ok', 'value': result.get('value'), 'runtime_ms': result.get('runtime_ms'), 'wall_ms': wall_ms}
+
+    def run_tests(self, code, tests, record=True):
+        """
+        Runs every case of `tests` against `code` in parallel. Returns
+        {'passed', 'failed', 'total', 'syntax_error', 'cases': [...]}, where each case
+        has its number, status (passed, failed, error or timeout), runtime_ms and any error.
+        `record=False` keeps the run out of stats().
+        """
+        cases = tests['cases']
+        try:
+            ast.parse(code)
+        except SyntaxError as e:
+            if record:
+                with self._lock:
+                    self._counters['runs'] += 1
+                    self._counters['syntax_errors'] += 1
+            message = f'SyntaxError: {e.msg} (line {e.lineno})'
+            return {'passed': 0, 'failed': len(cases), 'total': len(cases), 'syntax_error': message,
+                    'cases': [{'case': i + 1, 'status': 'error', 'runtime_ms': None, 'error': message} for i in range(len(cases))]}
+
+        futures = [self._executor.submit(self.run_case, code, tests['function_name'], case['args']) for case in cases]
+        results = []
+        for i, (case, future) in enumerate(zip(cases, futures)):
+            outcome = future.result()
+            entry = {'case': i + 1, 'runtime_ms': outcome.get('runtime_ms')}
+            if outcome['status'] != 'ok':
+                entry.update(status=outcome['status'], error=outcome['error'])
+            elif outputs_match(outcome['value'], case['expected']):
+                entry['status'] = 'passed'
+            else:
+                entry.update(status='failed', error=f"Expected {json.dumps(case['expected'])}, got {json.dumps(outcome['value'])}")
+            results.append(entry)
+
+        passed = sum(1 for entry in results if entry['status'] == 'passed')
+        if record:
+            self._record(results, passed)
+        return {'passed': passed, 'failed': len(results) - passed, 'total': len(results), 'syntax_error': None, 'cases': results}
+
+    def _record(self, results, passed):
+        with self._lock:
+            self._counters['runs'] += 1
+            self._counters['cases'] += len(results)
+            self._counters['passed'] += passed
+            for entry in results:
+                if entry['status'] == 'failed':
+                    self._counters['failed'] += 1
+                elif entry['status'] == 'error':
+                    self._counters['errors'] += 1
+                elif entry['status'] == 'timeout':
+                    self._counters['timeouts'] += 1
+                self._counters['case_ms_total'] += entry['runtime_ms'] or 0.0
+
+    def verify_tests(self, tests):
+        """
+        Runs the reference solution of a normalized test set and keeps only the
+        cases it passes. Returns the set without the solution, or None if too
+        few cases survive (or there is no solution to check against).
+        """
+        if not tests or not tests.get('reference_solution'):
+            return None
+        report = self.run_tests(tests['reference_solution'], tests, record=False)
+        cases = [case for case, entry in zip(tests['cases'], report['cases']) if entry['status'] == 'passed']
+        if len(cases) < SANDBOX_MIN_CASES:
+            log.warning("Dropped test set for %s(): reference solution passed %d of %d cases",
+                        tests['function_name'], len(cases), len(tests['cases']))
+            return None
+        if len(cases) < len(tests['cases']):
+            log.info("Dropped %d of %d generated cases for %s() that the reference solution fails",
+                     len(tests['cases']) - len(cases), len(tests['cases']), tests['function_name'])
+        return {'function_name': tests['function_name'], 'cases': cases}
+
+    def stats(self):
+        with self._lock:
+            counters = dict(self._counters)
+        case_ms_total = counters.pop('case_ms_total')
+        return {
+            'enabled': self.enabled,
+            'cpu_seconds': self.cpu_seconds,
+            'memory_mb': self.memory_mb,
+            'wall_seconds': self.wall_seconds,
+            **counters,
+            'avg_case_ms': round(case_ms_total / counters['cases'], 3) if counters['cases'] else 0.0,
+        }
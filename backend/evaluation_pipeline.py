@@ -0,0 +1,152 @@
+"""
+Concurrent evaluation pipeline for answer submissions.
+
+Code evaluation, AI-content detection and answer scoring do not depend on each
+other, so they are submitted together to one shared, bounded thread pool and
+the caller only waits as long as the slowest stage (or its timeout).
+run_stages_async() does the same on an event loop: coroutine stages run as
+tasks and can really be cancelled at their timeout, and blocking stages
+still go to the shared pool.
+"""
+import asyncio
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+
+# Shared across all requests so concurrent submissions cannot spawn unbounded threads
+PIPELINE_MAX_WORKERS = int(os.getenv('EVAL_PIPELINE_WORKERS', '16'))
+
+# Per-stage timeouts in seconds, measured from the moment the stage is submitted
+STAGE_TIMEOUTS = {
+    'code_evaluation': float(os.getenv('EVAL_TIMEOUT_CODE', '30')),
+    'ai_detection': float(os.getenv('EVAL_TIMEOUT_AI_DETECTION', '12')),
+    'answer_scoring': float(os.getenv('EVAL_TIMEOUT_SCORING', '30')),
+}
+DEFAULT_STAGE_TIMEOUT = 30.0
+
+executor = ThreadPoolExecutor(max_workers=PIPELINE_MAX_WORKERS, thread_name_prefix='eval-stage')
+
+log = logging.getLogger('hr_ai.app')
+
+
+class Stage:
+    """
+    A single unit of work in the pipeline plus the value to use if it fails or times out.
+    Exceptions of the types in `reraise` are passed to the caller instead of falling back.
+    """
+
+    def __init__(self, name, func, *args, fallback=None, timeout=None, reraise=()):
+        self.name = name
+        self.func = func
+        self.args = args
+        self.fallback = fallback
+        self.reraise = reraise
+        # Batch submissions name stages 'kind:question_id'; the timeout follows the kind
+        kind = name.split(':', 1)[0]
+        self.timeout = timeout if timeout is not None else STAGE_TIMEOUTS.get(kind, DEFAULT_STAGE_TIMEOUT)
+
+
+def _timed_call(func, args):
+    started = time.perf_counter()
+    result = func(*args)
+    return result, started, time.perf_counter()
+
+
+async def _timed_call_async(func, args):
+    started = time.perf_counter()
+    result = await func(*args)
+    return result, started, time.perf_counter()
+
+
+def run_stages(stages):
+    """
+    Runs all stages concurrently on the shared executor.
+    Returns (results, timings): results maps stage name to its return value (or
+    its fallback), timings maps stage name to {'status', 'duration_ms'}.
+    """
+    submitted_at = time.perf_counter()
+    futures = {stage.name: executor.submit(_timed_call, stage.func, stage.args) for stage in stages}
+
+    results = {}
+    timings = {}
+    for stage in stages:
+        remaining = max(0.0, submitted_at + stage.timeout - time.perf_counter())
+        try:
+            result, started, finished = futures[stage.name].result(timeout=remaining)
+            results[stage.name] = result
+            timings[stage.name] = {
+                'status': 'ok',
+                'duration_ms': round((finished - started) * 1000, 1),
+                'queued_ms': round((started - submitted_at) * 1000, 1),
+            }
+        except FutureTimeoutError:
+            # The worker thread cannot be interrupted; its late result is simply discarded
+            futures[stage.name].cancel()
+            results[stage.name] = stage.fallback
+            timings[stage.name] = {'status': 'timeout', 'duration_ms': round(stage.timeout * 1000, 1)}
+            log.warning("Evaluation stage %s timed out after %ss", stage.name, stage.timeout)
+        except stage.reraise:
+            raise
+        except Exception as e:
+            results[stage.name] = stage.fallback
+            timings[stage.name] = {
+                'status': 'error',
+                'duration_ms': round((time.perf_counter() - submitted_at) * 1000, 1),
+                'error': str(e),
+            }
+            log.warning("Evaluation stage %s failed: %s", stage.name, e)
+
+    timings['total_ms'] = round((time.perf_counter() - submitted_at) * 1000, 1)
+    return results, timings
+
+
+async def run_stages_async(stages):
+    """
+    Coroutine counterpart of run_stages() with the same results and timings.
+    Stages whose func is a coroutine function are awaited on the running loop;
+    the others are run on the shared executor.
+    """
+    loop = asyncio.get_running_loop()
+    submitted_at = time.perf_counter()
+    futures = {
+        stage.name: asyncio.ensure_future(_timed_call_async(stage.func, stage.args))
+        if asyncio.iscoroutinefunction(stage.func) else loop.run_in_executor(executor, _timed_call, stage.func, stage.args)
+        for stage in stages
+    }
+
+    results = {}
+    timings = {}
+    try:
+        for stage in stages:
+            remaining = max(0.0, submitted_at + stage.timeout - time.perf_counter())
+            try:
+                result, started, finished = await asyncio.wait_for(futures[stage.name], timeout=remaining)
+                results[stage.name] = result
+                timings[stage.name] = {
+                    'status': 'ok',
+                    'duration_ms': round((finished - started) * 1000, 1),
+                    'queued_ms': round((started - submitted_at) * 1000, 1),
+                }
+            except asyncio.TimeoutError:
+                # wait_for has cancelled the stage; a stage on the executor finishes unobserved
+                results[stage.name] = stage.fallback
+                timings[stage.name] = {'status': 'timeout', 'duration_ms': round(stage.timeout * 1000, 1)}
+                log.warning("Evaluation stage %s timed out after %ss", stage.name, stage.timeout)
+            except stage.reraise:
+                raise
+            except Exception as e:
+                results[stage.name] = stage.fallback
+                timings[stage.name] = {
+                    'status': 'error',
+                    'duration_ms': round((time.perf_counter() - submitted_at) * 1000, 1),
+                    'error': str(e),
+                }
+                log.warning("Evaluation stage %s failed: %s", stage.name, e)
+    finally:
+        # Nothing awaits the other stages once one is re-raised or the request is cancelled
+        for future in futures.values():
+            future.cancel()
+
+    timings['total_ms'] = round((time.perf_counter() - submitted_at) * 1000, 1)
+    return results, timings
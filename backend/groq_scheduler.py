@@ -0,0 +1,370 @@
+"""
+Rate-limit scheduler for Groq calls.
+
+Two token buckets mirror the Groq account limits: requests per minute
+(GROQ_RPM_LIMIT) and tokens per minute (GROQ_TPM_LIMIT). Before a call is
+sent it reserves one request and its estimated tokens; once Groq reports
+`usage`, the estimate is settled against the real count. A 429 from Groq
+blocks both buckets for the Retry-After period it returned.
+
+Calls that cannot go out at once wait in a bounded priority queue: interactive
+work (answer scoring) goes ahead of standard requests (resume analysis,
+question generation, assessments), which go ahead of bulk jobs (question bank
+refreshes). When the queue is full, a waiting call of lower priority is evicted
+to make room. Otherwise the new call is rejected with SchedulerBusyError, which
+carries a Retry-After hint. A call whose wait would exceed
+GROQ_SCHEDULER_MAX_WAIT is rejected the same way.
+
+With GROQ_SCHEDULER_DB set, the bucket levels live in a SQLite file, so every
+gunicorn worker draws from one budget. Wait queues are per process; blocking
+callers (acquire) and coroutines on the async server (acquire_async) share them.
+"""
+import asyncio
+import heapq
+import itertools
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+GROQ_RPM_LIMIT = int(os.getenv('GROQ_RPM_LIMIT', '30'))
+GROQ_TPM_LIMIT = int(os.getenv('GROQ_TPM_LIMIT', '12000'))
+GROQ_SCHEDULER_QUEUE_SIZE = int(os.getenv('GROQ_SCHEDULER_QUEUE_SIZE', '32'))
+GROQ_SCHEDULER_MAX_WAIT = float(os.getenv('GROQ_SCHEDULER_MAX_WAIT', '20'))
+GROQ_SCHEDULER_DB = os.getenv('GROQ_SCHEDULER_DB', '')
+# Completion tokens reserved per call until the real usage is known
+GROQ_COMPLETION_TOKEN_ESTIMATE = int(os.getenv('GROQ_COMPLETION_TOKEN_ESTIMATE', '1000'))
+# Seconds between queue checks for coroutine callers, which cannot wait on the condition
+ASYNC_POLL_INTERVAL = 0.05
+
+log = logging.getLogger('hr_ai.groq')
+
+PRIORITY_INTERACTIVE = 0
+PRIORITY_STANDARD = 1
+PRIORITY_BULK = 2
+PRIORITY_NAMES = {PRIORITY_INTERACTIVE: 'interactive', PRIORITY_STANDARD: 'standard', PRIORITY_BULK: 'bulk'}
+TASK_PRIORITIES = {
+    'evaluation': PRIORITY_INTERACTIVE,
+    'batch_evaluation': PRIORITY_INTERACTIVE,
+    'code_evaluation': PRIORITY_INTERACTIVE,
+}
+
+
+def task_priority(task):
+    return TASK_PRIORITIES.get(task, PRIORITY_STANDARD)
+
+
+class SchedulerBusyError(Exception):
+    """Raised when a Groq call cannot be scheduled in time; `retry_after` is in seconds."""
+
+    def __init__(self, message, retry_after):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def _refill(state, now, rpm, tpm):
+    elapsed = max(0.0, now - state['updated'])
+    state['requests'] = min(rpm, state['requests'] + elapsed * rpm / 60)
+    state['tokens'] = min(tpm, state['tokens'] + elapsed * tpm / 60)
+    state['updated'] = now
+
+
+class MemoryBucketStore:
+    """Bucket state for a single process."""
+
+    def __init__(self, rpm, tpm):
+        self._lock = threading.Lock()
+        self._state = {'requests': float(rpm), 'tokens': float(tpm), 'updated': time.time(), 'blocked_until': 0.0}
+
+    def transact(self, func):
+        """Runs func(state) atomically; func may mutate the state dict."""
+        with self._lock:
+            return func(self._state)
+
+
+class SQLiteBucketStore:
+    """Bucket state in one row of a SQLite table, updated under BEGIN IMMEDIATE by every worker."""
+
+    def __init__(self, db_path, rpm, tpm):
+        self.db_path = db_path
+        self._local = threading.local()
+        conn = self._connection()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS groq_buckets ('
+                ' id INTEGER PRIMARY KEY CHECK (id = 1),'
+                ' requests REAL NOT NULL,'
+                ' tokens REAL NOT NULL,'
+                ' updated REAL NOT NULL,'
+                ' blocked_until REAL NOT NULL)'
+            )
+            conn.execute('INSERT OR IGNORE INTO groq_buckets VALUES (1, ?, ?, ?, 0)', (rpm, tpm, time.time()))
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        conn.execute('COMMIT')
+
+    def _connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            # Autocommit mode; transactions are opened explicitly with BEGIN IMMEDIATE
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def transact(self, func):
+        conn = self._connection()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            row = conn.execute('SELECT requests, tokens, updated, blocked_until FROM groq_buckets WHERE id = 1').fetchone()
+            state = dict(zip(('requests', 'tokens', 'updated', 'blocked_until'), row))
+            result = func(state)
+            conn.execute('UPDATE groq_buckets SET requests = ?, tokens = ?, updated = ?, blocked_until = ? WHERE id = 1',
+                         (state['requests'], state['tokens'], state['updated'], state['blocked_until']))
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        conn.execute('COMMIT')
+        return result
+
+
+class Reservation:
+    """Capacity granted to one call. Set `used_tokens` from Groq's usage before it is settled."""
+
+    def __init__(self, tokens, priority, waited_seconds):
+        self.tokens = tokens
+        self.priority = priority
+        self.waited_seconds = waited_seconds
+        self.used_tokens = None
+
+
+class _Waiter:
+    def __init__(self, priority, seq):
+        self.priority = priority
+        self.seq = seq
+        self.evicted = False
+
+    def __lt__(self, other):
+        return (self.priority, self.seq) < (other.priority, other.seq)
+
+
+class GroqScheduler:
+    def __init__(self, rpm=GROQ_RPM_LIMIT, tpm=GROQ_TPM_LIMIT, queue_size=GROQ_SCHEDULER_QUEUE_SIZE,
+                 max_wait=GROQ_SCHEDULER_MAX_WAIT, db_path=GROQ_SCHEDULER_DB):
+        self.rpm = rpm
+        self.tpm = tpm
+        self.queue_size = queue_size
+        self.max_wait = max_wait
+        self.store = SQLiteBucketStore(db_path, rpm, tpm) if db_path else MemoryBucketStore(rpm, tpm)
+        self._cond = threading.Condition()
+        self._waiters = []  # heap of _Waiter, best priority first, FIFO within a priority
+        self._seq = itertools.count()
+        self._counters = {'granted': 0, 'waited': 0, 'rejected_queue_full': 0, 'rejected_timeout': 0,
+                          'evicted': 0, 'upstream_throttled': 0}
+
+    def _take(self, tokens):
+        """Takes one request and `tokens` if both buckets have them; returns 0 or the seconds until they will."""
+        def take(state):
+            now = time.time()
+            _refill(state, now, self.rpm, self.tpm)
+            if state['blocked_until'] > now:
+                return state['blocked_until'] - now
+            request_wait = (1 - state['requests']) * 60 / self.rpm
+            token_wait = (tokens - state['tokens']) * 60 / self.tpm
+            wait = max(request_wait, token_wait)
+            if wait > 0:
+                return wait
+            state['requests'] -= 1
+            state['tokens'] -= tokens
+            return 0.0
+        return self.store.transact(take)
+
+    def _queue_retry_after(self):
+        # Time for the calls already queued to drain at the request rate
+        return (len(self._waiters) + 1) * 60 / self.rpm
+
+    def _enqueue(self, priority):
+        if len(self._waiters) >= self.queue_size:
+            worst = max(self._waiters, default=None)
+            if worst is None or worst.priority <= priority:
+                self._counters['rejected_queue_full'] += 1
+                raise SchedulerBusyError('Groq request queue is full', self._queue_retry_after())
+            # Lower-priority work gives up its place
+            worst.evicted = True
+            self._waiters.remove(worst)
+            heapq.heapify(self._waiters)
+            self._counters['evicted'] += 1
+        waiter = _Waiter(priority, next(self._seq))
+        heapq.heappush(self._waiters, waiter)
+        return waiter
+
+    def _leave(self, waiter):
+        if waiter in self._waiters:
+            self._waiters.remove(waiter)
+            heapq.heapify(self._waiters)
+        self._cond.notify_all()
+
+    def _grant_now(self, tokens, priority):
+        """Fast path for an empty queue, under the condition: a Reservation, or None if the call must queue."""
+        if not self._waiters and self._take(tokens) == 0:
+            self._counters['granted'] += 1
+            return Reservation(tokens, priority, 0.0)
+        return None
+
+    def _check(self, waiter, tokens, started, deadline):
+        """
+        One turn of a queued call, under the condition: returns a Reservation
+        once the call heads the queue and the buckets have its capacity,
+        otherwise the seconds to wait before checking again. Raises
+        SchedulerBusyError (after leaving the queue) when the call was evicted
+        or cannot be granted before its deadline.
+        """
+        if waiter.evicted:
+            raise SchedulerBusyError('Groq request was displaced by higher-priority work', self._queue_retry_after())
+        remaining = deadline - time.monotonic()
+        if self._waiters[0] is waiter:
+            wait = self._take(tokens)
+            if wait == 0:
+                self._leave(waiter)
+                self._counters['granted'] += 1
+                self._counters['waited'] += 1
+                return Reservation(tokens, waiter.priority, time.monotonic() - started)
+            if wait > remaining:
+                self._leave(waiter)
+                self._counters['rejected_timeout'] += 1
+                raise SchedulerBusyError('Groq rate limit reached', wait)
+        else:
+            # Woken when the head changes; otherwise the deadline ends the wait
+            wait = remaining
+            if remaining <= 0:
+                self._leave(waiter)
+                self._counters['rejected_timeout'] += 1
+                raise SchedulerBusyError('Groq request waited too long in the queue', self._queue_retry_after())
+        return min(wait, remaining)
+
+    def acquire(self, tokens, priority=PRIORITY_STANDARD):
+        """
+        Blocks until one request and `tokens` are available and returns a
+        Reservation. Raises SchedulerBusyError if the queue is full, the call is
+        evicted by higher-priority work, or it cannot be granted within max_wait.
+        """
+        tokens = min(tokens, self.tpm)  # a call larger than the whole budget could never be granted
+        started = time.monotonic()
+        deadline = started + self.max_wait
+        with self._cond:
+            reservation = self._grant_now(tokens, priority)
+            if reservation is not None:
+                return reservation
+            waiter = self._enqueue(priority)
+            # A new head of the queue must get the chance to take capacity
+            self._cond.notify_all()
+            while True:
+                checked = self._check(waiter, tokens, started, deadline)
+                if isinstance(checked, Reservation):
+                    return checked
+                self._cond.wait(checked)
+
+    def _admit(self, tokens, priority):
+        """First turn of a call, under the condition: a Reservation, or the _Waiter it queued as."""
+        with self._cond:
+            reservation = self._grant_now(tokens, priority)
+            if reservation is not None:
+                return reservation
+            waiter = self._enqueue(priority)
+            self._cond.notify_all()
+            return waiter
+
+    def _check_locked(self, waiter, tokens, started, deadline):
+        with self._cond:
+            return self._check(waiter, tokens, started, deadline)
+
+    def _leave_locked(self, waiter):
+        with self._cond:
+            self._leave(waiter)
+
+    async def acquire_async(self, tokens, priority=PRIORITY_STANDARD):
+        """
+        Coroutine counterpart of acquire() for the async server. It shares the
+        buckets and the queue with blocking callers but sleeps on the event
+        loop instead of the condition. As it cannot be woken when the head of
+        the queue changes or tokens are refunded, it checks again at least
+        every ASYNC_POLL_INTERVAL seconds. Each turn takes the condition and
+        may run a SQLite transaction, so it runs in the loop's thread pool,
+        never on the loop itself. A cancelled call leaves the queue.
+        """
+        tokens = min(tokens, self.tpm)
+        started = time.monotonic()
+        deadline = started + self.max_wait
+        admitted = await asyncio.to_thread(self._admit, tokens, priority)
+        if isinstance(admitted, Reservation):
+            return admitted
+        waiter = admitted
+        try:
+            while True:
+                checked = await asyncio.to_thread(self._check_locked, waiter, tokens, started, deadline)
+                if isinstance(checked, Reservation):
+                    return checked
+                await asyncio.sleep(min(checked, ASYNC_POLL_INTERVAL))
+        except asyncio.CancelledError:
+            # Shielded so a second cancellation cannot leave the waiter queued
+            await asyncio.shield(asyncio.to_thread(self._leave_locked, waiter))
+            raise
+
+    def try_acquire(self, tokens, priority=PRIORITY_STANDARD):
+        """Grants capacity only if it is free right now and no call is queued; returns a Reservation or None."""
+        tokens = min(tokens, self.tpm)
+        with self._cond:
+            if self._waiters or self._take(tokens) != 0:
+                return None
+            self._counters['granted'] += 1
+            return Reservation(tokens, priority, 0.0)
+
+    def settle(self, reservation):
+        """Corrects the token bucket once the real usage of a call is known."""
+        if reservation.used_tokens is None:
+            return
+        difference = reservation.used_tokens - reservation.tokens
+
+        def adjust(state):
+            state['tokens'] = min(self.tpm, state['tokens'] - difference)
+        self.store.transact(adjust)
+        if difference < 0:
+            with self._cond:
+                self._cond.notify_all()
+
+    def throttled_upstream(self, retry_after):
+        """Blocks all calls for `retry_after` seconds after Groq itself returned a 429."""
+        until = time.time() + retry_after
+
+        def block(state):
+            state['blocked_until'] = max(state['blocked_until'], until)
+        self.store.transact(block)
+        with self._cond:
+            self._counters['upstream_throttled'] += 1
+        log.warning("Groq returned 429; holding calls for %.1fs", retry_after)
+
+    def stats(self):
+        def read(state):
+            _refill(state, time.time(), self.rpm, self.tpm)
+            return dict(state)
+        state = self.store.transact(read)
+        with self._cond:
+            queued = {name: 0 for name in PRIORITY_NAMES.values()}
+            for waiter in self._waiters:
+                queued[PRIORITY_NAMES[waiter.priority]] += 1
+            counters = dict(self._counters)
+        return {
+            'rpm_limit': self.rpm,
+            'tpm_limit': self.tpm,
+            'requests_available': round(state['requests'], 2),
+            'tokens_available': round(state['tokens']),
+            'blocked_seconds': round(max(0.0, state['blocked_until'] - time.time()), 1),
+            'shared': isinstance(self.store, SQLiteBucketStore),
+            'queue_size': self.queue_size,
+            'queued': queued,
+            **counters,
+        }
@@ -0,0 +1,263 @@
+"""
+JSON extraction from LLM output.
+
+`extract_json_value()` finds the first complete top-level JSON object (or,
+failing that, the first array) in a reply that may wrap it in prose or
+markdown fences. One left-to-right scan, aware of brackets and strings,
+yields the balanced top-level spans. Brackets not followed by anything
+JSON-like ("[see below]", "{ and") are prose and are stepped over, so a
+quote after them cannot throw the string tracking out of step.
+Each span is handed to `json.JSONDecoder.raw_decode`. The spans do not
+overlap, so the total work is linear in the length of the reply, with no
+regex backtracking and no repeated slicing and re-parsing.
+
+`TopLevelFieldParser` handles streamed output. LLM output arrives a few tokens
+at a time; `feed()` takes each text delta and returns the `(key, value)` pairs
+of the outer object that have become complete. They can then be forwarded to
+the client before the rest of the object has been generated. Any prose or
+markdown fence before the opening brace is skipped. A value that is still
+arriving is scanned once, delta by delta, for the string or bracket that closes
+it; only then is it decoded, so a long streamed field costs linear time.
+"""
+import json
+import re
+
+_WHITESPACE = ' \t\r\n'
+_OPEN_RE = re.compile(r'[{\[]')
+# A complete JSON string (unrolled so it cannot backtrack) or a single bracket
+_TOKEN_RE = re.compile(r'"[^"\\]*(?:\\.[^"\\]*)*"|[{}\[\]]')
+_CLOSERS = {'{': '}', '[': ']'}
+# Does the text right after an opening bracket look like JSON content?
+_JSON_CONTENT_RE = re.compile(r'\s*(?:["{\[\]}\d-]|true\b|false\b|null\b)')
+
+# What can end the scan inside a string, and outside one
+_STRING_STOP_RE = re.compile(r'["\\]')
+_STRUCTURE_RE = re.compile(r'["{}\[\]]')
+
+_decoder = json.JSONDecoder()
+
+
+def iter_json_spans(text, pos=0):
+    """
+    Yields (start, end) for each balanced top-level {...} or [...] span.
+    Brackets inside JSON strings are ignored; quotes outside any bracket are prose.
+    If the text ends inside an unclosed bracket that is prose (e.g. "[see below"),
+    the complete spans nested directly in it are yielded instead. Brackets that
+    look like truncated JSON are not mined for fragments.
+    """
+    while True:
+        match = _OPEN_RE.search(text, pos)
+        if match is None:
+            return
+        if not _JSON_CONTENT_RE.match(text, match.end()):
+            pos = match.end()
+            continue
+        # Each frame: [expected closer, start, complete child spans]
+        stack = [[_CLOSERS[match.group()], match.start(), []]]
+        for token in _TOKEN_RE.finditer(text, match.end()):
+            value = token.group()
+            if value[0] == '"':
+                continue
+            if value in _CLOSERS:
+                stack.append([_CLOSERS[value], token.start(), []])
+                continue
+            closer, start, _ = stack.pop()
+            if value != closer:
+                # Mismatched closer: this span is not JSON, resume after it
+                pos = token.end()
+                break
+            if not stack:
+                yield start, token.end()
+                pos = token.end()
+                break
+            stack[-1][2].append((start, token.end()))
+        else:
+            yield from sorted(span for frame in stack for span in frame[2]
+                              if not _JSON_CONTENT_RE.match(text, frame[1] + 1))
+            return
+
+
+def extract_json_value(text):
+    """
+    Returns the first top-level JSON object in `text` that parses, else the
+    first top-level array that does (so "see [1] for {...}" gives the object), or None.
+    """
+    if not text:
+        return None
+    first = _OPEN_RE.search(text)
+    if first is None:
+        return None
+    # Fast path: the reply is (or starts with) the JSON object itself.
+    # RecursionError: absurdly deep nesting is treated as "not JSON"
+    try:
+        value = _decoder.raw_decode(text, first.start())[0]
+        if isinstance(value, dict):
+            return value
+    except (json.JSONDecodeError, RecursionError):
+        pass
+    first_array = None
+    for start, end in iter_json_spans(text, first.start()):
+        try:
+            value, value_end = _decoder.raw_decode(text, start)
+        except (json.JSONDecodeError, RecursionError):
+            continue
+        if value_end != end:
+            continue
+        if isinstance(value, dict):
+            return value
+        if first_array is None:
+            first_array = value
+    return first_array
+
+
+# Characters that prove a bare number or literal has ended
+_VALUE_TERMINATORS = ',}' + _WHITESPACE
+
+
+class TopLevelFieldParser:
+    def __init__(self):
+        self._decoder = json.JSONDecoder()
+        self._buffer = ''
+        self._pos = 0
+        self._started = False
+        # (key, value offset) of the field being streamed, once its key has arrived
+        self._pending = None
+        # Incremental scan of that value: how far it has been scanned,
+        # bracket depth and whether the scan is inside a string
+        self._scan_pos = 0
+        self._depth = 0
+        self._in_string = False
+        self.finished = False
+        self.fields = {}
+
+    def feed(self, text):
+        """Appends a text delta and returns the newly completed top-level fields."""
+        if self.finished or not text:
+            return []
+        self._buffer += text
+        completed = []
+        while True:
+            field = self._next_field()
+            if field is None:
+                break
+            completed.append(field)
+            self.fields[field[0]] = field[1]
+        return completed
+
+    def _skip(self, chars):
+        while self._pos < len(self._buffer) and self._buffer[self._pos] in chars:
+            self._pos += 1
+
+    def _next_field(self):
+        if not self._started:
+            brace = self._buffer.find('{', self._pos)
+            if brace == -1:
+                self._pos = len(self._buffer)
+                return None
+            self._pos = brace + 1
+            self._started = True
+
+        if self._pending is None:
+            self._pending = self._next_key()
+            if self._pending is None:
+                return None
+            self._scan_pos = self._pending[1]
+            self._depth = 0
+            self._in_string = False
+        key, value_start = self._pending
+
+        if self._buffer[value_start] in '{["':
+            if self._scan_value() is None:
+                return None  # value not complete yet
+            try:
+                value, value_end = self._decoder.raw_decode(self._buffer, value_start)
+            except (json.JSONDecodeError, RecursionError):
+                # Balanced but not JSON: leave it to the final full parse
+                self.finished = True
+                return None
+        else:
+            try:
+                value, value_end = self._decoder.raw_decode(self._buffer, value_start)
+            except json.JSONDecodeError:
+                return None  # value not complete yet
+            # A number or literal at the very end of the buffer may still be growing ("8" -> "85")
+            if value_end >= len(self._buffer) or self._buffer[value_end] not in _VALUE_TERMINATORS:
+                return None
+
+        self._pos = value_end
+        self._pending = None
+        return key, value
+
+    def _next_key(self):
+        """Returns (key, offset of its value) once both have arrived, else None."""
+        self._skip(_WHITESPACE + ',')
+        if self._pos >= len(self._buffer):
+            return None
+        if self._buffer[self._pos] == '}':
+            self.finished = True
+            return None
+        if self._buffer[self._pos] != '"':
+            # Not a key: the stream is malformed, leave it to the final full parse
+            self.finished = True
+            return None
+
+        try:
+            key, after_key = self._decoder.raw_decode(self._buffer, self._pos)
+        except json.JSONDecodeError:
+            return None  # key string not complete yet
+
+        colon = after_key
+        while colon < len(self._buffer) and self._buffer[colon] in _WHITESPACE:
+            colon += 1
+        if colon >= len(self._buffer):
+            return None
+        if self._buffer[colon] != ':':
+            self.finished = True
+            return None
+        value_start = colon + 1
+        while value_start < len(self._buffer) and self._buffer[value_start] in _WHITESPACE:
+            value_start += 1
+        if value_start >= len(self._buffer):
+            return None
+        return key, value_start
+
+    def _scan_value(self):
+        """
+        Scans the pending string, object or array value from where the last call stopped.
+        Returns the offset just past its closing character, or None while it is still open.
+        """
+        buffer = self._buffer
+        pos = self._scan_pos
+        while True:
+            if self._in_string:
+                match = _STRING_STOP_RE.search(buffer, pos)
+                if match is None:
+                    pos = len(buffer)
+                    break
+                if match.group() == '\\':
+                    if match.end() >= len(buffer):
+                        pos = match.start()  # the escaped character has not arrived
+                        break
+                    pos = match.end() + 1
+                    continue
+                self._in_string = False
+                pos = match.end()
+                if self._depth == 0:
+                    return pos
+                continue
+            match = _STRUCTURE_RE.search(buffer, pos)
+            if match is None:
+                pos = len(buffer)
+                break
+            pos = match.end()
+            char = match.group()
+            if char == '"':
+                self._in_string = True
+            elif char in '{[':
+                self._depth += 1
+            else:
+                self._depth -= 1
+                if self._depth == 0:
+                    return pos
+        self._scan_pos = pos
+        return None
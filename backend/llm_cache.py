@@ -0,0 +1,164 @@
+"""
+Response cache for Groq calls.
+
+Keys are a SHA-256 over model, system prompt, user prompt and sampling
+parameters, so only byte-identical requests share an entry. Entries live in an
+in-memory LRU (bounded by count and bytes) with an optional SQLite tier
+(LLM_CACHE_DB) that survives restarts and is shared between workers. Every
+entry carries the TTL of the task that produced it.
+"""
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+LLM_CACHE_ENABLED = os.getenv('LLM_CACHE_ENABLED', '1') not in ('0', 'false', 'False')
+LLM_CACHE_MAX_ENTRIES = int(os.getenv('LLM_CACHE_MAX_ENTRIES', '5000'))
+LLM_CACHE_MAX_BYTES = int(os.getenv('LLM_CACHE_MAX_BYTES', str(64 * 1024 * 1024)))
+# Leave empty to keep the cache in memory only
+LLM_CACHE_DB = os.getenv('LLM_CACHE_DB', '')
+
+log = logging.getLogger('hr_ai.groq')
+
+# Seconds a cached response stays valid, per task. 0 disables caching for that task.
+TASK_TTLS = {
+    'resume': 24 * 60 * 60,
+    'questions': 60 * 60,
+    'evaluation': 6 * 60 * 60,
+    'batch_evaluation': 6 * 60 * 60,
+    'code_evaluation': 6 * 60 * 60,
+    'assessment': 10 * 60,
+    'default': 10 * 60,
+}
+
+
+def make_cache_key(model, system_prompt, prompt, params):
+    payload = json.dumps([model, system_prompt, prompt, params], sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class LLMResponseCache:
+    def __init__(self, enabled=LLM_CACHE_ENABLED, max_entries=LLM_CACHE_MAX_ENTRIES,
+                 max_bytes=LLM_CACHE_MAX_BYTES, db_path=LLM_CACHE_DB, task_ttls=None):
+        self.enabled = enabled
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.db_path = db_path or None
+        self.task_ttls = dict(TASK_TTLS, **(task_ttls or {}))
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        # key -> (value, expires_at), least recently used first
+        self._entries = OrderedDict()
+        self._total_bytes = 0
+        self._counters = {'hits': 0, 'disk_hits': 0, 'misses': 0, 'stores': 0, 'expired': 0, 'evictions': 0, 'bypassed': 0}
+        if self.db_path:
+            self._db().execute(
+                'CREATE TABLE IF NOT EXISTS llm_cache (key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)'
+            )
+
+    def ttl_for(self, task):
+        return self.task_ttls.get(task, self.task_ttls['default'])
+
+    def is_active(self, task):
+        return self.enabled and self.ttl_for(task) > 0
+
+    def get(self, key):
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at > now:
+                    self._entries.move_to_end(key)
+                    self._counters['hits'] += 1
+                    return value
+                self._remove(key)
+                self._counters['expired'] += 1
+
+        row = self._disk_get(key, now)
+        with self._lock:
+            if row is None:
+                self._counters['misses'] += 1
+                return None
+            self._counters['hits'] += 1
+            self._counters['disk_hits'] += 1
+            self._put_memory(key, row[0], row[1])
+        return row[0]
+
+    def put(self, key, value, task):
+        ttl = self.ttl_for(task)
+        if ttl <= 0:
+            return
+        expires_at = time.time() + ttl
+        with self._lock:
+            self._counters['stores'] += 1
+            self._put_memory(key, value, expires_at)
+            prune_disk = self._counters['stores'] % 100 == 0
+        if self.db_path:
+            try:
+                self._db().execute(
+                    'INSERT OR REPLACE INTO llm_cache (key, value, expires_at) VALUES (?, ?, ?)',
+                    (key, value, expires_at)
+                )
+                if prune_disk:
+                    self._db().execute('DELETE FROM llm_cache WHERE expires_at <= ?', (time.time(),))
+            except sqlite3.Error as e:
+                log.warning("Failed to write LLM cache entry to disk: %s", e)
+
+    def record_bypass(self):
+        with self._lock:
+            self._counters['bypassed'] += 1
+
+    def stats(self):
+        with self._lock:
+            lookups = self._counters['hits'] + self._counters['misses']
+            return {
+                'enabled': self.enabled,
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'bytes': self._total_bytes,
+                'max_bytes': self.max_bytes,
+                'disk_enabled': bool(self.db_path),
+                'hit_ratio': round(self._counters['hits'] / lookups, 4) if lookups else 0.0,
+                **self._counters,
+            }
+
+    def _db(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=10, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            self._local.conn = conn
+        return conn
+
+    def _disk_get(self, key, now):
+        if not self.db_path:
+            return None
+        try:
+            row = self._db().execute('SELECT value, expires_at FROM llm_cache WHERE key = ?', (key,)).fetchone()
+            if row is not None and row[1] <= now:
+                self._db().execute('DELETE FROM llm_cache WHERE key = ?', (key,))
+                return None
+            return row
+        except sqlite3.Error as e:
+            log.warning("Failed to read LLM cache entry from disk: %s", e)
+            return None
+
+    def _remove(self, key):
+        value, _ = self._entries.pop(key)
+        self._total_bytes -= len(value)
+
+    def _put_memory(self, key, value, expires_at):
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = (value, expires_at)
+        self._total_bytes += len(value)
+        while len(self._entries) > self.max_entries or self._total_bytes > self.max_bytes:
+            if len(self._entries) == 1:
+                break
+            self._remove(next(iter(self._entries)))
+            self._counters['evictions'] += 1
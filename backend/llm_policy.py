@@ -0,0 +1,258 @@
+"""
+Retry, hedging and fallback-model policy for LLM calls.
+
+A call is made in rounds. In each round the primary model is asked first;
+while it has not answered:
+- after the hedge delay (the GROQ_HEDGE_QUANTILE of recent primary latencies
+  for the task, at least GROQ_HEDGE_MIN_DELAY), one duplicate request is sent
+  if hedging is on (GROQ_HEDGE_ENABLED);
+- after GROQ_LATENCY_SLO seconds, the same prompt goes to GROQ_FALLBACK_MODEL.
+The first successful answer wins, and the others finish in the background and
+are discarded. If every attempt in a round fails with a retryable error, the
+next round starts after a jittered exponential backoff, up to
+GROQ_RETRY_ATTEMPTS rounds. Any other error is raised at once.
+
+call_async() runs the same policy on an event loop for senders that are
+coroutine functions; attempts are tasks rather than pool threads, and the
+losing attempts are cancelled as soon as one answers.
+
+Each attempt is reported to `on_attempt(task, kind, model, outcome, seconds)`,
+where kind is primary, retry, hedge or fallback and outcome is ok, error,
+skipped, discarded (a losing thread attempt that finished) or cancelled (a
+losing async attempt). The sender may raise AttemptSkipped to decline an extra
+attempt, e.g. when there is no rate-limit headroom for it.
+"""
+import asyncio
+import logging
+import os
+import random
+import threading
+import time
+from collections import deque, namedtuple
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+GROQ_RETRY_ATTEMPTS = int(os.getenv('GROQ_RETRY_ATTEMPTS', '3'))
+GROQ_RETRY_BASE_DELAY = float(os.getenv('GROQ_RETRY_BASE_DELAY', '0.5'))
+GROQ_RETRY_MAX_DELAY = float(os.getenv('GROQ_RETRY_MAX_DELAY', '8'))
+GROQ_HEDGE_ENABLED = os.getenv('GROQ_HEDGE_ENABLED', '0') not in ('0', 'false', 'False')
+GROQ_HEDGE_QUANTILE = float(os.getenv('GROQ_HEDGE_QUANTILE', '0.95'))
+GROQ_HEDGE_MIN_DELAY = float(os.getenv('GROQ_HEDGE_MIN_DELAY', '1'))
+GROQ_FALLBACK_MODEL = os.getenv('GROQ_FALLBACK_MODEL', 'llama-3.1-8b-instant')
+# Seconds the primary model may take before the fallback model is asked too; 0 disables the fallback
+GROQ_LATENCY_SLO = float(os.getenv('GROQ_LATENCY_SLO', '20'))
+GROQ_POLICY_WORKERS = int(os.getenv('GROQ_POLICY_WORKERS', '32'))
+
+# Latency samples kept per task, and how many are needed before hedging starts
+LATENCY_WINDOW = 200
+MIN_HEDGE_SAMPLES = 20
+
+log = logging.getLogger('hr_ai.groq')
+
+PolicyResult = namedtuple('PolicyResult', ['value', 'model', 'kind', 'attempts'])
+
+
+class AttemptSkipped(Exception):
+    """Raised by a sender that declines to make an extra (hedge or fallback) attempt."""
+
+
+def backoff_delay(round_number, base=GROQ_RETRY_BASE_DELAY, cap=GROQ_RETRY_MAX_DELAY):
+    """Full-jitter exponential backoff before retry round `round_number` (1-based)."""
+    return random.uniform(0, min(cap, base * 2 ** (round_number - 1)))
+
+
+class LLMCallPolicy:
+    def __init__(self, primary_model, fallback_model=GROQ_FALLBACK_MODEL, max_attempts=GROQ_RETRY_ATTEMPTS,
+                 hedge_enabled=GROQ_HEDGE_ENABLED, hedge_quantile=GROQ_HEDGE_QUANTILE,
+                 hedge_min_delay=GROQ_HEDGE_MIN_DELAY, latency_slo=GROQ_LATENCY_SLO, on_attempt=None,
+                 max_workers=GROQ_POLICY_WORKERS):
+        self.primary_model = primary_model
+        self.fallback_model = fallback_model
+        self.max_attempts = max(1, max_attempts)
+        self.hedge_enabled = hedge_enabled
+        self.hedge_quantile = hedge_quantile
+        self.hedge_min_delay = hedge_min_delay
+        self.latency_slo = latency_slo
+        self.on_attempt = on_attempt
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='llm-attempt')
+        self._lock = threading.Lock()
+        self._latencies = {}
+        # The event loop only holds weak references to tasks; cancelled attempts are kept here until they unwind
+        self._background = set()
+
+    def hedge_delay(self, task):
+        """Seconds before a hedge is sent for `task`, or None while there are too few samples."""
+        with self._lock:
+            samples = sorted(self._latencies.get(task, ()))
+        if len(samples) < MIN_HEDGE_SAMPLES:
+            return None
+        index = min(len(samples) - 1, int(self.hedge_quantile * len(samples)))
+        return max(self.hedge_min_delay, samples[index])
+
+    def _record_latency(self, task, seconds):
+        with self._lock:
+            self._latencies.setdefault(task, deque(maxlen=LATENCY_WINDOW)).append(seconds)
+
+    def _report(self, task, kind, model, outcome, seconds):
+        if kind != 'fallback' and outcome in ('ok', 'discarded'):
+            self._record_latency(task, seconds)
+        if self.on_attempt is not None:
+            try:
+                self.on_attempt(task, kind, model, outcome, seconds)
+            except Exception as e:
+                log.debug("Attempt reporter failed: %s", e)
+
+    def call(self, send, task='default', model=None, is_retryable=lambda error: False, hedge=True, fallback=True):
+        """
+        Runs send(model, kind) under the policy and returns a PolicyResult.
+        `model` overrides the primary model for this call. `hedge` and
+        `fallback` can be turned off for calls that must not be duplicated,
+        such as streams. The last error is raised when all rounds fail.
+        """
+        model = model or self.primary_model
+        attempts = 0
+        for round_number in range(self.max_attempts):
+            if round_number:
+                delay = backoff_delay(round_number)
+                log.warning("Groq call for task %s failed (%s), retrying in %.2fs", task, last_error, delay)
+                time.sleep(delay)
+            try:
+                value, answered_by, kind, launched = self._race(send, task, model, 'retry' if round_number else 'primary', hedge, fallback)
+                return PolicyResult(value, answered_by, kind, attempts + launched)
+            except Exception as e:
+                attempts += getattr(e, 'policy_attempts', 1)
+                if not is_retryable(e) or round_number == self.max_attempts - 1:
+                    raise
+                last_error = e
+
+    def _race(self, send, task, primary_model, first_kind, hedge, fallback):
+        started = time.monotonic()
+        pending = {}
+
+        def launch(kind, model):
+            pending[self._executor.submit(send, model, kind)] = (kind, model, time.monotonic())
+
+        launch(first_kind, primary_model)
+        hedge_delay = self.hedge_delay(task) if hedge and self.hedge_enabled else None
+        hedge_at = started + hedge_delay if hedge_delay is not None else None
+        # A task already routed to the fallback model has nothing to fall back to
+        fallback = fallback and self.fallback_model and self.fallback_model != primary_model and self.latency_slo > 0
+        fallback_at = started + self.latency_slo if fallback else None
+        launched = 1
+        errors = []
+
+        while pending:
+            deadlines = [t for t in (hedge_at, fallback_at) if t is not None]
+            timeout = max(0.0, min(deadlines) - time.monotonic()) if deadlines else None
+            done, _ = wait(list(pending), timeout=timeout, return_when=FIRST_COMPLETED)
+            for future in done:
+                kind, model, attempt_started = pending.pop(future)
+                elapsed = time.monotonic() - attempt_started
+                try:
+                    value = future.result()
+                except AttemptSkipped:
+                    self._report(task, kind, model, 'skipped', elapsed)
+                    continue
+                except Exception as e:
+                    self._report(task, kind, model, 'error', elapsed)
+                    errors.append(e)
+                    continue
+                self._report(task, kind, model, 'ok', elapsed)
+                for other, (other_kind, other_model, other_started) in pending.items():
+                    other.add_done_callback(lambda f, k=other_kind, m=other_model, s=other_started:
+                                            self._report(task, k, m, 'error' if f.exception() else 'discarded',
+                                                         time.monotonic() - s))
+                if kind == 'fallback':
+                    log.warning("Groq task %s answered by fallback model %s after the %ss SLO", task, model, self.latency_slo)
+                return value, model, kind, launched
+
+            now = time.monotonic()
+            if hedge_at is not None and now >= hedge_at:
+                hedge_at = None
+                launch('hedge', primary_model)
+                launched += 1
+            if fallback_at is not None and now >= fallback_at:
+                fallback_at = None
+                launch('fallback', self.fallback_model)
+                launched += 1
+
+        error = errors[-1] if errors else AttemptSkipped('No attempt could be made')
+        error.policy_attempts = launched
+        raise error
+
+    async def call_async(self, send, task='default', model=None, is_retryable=lambda error: False, hedge=True, fallback=True):
+        """Coroutine counterpart of call(): awaits send(model, kind), a coroutine function, under the same policy."""
+        model = model or self.primary_model
+        attempts = 0
+        for round_number in range(self.max_attempts):
+            if round_number:
+                delay = backoff_delay(round_number)
+                log.warning("Groq call for task %s failed (%s), retrying in %.2fs", task, last_error, delay)
+                await asyncio.sleep(delay)
+            try:
+                value, answered_by, kind, launched = await self._race_async(send, task, model, 'retry' if round_number else 'primary', hedge, fallback)
+                return PolicyResult(value, answered_by, kind, attempts + launched)
+            except Exception as e:
+                attempts += getattr(e, 'policy_attempts', 1)
+                if not is_retryable(e) or round_number == self.max_attempts - 1:
+                    raise
+                last_error = e
+
+    async def _race_async(self, send, task, primary_model, first_kind, hedge, fallback):
+        started = time.monotonic()
+        pending = {}
+
+        def launch(kind, model):
+            pending[asyncio.ensure_future(send(model, kind))] = (kind, model, time.monotonic())
+
+        launch(first_kind, primary_model)
+        hedge_delay = self.hedge_delay(task) if hedge and self.hedge_enabled else None
+        hedge_at = started + hedge_delay if hedge_delay is not None else None
+        fallback = fallback and self.fallback_model and self.fallback_model != primary_model and self.latency_slo > 0
+        fallback_at = started + self.latency_slo if fallback else None
+        launched = 1
+        errors = []
+
+        try:
+            while pending:
+                deadlines = [t for t in (hedge_at, fallback_at) if t is not None]
+                timeout = max(0.0, min(deadlines) - time.monotonic()) if deadlines else None
+                done, _ = await asyncio.wait(list(pending), timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                for future in done:
+                    kind, model, attempt_started = pending.pop(future)
+                    elapsed = time.monotonic() - attempt_started
+                    try:
+                        value = future.result()
+                    except AttemptSkipped:
+                        self._report(task, kind, model, 'skipped', elapsed)
+                        continue
+                    except Exception as e:
+                        self._report(task, kind, model, 'error', elapsed)
+                        errors.append(e)
+                        continue
+                    self._report(task, kind, model, 'ok', elapsed)
+                    # Losing attempts are cancelled below; their partial latency says nothing about the model
+                    for other_kind, other_model, other_started in pending.values():
+                        self._report(task, other_kind, other_model, 'cancelled', time.monotonic() - other_started)
+                    if kind == 'fallback':
+                        log.warning("Groq task %s answered by fallback model %s after the %ss SLO", task, model, self.latency_slo)
+                    return value, model, kind, launched
+
+                now = time.monotonic()
+                if hedge_at is not None and now >= hedge_at:
+                    hedge_at = None
+                    launch('hedge', primary_model)
+                    launched += 1
+                if fallback_at is not None and now >= fallback_at:
+                    fallback_at = None
+                    launch('fallback', self.fallback_model)
+                    launched += 1
+        finally:
+            # Either an attempt won or the caller went away (e.g. the client disconnected): nobody is waiting for these
+            for future in pending:
+                future.cancel()
+                self._background.add(future)
+                future.add_done_callback(self._background.discard)
+
+        error = errors[-1] if errors else AttemptSkipped('No attempt could be made')
+        error.policy_attempts = launched
+        raise error
@@ -0,0 +1,68 @@
+"""
+Per-task model routing and output sizing for Groq calls.
+
+Every call site names its task, and the task selects the model, the
+completion cap (max_tokens), the temperature and the request timeout. Tasks
+with small, fixed-shape outputs, such as answer scoring, go to a smaller and
+faster model with a tight cap. Tasks whose output quality drives the result,
+such as question generation and the assessment, stay on the large model.
+Each setting can be overridden per task with GROQ_MODEL_<TASK>,
+GROQ_MAX_TOKENS_<TASK>, GROQ_TEMPERATURE_<TASK> and GROQ_TIMEOUT_<TASK>
+(e.g. GROQ_MODEL_EVALUATION=llama-3.3-70b-versatile).
+
+BASELINE is the configuration every call used before tasks were routed, and
+it still applies to unnamed ('default') calls.
+"""
+import os
+from collections import namedtuple
+
+GROQ_MODEL = os.getenv('GROQ_MODEL', 'llama-3.3-70b-versatile')
+GROQ_SMALL_MODEL = os.getenv('GROQ_SMALL_MODEL', 'llama-3.1-8b-instant')
+
+TaskConfig = namedtuple('TaskConfig', ['model', 'max_tokens', 'temperature', 'timeout'])
+
+BASELINE = TaskConfig(GROQ_MODEL, 4096, 0.7, 60.0)
+
+DEFAULT_TASKS = {
+    # Five short profile fields
+    'resume': TaskConfig(GROQ_MODEL, 800, 0.2, 30.0),
+    # 15-17 questions with tags
+    'questions': TaskConfig(GROQ_MODEL, 3000, 0.7, 60.0),
+    # Three scores and a sentence of feedback
+    'evaluation': TaskConfig(GROQ_SMALL_MODEL, 300, 0.2, 15.0),
+    # The same per answer, for up to BATCH_SCORING_MAX_ANSWERS answers
+    'batch_evaluation': TaskConfig(GROQ_SMALL_MODEL, 2000, 0.2, 30.0),
+    'code_evaluation': TaskConfig(GROQ_MODEL, 400, 0.2, 30.0),
+    # Scores plus short strength and improvement lists; the question analysis is filled in by the server
+    'assessment': TaskConfig(GROQ_MODEL, 1200, 0.5, 60.0),
+    'default': BASELINE,
+}
+
+
+def _override(task, name, default, cast):
+    value = os.getenv(f'GROQ_{name}_{task.upper()}')
+    return cast(value) if value else default
+
+
+def load_tasks():
+    return {
+        task: TaskConfig(
+            _override(task, 'MODEL', config.model, str),
+            _override(task, 'MAX_TOKENS', config.max_tokens, int),
+            _override(task, 'TEMPERATURE', config.temperature, float),
+            _override(task, 'TIMEOUT', config.timeout, float),
+        )
+        for task, config in DEFAULT_TASKS.items()
+    }
+
+
+TASKS = load_tasks()
+
+
+def task_config(task):
+    return TASKS.get(task, TASKS['default'])
+
+
+def sampling_params(config):
+    """The request parameters that shape the output; they are also part of the LLM cache key."""
+    return {'temperature': config.temperature, 'max_tokens': config.max_tokens, 'top_p': 1}
@@ -0,0 +1,289 @@
+"""
+Bounded PDF text extraction engine.
+
+Pages are read lazily and extraction stops as soon as the page or character
+budget is reached, since everything past the budget would be cut from the
+prompt anyway. Extractions run in a pool of long-lived worker processes
+(this file, started with `--worker`). Each worker caps its own address space,
+and a worker that misses the wall-clock timeout is killed together with any
+`pdftotext` child and replaced, so a huge or malformed PDF cannot pin a web
+worker.
+
+Two backends are available:
+
+- `pypdf2`: pure Python, always available.
+- `pdftotext`: poppler-utils CLI, usually much faster; used when installed.
+
+`PDF_BACKEND=auto` prefers `pdftotext` and falls back to `pypdf2`.
+"""
+import io
+import json
+import logging
+import os
+import queue
+import shutil
+import signal
+import subprocess
+import sys
+import threading
+import time
+from collections import namedtuple
+
+try:
+    import resource
+except ImportError:  # Windows: no rlimits, timeouts still apply
+    resource = None
+
+PDF_BACKEND = os.getenv('PDF_BACKEND', 'auto')
+PDF_MAX_PAGES = int(os.getenv('PDF_MAX_PAGES', '30'))
+PDF_MAX_CHARS = int(os.getenv('PDF_MAX_CHARS', '20000'))
+PDF_EXTRACT_TIMEOUT = float(os.getenv('PDF_EXTRACT_TIMEOUT', '10'))
+PDF_EXTRACT_MEMORY_MB = int(os.getenv('PDF_EXTRACT_MEMORY_MB', '512'))
+PDF_EXTRACT_WORKERS = int(os.getenv('PDF_EXTRACT_WORKERS', '4'))
+# Workers are recycled after this many jobs to bound fragmentation and leaks
+PDF_WORKER_MAX_JOBS = int(os.getenv('PDF_WORKER_MAX_JOBS', '200'))
+
+log = logging.getLogger('hr_ai.pdf')
+
+PdfExtraction = namedtuple('PdfExtraction', ['text', 'pages', 'backend', 'truncated', 'elapsed_ms'])
+
+
+class PdfExtractionError(Exception):
+    pass
+
+
+def iter_pages_pypdf2(pdf_bytes):
+    """Yields the text of each page, parsing pages only as they are requested."""
+    from PyPDF2 import PdfReader
+
+    reader = PdfReader(io.BytesIO(pdf_bytes))
+    for page in reader.pages:
+        yield page.extract_text() or ""
+
+
+def iter_pages_pdftotext(pdf_bytes, max_pages, pdftotext_path='pdftotext'):
+    """
+    Yields page texts from pdftotext as its output streams in, so the process
+    can be stopped as soon as the caller has enough text.
+    """
+    proc = subprocess.Popen(
+        [pdftotext_path, '-q', '-enc', 'UTF-8', '-f', '1', '-l', str(max_pages), '-', '-'],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+    )
+    # Feed stdin from a thread so a large PDF cannot deadlock against a full stdout pipe
+    def feed():
+        try:
+            proc.stdin.write(pdf_bytes)
+            proc.stdin.close()
+        except OSError:
+            pass
+    threading.Thread(target=feed, daemon=True).start()
+
+    pending = b""
+    try:
+        while True:
+            chunk = proc.stdout.read1(65536)
+            if not chunk:
+                break
+            pending += chunk
+            # pdftotext terminates every page with a form feed
+            *pages, pending = pending.split(b'\f')
+            for page in pages:
+                yield page.decode('utf-8', errors='replace')
+        if pending.strip():
+            yield pending.decode('utf-8', errors='replace')
+    finally:
+        if proc.poll() is None:
+            proc.kill()
+        returncode = proc.wait()
+        proc.stdout.close()
+    # Only reached when the output was fully consumed, so the process exited on its own
+    if returncode != 0:
+        raise PdfExtractionError(f'pdftotext exited with status {returncode}')
+
+
+def collect_pages(pages, max_pages=PDF_MAX_PAGES, max_chars=PDF_MAX_CHARS):
+    """
+    Joins page texts until either budget is reached.
+    Returns (text, pages_read, truncated).
+    """
+    parts = []
+    total_chars = 0
+    pages_read = 0
+    truncated = False
+    for page_text in pages:
+        if pages_read >= max_pages:
+            truncated = True
+            break
+        pages_read += 1
+        remaining = max_chars - total_chars
+        if len(page_text) >= remaining:
+            parts.append(page_text[:remaining])
+            truncated = len(page_text) > remaining
+            break
+        parts.append(page_text)
+        total_chars += len(page_text)
+    if hasattr(pages, 'close'):
+        # Stops a streaming backend early instead of letting it finish the document
+        pages.close()
+    return "".join(parts), pages_read, truncated
+
+
+class _Worker:
+    """One long-lived extraction process speaking line-delimited JSON over stdin/stdout."""
+
+    def __init__(self, memory_mb):
+        self.jobs = 0
+        self.proc = subprocess.Popen(
+            [sys.executable, os.path.abspath(__file__), '--worker', str(memory_mb)],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            # Own process group so a pdftotext grandchild dies with its worker
+            start_new_session=(os.name == 'posix'),
+        )
+        self._replies = queue.Queue()
+        threading.Thread(target=self._read_replies, daemon=True).start()
+
+    def _read_replies(self):
+        for line in self.proc.stdout:
+            self._replies.put(line)
+        self._replies.put(None)
+
+    def run(self, job, pdf_bytes, timeout):
+        self.jobs += 1
+        header = json.dumps(dict(job, size=len(pdf_bytes))).encode('utf-8') + b'\n'
+        try:
+            self.proc.stdin.write(header + pdf_bytes)
+            self.proc.stdin.flush()
+            line = self._replies.get(timeout=timeout)
+        except queue.Empty:
+            raise PdfExtractionError(f"{job['backend']} extraction timed out after {timeout}s")
+        except OSError as e:
+            raise PdfExtractionError(f'Extraction worker is unavailable: {e}')
+        if line is None:
+            raise PdfExtractionError('Extraction worker exited without a result (likely killed by the memory cap)')
+        return json.loads(line)
+
+    def kill(self):
+        try:
+            if os.name == 'posix':
+                os.killpg(self.proc.pid, signal.SIGKILL)
+            else:
+                self.proc.kill()
+        except OSError:
+            pass
+        self.proc.wait()
+
+
+class PdfExtractionEngine:
+    def __init__(self, backend=PDF_BACKEND, max_pages=PDF_MAX_PAGES, max_chars=PDF_MAX_CHARS,
+                 timeout=PDF_EXTRACT_TIMEOUT, memory_mb=PDF_EXTRACT_MEMORY_MB, workers=PDF_EXTRACT_WORKERS):
+        if backend not in ('auto', 'pypdf2', 'pdftotext'):
+            raise ValueError(f"Unknown PDF_BACKEND '{backend}'. Use 'auto', 'pypdf2' or 'pdftotext'.")
+        self.backend = backend
+        self.max_pages = max_pages
+        self.max_chars = max_chars
+        self.timeout = timeout
+        self.memory_mb = memory_mb
+        self.pdftotext_path = shutil.which('pdftotext')
+        # Worker processes are started lazily and reused; the semaphore bounds how many exist
+        self._slots = threading.BoundedSemaphore(workers)
+        self._idle = queue.LifoQueue()
+
+    def backends(self):
+        """Backends to try, in order, for the configured mode."""
+        if self.backend == 'pypdf2':
+            return ['pypdf2']
+        if self.backend == 'pdftotext':
+            return ['pdftotext']
+        return ['pdftotext', 'pypdf2'] if self.pdftotext_path else ['pypdf2']
+
+    def extract(self, pdf_bytes, backend=None):
+        """Extracts budgeted text, falling back to the next backend on failure."""
+        last_error = None
+        for name in ([backend] if backend else self.backends()):
+            started = time.perf_counter()
+            try:
+                text, pages, truncated = self._run(name, pdf_bytes)
+            except PdfExtractionError as e:
+                last_error = e
+                log.warning("PDF extraction with %s failed: %s", name, e)
+                continue
+            if not text.strip() and name != 'pypdf2' and not backend:
+                # pdftotext occasionally yields nothing where PyPDF2 succeeds
+                continue
+            elapsed_ms = round((time.perf_counter() - started) * 1000, 1)
+            return PdfExtraction(text, pages, name, truncated, elapsed_ms)
+        raise last_error or PdfExtractionError('No text could be extracted')
+
+    def _run(self, name, pdf_bytes):
+        if name == 'pdftotext' and not self.pdftotext_path:
+            raise PdfExtractionError('pdftotext is not installed')
+        job = {
+            'backend': name,
+            'max_pages': self.max_pages,
+            'max_chars': self.max_chars,
+            'pdftotext_path': self.pdftotext_path,
+        }
+        with self._slots:
+            try:
+                worker = self._idle.get_nowait()
+            except queue.Empty:
+                worker = _Worker(self.memory_mb)
+            try:
+                reply = worker.run(job, pdf_bytes, self.timeout)
+            except PdfExtractionError:
+                worker.kill()
+                raise
+            if worker.jobs >= PDF_WORKER_MAX_JOBS:
+                worker.kill()
+            else:
+                self._idle.put(worker)
+        if not reply.get('ok'):
+            raise PdfExtractionError(reply.get('error', 'Unknown extraction error'))
+        return reply['text'], reply['pages'], reply['truncated']
+
+    def close(self):
+        while True:
+            try:
+                self._idle.get_nowait().kill()
+            except queue.Empty:
+                return
+
+
+def _worker_main(memory_mb):
+    """Entry point of an extraction worker process."""
+    if resource is not None and memory_mb:
+        limit = memory_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    stdin = sys.stdin.buffer
+    stdout = sys.stdout.buffer
+    # Anything a library prints must not corrupt the reply channel
+    sys.stdout = sys.stderr
+
+    while True:
+        header = stdin.readline()
+        if not header:
+            return
+        job = json.loads(header)
+        pdf_bytes = stdin.read(job['size'])
+        try:
+            if job['backend'] == 'pdftotext':
+                pages = iter_pages_pdftotext(pdf_bytes, job['max_pages'], job['pdftotext_path'])
+            else:
+                pages = iter_pages_pypdf2(pdf_bytes)
+            text, pages_read, truncated = collect_pages(pages, job['max_pages'], job['max_chars'])
+            reply = {'ok': True, 'text': text, 'pages': pages_read, 'truncated': truncated}
+        except MemoryError:
+            reply = {'ok': False, 'error': f'PDF extraction exceeded the {memory_mb} MB memory cap'}
+        except Exception as e:
+            reply = {'ok': False, 'error': f'{type(e).__name__}: {e}'}
+        stdout.write(json.dumps(reply).encode('utf-8') + b'\n')
+        stdout.flush()
+
+
+if __name__ == '__main__' and len(sys.argv) == 3 and sys.argv[1] == '--worker':
+    _worker_main(int(sys.argv[2]))
@@ -0,0 +1,93 @@
+"""
+Token budgets for LLM prompts.
+
+Each task has a prompt budget in estimated tokens: PROMPT_MAX_TOKENS is the
+default, and PROMPT_MAX_TOKENS_<TASK> overrides it (e.g.
+PROMPT_MAX_TOKENS_ASSESSMENT=4000). The helpers here shrink the variable
+parts of a prompt to fit: the candidate profile is reduced to the fields the
+model uses and serialized without indentation, and long free-text fields
+(answers) share the remaining budget. Short texts stay whole; only the
+longest are cut, each to the same length.
+"""
+import json
+import os
+from collections import namedtuple
+
+PROMPT_MAX_TOKENS = int(os.getenv('PROMPT_MAX_TOKENS', '8000'))
+DEFAULT_TASK_BUDGETS = {'assessment': 6000}
+# No text is cut below this many characters, even if the budget is then exceeded
+MIN_TEXT_CHARS = int(os.getenv('PROMPT_MIN_TEXT_CHARS', '200'))
+CHARS_PER_TOKEN = 4
+# Room left for the "...(+N chars)" marker that truncate_text appends
+TRUNCATION_MARKER_CHARS = 20
+
+# Profile fields the assessment and question prompts rely on; contact details are left out
+PROFILE_FIELDS = ('name', 'experience', 'inferred_position', 'key_skills')
+PROFILE_MAX_SKILLS = 25
+PROFILE_MAX_FIELD_CHARS = 300
+
+FittedTexts = namedtuple('FittedTexts', ['texts', 'truncated', 'limit_chars'])
+
+
+def estimate_tokens(text):
+    """Rough token count (about four characters per token for English text)."""
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+def prompt_token_budget(task):
+    env_value = os.getenv(f'PROMPT_MAX_TOKENS_{task.upper()}')
+    if env_value:
+        return int(env_value)
+    return DEFAULT_TASK_BUDGETS.get(task, PROMPT_MAX_TOKENS)
+
+
+def truncate_text(text, limit_chars):
+    """Keeps the first `limit_chars` characters and notes how much was cut."""
+    if len(text) <= limit_chars:
+        return text
+    return f"{text[:limit_chars].rstrip()}...(+{len(text) - limit_chars} chars)"
+
+
+def compact_json(value):
+    return json.dumps(value, separators=(',', ':'), ensure_ascii=False)
+
+
+def compact_profile(profile):
+    """The profile fields used by prompts, with empty values dropped and long values capped."""
+    compacted = {}
+    for field in PROFILE_FIELDS:
+        value = (profile or {}).get(field)
+        if not value:
+            continue
+        if isinstance(value, list):
+            value = [truncate_text(str(item), PROFILE_MAX_FIELD_CHARS) for item in value[:PROFILE_MAX_SKILLS]]
+        else:
+            value = truncate_text(str(value), PROFILE_MAX_FIELD_CHARS)
+        compacted[field] = value
+    return compacted
+
+
+def fit_texts(texts, budget_tokens, min_chars=MIN_TEXT_CHARS):
+    """
+    Truncates `texts` so that together they fit `budget_tokens`. All texts
+    longer than a common character limit are cut to that limit, with the
+    limit chosen as high as the budget allows (never below `min_chars`).
+    Returns FittedTexts(texts, truncated count, limit or None if nothing was cut).
+    """
+    budget_chars = max(0, budget_tokens) * CHARS_PER_TOKEN
+    lengths = sorted(len(text) for text in texts)
+    if sum(lengths) <= budget_chars:
+        return FittedTexts(list(texts), 0, None)
+
+    # Water-filling: texts shorter than the limit keep their length, the rest share what is left
+    limit = 0
+    remaining = budget_chars
+    for i, length in enumerate(lengths):
+        share = remaining // (len(lengths) - i)
+        if length > share:
+            limit = share - TRUNCATION_MARKER_CHARS
+            break
+        remaining -= length
+    limit = max(limit, min_chars)
+    fitted = [truncate_text(text, limit) for text in texts]
+    return FittedTexts(fitted, sum(1 for text in texts if len(text) > limit), limit)
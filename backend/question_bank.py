@@ -0,0 +1,223 @@
+"""
+Pre-generated interview question bank.
+
+Questions are pooled per (normalized role, skill signature, coding flag) and
+split by category. `/setup_interview` samples a fresh randomized set from the
+pools when they are deep enough; otherwise it generates live and the result is
+fed back into the bank. A background refresher keeps every known key topped
+up to QUESTION_BANK_TARGET_SETS generated sets, so hit rates climb over time.
+"""
+import logging
+import math
+import os
+import random
+import re
+import threading
+import time
+
+QUESTION_BANK_ENABLED = os.getenv('QUESTION_BANK_ENABLED', '1') not in ('0', 'false', 'False')
+QUESTION_BANK_TARGET_SETS = int(os.getenv('QUESTION_BANK_TARGET_SETS', '3'))
+QUESTION_BANK_MAX_KEYS = int(os.getenv('QUESTION_BANK_MAX_KEYS', '500'))
+QUESTION_BANK_REFRESH_INTERVAL = float(os.getenv('QUESTION_BANK_REFRESH_INTERVAL', '60'))
+# Comma-separated roles to pre-generate at start-up, e.g. "Backend Engineer,Data Scientist"
+QUESTION_BANK_SEED_ROLES = [r.strip() for r in os.getenv('QUESTION_BANK_SEED_ROLES', '').split(',') if r.strip()]
+
+log = logging.getLogger('hr_ai.groq')
+
+# Questions per category in one interview
+QUESTION_COUNTS = {'technical': 10, 'soft': 3, 'communication': 2, 'coding': 2}
+# A pool must hold this many sets' worth of questions before it is served,
+# so consecutive candidates do not receive the same set in a different order
+MIN_POOL_DEPTH = 1.5
+# Pools never grow past this many sets' worth of questions
+MAX_POOL_SETS = 6
+# Keys whose refresh keeps failing are left alone until a live generation succeeds
+MAX_REFRESH_FAILURES = 3
+
+# Only well-known technologies go into the skill signature, so resumes that
+# list the same stack in different words and order land on the same key
+SIGNATURE_SKILLS = [
+    'python', 'java', 'javascript', 'typescript', 'c++', 'c#', 'go', 'rust', 'ruby', 'php', 'kotlin', 'swift',
+    'react', 'angular', 'vue', 'node', 'django', 'flask', 'fastapi', 'spring', '.net',
+    'sql', 'nosql', 'aws', 'azure', 'gcp', 'docker', 'kubernetes',
+    'machine learning', 'deep learning', 'data science', 'nlp', 'computer vision',
+]
+SIGNATURE_MAX_SKILLS = 4
+
+_NON_WORD_RE = re.compile(r'[^a-z0-9+#. ]+')
+_SPACE_RE = re.compile(r'\s+')
+
+
+def normalize_role(position_role):
+    text = _NON_WORD_RE.sub(' ', position_role.lower())
+    return _SPACE_RE.sub(' ', text).strip()
+
+
+def skill_signature(skills):
+    joined = ' | '.join(s.lower() for s in skills if isinstance(s, str))
+    matched = sorted(skill for skill in SIGNATURE_SKILLS if re.search(r'(?<![a-z])' + re.escape(skill) + r'(?![a-z])', joined))
+    return ','.join(matched[:SIGNATURE_MAX_SKILLS])
+
+
+def bank_key(position_role, skills, is_coding_role):
+    return (normalize_role(position_role), skill_signature(skills), bool(is_coding_role))
+
+
+def question_category(question):
+    tags = [str(t).lower() for t in question.get('tags', [])]
+    if 'coding' in tags or 'programming' in tags:
+        return 'coding'
+    if 'communication' in tags:
+        return 'communication'
+    if any(t in ('soft skills', 'soft skill', 'leadership', 'teamwork', 'behavioral') for t in tags):
+        return 'soft'
+    return 'technical'
+
+
+def required_counts(is_coding_role):
+    counts = dict(QUESTION_COUNTS)
+    if not is_coding_role:
+        counts['coding'] = 0
+    return counts
+
+
+class QuestionBank:
+    def __init__(self, generate_fn=None, enabled=QUESTION_BANK_ENABLED, target_sets=QUESTION_BANK_TARGET_SETS,
+                 max_keys=QUESTION_BANK_MAX_KEYS, refresh_interval=QUESTION_BANK_REFRESH_INTERVAL):
+        """
+        generate_fn(position_role, skills, experience, is_coding_role) must return a
+        list of question dicts (or None) and is used only by the background refresher.
+        """
+        self.generate_fn = generate_fn
+        self.enabled = enabled
+        self.target_sets = target_sets
+        self.max_keys = max_keys
+        self.refresh_interval = refresh_interval
+        self._lock = threading.Lock()
+        # key -> {'pools': {category: [question, ...]}, 'seen': set of question texts,
+        #         'sets': int, 'failures': int, 'meta': dict, 'last_used': float}
+        self._entries = {}
+        self._refresher = None
+        self._wakeup = threading.Event()
+        self._counters = {'hits': 0, 'misses': 0, 'sets_added': 0, 'refresh_runs': 0, 'refresh_failures': 0}
+
+    def sample(self, position_role, skills, is_coding_role):
+        """Returns a randomized question set from the bank, or None on a miss."""
+        if not self.enabled:
+            return None
+        key = bank_key(position_role, skills, is_coding_role)
+        counts = required_counts(is_coding_role)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or any(len(entry['pools'].get(cat, [])) < math.ceil(n * MIN_POOL_DEPTH) for cat, n in counts.items()):
+                self._counters['misses'] += 1
+                return None
+            entry['last_used'] = time.time()
+            self._counters['hits'] += 1
+            picked = {cat: random.sample(entry['pools'][cat], n) for cat, n in counts.items() if n}
+
+        # Fresh ids per interview; tags are copied so sessions never share list objects
+        questions = []
+        prefixes = {'technical': 'tech', 'soft': 'soft', 'communication': 'comm', 'coding': 'coding'}
+        for cat in ('technical', 'soft', 'communication', 'coding'):
+            for i, question in enumerate(picked.get(cat, []), start=1):
+                questions.append(dict(question, id=f"{prefixes[cat]}_{i}", tags=list(question.get('tags', []))))
+        return questions
+
+    def add(self, position_role, skills, experience, is_coding_role, questions):
+        """Feeds a generated question set into the bank and registers the key for refreshing."""
+        if not self.enabled or not questions:
+            return
+        key = bank_key(position_role, skills, is_coding_role)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                if len(self._entries) >= self.max_keys:
+                    # Drop the least recently used key to stay bounded
+                    oldest = min(self._entries, key=lambda k: self._entries[k]['last_used'])
+                    del self._entries[oldest]
+                entry = {'pools': {}, 'seen': set(), 'sets': 0, 'failures': 0, 'last_used': time.time(),
+                         'meta': {'position_role': position_role, 'skills': list(skills),
+                                  'experience': experience, 'is_coding_role': bool(is_coding_role)}}
+                self._entries[key] = entry
+            counts = required_counts(is_coding_role)
+            for question in questions:
+                text = _SPACE_RE.sub(' ', str(question.get('question', '')).strip().lower())
+                cat = question_category(question)
+                if not text or text in entry['seen'] or not counts.get(cat):
+                    continue
+                pool = entry['pools'].setdefault(cat, [])
+                if len(pool) >= counts[cat] * MAX_POOL_SETS:
+                    continue
+                entry['seen'].add(text)
+                pooled = {'question': question['question'], 'tags': list(question.get('tags', []))}
+                if question.get('tests'):
+                    pooled['tests'] = question['tests']  # verified test cases travel with coding questions
+                pool.append(pooled)
+            entry['sets'] += 1
+            entry['failures'] = 0
+            self._counters['sets_added'] += 1
+        self._ensure_refresher()
+
+    def stats(self):
+        with self._lock:
+            lookups = self._counters['hits'] + self._counters['misses']
+            return {
+                'enabled': self.enabled,
+                'keys': len(self._entries),
+                'questions': sum(len(p) for e in self._entries.values() for p in e['pools'].values()),
+                'hit_ratio': round(self._counters['hits'] / lookups, 4) if lookups else 0.0,
+                **self._counters,
+            }
+
+    def seed(self, roles, experience='a few years'):
+        """Registers roles (without a skill signature) for the refresher to pre-generate."""
+        if not self.enabled or not roles:
+            return
+        with self._lock:
+            for role in roles:
+                for is_coding_role in (True, False):
+                    key = bank_key(role, [], is_coding_role)
+                    self._entries.setdefault(key, {
+                        'pools': {}, 'seen': set(), 'sets': 0, 'failures': 0, 'last_used': time.time(),
+                        'meta': {'position_role': role, 'skills': [], 'experience': experience,
+                                 'is_coding_role': is_coding_role}})
+        self._ensure_refresher()
+
+    def _ensure_refresher(self):
+        if self.generate_fn is None or self._refresher is not None:
+            return
+        with self._lock:
+            if self._refresher is None:
+                self._refresher = threading.Thread(target=self._refresh_loop, name='question-bank-refresher', daemon=True)
+                self._refresher.start()
+
+    def _refresh_loop(self):
+        while True:
+            self.refresh_once()
+            self._wakeup.wait(self.refresh_interval)
+            self._wakeup.clear()
+
+    def refresh_once(self):
+        """Generates one more set for every key that is below the target depth."""
+        with self._lock:
+            self._counters['refresh_runs'] += 1
+            pending = [(key, dict(e['meta'])) for key, e in self._entries.items()
+                       if e['sets'] < self.target_sets and e['failures'] < MAX_REFRESH_FAILURES]
+        for key, meta in pending:
+            try:
+                questions = self.generate_fn(meta['position_role'], meta['skills'], meta['experience'], meta['is_coding_role'])
+            except Exception as e:
+                if getattr(e, 'retry_after', None) is not None:
+                    # Rate-limited: not a failure of this key, just try again on the next run
+                    log.info("Question bank refresh deferred, Groq is busy (retry after %.1fs)", e.retry_after)
+                    break
+                questions = None
+                log.warning("Question bank refresh failed for %r: %s", meta['position_role'], e)
+            if questions:
+                self.add(meta['position_role'], meta['skills'], meta['experience'], meta['is_coding_role'], questions)
+            else:
+                with self._lock:
+                    self._counters['refresh_failures'] += 1
+                    if key in self._entries:
+                        self._entries[key]['failures'] += 1
@@ -0,0 +1,218 @@
+"""
+Content-addressed cache for resume analysis results.
+
+A `candidate_profile` is stored under two keys: the SHA-256 of the raw PDF
+bytes (so an identical re-upload skips PDF parsing entirely) and the SHA-256 of
+the normalized extracted text (so a re-exported PDF with the same content still
+skips the Groq call). The in-memory tier is an LRU bounded by entry count and
+bytes; an optional on-disk tier (RESUME_CACHE_DIR) survives restarts.
+
+The disk tier is bounded by RESUME_CACHE_DISK_MAX_ENTRIES through an
+in-memory index of its files in least-recently-used order, so writes never
+list the directory. The index is rebuilt from the directory at startup and
+after every RESUME_CACHE_DISK_RESCAN_WRITES writes, which picks up files
+written by other worker processes.
+"""
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+from collections import OrderedDict
+
+RESUME_CACHE_MAX_ENTRIES = int(os.getenv('RESUME_CACHE_MAX_ENTRIES', '2000'))
+RESUME_CACHE_MAX_BYTES = int(os.getenv('RESUME_CACHE_MAX_BYTES', str(32 * 1024 * 1024)))
+# Leave empty to keep the cache in memory only
+RESUME_CACHE_DIR = os.getenv('RESUME_CACHE_DIR', '')
+RESUME_CACHE_DISK_MAX_ENTRIES = int(os.getenv('RESUME_CACHE_DISK_MAX_ENTRIES', '20000'))
+RESUME_CACHE_DISK_RESCAN_WRITES = int(os.getenv('RESUME_CACHE_DISK_RESCAN_WRITES', '500'))
+
+log = logging.getLogger('hr_ai.pdf')
+
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+def hash_pdf_bytes(pdf_bytes):
+    return hashlib.sha256(pdf_bytes).hexdigest()
+
+
+def normalize_resume_text(text):
+    """Collapses whitespace so layout-only differences map to the same key."""
+    return _WHITESPACE_RE.sub(' ', text).strip()
+
+
+def hash_resume_text(text):
+    return hashlib.sha256(normalize_resume_text(text).encode('utf-8')).hexdigest()
+
+
+class ResumeCache:
+    def __init__(self, max_entries=RESUME_CACHE_MAX_ENTRIES, max_bytes=RESUME_CACHE_MAX_BYTES,
+                 disk_dir=RESUME_CACHE_DIR, disk_max_entries=RESUME_CACHE_DISK_MAX_ENTRIES,
+                 disk_rescan_writes=RESUME_CACHE_DISK_RESCAN_WRITES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.disk_dir = disk_dir or None
+        self.disk_max_entries = disk_max_entries
+        self.disk_rescan_writes = max(1, disk_rescan_writes)
+        self._lock = threading.Lock()
+        # key -> serialized profile JSON; profiles are stored serialized so callers
+        # can never mutate a cached entry through a shared reference
+        self._entries = OrderedDict()
+        self._total_bytes = 0
+        # disk file name -> None, least recently used first
+        self._disk_index = OrderedDict()
+        self._disk_writes = 0
+        self._counters = {
+            'pdf_hits': 0,
+            'text_hits': 0,
+            'disk_hits': 0,
+            'misses': 0,
+            'stores': 0,
+            'evictions': 0,
+            'disk_evictions': 0,
+        }
+        if self.disk_dir:
+            os.makedirs(self.disk_dir, exist_ok=True)
+            self._rescan_disk()
+
+    def get_by_pdf(self, pdf_hash):
+        return self._get('pdf:' + pdf_hash, 'pdf_hits')
+
+    def get_by_text(self, text_hash):
+        return self._get('text:' + text_hash, 'text_hits')
+
+    def put(self, profile, pdf_hash=None, text_hash=None):
+        data = json.dumps(profile)
+        keys = []
+        if pdf_hash:
+            keys.append('pdf:' + pdf_hash)
+        if text_hash:
+            keys.append('text:' + text_hash)
+        with self._lock:
+            self._counters['stores'] += 1
+            for key in keys:
+                self._put_memory(key, data)
+        for key in keys:
+            self._put_disk(key, data)
+
+    def stats(self):
+        with self._lock:
+            hits = self._counters['pdf_hits'] + self._counters['text_hits']
+            lookups = hits + self._counters['misses']
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'bytes': self._total_bytes,
+                'max_bytes': self.max_bytes,
+                'disk_enabled': bool(self.disk_dir),
+                'disk_entries': len(self._disk_index),
+                'hit_ratio': round(hits / lookups, 4) if lookups else 0.0,
+                **self._counters,
+            }
+
+    def _get(self, key, hit_counter):
+        with self._lock:
+            data = self._entries.get(key)
+            if data is not None:
+                self._entries.move_to_end(key)
+                self._counters[hit_counter] += 1
+                return json.loads(data)
+
+        data = self._get_disk(key)
+        with self._lock:
+            if data is None:
+                self._counters['misses'] += 1
+                return None
+            self._counters[hit_counter] += 1
+            self._counters['disk_hits'] += 1
+            # Promote to the memory tier
+            self._put_memory(key, data)
+        return json.loads(data)
+
+    def _put_memory(self, key, data):
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._total_bytes -= len(old)
+        self._entries[key] = data
+        self._total_bytes += len(data)
+        while len(self._entries) > self.max_entries or self._total_bytes > self.max_bytes:
+            if len(self._entries) == 1:
+                break
+            _, evicted = self._entries.popitem(last=False)
+            self._total_bytes -= len(evicted)
+            self._counters['evictions'] += 1
+
+    def _disk_path(self, key):
+        return os.path.join(self.disk_dir, key.replace(':', '_') + '.json')
+
+    def _get_disk(self, key):
+        if not self.disk_dir:
+            return None
+        path = self._disk_path(key)
+        name = os.path.basename(path)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = f.read()
+            # Refresh mtime so the order survives a rescan or restart
+            os.utime(path)
+        except OSError:
+            with self._lock:
+                self._disk_index.pop(name, None)
+            return None
+        with self._lock:
+            self._disk_index[name] = None
+            self._disk_index.move_to_end(name)
+        return data
+
+    def _put_disk(self, key, data):
+        if not self.disk_dir:
+            return
+        path = self._disk_path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            log.warning("Failed to write resume cache entry to disk: %s", e)
+            return
+        with self._lock:
+            self._disk_index[os.path.basename(path)] = None
+            self._disk_index.move_to_end(os.path.basename(path))
+            self._disk_writes += 1
+            rescan = self._disk_writes % self.disk_rescan_writes == 0
+        if rescan:
+            self._rescan_disk()
+        self._prune_disk()
+
+    def _rescan_disk(self):
+        """Rebuilds the disk index from the directory, oldest modification first."""
+        try:
+            with os.scandir(self.disk_dir) as it:
+                files = []
+                for entry in it:
+                    if entry.name.endswith('.json'):
+                        try:
+                            files.append((entry.stat().st_mtime, entry.name))
+                        except OSError:
+                            pass
+        except OSError as e:
+            log.warning("Failed to list the resume cache directory: %s", e)
+            return
+        files.sort()
+        with self._lock:
+            self._disk_index = OrderedDict((name, None) for _, name in files)
+
+    def _prune_disk(self):
+        with self._lock:
+            excess = len(self._disk_index) - self.disk_max_entries
+            evicted = [self._disk_index.popitem(last=False)[0] for _ in range(max(0, excess))]
+        for name in evicted:
+            try:
+                os.remove(os.path.join(self.disk_dir, name))
+                with self._lock:
+                    self._counters['disk_evictions'] += 1
+            except OSError:
+                # Another worker already removed it
+                pass
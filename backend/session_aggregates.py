@@ -0,0 +1,105 @@
+"""
+Running per-session score aggregates.
+
+Each session keeps an `aggregates` dict that is updated as answers arrive:
+- the score sum and answer count per tag
+- the overall score sum and count
+- the total answer duration in seconds
+- an index from question_id to the position of its response
+
+When a question is answered again, the old answer's contribution is subtracted
+before the new one is added. Assessment and progress reads are then O(1) and
+never rescan `interview_responses`. Everything is plain JSON, so it works with
+every session backend.
+"""
+
+
+def new_aggregates():
+    return {
+        'response_index': {},
+        'tags': {},
+        'score_sum': 0,
+        'scored_count': 0,
+        'duration_seconds': 0,
+    }
+
+
+def parse_duration_seconds(duration):
+    """Seconds in an 'MM:SS' (or 'HH:MM:SS') duration; 0 if it is missing or malformed."""
+    try:
+        seconds = 0
+        for part in duration.split(':'):
+            seconds = seconds * 60 + int(part)
+        return max(0, seconds)
+    except (ValueError, AttributeError, TypeError):
+        return 0
+
+
+def _apply(aggregates, response, sign):
+    aggregates['duration_seconds'] += sign * parse_duration_seconds(response.get('duration'))
+    evaluation = response.get('evaluation')
+    if not evaluation:
+        return
+    score = evaluation.get('score', 0)
+    aggregates['score_sum'] += sign * score
+    aggregates['scored_count'] += sign
+    for tag in {str(t).strip().lower() for t in response.get('tags', [])}:
+        entry = aggregates['tags'].setdefault(tag, {'sum': 0, 'count': 0})
+        entry['sum'] += sign * score
+        entry['count'] += sign
+        if entry['count'] <= 0:
+            del aggregates['tags'][tag]
+
+
+def ensure_aggregates(session):
+    """Returns the session's aggregates, rebuilding them for sessions created before they existed."""
+    aggregates = session.get('aggregates')
+    if aggregates is None:
+        aggregates = session['aggregates'] = new_aggregates()
+        for i, response in enumerate(session.get('interview_responses', [])):
+            aggregates['response_index'][response['question_id']] = i
+            _apply(aggregates, response, 1)
+    return aggregates
+
+
+def record_response(session, response):
+    """Stores `response`, replacing any earlier answer to the same question, and updates the aggregates."""
+    aggregates = ensure_aggregates(session)
+    index = aggregates['response_index'].get(response['question_id'])
+    if index is not None:
+        _apply(aggregates, session['interview_responses'][index], -1)
+        session['interview_responses'][index] = response
+    else:
+        aggregates['response_index'][response['question_id']] = len(session['interview_responses'])
+        session['interview_responses'].append(response)
+    _apply(aggregates, response, 1)
+
+
+def reset_responses(session):
+    session['interview_responses'] = []
+    session['aggregates'] = new_aggregates()
+
+
+def format_duration(total_seconds):
+    return f"{total_seconds // 60}m {total_seconds % 60}s"
+
+
+def progress_summary(session):
+    """Live interview progress computed from the aggregates only."""
+    aggregates = ensure_aggregates(session)
+    total_questions = len(session.get('interview_questions', []))
+    answered = len(aggregates['response_index'])
+    scored = aggregates['scored_count']
+    return {
+        'answered': answered,
+        'total_questions': total_questions,
+        'remaining': max(0, total_questions - answered),
+        'percent_complete': round(100 * answered / total_questions, 1) if total_questions else 0.0,
+        'average_score': round(aggregates['score_sum'] / scored, 1) if scored else None,
+        'tag_scores': {
+            tag: {'average': round(entry['sum'] / entry['count'], 1), 'count': entry['count']}
+            for tag, entry in aggregates['tags'].items()
+        },
+        'duration_seconds': aggregates['duration_seconds'],
+        'interview_duration': format_duration(aggregates['duration_seconds']),
+    }
@@ -0,0 +1,386 @@
+"""
+Pluggable, bounded session storage.
+
+Two backends implement the same `SessionBackend` interface:
+
+- `InMemorySessionBackend` keeps sessions in this process (single worker).
+- `SQLiteSessionBackend` keeps sessions in a local SQLite database in WAL mode,
+  so several gunicorn workers or processes can serve the same interview.
+
+Both evict sessions that sit idle past the TTL, when the entry count exceeds
+`max_entries`, or when the estimated memory footprint exceeds `max_bytes`, and
+expose eviction and occupancy counters through `stats()`.
+
+Sessions returned by `get()` must be treated as read-only snapshots; all writes
+go through `update()`, which applies a mutator atomically for that session.
+"""
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from contextlib import contextmanager
+
+SESSION_BACKEND = os.getenv('SESSION_BACKEND', 'memory')
+SESSION_DB_PATH = os.getenv('SESSION_DB_PATH', os.path.join(tempfile.gettempdir(), 'hr_ai_sessions.db'))
+SESSION_MAX_ENTRIES = int(os.getenv('SESSION_MAX_ENTRIES', '1000'))
+SESSION_TTL_SECONDS = int(os.getenv('SESSION_TTL_SECONDS', str(4 * 60 * 60)))
+SESSION_MAX_BYTES = int(os.getenv('SESSION_MAX_BYTES', str(256 * 1024 * 1024)))
+# SQLite backend: a read records its access time only when the stored one is older than this
+SESSION_TOUCH_SECONDS = int(os.getenv('SESSION_TOUCH_SECONDS', '60'))
+
+
+def new_session():
+    return {
+        'candidate_profile': None,
+        'interview_questions': [],
+        'interview_responses': [],
+        'interview_start_time': None,
+        'interview_end_time': None
+    }
+
+
+def estimate_session_bytes(session):
+    """Approximates a session's footprint by the size of its JSON encoding."""
+    try:
+        return len(json.dumps(session, default=str))
+    except (TypeError, ValueError):
+        return 0
+
+
+class SessionBackend(ABC):
+    """Interface shared by all session backends."""
+
+    def __init__(self, max_entries=SESSION_MAX_ENTRIES, ttl_seconds=SESSION_TTL_SECONDS, max_bytes=SESSION_MAX_BYTES):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self._counter_lock = threading.Lock()
+        self._counters = {
+            'hits': 0,
+            'misses': 0,
+            'created': 0,
+            'evicted_ttl': 0,
+            'evicted_lru': 0,
+            'evicted_memory': 0,
+        }
+
+    @abstractmethod
+    def get(self, session_id):
+        """Returns the session dict, or None if it does not exist or has expired."""
+
+    @abstractmethod
+    def get_or_create(self, session_id):
+        """Returns the session, creating an empty one if it does not exist."""
+
+    @abstractmethod
+    def update(self, session_id, mutator):
+        """
+        Atomically applies mutator(session) to a stored session and persists it.
+        Returns the mutator's return value, or raises KeyError if the session is gone.
+        """
+
+    @abstractmethod
+    def delete(self, session_id):
+        """Removes a session if it exists."""
+
+    @abstractmethod
+    def stats(self):
+        """Occupancy, limits and hit/miss/eviction counters."""
+
+    def __contains__(self, session_id):
+        return self.get(session_id) is not None
+
+    def _count(self, name, amount=1):
+        with self._counter_lock:
+            self._counters[name] += amount
+
+
+class InMemorySessionBackend(SessionBackend):
+    """Process-local LRU store. Sessions are live dicts shared between requests."""
+
+    def __init__(self, **limits):
+        super().__init__(**limits)
+        self._lock = threading.RLock()
+        # session_id -> (session, last_access, size_bytes), least recently used first
+        self._entries = OrderedDict()
+        self._total_bytes = 0
+
+    def get(self, session_id):
+        if not session_id:
+            return None
+        with self._lock:
+            now = time.monotonic()
+            self._expire(now)
+            entry = self._entries.get(session_id)
+            if entry is None:
+                self._count('misses')
+                return None
+            self._count('hits')
+            session, _, size = entry
+            # Reads only refresh recency; the size is re-measured when update() changes the session
+            self._entries[session_id] = (session, now, size)
+            self._entries.move_to_end(session_id)
+            return session
+
+    def get_or_create(self, session_id):
+        with self._lock:
+            session = self.get(session_id)
+            if session is None:
+                session = new_session()
+                self._count('created')
+                self._touch(session_id, session, time.monotonic())
+                self._evict(keep=session_id)
+            return session
+
+    def update(self, session_id, mutator):
+        with self._lock:
+            session = self.get(session_id)
+            if session is None:
+                raise KeyError(session_id)
+            result = mutator(session)
+            self._touch(session_id, session, time.monotonic())
+            self._evict(keep=session_id)
+            return result
+
+    def delete(self, session_id):
+        with self._lock:
+            entry = self._entries.pop(session_id, None)
+            if entry is not None:
+                self._total_bytes -= entry[2]
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    def stats(self):
+        with self._lock:
+            self._expire(time.monotonic())
+            return {
+                'backend': 'memory',
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'bytes': self._total_bytes,
+                'max_bytes': self.max_bytes,
+                'ttl_seconds': self.ttl_seconds,
+                **self._counters,
+            }
+
+    def _touch(self, session_id, session, now):
+        old = self._entries.pop(session_id, None)
+        if old is not None:
+            self._total_bytes -= old[2]
+        size = estimate_session_bytes(session)
+        self._entries[session_id] = (session, now, size)
+        self._total_bytes += size
+
+    def _pop_oldest(self, reason):
+        _, (_, _, size) = self._entries.popitem(last=False)
+        self._total_bytes -= size
+        self._count(reason)
+
+    def _expire(self, now):
+        # Entries are ordered by last access, so expired ones are always at the front
+        while self._entries:
+            _, last_access, _ = next(iter(self._entries.values()))
+            if now - last_access <= self.ttl_seconds:
+                break
+            self._pop_oldest('evicted_ttl')
+
+    def _evict(self, keep=None):
+        while len(self._entries) > self.max_entries or self._total_bytes > self.max_bytes:
+            oldest_id = next(iter(self._entries))
+            if oldest_id == keep:
+                # Never evict the session currently being served
+                break
+            self._pop_oldest('evicted_lru' if len(self._entries) > self.max_entries else 'evicted_memory')
+
+
+class SQLiteSessionBackend(SessionBackend):
+    """
+    Shared store backed by a local SQLite database in WAL mode.
+    Every worker process opens the same file; `update()` runs inside a
+    BEGIN IMMEDIATE transaction so concurrent writers to one session serialize.
+
+    Reads take no write lock: `get()` is a plain SELECT, and it only writes
+    the access time (one UPDATE statement) when the stored one is more than
+    `touch_seconds` old, so idle expiry and LRU order are that coarse. The entry
+    count and byte total live in a one-row table kept up to date by triggers,
+    so eviction checks never scan the sessions table, and `stats()` is a
+    single read of that row.
+    Hit/miss/eviction counters are tracked per process.
+    """
+
+    def __init__(self, db_path=SESSION_DB_PATH, touch_seconds=SESSION_TOUCH_SECONDS, **limits):
+        super().__init__(**limits)
+        self.db_path = db_path
+        self.touch_seconds = touch_seconds
+        self._local = threading.local()
+        with self._transaction() as conn:
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS sessions ('
+                ' session_id TEXT PRIMARY KEY,'
+                ' data TEXT NOT NULL,'
+                ' size_bytes INTEGER NOT NULL,'
+                ' last_access REAL NOT NULL)'
+            )
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_sessions_last_access ON sessions(last_access)')
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS session_totals ('
+                ' id INTEGER PRIMARY KEY CHECK (id = 1),'
+                ' entries INTEGER NOT NULL,'
+                ' bytes INTEGER NOT NULL)'
+            )
+            # Databases created before the totals table get it filled once, in this transaction
+            conn.execute('INSERT OR IGNORE INTO session_totals SELECT 1, COUNT(*), COALESCE(SUM(size_bytes), 0) FROM sessions')
+            conn.execute(
+                'CREATE TRIGGER IF NOT EXISTS sessions_totals_insert AFTER INSERT ON sessions BEGIN'
+                ' UPDATE session_totals SET entries = entries + 1, bytes = bytes + NEW.size_bytes WHERE id = 1; END'
+            )
+            conn.execute(
+                'CREATE TRIGGER IF NOT EXISTS sessions_totals_delete AFTER DELETE ON sessions BEGIN'
+                ' UPDATE session_totals SET entries = entries - 1, bytes = bytes - OLD.size_bytes WHERE id = 1; END'
+            )
+            conn.execute(
+                'CREATE TRIGGER IF NOT EXISTS sessions_totals_update AFTER UPDATE OF size_bytes ON sessions BEGIN'
+                ' UPDATE session_totals SET bytes = bytes - OLD.size_bytes + NEW.size_bytes WHERE id = 1; END'
+            )
+
+    def _connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            # Autocommit mode; transactions are opened explicitly with BEGIN IMMEDIATE
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def _transaction(self):
+        conn = self._connection()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            yield conn
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        conn.execute('COMMIT')
+
+    def _load(self, conn, session_id, now):
+        row = conn.execute('SELECT data, last_access FROM sessions WHERE session_id = ?', (session_id,)).fetchone()
+        if row is None:
+            return None
+        if now - row[1] > self.ttl_seconds:
+            conn.execute('DELETE FROM sessions WHERE session_id = ?', (session_id,))
+            self._count('evicted_ttl')
+            return None
+        return json.loads(row[0])
+
+    def _store(self, conn, session_id, session, now):
+        data = json.dumps(session, default=str)
+        # An upsert rather than INSERT OR REPLACE, whose implicit delete would not fire the totals trigger
+        conn.execute(
+            'INSERT INTO sessions (session_id, data, size_bytes, last_access) VALUES (?, ?, ?, ?)'
+            ' ON CONFLICT(session_id) DO UPDATE SET'
+            ' data = excluded.data, size_bytes = excluded.size_bytes, last_access = excluded.last_access',
+            (session_id, data, len(data), now)
+        )
+
+    def get(self, session_id):
+        if not session_id:
+            return None
+        now = time.time()
+        conn = self._connection()
+        row = conn.execute('SELECT data, last_access FROM sessions WHERE session_id = ?', (session_id,)).fetchone()
+        if row is None or now - row[1] > self.ttl_seconds:
+            # An expired row is left for the next write's eviction pass
+            self._count('misses')
+            return None
+        if now - row[1] > self.touch_seconds:
+            conn.execute('UPDATE sessions SET last_access = ? WHERE session_id = ? AND last_access < ?',
+                         (now, session_id, now))
+        self._count('hits')
+        return json.loads(row[0])
+
+    def get_or_create(self, session_id):
+        session = self.get(session_id)
+        if session is not None:
+            return session
+        now = time.time()
+        with self._transaction() as conn:
+            # Another worker may have created it since the read
+            session = self._load(conn, session_id, now)
+            if session is None:
+                session = new_session()
+                self._count('created')
+                self._store(conn, session_id, session, now)
+                self._evict(conn, now, keep=session_id)
+        return session
+
+    def update(self, session_id, mutator):
+        now = time.time()
+        with self._transaction() as conn:
+            session = self._load(conn, session_id, now)
+            if session is None:
+                raise KeyError(session_id)
+            result = mutator(session)
+            self._store(conn, session_id, session, now)
+            self._evict(conn, now, keep=session_id)
+        return result
+
+    def delete(self, session_id):
+        with self._transaction() as conn:
+            conn.execute('DELETE FROM sessions WHERE session_id = ?', (session_id,))
+
+    def stats(self):
+        # A plain read: expired sessions are counted until the next write evicts them
+        entries, total_bytes = self._totals(self._connection())
+        return {
+            'backend': 'sqlite',
+            'entries': entries,
+            'max_entries': self.max_entries,
+            'bytes': total_bytes,
+            'max_bytes': self.max_bytes,
+            'ttl_seconds': self.ttl_seconds,
+            **self._counters,
+        }
+
+    def _totals(self, conn):
+        return conn.execute('SELECT entries, bytes FROM session_totals WHERE id = 1').fetchone()
+
+    def _evict(self, conn, now, keep=None):
+        # Uses the last_access index, so it only visits expired rows
+        expired = conn.execute('DELETE FROM sessions WHERE last_access < ?', (now - self.ttl_seconds,)).rowcount
+        if expired:
+            self._count('evicted_ttl', expired)
+
+        entries, total_bytes = self._totals(conn)
+        if entries <= self.max_entries and total_bytes <= self.max_bytes:
+            return
+
+        rows = conn.execute(
+            'SELECT session_id, size_bytes FROM sessions WHERE session_id != ? ORDER BY last_access',
+            (keep or '',)
+        )
+        doomed = []
+        for session_id, size_bytes in rows:
+            if entries <= self.max_entries and total_bytes <= self.max_bytes:
+                break
+            self._count('evicted_lru' if entries > self.max_entries else 'evicted_memory')
+            doomed.append((session_id,))
+            entries -= 1
+            total_bytes -= size_bytes
+        conn.executemany('DELETE FROM sessions WHERE session_id = ?', doomed)
+
+
+def create_session_backend(kind=SESSION_BACKEND):
+    """Builds the backend selected by the SESSION_BACKEND environment variable."""
+    if kind == 'sqlite':
+        return SQLiteSessionBackend()
+    if kind == 'memory':
+        return InMemorySessionBackend()
+    raise ValueError(f"Unknown SESSION_BACKEND '{kind}'. Use 'memory' or 'sqlite'.")
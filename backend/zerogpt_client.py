@@ -0,0 +1,219 @@
+"""
+Pooled, circuit-broken HTTP client for the ZeroGPT detector.
+
+One keep-alive `requests.Session` is shared by every request, so answers after
+the first reuse an open TCP/TLS connection. Connect and read timeouts are set
+separately: an unreachable host fails in about ZEROGPT_CONNECT_TIMEOUT seconds,
+not the full read budget. After ZEROGPT_FAILURE_THRESHOLD consecutive failures
+the circuit opens, and calls fail immediately for ZEROGPT_RECOVERY_SECONDS.
+One probe request then runs in the half-open state; it either closes the circuit
+again or reopens it.
+
+detect_async() is the coroutine counterpart for the async server. It posts
+through a pooled httpx.AsyncClient, created on first use, under the same
+breaker and counters.
+
+Point ZEROGPT_API_URL at a local stand-in server to exercise the client offline.
+"""
+import asyncio
+import logging
+import os
+import threading
+import time
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+
+ZEROGPT_API_URL = os.getenv('ZEROGPT_API_URL', 'https://api.zerogpt.com/api/detect/detectText')
+ZEROGPT_API_KEY = os.getenv('ZEROGPT_API_KEY', '')
+ZEROGPT_CONNECT_TIMEOUT = float(os.getenv('ZEROGPT_CONNECT_TIMEOUT', '2'))
+ZEROGPT_READ_TIMEOUT = float(os.getenv('ZEROGPT_READ_TIMEOUT', '6'))
+ZEROGPT_POOL_SIZE = int(os.getenv('ZEROGPT_POOL_SIZE', '16'))
+ZEROGPT_FAILURE_THRESHOLD = int(os.getenv('ZEROGPT_FAILURE_THRESHOLD', '3'))
+ZEROGPT_RECOVERY_SECONDS = float(os.getenv('ZEROGPT_RECOVERY_SECONDS', '30'))
+
+log = logging.getLogger('hr_ai.zerogpt')
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+# Numeric encoding of the state for metrics scrapers
+STATE_CODES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+
+class CircuitOpenError(Exception):
+    pass
+
+
+class CircuitBreaker:
+    def __init__(self, failure_threshold=ZEROGPT_FAILURE_THRESHOLD, recovery_seconds=ZEROGPT_RECOVERY_SECONDS):
+        self.failure_threshold = failure_threshold
+        self.recovery_seconds = recovery_seconds
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._counters = {'opened': 0, 'half_opened': 0, 'closed': 0, 'short_circuited': 0}
+
+    @property
+    def state(self):
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self):
+        if self._state == OPEN and time.monotonic() - self._opened_at >= self.recovery_seconds:
+            self._state = HALF_OPEN
+            self._probe_in_flight = False
+            self._counters['half_opened'] += 1
+            log.info("ZeroGPT circuit half-open, allowing a probe request")
+        return self._state
+
+    def allow(self):
+        """Returns True if a request may go out now; in half-open state only one probe is allowed."""
+        with self._lock:
+            state = self._current_state()
+            if state == CLOSED:
+                return True
+            if state == HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            self._counters['short_circuited'] += 1
+            return False
+
+    def record_success(self):
+        with self._lock:
+            if self._state != CLOSED:
+                self._counters['closed'] += 1
+                log.info("ZeroGPT circuit closed")
+            self._state = CLOSED
+            self._consecutive_failures = 0
+            self._probe_in_flight = False
+
+    def abandon(self):
+        """Forgets a request that was cancelled before it got an answer."""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self._consecutive_failures += 1
+            if self._state == HALF_OPEN or self._consecutive_failures >= self.failure_threshold:
+                if self._state != OPEN:
+                    self._counters['opened'] += 1
+                    log.warning("ZeroGPT circuit opened after %d consecutive failures", self._consecutive_failures)
+                self._state = OPEN
+                self._opened_at = time.monotonic()
+                self._probe_in_flight = False
+
+    def stats(self):
+        with self._lock:
+            state = self._current_state()
+            return {
+                'state': state,
+                'state_code': STATE_CODES[state],
+                'consecutive_failures': self._consecutive_failures,
+                'seconds_until_probe': round(max(0.0, self._opened_at + self.recovery_seconds - time.monotonic()), 1) if state == OPEN else 0.0,
+                **self._counters,
+            }
+
+
+class ZeroGPTClient:
+    def __init__(self, url=ZEROGPT_API_URL, api_key=ZEROGPT_API_KEY, connect_timeout=ZEROGPT_CONNECT_TIMEOUT,
+                 read_timeout=ZEROGPT_READ_TIMEOUT, pool_size=ZEROGPT_POOL_SIZE, breaker=None):
+        self.url = url
+        self.timeout = (connect_timeout, read_timeout)
+        self.breaker = breaker or CircuitBreaker()
+        self.session = requests.Session()
+        # Retries are left to the breaker; a retry loop would multiply the latency of a degraded service
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.session.headers.update({'Content-Type': 'application/json'})
+        if api_key:
+            self.session.headers['ApiKey'] = api_key
+        self.pool_size = pool_size
+        self._async_session = None
+        self._lock = threading.Lock()
+        self._counters = {'requests': 0, 'successes': 0, 'failures': 0, 'timeouts': 0, 'total_latency_ms': 0.0}
+
+    def detect(self, text):
+        """
+        Posts `text` to the detector and returns the `requests.Response`.
+        Raises CircuitOpenError without touching the network while the circuit is
+        open, and re-raises timeouts and connection errors after recording them.
+        """
+        if not self.breaker.allow():
+            raise CircuitOpenError('ZeroGPT circuit is open')
+
+        started = time.perf_counter()
+        try:
+            response = self.session.post(self.url, json={'input_text': text}, timeout=self.timeout)
+        except requests.exceptions.RequestException as e:
+            self._record(started, ok=False, timeout=isinstance(e, requests.exceptions.Timeout))
+            raise
+        # Throttling and server errors mean the service is unhealthy; other statuses mean it answered
+        ok = response.status_code < 500 and response.status_code != 429
+        self._record(started, ok=ok)
+        return response
+
+    async def detect_async(self, text):
+        """
+        Coroutine counterpart of detect(); returns an `httpx.Response` and
+        raises CircuitOpenError or the httpx timeout and connection errors.
+        """
+        if not self.breaker.allow():
+            raise CircuitOpenError('ZeroGPT circuit is open')
+
+        if self._async_session is None:
+            connect_timeout, read_timeout = self.timeout
+            self._async_session = httpx.AsyncClient(
+                headers=dict(self.session.headers),
+                timeout=httpx.Timeout(read_timeout, connect=connect_timeout),
+                limits=httpx.Limits(max_connections=self.pool_size, max_keepalive_connections=self.pool_size),
+            )
+        started = time.perf_counter()
+        try:
+            response = await self._async_session.post(self.url, json={'input_text': text})
+        except httpx.HTTPError as e:
+            self._record(started, ok=False, timeout=isinstance(e, httpx.TimeoutException))
+            raise
+        except asyncio.CancelledError:
+            # Says nothing about the service's health, but a cancelled probe must not hold the half-open slot
+            self.breaker.abandon()
+            raise
+        ok = response.status_code < 500 and response.status_code != 429
+        self._record(started, ok=ok)
+        return response
+
+    async def aclose(self):
+        """Closes the async connection pool; the async server calls this on shutdown."""
+        if self._async_session is not None:
+            await self._async_session.aclose()
+            self._async_session = None
+
+    def _record(self, started, ok, timeout=False):
+        if ok:
+            self.breaker.record_success()
+        else:
+            self.breaker.record_failure()
+        with self._lock:
+            self._counters['requests'] += 1
+            self._counters['successes' if ok else 'failures'] += 1
+            if timeout:
+                self._counters['timeouts'] += 1
+            self._counters['total_latency_ms'] += (time.perf_counter() - started) * 1000
+
+    def stats(self):
+        with self._lock:
+            counters = dict(self._counters)
+        requests_made = counters.pop('requests')
+        total_latency_ms = counters.pop('total_latency_ms')
+        return {
+            'url': self.url,
+            'requests': requests_made,
+            'avg_latency_ms': round(total_latency_ms / requests_made, 1) if requests_made else 0.0,
+            **counters,
+            'circuit': self.breaker.stats(),
+        }
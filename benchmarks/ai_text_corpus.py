@@ -0,0 +1,134 @@
+"""
+Labelled interview answers for calibrating the local AI-text detector.
+
+HUMAN_ANSWERS are written the way candidates actually answer in a timed
+interview box: short, unpolished, often in the first person. AI_ANSWERS are
+the kind of replies a chat model gives to the same questions, from one-line
+definitions to structured paragraphs. Both cover short texts (under the
+detector's TTR window) as well as long ones, so short human answers are not
+learned as "AI" just for lacking informal marks.
+
+This is a starting point, not ground truth: calibrate on answers labelled
+from your own interviews (calibrate_ai_detector.py --data) before letting
+local verdicts penalize candidates.
+"""
+
+HUMAN_ANSWERS = [
+    "ok so basically i think polymorphism is when a class can act like another one, like a dog is an animal lol not sure",
+    "REST is an architectural style for APIs where resources are identified by URLs and manipulated with standard HTTP methods.",
+    "I'd use a dictionary for that. Did it at my last job, worked fine.",
+    "A primary key uniquely identifies a row. A foreign key points at a primary key in another table.",
+    "honestly never used kubernetes in prod, only minikube on my laptop for a course",
+    "Big O is how the running time grows with the input. Binary search is log n because you halve it each time.",
+    "I'd check the logs first, then see if anything was deployed recently. Nine times out of ten it's a bad deploy.",
+    "git rebase rewrites your commits on top of another branch, merge just adds a merge commit. I prefer rebase for small feature branches.",
+    "My biggest weakness is probably saying yes to too many things. I've started blocking time in my calendar which helps a bit.",
+    "Not sure tbh. Maybe a queue? Producers push, workers pull, and you retry the failed ones.",
+    "A process has its own memory, threads share it. That's why threads need locks.",
+    "We had a cron job that kept overlapping with itself, took us ages to notice. Fixed it with a lock file.",
+    "TCP guarantees order and delivery, UDP doesn't. Games and video calls use UDP because a late packet is useless anyway.",
+    "I would index the email column since every login query filters on it.",
+    "So at my last company the checkout page was slow, like 4 seconds. I profiled it and it was an N+1 query in the cart, "
+    "we were loading every product separately. Switched to one query with a join and it went under 500ms. Took a day, "
+    "most of it was writing tests because nobody trusted that code.",
+    "I left because the team got reorganised and I ended up doing mostly support tickets. I want to get back to building things.",
+    "Caching is great until it isn't. We cached user permissions once and people kept access for an hour after being removed. "
+    "So now I always ask what happens when the data changes, and if the answer is 'bad things' I keep the TTL short or skip it.",
+    "i dont really know docker compose that well, i know docker run and writing a dockerfile",
+    "First I'd ask what 'slow' means to them. Then measure. I've been burned guessing before - spent two days optimising a "
+    "function that turned out to be 2% of the request.",
+    "Conflict with a coworker? Yeah, we disagreed about using an ORM. I thought raw SQL was clearer, he wanted SQLAlchemy. "
+    "We tried both on one endpoint and honestly his version was fine, so we went with it.",
+    "A hash map. Key is the word, value is the count. Then sort by count at the end, or use a heap if you only want the top ten.",
+    "Unit tests for the pure functions, a couple of integration tests that hit a real database in docker. I don't mock the DB anymore, "
+    "it lied to us too many times.",
+    "Eventual consistency means replicas might disagree for a bit but they'll converge. Fine for likes, not fine for bank balances.",
+    "I'm not a frontend person really. I can do basic React, state, props, hooks, but CSS still beats me sometimes.",
+    "To be honest I think the interviewer wants me to say microservices but for a team of four a monolith is way easier to run. "
+    "You can split it later when you actually know where the seams are.",
+    "Deadlock is when two threads each hold a lock the other needs. Fix is usually to always take locks in the same order.",
+    "We used Redis for sessions and rate limiting. It went down once and took login with it, so now there's a fallback to the DB.",
+    "The GIL means only one thread runs Python bytecode at a time, so for CPU stuff you use processes. For IO threads are fine.",
+    "dunno, I'd google it",
+    "I like small PRs. Big ones just get rubber stamped because nobody has time to read 2000 lines, me included.",
+    "SQL injection - you build the query with string concatenation and someone puts a quote in the input. Use parameters, always.",
+    "My manager would say I'm reliable but I go quiet when I'm stuck. I'm working on asking for help earlier, like after an hour not a day.",
+]
+
+AI_ANSWERS = [
+    "Polymorphism is a core principle of object-oriented programming that allows objects of different classes to be treated "
+    "as objects of a common superclass, enabling flexible and reusable code.",
+    "REST (Representational State Transfer) is an architectural style that leverages standard HTTP methods to facilitate "
+    "stateless communication between clients and servers, ensuring scalability and a uniform interface.",
+    "A dictionary (hash map) is an excellent choice here, as it provides average O(1) lookups and ensures efficient access.",
+    "Certainly! A primary key uniquely identifies each record in a table, while a foreign key establishes a relationship by "
+    "referencing the primary key of another table, ensuring referential integrity.",
+    "Kubernetes is a robust container orchestration platform that automates the deployment, scaling, and management of "
+    "containerized applications across clusters of machines.",
+    "Big O notation describes the upper bound of an algorithm's time complexity as the input size grows. For example, binary "
+    "search operates in O(log n) time, as it halves the search space at each step.",
+    "To troubleshoot a production issue, it is essential to follow a systematic approach. First, review the application logs "
+    "and monitoring dashboards to identify anomalies. Next, correlate the incident with recent deployments or configuration "
+    "changes. Finally, implement a fix, validate it in a staging environment, and document the root cause to prevent recurrence.",
+    "Git rebase and git merge both integrate changes from one branch into another, but they do so differently. Rebase rewrites "
+    "commit history to create a linear sequence, whereas merge preserves the complete history by creating a merge commit. "
+    "Each approach has its advantages depending on the team's workflow.",
+    "One area I am actively working to improve is my tendency to take on too many responsibilities. To address this, I have "
+    "adopted prioritization frameworks and time-blocking techniques, which have significantly enhanced my productivity and "
+    "ensured that I consistently deliver high-quality results.",
+    "A message queue is a robust solution for this scenario. Producers publish messages to the queue, and consumers process "
+    "them asynchronously, which facilitates decoupling, improves fault tolerance, and enables seamless horizontal scaling.",
+    "Processes have separate memory spaces, whereas threads share the same memory within a process. Consequently, threads "
+    "require synchronization mechanisms such as locks to ensure data consistency.",
+    "TCP is a connection-oriented protocol that guarantees reliable, ordered delivery of data, while UDP is connectionless and "
+    "prioritizes low latency. As a result, UDP is commonly utilized in real-time applications such as gaming and video streaming.",
+    "Adding an index on the email column would significantly improve query performance, as it is frequently used in filtering "
+    "conditions during authentication.",
+    "In my previous role, I identified a significant performance bottleneck in the checkout process. By leveraging profiling "
+    "tools, I discovered an N+1 query pattern in the cart module. I refactored the data access layer to utilize a single "
+    "optimized query with joins, which reduced page load time by over 80%. Additionally, I implemented comprehensive tests to "
+    "ensure the reliability of the changes.",
+    "I am seeking a new opportunity that aligns more closely with my passion for building innovative solutions. While I valued "
+    "my experience at my current organization, I am eager to take on new challenges and contribute to a dynamic team.",
+    "Caching is a powerful technique for improving performance, but it is crucial to consider cache invalidation. For instance, "
+    "caching sensitive data such as user permissions can lead to security issues if the cache is not invalidated promptly. "
+    "Therefore, it is important to carefully evaluate time-to-live settings and invalidation strategies.",
+    "Docker Compose is a tool that facilitates the definition and management of multi-container applications using a "
+    "declarative YAML configuration file.",
+    "To address performance concerns effectively, it is important to first establish clear, measurable criteria. I would then "
+    "utilize profiling tools to identify the actual bottlenecks, ensuring that optimization efforts are data-driven rather "
+    "than based on assumptions.",
+    "In a previous project, a colleague and I had differing opinions regarding the use of an ORM. To resolve this constructively, "
+    "we implemented a proof of concept using both approaches and evaluated them against agreed criteria. This collaborative "
+    "approach fostered mutual respect and led to a well-informed decision.",
+    "The most efficient approach is to utilize a hash map to store word frequencies, followed by a min-heap to retrieve the top "
+    "k elements. This solution achieves O(n log k) time complexity, making it highly scalable.",
+    "A comprehensive testing strategy should include unit tests for individual components, integration tests to validate "
+    "interactions with external systems such as databases, and end-to-end tests to ensure the overall system functions as "
+    "expected.",
+    "Eventual consistency is a consistency model used in distributed systems, which guarantees that, in the absence of new "
+    "updates, all replicas will eventually converge to the same state.",
+    "While my primary expertise lies in backend development, I have a solid understanding of frontend technologies, including "
+    "React, state management, and component-based architecture.",
+    "The choice between a monolithic and a microservices architecture depends on various factors, including team size, system "
+    "complexity, and scalability requirements. For smaller teams, a well-structured monolith is often more practical, as it "
+    "reduces operational overhead while still allowing for future decomposition.",
+    "A deadlock occurs when two or more threads are each waiting for resources held by the others, resulting in a standstill. "
+    "It can be prevented by enforcing a consistent lock acquisition order.",
+    "Redis is a versatile in-memory data store that is commonly utilized for session management and rate limiting. To ensure "
+    "high availability, it is essential to implement fallback mechanisms and replication.",
+    "The Global Interpreter Lock (GIL) ensures that only one thread executes Python bytecode at a time. Consequently, "
+    "multiprocessing is recommended for CPU-bound tasks, while threading remains effective for I/O-bound workloads.",
+    "Great question! I would approach this by researching the topic thoroughly and consulting reliable documentation.",
+    "Small, focused pull requests facilitate more thorough code reviews, reduce the risk of introducing defects, and enable "
+    "faster feedback cycles, ultimately improving overall code quality.",
+    "SQL injection is a security vulnerability that occurs when untrusted input is concatenated into a query. It can be "
+    "effectively mitigated by utilizing parameterized queries and prepared statements.",
+    "My manager would describe me as dependable, detail-oriented, and committed to delivering high-quality work. I am also "
+    "continuously working to improve my communication skills by proactively seeking feedback.",
+]
+
+
+def labelled_samples():
+    """Returns [(text, label)], with label 1 for AI-generated and 0 for human."""
+    return [(text, 0) for text in HUMAN_ANSWERS] + [(text, 1) for text in AI_ANSWERS]
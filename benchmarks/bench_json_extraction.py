@@ -0,0 +1,104 @@
+"""
+Compares the legacy regex-based JSON extractor with the linear scanner in
+backend/json_stream.py on typical and pathological LLM outputs.
+
+Usage (from the repository root):
+    python benchmarks/bench_json_extraction.py
+    python benchmarks/bench_json_extraction.py --size 200000 --runs 5 --json results.json
+
+Inputs:
+- clean_object:       a plain assessment-sized JSON object
+- fenced_with_prose:  the object in a ```json fence with prose around it
+- brace_prose:        long prose full of unmatched "{ and quotes, no JSON at all
+- truncated_object:   a large object cut off before its closing brace
+- deep_brackets:      thousands of unclosed '[' followed by a small object (the scanner treats a
+                      runaway array as truncated JSON and reports nothing, in linear time)
+- trailing_garbage:   a valid object followed by a long run of '}' characters
+"""
+import argparse
+import json
+import os
+import re
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend'))
+
+from json_stream import extract_json_value  # noqa: E402
+
+LEGACY_RE = re.compile(r'```(?:json)?\s*([\s\S]*?)\s*```|({\s*".*?"[\s\S]*})|(\[\s*[\s\S]*\])', re.DOTALL)
+
+
+def legacy_extract(text):
+    """The extractor previously in backend/app.py, minus its debug output."""
+    match = LEGACY_RE.search(text)
+    if match:
+        json_str = match.group(1) or match.group(2) or match.group(3)
+        if json_str:
+            try:
+                return json.loads(json_str)
+            except json.JSONDecodeError:
+                pass
+    if '{' in text and '}' in text:
+        try:
+            return json.loads(text[text.find('{'): text.rfind('}') + 1])
+        except json.JSONDecodeError:
+            pass
+    if '[' in text and ']' in text:
+        try:
+            return json.loads(text[text.find('['): text.rfind(']') + 1])
+        except json.JSONDecodeError:
+            pass
+    return None
+
+
+def build_inputs(size):
+    analysis = [{'question': f'Question {i}?', 'response': 'An answer with {braces} and "quotes". ' * 5,
+                 'score': i % 100} for i in range(max(1, size // 300))]
+    obj = json.dumps({'overallScore': 82, 'recommendation': 'Recommended', 'detailedQuestionAnalysis': analysis})
+    return {
+        'clean_object': obj,
+        'fenced_with_prose': 'Sure! Here is the assessment you asked for:\n```json\n' + obj + '\n```\nLet me know {if} you need more.',
+        'brace_prose': ('The candidate said "{ maybe" and then { "well ' * (size // 40))[:size],
+        'truncated_object': obj[:-1],
+        'deep_brackets': '[' * size + ' {"ok": true}',
+        'trailing_garbage': '{"ok": true}' + '}' * size,
+    }
+
+
+def measure(func, text, runs):
+    timings = []
+    result = None
+    for _ in range(runs):
+        started = time.perf_counter()
+        result = func(text)
+        timings.append((time.perf_counter() - started) * 1000)
+    return {'median_ms': round(statistics.median(timings), 3), 'found': result is not None}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--size', type=int, default=50000, help='Approximate length of each input in characters')
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--json', help='Write results to this JSON file')
+    args = parser.parse_args()
+
+    results = {}
+    for name, text in build_inputs(args.size).items():
+        results[name] = {
+            'chars': len(text),
+            'legacy': measure(legacy_extract, text, args.runs),
+            'scanner': measure(extract_json_value, text, args.runs),
+        }
+        legacy, scanner = results[name]['legacy'], results[name]['scanner']
+        print(f"{name:<18} {len(text):>8} chars  legacy {legacy['median_ms']:>10.3f} ms (found={legacy['found']})  "
+              f"scanner {scanner['median_ms']:>8.3f} ms (found={scanner['found']})")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,386 @@
+"""
+End-to-end load test: full interview flows against a local backend whose
+Groq and ZeroGPT calls go to the stand-ins in fake_services.py, so no API
+quota is spent and upstream latency is under our control.
+
+Usage (from the repository root):
+    python benchmarks/bench_load.py --flows 100 --concurrency 20 --json load.json
+    python benchmarks/bench_load.py --server asgi --flows 1000 --concurrency 200 --fake-config fake.json
+    python benchmarks/bench_load.py --server gunicorn --workers 4 --threads 8 --compare load.json
+    python benchmarks/bench_load.py --base-url http://127.0.0.1:5000   # a backend you started yourself
+
+Each flow is upload_resume -> setup_interview -> N x submit_answer ->
+get_assessment for a fresh session, with its own resume PDF (so the resume
+cache never answers). Coding questions are answered with code. By default
+N is half the questions, the minimum the assessment accepts.
+
+Servers (started with the fakes wired in through the environment):
+- flask:     the Flask development server, threaded
+- gunicorn:  gunicorn app:app with --workers/--threads (sessions in SQLite when workers > 1)
+- asgi:      uvicorn asgi:app (the async serving mode)
+
+The Groq cache, question bank and rate limits are switched off unless
+--keep-caches / --keep-limits are given, so every flow pays for its calls.
+
+The report (printed, and written with --json) holds throughput in flows and
+requests per second, p50/p95/p99 latency and status counts per route, the
+peak RSS of the backend (all of its processes together, sampled from /proc,
+and its largest single process), and the call counts seen by the fakes.
+"""
+import argparse
+import asyncio
+import importlib.util
+import json
+import os
+import resource
+import shutil
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+import httpx
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fake_services import FakeServices  # noqa: E402
+from pdf_corpus import RESUME_LINES, build_pdf  # noqa: E402
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend')
+ROUTES = ('upload_resume', 'setup_interview', 'submit_answer', 'get_assessment')
+PERCENTILES = (50, 95, 99)
+RSS_SAMPLE_INTERVAL = 0.25
+READY_TIMEOUT = 60
+
+CODE_ANSWERS = {
+    'reverse_string': 'def reverse_string(s):\n    return s[::-1]',
+    'sum_evens': 'def sum_evens(n):\n    return sum(i for i in range(2, n + 1, 2))',
+}
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def percentile(sorted_values, q):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    rank = max(1, -(-q * len(sorted_values) // 100))
+    return sorted_values[int(rank) - 1]
+
+
+def tree_rss_bytes(root_pid):
+    """Resident memory of a process and all of its descendants, from /proc; None where /proc is missing."""
+    if not os.path.isdir('/proc'):
+        return None
+    children, rss_pages = {}, {}
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entry}/stat') as f:
+                stat = f.read()
+        except OSError:
+            continue
+        fields = stat[stat.rindex(')') + 2:].split()
+        children.setdefault(int(fields[1]), []).append(int(entry))
+        rss_pages[int(entry)] = int(fields[21])
+    total, stack = 0, [root_pid]
+    while stack:
+        pid = stack.pop()
+        total += rss_pages.get(pid, 0)
+        stack.extend(children.get(pid, []))
+    return total * os.sysconf('SC_PAGE_SIZE')
+
+
+class RssSampler:
+    """Samples the backend's process-tree RSS on a thread and keeps the peak."""
+
+    def __init__(self, pid):
+        self.pid = pid
+        self.peak = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='rss-sampler', daemon=True)
+
+    def _run(self):
+        while not self._stop.is_set():
+            rss = tree_rss_bytes(self.pid)
+            if rss is not None:
+                self.peak = max(self.peak or 0, rss)
+            self._stop.wait(RSS_SAMPLE_INTERVAL)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+
+def server_command(args, port):
+    if args.server == 'flask':
+        return [sys.executable, '-c', f"from app import app; app.run(host='127.0.0.1', port={port}, threaded=True)"]
+    if args.server == 'gunicorn':
+        if not shutil.which('gunicorn'):
+            sys.exit("gunicorn is not installed (pip install gunicorn)")
+        return ['gunicorn', '--workers', str(args.workers), '--threads', str(args.threads), '--bind', f'127.0.0.1:{port}',
+                '--log-level', 'warning', 'app:app']
+    if importlib.util.find_spec('uvicorn') is None:
+        sys.exit("uvicorn is not installed (pip install uvicorn)")
+    return [sys.executable, '-m', 'uvicorn', 'asgi:app', '--host', '127.0.0.1', '--port', str(port), '--log-level', 'warning']
+
+
+def server_environment(args, fakes_url, session_db):
+    env = dict(os.environ)
+    env.update({
+        'GROQ_API_KEY': 'gsk_loadtest',
+        'GROQ_BASE_URL': fakes_url,
+        'ZEROGPT_API_URL': f'{fakes_url}/detect',
+        'AI_DETECTION_MODE': 'remote',
+        'LOG_LEVEL': args.log_level,
+    })
+    if not args.keep_limits:
+        env.update({'GROQ_RPM_LIMIT': '1000000', 'GROQ_TPM_LIMIT': '1000000000'})
+    if not args.keep_caches:
+        env.update({'LLM_CACHE_ENABLED': '0', 'QUESTION_BANK_ENABLED': '0'})
+    if args.server == 'gunicorn' and args.workers > 1:
+        env.update({'SESSION_BACKEND': 'sqlite', 'SESSION_DB_PATH': session_db})
+    return env
+
+
+def wait_until_ready(base_url, process=None, server_log=None):
+    deadline = time.monotonic() + READY_TIMEOUT
+    while time.monotonic() < deadline:
+        if process is not None and process.poll() is not None:
+            sys.exit(f"Backend exited with status {process.returncode} before it was ready (see {server_log})")
+        try:
+            if httpx.get(f'{base_url}/session_stats', timeout=2).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    sys.exit(f"Backend at {base_url} was not ready after {READY_TIMEOUT}s")
+
+
+def resume_pdf(flow_id):
+    lines = [f"Candidate {flow_id:06d} - Senior Software Engineer", f"candidate{flow_id}@example.com"] + RESUME_LINES[2:]
+    return build_pdf([lines])
+
+
+def answer_payload(question, index, flow_id):
+    code_name = next((name for name in CODE_ANSWERS if name in question['question']), None)
+    payload = {
+        'question_id': question['id'],
+        'response_text': (f"In flow {flow_id} I would approach question {index} by first clarifying the requirements, "
+                          "then choosing a simple design, measuring it under realistic load and iterating on the slowest part."),
+        'duration': f'00:{30 + index:02d}',
+    }
+    if code_name:
+        payload.update(code_submission=CODE_ANSWERS[code_name], is_coding_question=True)
+    return payload
+
+
+class LoadDriver:
+    def __init__(self, base_url, answers, timeout):
+        self.base_url = base_url
+        self.answers = answers
+        self.timeout = timeout
+        self.samples = {route: [] for route in ROUTES}
+        self.statuses = {route: {} for route in ROUTES}
+        self.flows_completed = 0
+        self.flows_failed = 0
+        self.failures = {}
+
+    async def _request(self, client, route, method, record, **kwargs):
+        started = time.perf_counter()
+        try:
+            response = await client.request(method, f'{self.base_url}/{route}', **kwargs)
+            status = str(response.status_code)
+        except httpx.HTTPError as e:
+            response, status = None, type(e).__name__
+        if record:
+            self.samples[route].append(time.perf_counter() - started)
+            self.statuses[route][status] = self.statuses[route].get(status, 0) + 1
+        if response is None or response.status_code >= 400:
+            raise RuntimeError(f'{route} -> {status}')
+        return response.json()
+
+    async def run_flow(self, client, flow_id, record=True):
+        headers = {'X-User-Session-Id': f'load-{flow_id}-{time.time_ns()}'}
+        try:
+            upload = await self._request(client, 'upload_resume', 'POST', record, headers=headers,
+                                         files={'resume': (f'resume_{flow_id}.pdf', resume_pdf(flow_id), 'application/pdf')})
+            setup = await self._request(client, 'setup_interview', 'POST', record, headers=headers,
+                                        json={'position_role': upload['candidate_profile'].get('inferred_position') or 'Software Engineer'})
+            questions = setup['questions']
+            count = self.answers if self.answers is not None else -(-len(questions) // 2)
+            for index, question in enumerate(questions[:count]):
+                await self._request(client, 'submit_answer', 'POST', record, headers=headers,
+                                    json=answer_payload(question, index, flow_id))
+            await self._request(client, 'get_assessment', 'GET', record, headers=headers)
+        except (RuntimeError, KeyError, ValueError) as e:
+            if record:
+                self.flows_failed += 1
+                self.failures[str(e)] = self.failures.get(str(e), 0) + 1
+            return
+        if record:
+            self.flows_completed += 1
+
+    async def run(self, flows, concurrency, warmup):
+        limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+        async with httpx.AsyncClient(timeout=self.timeout, limits=limits) as client:
+            await asyncio.gather(*(self.run_flow(client, -1 - i, record=False) for i in range(warmup)))
+            next_flow = iter(range(flows))
+
+            async def worker():
+                for flow_id in next_flow:
+                    await self.run_flow(client, flow_id)
+
+            started = time.perf_counter()
+            await asyncio.gather(*(worker() for _ in range(concurrency)))
+            return time.perf_counter() - started
+
+    def route_report(self):
+        report = {}
+        for route in ROUTES:
+            latencies = sorted(self.samples[route])
+            errors = sum(count for status, count in self.statuses[route].items() if not status.startswith('2'))
+            report[route] = {
+                'requests': len(latencies),
+                'errors': errors,
+                'statuses': self.statuses[route],
+                'mean_ms': round(statistics.fmean(latencies) * 1000, 2) if latencies else None,
+                'max_ms': round(latencies[-1] * 1000, 2) if latencies else None,
+                **{f'p{q}_ms': round(percentile(latencies, q) * 1000, 2) if latencies else None for q in PERCENTILES},
+            }
+        return report
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_report(report, previous=None):
+    throughput = report['throughput']
+    print(f"{report['server']}: {report['flows']['completed']}/{report['flows']['requested']} flows in {report['duration_s']}s "
+          f"at concurrency {report['concurrency']} - {throughput['flows_per_s']} flows/s, {throughput['requests_per_s']} req/s")
+    print(f"{'route':<18}{'requests':>9}{'errors':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for route, stats in report['routes'].items():
+        line = f"{route:<18}{stats['requests']:>9}{stats['errors']:>8}"
+        for q in PERCENTILES:
+            value = stats[f'p{q}_ms']
+            line += f"{value if value is not None else '-':>10}"
+            before = previous and previous['routes'].get(route, {}).get(f'p{q}_ms')
+            if before and value is not None:
+                line += f" ({(value - before) / before:+.0%})"
+        print(line)
+    rss = report['peak_rss_mb']
+    print(f"peak RSS: {rss['process_tree']} MB for all backend processes, {rss['largest_process']} MB for the largest")
+    if report['flows']['failures']:
+        print("failures:", json.dumps(report['flows']['failures']))
+    if previous:
+        before = previous['throughput']['flows_per_s']
+        if before:
+            print(f"throughput vs {previous.get('commit')}: {(throughput['flows_per_s'] - before) / before:+.1%}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--server', choices=('flask', 'gunicorn', 'asgi'), default='flask')
+    parser.add_argument('--base-url', help='Load an already running backend instead of starting one (fakes are not wired in)')
+    parser.add_argument('--workers', type=int, default=2, help='gunicorn worker processes')
+    parser.add_argument('--threads', type=int, default=8, help='gunicorn threads per worker')
+    parser.add_argument('--flows', type=int, default=50, help='Interview flows to run')
+    parser.add_argument('--concurrency', type=int, default=10, help='Flows in flight at once')
+    parser.add_argument('--answers', type=int, help='Answers per flow (default: half the questions)')
+    parser.add_argument('--warmup', type=int, default=2, help='Unrecorded flows run first')
+    parser.add_argument('--timeout', type=float, default=120.0, help='Per-request timeout in seconds')
+    parser.add_argument('--fake-config', help='JSON config for fake_services (latency, error rates, responses)')
+    parser.add_argument('--seed', type=int, help='Seed for the fake latency and error draws')
+    parser.add_argument('--keep-limits', action='store_true', help='Keep the configured Groq rate limits')
+    parser.add_argument('--keep-caches', action='store_true', help='Keep the Groq cache and question bank enabled')
+    parser.add_argument('--log-level', default='WARNING', help='LOG_LEVEL for the backend')
+    parser.add_argument('--server-log', default=os.path.join(tempfile.gettempdir(), 'hr_ai_load_backend.log'),
+                        help='File for the backend output')
+    parser.add_argument('--json', help='Write the report to this file')
+    parser.add_argument('--compare', help='Earlier report to print changes against')
+    args = parser.parse_args()
+
+    fake_config = {}
+    if args.fake_config:
+        with open(args.fake_config) as f:
+            fake_config = json.load(f)
+    fakes = FakeServices(fake_config, seed=args.seed).start()
+
+    process = sampler = None
+    session_db = tempfile.NamedTemporaryFile(suffix='.db', delete=False).name
+    if args.base_url:
+        base_url = args.base_url.rstrip('/')
+        wait_until_ready(base_url)
+    else:
+        port = free_port()
+        base_url = f'http://127.0.0.1:{port}'
+        server_log = open(args.server_log, 'w')
+        process = subprocess.Popen(server_command(args, port), cwd=BACKEND_DIR, stdout=server_log, stderr=subprocess.STDOUT,
+                                   env=server_environment(args, fakes.url, session_db))
+        wait_until_ready(base_url, process, args.server_log)
+        sampler = RssSampler(process.pid).start()
+
+    driver = LoadDriver(base_url, args.answers, args.timeout)
+    try:
+        duration = asyncio.run(driver.run(args.flows, args.concurrency, args.warmup))
+    finally:
+        if process is not None:
+            sampler.stop()
+            process.terminate()
+            try:
+                process.wait(timeout=15)
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.wait()
+            server_log.close()
+        fakes.stop()
+        os.unlink(session_db)
+
+    # ru_maxrss is in kilobytes on Linux; it covers the backend once it has been waited for
+    largest = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss if process is not None else None
+    routes = driver.route_report()
+    total_requests = sum(stats['requests'] for stats in routes.values())
+    report = {
+        'commit': git_commit(),
+        'server': 'external' if args.base_url else args.server,
+        'concurrency': args.concurrency,
+        'duration_s': round(duration, 3),
+        'flows': {'requested': args.flows, 'completed': driver.flows_completed, 'failed': driver.flows_failed,
+                  'failures': driver.failures},
+        'throughput': {'flows_per_s': round(driver.flows_completed / duration, 3) if duration else None,
+                       'requests_per_s': round(total_requests / duration, 3) if duration else None},
+        'routes': routes,
+        'peak_rss_mb': {'process_tree': round(sampler.peak / 2**20, 1) if sampler and sampler.peak else None,
+                        'largest_process': round(largest / 1024, 1) if largest else None},
+        'fake_services': fakes.stats(),
+        'config': {key: value for key, value in vars(args).items() if key not in ('json', 'compare')},
+    }
+
+    previous = None
+    if args.compare:
+        with open(args.compare) as f:
+            previous = json.load(f)
+    print_report(report, previous)
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
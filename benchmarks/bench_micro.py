@@ -0,0 +1,227 @@
+"""
+Micro-benchmarks for the per-request CPU path of the backend, with a stored
+baseline and a regression threshold (pytest-benchmark style, without the
+dependency).
+
+Usage (from the repository root):
+    python benchmarks/bench_micro.py                    # run and compare with the stored baseline
+    python benchmarks/bench_micro.py --filter prompt    # only cases whose name contains "prompt"
+    python benchmarks/bench_micro.py --save-baseline    # record a new baseline
+    python benchmarks/bench_micro.py --threshold 0.5 --rounds 30 --json results.json
+
+Each case is calibrated so that one round lasts at least --min-time, then
+timed for --rounds rounds. The report gives per-call min, median, mean and
+stddev. A case regresses when its --stat (min by default, the figure least
+disturbed by a busy machine) is more than --threshold (a fraction) above the
+baseline's, and the script then exits with status 1.
+Baselines depend on the machine, so record one on the machine or CI runner
+that checks against it. The baseline stores the Python version and platform,
+and a warning is printed when they differ from the current run.
+
+Cases:
+- pdf_<n>_pages:          extract_text_from_pdf on synthetic resumes (pdf_corpus), through the extraction engine
+- json_<task>_<style>:    extract_json_from_response on the llm_corpus replies (bare, markdown, prose, truncated)
+- duration_*:             parse_duration_seconds, rebuilding the aggregates of a 20-answer session,
+                          recording an answer, and the duration/analysis summary get_assessment builds
+- coding_role_*:          is_coding_role matching by title, by skill only, and not matching
+- prompt_*:               the resume, question, answer scoring, batch scoring, code review and assessment prompts
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from functools import partial
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, '..', 'backend'))
+sys.path.insert(0, BENCH_DIR)
+
+# app refuses to import without a Groq key; nothing here calls Groq
+os.environ.setdefault('GROQ_API_KEY', 'gsk_benchmark')
+os.environ.setdefault('LOG_LEVEL', 'ERROR')
+
+import app  # noqa: E402
+from llm_corpus import build_corpus  # noqa: E402
+from pdf_corpus import RESUME_LINES, build_pdf  # noqa: E402
+from session_aggregates import ensure_aggregates, format_duration, parse_duration_seconds, record_response  # noqa: E402
+
+DEFAULT_BASELINE = os.path.join(BENCH_DIR, 'baselines', 'bench_micro.json')
+PDF_PAGE_COUNTS = (1, 3, 20)
+SESSION_ANSWERS = 20
+
+
+def interview_session(answers=SESSION_ANSWERS):
+    responses = [{
+        'question_id': f'tech_{i}',
+        'question': f'Question {i}: explain a backend design trade-off you have made.',
+        'tags': ['technical', 'system design'] if i % 3 else ['coding', 'programming'],
+        'response': 'I would first clarify the requirements, then pick a simple design and measure it. ' * 6,
+        'duration': f'{i % 4:02d}:{(i * 7) % 60:02d}',
+        'evaluation': {'score': 70 + i % 30, 'technicalScore': 72, 'communicationScore': 80, 'relevanceScore': 76,
+                       'feedback': 'Relevant and well reasoned; more concrete detail would help.'},
+    } for i in range(answers)]
+    profile = {'name': 'Jane Doe', 'email': 'jane.doe@example.com', 'experience': '7 years',
+               'key_skills': ['Python', 'Flask', 'PostgreSQL', 'Redis', 'Docker', 'Kubernetes', 'AWS'],
+               'inferred_position': 'Senior Backend Engineer'}
+    return {'candidate_profile': profile, 'interview_responses': responses}
+
+
+def assessment_summary(session):
+    """The non-LLM part of prepare_assessment: total duration and the per-question analysis."""
+    return (format_duration(ensure_aggregates(session)['duration_seconds']),
+            app.build_detailed_question_analysis(session['interview_responses']))
+
+
+def build_cases():
+    cases = {}
+    for pages in PDF_PAGE_COUNTS:
+        pdf_bytes = build_pdf([RESUME_LINES * 6 for _ in range(pages)])
+        cases[f'pdf_{pages}_pages'] = partial(app.extract_text_from_pdf, pdf_bytes)
+
+    for name, text in build_corpus().items():
+        cases[f'json_{name}'] = partial(app.extract_json_from_response, text)
+
+    session = interview_session()
+    responses = session['interview_responses']
+    aggregated = {'interview_responses': list(responses)}
+    ensure_aggregates(aggregated)
+    cases['duration_parse'] = partial(parse_duration_seconds, '12:34')
+    cases['duration_rebuild_aggregates'] = lambda: ensure_aggregates({'interview_responses': responses})
+    cases['duration_record_response'] = partial(record_response, aggregated, dict(responses[5], duration='03:21'))
+    cases['duration_assessment_summary'] = partial(assessment_summary, dict(session, aggregates=aggregated['aggregates']))
+
+    skills = ', '.join(session['candidate_profile']['key_skills'])
+    cases['coding_role_title_match'] = partial(app.is_coding_role, 'Senior Backend Engineer', skills)
+    cases['coding_role_skill_match'] = partial(app.is_coding_role, 'Data Analyst', 'Excel, SQL, Tableau, Python')
+    cases['coding_role_no_match'] = partial(app.is_coding_role, 'Sales Account Manager', 'Negotiation, CRM, Salesforce, Forecasting')
+
+    profile = session['candidate_profile']
+    resume_text = '\n'.join(RESUME_LINES * 6)
+    batch = [(res['question_id'], res['question'], res['response']) for res in responses[:10]]
+    code = 'def reverse_string(s):\n    return s[::-1]\n' * 3
+    cases['prompt_resume'] = partial(app.build_resume_prompt, resume_text)
+    cases['prompt_questions'] = partial(app.build_question_prompt, profile['name'], profile['inferred_position'], profile['experience'], skills, True)
+    cases['prompt_answer_scoring'] = partial(app.build_answer_scoring_prompt, responses[0]['question'], responses[0]['response'])
+    cases['prompt_batch_scoring'] = partial(app.build_batch_scoring_prompt, batch)
+    cases['prompt_code_review'] = partial(app.build_code_review_prompt, code, 'Write a function reverse_string(s).')
+    cases['prompt_assessment'] = partial(app.build_assessment_prompt, profile, responses, '27m 40s')
+    return cases
+
+
+def calibrate(func, min_time):
+    """Calls per round so that a round lasts at least `min_time` seconds."""
+    iterations = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(iterations):
+            func()
+        elapsed = time.perf_counter() - started
+        if elapsed >= min_time:
+            return iterations
+        iterations *= 10 if elapsed < min_time / 10 else 2
+
+
+def measure(func, rounds, min_time):
+    iterations = calibrate(func, min_time)
+    timings = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        for _ in range(iterations):
+            func()
+        timings.append((time.perf_counter() - started) / iterations * 1e6)
+    return {
+        'rounds': rounds,
+        'iterations': iterations,
+        'min_us': round(min(timings), 3),
+        'median_us': round(statistics.median(timings), 3),
+        'mean_us': round(statistics.fmean(timings), 3),
+        'stddev_us': round(statistics.stdev(timings), 3) if rounds > 1 else 0.0,
+    }
+
+
+def compare(results, baseline, stat, threshold):
+    """Adds the baseline figure, the relative change and a status (ok, regressed, improved, new) to each result."""
+    key = f'{stat}_us'
+    for name, stats in results.items():
+        before = baseline.get(name, {}).get(key)
+        if not before:
+            stats['status'] = 'new'
+            continue
+        change = (stats[key] - before) / before
+        stats.update(baseline_us=before, change=round(change, 4),
+                     status='regressed' if change > threshold else 'improved' if change < -threshold else 'ok')
+
+
+def machine_info():
+    return {'python': platform.python_version(), 'implementation': platform.python_implementation(),
+            'platform': platform.platform(), 'machine': platform.machine()}
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--filter', help='Only run cases whose name contains this text')
+    parser.add_argument('--rounds', type=int, default=15)
+    parser.add_argument('--min-time', type=float, default=0.01, help='Minimum seconds per round')
+    parser.add_argument('--stat', choices=('min', 'median', 'mean'), default='min', help='Statistic compared with the baseline')
+    parser.add_argument('--threshold', type=float, default=0.25, help='Allowed slowdown against the baseline')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help='Baseline file to compare with or save to')
+    parser.add_argument('--save-baseline', action='store_true', help='Write the results as the new baseline')
+    parser.add_argument('--json', help='Write results to this JSON file')
+    args = parser.parse_args()
+
+    baseline = {}
+    if not args.save_baseline and os.path.exists(args.baseline):
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        if baseline.get('machine') != machine_info():
+            print(f"warning: the baseline was recorded on {baseline.get('machine')}; timings may not be comparable")
+
+    results = {}
+    try:
+        for name, func in build_cases().items():
+            if args.filter and args.filter not in name:
+                continue
+            results[name] = measure(func, args.rounds, args.min_time)
+    finally:
+        app.pdf_engine.close()
+    compare(results, baseline.get('cases', {}), args.stat, args.threshold)
+
+    print(f"{'case':<34}{'median us':>12}{'min us':>12}{'stddev us':>12}{'baseline us':>13}{'change':>9}  status")
+    for name, stats in results.items():
+        before = stats.get('baseline_us')
+        change = f"{stats['change']:+.1%}" if 'change' in stats else '-'
+        print(f"{name:<34}{stats['median_us']:>12.3f}{stats['min_us']:>12.3f}{stats['stddev_us']:>12.3f}"
+              f"{before if before is not None else '-':>13}{change:>9}  {stats['status']}")
+
+    report = {'commit': git_commit(), 'machine': machine_info(), 'stat': args.stat, 'threshold': args.threshold, 'cases': results}
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(os.path.abspath(args.baseline)), exist_ok=True)
+        cases = {name: {key: value for key, value in stats.items() if key.endswith('_us') and key != 'baseline_us'}
+                 for name, stats in results.items()}
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump({'commit': report['commit'], 'machine': report['machine'], 'cases': cases}, f, indent=2)
+        print(f"Saved baseline for {len(cases)} cases to {args.baseline}")
+        return
+
+    regressed = [name for name, stats in results.items() if stats['status'] == 'regressed']
+    if regressed:
+        print(f"{len(regressed)} case(s) regressed by more than {args.threshold:.0%} ({args.stat}): {', '.join(regressed)}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+"""
+Compares PDF text extraction backends on a corpus of sample PDFs.
+
+Usage (from the repository root):
+    python benchmarks/bench_pdf_extraction.py
+    python benchmarks/bench_pdf_extraction.py --corpus path/to/pdfs --runs 10 --json results.json
+
+Strategies measured:
+- legacy:            the original unbounded `text += page.extract_text()` loop, in-process
+- pypdf2_budgeted:   lazy PyPDF2 pages with the page/char budget, in-process
+- engine_pypdf2:     PdfExtractionEngine with the pypdf2 backend (worker pool, timeout, memory cap)
+- engine_pdftotext:  PdfExtractionEngine with the pdftotext backend (skipped if not installed)
+"""
+import argparse
+import io
+import json
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend'))
+
+from PyPDF2 import PdfReader  # noqa: E402
+
+from pdf_corpus import load_corpus  # noqa: E402
+from pdf_extraction import PdfExtractionEngine, collect_pages, iter_pages_pypdf2  # noqa: E402
+
+
+def legacy_extract(pdf_bytes):
+    text = ""
+    reader = PdfReader(io.BytesIO(pdf_bytes))
+    for page in reader.pages:
+        text += page.extract_text() or ""
+    return text
+
+
+def measure(func, pdf_bytes, runs):
+    timings = []
+    chars = 0
+    for _ in range(runs):
+        started = time.perf_counter()
+        chars = len(func(pdf_bytes))
+        timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+    return {
+        'median_ms': round(statistics.median(timings), 2),
+        'p95_ms': round(timings[min(len(timings) - 1, int(len(timings) * 0.95))], 2),
+        'min_ms': round(timings[0], 2),
+        'chars': chars,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--corpus', help='Directory of PDFs to use instead of the synthetic corpus')
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--max-pages', type=int, default=30)
+    parser.add_argument('--max-chars', type=int, default=20000)
+    parser.add_argument('--json', help='Write results to this JSON file')
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.corpus)
+    engine_pypdf2 = PdfExtractionEngine(backend='pypdf2', max_pages=args.max_pages, max_chars=args.max_chars, timeout=120)
+    engine_pdftotext = PdfExtractionEngine(backend='pdftotext', max_pages=args.max_pages, max_chars=args.max_chars, timeout=120)
+
+    strategies = {
+        'legacy': legacy_extract,
+        'pypdf2_budgeted': lambda b: collect_pages(iter_pages_pypdf2(b), args.max_pages, args.max_chars)[0],
+        'engine_pypdf2': lambda b: engine_pypdf2.extract(b).text,
+    }
+    if engine_pdftotext.pdftotext_path:
+        strategies['engine_pdftotext'] = lambda b: engine_pdftotext.extract(b).text
+    else:
+        print("pdftotext not found on PATH; skipping engine_pdftotext (install poppler-utils)")
+
+    # Warm the worker pools so process start-up is not attributed to the first file
+    sample = next(iter(corpus.values()))
+    for name in ('engine_pypdf2', 'engine_pdftotext'):
+        if name in strategies:
+            strategies[name](sample)
+
+    results = {}
+    header = f"{'file':<22}{'KB':>8}  " + "".join(f"{name:>20}" for name in strategies)
+    print(header)
+    print('-' * len(header))
+    for filename, pdf_bytes in corpus.items():
+        results[filename] = {'bytes': len(pdf_bytes)}
+        row = f"{filename:<22}{len(pdf_bytes) / 1024:>8.1f}  "
+        for name, func in strategies.items():
+            stats = measure(func, pdf_bytes, args.runs)
+            results[filename][name] = stats
+            row += f"{stats['median_ms']:>17.1f} ms"
+        print(row)
+
+    engine_pypdf2.close()
+    engine_pdftotext.close()
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'runs': args.runs, 'max_pages': args.max_pages, 'max_chars': args.max_chars, 'results': results}, f, indent=2)
+        print(f"Results written to {args.json}")
+
+
+if __name__ == '__main__':
+    main()
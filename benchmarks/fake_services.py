@@ -0,0 +1,303 @@
+"""
+Local stand-ins for the Groq and ZeroGPT APIs, so load tests spend no quota.
+
+Usage (from the repository root):
+    python benchmarks/fake_services.py --port 8765 --config fake.json
+
+Then start the backend with
+    GROQ_BASE_URL=http://127.0.0.1:8765 ZEROGPT_API_URL=http://127.0.0.1:8765/detect
+bench_load.py runs the services in its own process and does this for you.
+
+The Groq side answers POST .../chat/completions in the OpenAI/Groq format,
+as one JSON body or, for stream=true, as Server-Sent Events with usage in
+the final chunk's x_groq. The task of each request is recognised from its
+prompt (TASK_MARKERS), and the task selects the latency, the error rate and
+the canned JSON reply. The ZeroGPT side answers POST .../detect.
+
+The config file is a JSON object. Every key is optional, and per-task
+settings fall back to "default":
+
+    {
+      "latency": {"default": {"dist": "lognormal", "median_ms": 400, "sigma": 0.5},
+                  "questions": {"dist": "uniform", "min_ms": 1500, "max_ms": 3000}},
+      "error_rate": {"default": 0.0, "evaluation": 0.02},
+      "error_status": 500,
+      "responses": {"resume": {"name": "Ann", "email": "ann@example.com", ...}},
+      "zerogpt": {"latency": {"dist": "fixed", "ms": 150}, "error_rate": 0.0, "ai_percentage": 12.5}
+    }
+
+Latency distributions are fixed (ms), uniform (min_ms, max_ms), normal
+(mean_ms, stddev_ms), lognormal (median_ms, sigma) and exponential
+(mean_ms). error_status 429 replies carry a Retry-After of one second.
+"""
+import argparse
+import json
+import math
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# The first marker found in the user prompt names the task (the batch prompt also mentions "Candidate's Response")
+TASK_MARKERS = [
+    ('resume', 'Analyze the following resume text'),
+    ('questions', 'generate interview questions'),
+    ('code_evaluation', 'You are a code evaluator'),
+    ('batch_evaluation', 'Answers:\n'),
+    ('evaluation', "Candidate's Response:"),
+    ('assessment', 'Generate a comprehensive interview assessment'),
+]
+
+DEFAULT_CONFIG = {
+    'latency': {
+        'default': {'dist': 'lognormal', 'median_ms': 400, 'sigma': 0.4},
+        'questions': {'dist': 'lognormal', 'median_ms': 2500, 'sigma': 0.3},
+        'assessment': {'dist': 'lognormal', 'median_ms': 1800, 'sigma': 0.3},
+        'evaluation': {'dist': 'lognormal', 'median_ms': 250, 'sigma': 0.4},
+    },
+    'error_rate': {'default': 0.0},
+    'error_status': 500,
+    'responses': {},
+    'zerogpt': {'latency': {'dist': 'lognormal', 'median_ms': 300, 'sigma': 0.3}, 'error_rate': 0.0, 'ai_percentage': 12.5},
+}
+
+REVERSE_STRING_TESTS = {
+    'function_name': 'reverse_string',
+    'reference_solution': 'def reverse_string(s):\n    return s[::-1]',
+    'cases': [{'args': ['abc'], 'expected': 'cba'}, {'args': [''], 'expected': ''}, {'args': ['racecar'], 'expected': 'racecar'},
+              {'args': ['Hello, World'], 'expected': 'dlroW ,olleH'}],
+}
+SUM_EVENS_TESTS = {
+    'function_name': 'sum_evens',
+    'reference_solution': 'def sum_evens(n):\n    return sum(i for i in range(2, n + 1, 2))',
+    'cases': [{'args': [10], 'expected': 30}, {'args': [1], 'expected': 0}, {'args': [2], 'expected': 2}, {'args': [100], 'expected': 2550}],
+}
+
+CANNED_RESPONSES = {
+    'resume': {
+        'name': 'Load Test Candidate',
+        'email': 'candidate@example.com',
+        'experience': '6 years',
+        'key_skills': ['Python', 'Flask', 'PostgreSQL', 'Redis', 'Docker'],
+        'inferred_position': 'Backend Engineer',
+    },
+    'questions': {'questions': (
+        [{'id': f'tech_{i}', 'question': f'Technical question {i}: explain a backend design trade-off you have made.', 'tags': ['technical']}
+         for i in range(1, 11)]
+        + [{'id': f'soft_{i}', 'question': f'Soft skills question {i}: describe how you handled a disagreement.', 'tags': ['soft skills']}
+           for i in range(1, 4)]
+        + [{'id': f'comm_{i}', 'question': f'Communication question {i}: explain a technical topic to a non-engineer.', 'tags': ['communication']}
+           for i in range(1, 3)]
+        + [{'id': 'code_1', 'question': 'Write a function reverse_string(s) that returns the string reversed.',
+            'tags': ['coding', 'programming'], 'tests': REVERSE_STRING_TESTS},
+           {'id': 'code_2', 'question': 'Write a function sum_evens(n) that returns the sum of the even numbers from 1 to n.',
+            'tags': ['coding', 'programming'], 'tests': SUM_EVENS_TESTS}]
+    )},
+    'evaluation': {'technicalScore': 72, 'communicationScore': 80, 'relevanceScore': 76,
+                   'feedback': 'A relevant answer with sound reasoning; more concrete detail would strengthen it.'},
+    'code_evaluation': {'correctness': 85, 'logic': 80, 'syntax': 95, 'overall_score': 85,
+                        'feedback': 'Correct and readable solution.', 'has_errors': False},
+    'assessment': {
+        'overallScore': 74,
+        'recommendation': 'Recommended',
+        'detailedScores': {'technicalSkills': 75, 'communication': 78, 'softSkills': 70},
+        'keyStrengths': ['Clear explanations', 'Solid backend fundamentals'],
+        'areasForImprovement': ['More concrete metrics when describing impact'],
+    },
+}
+
+
+def merge_config(base, override):
+    """Recursively overlays `override` on a copy of `base`."""
+    merged = dict(base)
+    for key, value in override.items():
+        merged[key] = merge_config(base[key], value) if isinstance(value, dict) and isinstance(base.get(key), dict) else value
+    return merged
+
+
+def sample_latency(spec, rng):
+    """Seconds to wait for one request under a latency spec (see the module docstring)."""
+    dist = spec.get('dist', 'fixed')
+    if dist == 'fixed':
+        ms = spec.get('ms', 0)
+    elif dist == 'uniform':
+        ms = rng.uniform(spec['min_ms'], spec['max_ms'])
+    elif dist == 'normal':
+        ms = rng.gauss(spec['mean_ms'], spec['stddev_ms'])
+    elif dist == 'lognormal':
+        ms = rng.lognormvariate(math.log(spec['median_ms']), spec.get('sigma', 0.5))
+    elif dist == 'exponential':
+        ms = rng.expovariate(1 / spec['mean_ms'])
+    else:
+        raise ValueError(f"Unknown latency distribution {dist!r}")
+    return max(0.0, ms) / 1000
+
+
+def classify_prompt(prompt):
+    for task, marker in TASK_MARKERS:
+        if marker in prompt:
+            return task
+    return 'default'
+
+
+def batch_evaluations(prompt):
+    """One canned evaluation per answer in a batch scoring prompt, keyed by its question_id."""
+    try:
+        answers = json.loads(prompt.split('Answers:\n', 1)[1])
+    except (IndexError, ValueError):
+        answers = []
+    return {'evaluations': [dict(CANNED_RESPONSES['evaluation'], question_id=answer.get('question_id')) for answer in answers]}
+
+
+class FakeServices:
+    """Both stand-ins on one threaded HTTP server; start() runs it on a daemon thread."""
+
+    def __init__(self, config=None, host='127.0.0.1', port=0, seed=None):
+        self.config = merge_config(DEFAULT_CONFIG, config or {})
+        self._rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+        self._lock = threading.Lock()
+        self._counters = {}
+        services = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, *args):
+                pass
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers.get('Content-Length') or 0)) or b'{}')
+                if self.path.rstrip('/').endswith('/chat/completions'):
+                    services._groq(self, body)
+                elif self.path.rstrip('/').endswith('/detect'):
+                    services._zerogpt(self, body)
+                else:
+                    services._send_json(self, 404, {'error': {'message': f'No fake service at {self.path}'}})
+
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self.server.daemon_threads = True
+        self.server.request_queue_size = 1024
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self.server.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def start(self):
+        self._thread = threading.Thread(target=self.server.serve_forever, name='fake-services', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def _task_setting(self, name, task):
+        settings = self.config[name]
+        return settings.get(task, settings['default'])
+
+    def _draw(self, latency_spec, error_rate):
+        with self._rng_lock:
+            return sample_latency(latency_spec, self._rng), self._rng.random() < error_rate
+
+    def _count(self, service, task, outcome):
+        with self._lock:
+            counters = self._counters.setdefault(service, {}).setdefault(task, {'requests': 0, 'errors': 0})
+            counters['requests'] += 1
+            if outcome != 'ok':
+                counters['errors'] += 1
+
+    def _send_json(self, handler, status, payload, headers=None):
+        data = json.dumps(payload).encode()
+        handler.send_response(status)
+        handler.send_header('Content-Type', 'application/json')
+        handler.send_header('Content-Length', str(len(data)))
+        for name, value in (headers or {}).items():
+            handler.send_header(name, value)
+        handler.end_headers()
+        handler.wfile.write(data)
+
+    def _groq(self, handler, body):
+        messages = body.get('messages') or [{'content': ''}]
+        prompt = messages[-1].get('content') or ''
+        task = classify_prompt(prompt)
+        delay, failed = self._draw(self._task_setting('latency', task), self._task_setting('error_rate', task))
+        time.sleep(delay)
+        self._count('groq', task, 'error' if failed else 'ok')
+        if failed:
+            status = self.config['error_status']
+            self._send_json(handler, status, {'error': {'message': 'Fake upstream error', 'type': 'fake_error'}},
+                            {'Retry-After': '1'} if status == 429 else None)
+            return
+
+        reply = self.config['responses'].get(task) or (batch_evaluations(prompt) if task == 'batch_evaluation' else CANNED_RESPONSES.get(task, CANNED_RESPONSES['evaluation']))
+        content = json.dumps(reply)
+        usage = {'prompt_tokens': sum(len(m.get('content') or '') for m in messages) // 4, 'completion_tokens': len(content) // 4}
+        usage['total_tokens'] = usage['prompt_tokens'] + usage['completion_tokens']
+        model = body.get('model', 'fake-model')
+        created = int(time.time())
+        if not body.get('stream'):
+            self._send_json(handler, 200, {
+                'id': 'chatcmpl-fake', 'object': 'chat.completion', 'created': created, 'model': model,
+                'choices': [{'index': 0, 'message': {'role': 'assistant', 'content': content}, 'finish_reason': 'stop'}],
+                'usage': usage,
+            })
+            return
+
+        handler.send_response(200)
+        handler.send_header('Content-Type', 'text/event-stream')
+        handler.send_header('Connection', 'close')
+        handler.end_headers()
+        handler.close_connection = True
+        chunk = {'id': 'chatcmpl-fake', 'object': 'chat.completion.chunk', 'created': created, 'model': model}
+        for start in range(0, len(content), 24):
+            event = dict(chunk, choices=[{'index': 0, 'delta': {'content': content[start:start + 24]}, 'finish_reason': None}])
+            handler.wfile.write(f"data: {json.dumps(event)}\n\n".encode())
+        final = dict(chunk, choices=[{'index': 0, 'delta': {}, 'finish_reason': 'stop'}], x_groq={'id': 'fake', 'usage': usage})
+        handler.wfile.write(f"data: {json.dumps(final)}\n\ndata: [DONE]\n\n".encode())
+
+    def _zerogpt(self, handler, body):
+        settings = self.config['zerogpt']
+        delay, failed = self._draw(settings['latency'], settings['error_rate'])
+        time.sleep(delay)
+        self._count('zerogpt', 'detect', 'error' if failed else 'ok')
+        if failed:
+            self._send_json(handler, 503, {'success': False, 'message': 'Fake detector error'})
+            return
+        self._send_json(handler, 200, {'success': True, 'data': {
+            'fakePercentage': settings['ai_percentage'],
+            'textWords': len((body.get('input_text') or '').split()),
+        }})
+
+    def stats(self):
+        with self._lock:
+            return json.loads(json.dumps(self._counters))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--config', help='JSON file with latency, error and response overrides')
+    parser.add_argument('--seed', type=int, help='Seed for the latency and error draws')
+    args = parser.parse_args()
+
+    config = {}
+    if args.config:
+        with open(args.config) as f:
+            config = json.load(f)
+    services = FakeServices(config, host=args.host, port=args.port, seed=args.seed)
+    print(f"Fake Groq:    GROQ_BASE_URL={services.url}")
+    print(f"Fake ZeroGPT: ZEROGPT_API_URL={services.url}/detect")
+    try:
+        services.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print(json.dumps(services.stats(), indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+"""
+Synthetic LLM output corpus for the benchmarks.
+
+Builds the replies the backend parses, one per task shape (resume profile,
+question set, answer evaluation, batch evaluation, assessment), in each of
+the wrappers models actually produce: bare JSON, a markdown ```json fence,
+prose before and after the object, and JSON cut off mid-stream. Everything
+is generated deterministically, so the corpus needs no files.
+"""
+import json
+
+from fake_services import CANNED_RESPONSES
+
+
+def assessment_reply(questions=15):
+    """An assessment as large as a full interview produces, before the server drops detailedQuestionAnalysis."""
+    reply = dict(CANNED_RESPONSES['assessment'])
+    reply['detailedQuestionAnalysis'] = [
+        {'question': f'Question {i}: explain a backend design trade-off you have made.',
+         'response': 'I chose a write-through cache because {reads} dominate and "stale" data was unacceptable. ' * 4,
+         'score': 60 + i % 40}
+        for i in range(questions)
+    ]
+    return reply
+
+
+def batch_reply(answers=10):
+    return {'evaluations': [dict(CANNED_RESPONSES['evaluation'], question_id=f'tech_{i}') for i in range(1, answers + 1)]}
+
+
+REPLIES = {
+    'resume': CANNED_RESPONSES['resume'],
+    'questions': CANNED_RESPONSES['questions'],
+    'evaluation': CANNED_RESPONSES['evaluation'],
+    'batch_evaluation': batch_reply(),
+    'assessment': assessment_reply(),
+}
+
+
+def wrap(text, style):
+    if style == 'bare':
+        return text
+    if style == 'markdown':
+        return f"```json\n{text}\n```"
+    if style == 'prose':
+        return f"Sure! Here is the JSON you asked for, based on the {{candidate's}} answers:\n\n{text}\n\nLet me know if you need anything else."
+    if style == 'truncated':
+        return text[:len(text) * 3 // 4]
+    raise ValueError(f"Unknown wrapper style {style!r}")
+
+
+WRAPPER_STYLES = ('bare', 'markdown', 'prose', 'truncated')
+
+
+def build_corpus():
+    """Returns {'<task>_<style>': reply text} for every task and wrapper style."""
+    return {
+        f'{task}_{style}': wrap(json.dumps(reply, indent=2), style)
+        for task, reply in REPLIES.items()
+        for style in WRAPPER_STYLES
+    }
@@ -0,0 +1,86 @@
+"""
+Synthetic PDF corpus for the benchmarks.
+
+Writes minimal, valid text PDFs (Helvetica, one text block per line) without
+any third-party dependency, so benchmarks can run on a clean checkout.
+"""
+import os
+
+RESUME_LINES = [
+    "Jane Doe - Senior Software Engineer",
+    "jane.doe@example.com | +1 555 0100 | github.com/janedoe",
+    "Experience: 7 years building backend services in Python, Go and Java.",
+    "Led migration of a monolith to Flask microservices serving 2M requests/day.",
+    "Skills: Python, Flask, Django, PostgreSQL, Redis, Docker, Kubernetes, AWS.",
+    "Designed CI/CD pipelines and mentored a team of five engineers.",
+    "Education: B.Sc. Computer Science, 2016.",
+]
+
+# name -> page count
+DEFAULT_CORPUS = {
+    'resume_1_page': 1,
+    'resume_3_pages': 3,
+    'portfolio_20_pages': 20,
+    'report_100_pages': 100,
+    'dump_300_pages': 300,
+}
+
+
+def _escape(text):
+    return text.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+
+
+def build_pdf(pages):
+    """Builds a PDF where `pages` is a list of pages, each a list of text lines."""
+    objects = [
+        b"<</Type/Catalog/Pages 2 0 R>>",
+        None,  # page tree, filled in once page object ids are known
+        b"<</Type/Font/Subtype/Type1/BaseFont/Helvetica>>",
+    ]
+    page_ids = []
+    for lines in pages:
+        ops = ["BT /F1 11 Tf 14 TL 56 760 Td"]
+        for line in lines:
+            ops.append(f"({_escape(line)}) Tj T*")
+        ops.append("ET")
+        stream = "\n".join(ops).encode('latin-1', errors='replace')
+        content_id = len(objects) + 2
+        page_ids.append(len(objects) + 1)
+        objects.append(
+            f"<</Type/Page/Parent 2 0 R/MediaBox[0 0 612 792]/Resources<</Font<</F1 3 0 R>>>>/Contents {content_id} 0 R>>".encode()
+        )
+        objects.append(b"<</Length %d>>stream\n" % len(stream) + stream + b"\nendstream")
+    kids = " ".join(f"{page_id} 0 R" for page_id in page_ids)
+    objects[1] = f"<</Type/Pages/Kids[{kids}]/Count {len(page_ids)}>>".encode()
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref_offset = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        out += b"%010d 00000 n \n" % offset
+    out += b"trailer<</Size %d/Root 1 0 R>>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref_offset)
+    return bytes(out)
+
+
+def synthetic_resume(page_count, lines_per_page=40):
+    pages = []
+    for page in range(page_count):
+        lines = [f"{RESUME_LINES[i % len(RESUME_LINES)]} (p{page + 1}.{i + 1})" for i in range(lines_per_page)]
+        pages.append(lines)
+    return build_pdf(pages)
+
+
+def load_corpus(directory=None):
+    """Returns {name: pdf_bytes}; reads *.pdf from `directory` if given, else builds the default corpus."""
+    if directory:
+        corpus = {}
+        for filename in sorted(os.listdir(directory)):
+            if filename.lower().endswith('.pdf'):
+                with open(os.path.join(directory, filename), 'rb') as f:
+                    corpus[filename] = f.read()
+        return corpus
+    return {name: synthetic_resume(page_count) for name, page_count in DEFAULT_CORPUS.items()}
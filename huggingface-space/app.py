@@ -5,15 +5,19 @@ Deployed: December 2024
 """
 
 import os
-from flask import Flask, request, jsonify, send_from_directory, send_file
+from flask import Flask, request, jsonify, send_from_directory, send_file, Response, g
 from flask_cors import CORS
 from groq import Groq
 import json
 import uuid
-import re
+import time
 from datetime import datetime
 from PyPDF2 import PdfReader
 
+from session_store import create_session_backend
+from json_stream import extract_json_value
+from metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, MetricsRegistry
+
 # Configuration
 API_KEY = os.getenv('GROQ_API_KEY', '')
 GROQ_MODEL = 'llama-3.3-70b-versatile'
@@ -25,47 +29,69 @@ client = None
 if API_KEY:
     client = Groq(api_key=API_KEY)
 
-sessions = {}
+sessions = create_session_backend()
+
+# Prometheus metrics served at /metrics
+metrics = MetricsRegistry()
+http_request_seconds = metrics.histogram('hr_ai_http_request_duration_seconds', 'Request latency by route', ('route', 'method', 'status'))
+groq_request_seconds = metrics.histogram('hr_ai_groq_request_duration_seconds', 'Groq call latency by task and outcome', ('task', 'outcome'))
+groq_tokens_total = metrics.counter('hr_ai_groq_tokens_total', 'Tokens reported in Groq usage by task and kind', ('task', 'kind'))
+pdf_extraction_seconds = metrics.histogram('hr_ai_pdf_extraction_duration_seconds', 'PDF text extraction time by backend', ('backend',))
+pdf_pages = metrics.histogram('hr_ai_pdf_pages', 'Pages extracted per resume', buckets=(1, 2, 3, 5, 10, 20, 50, 100))
+pdf_extraction_failures_total = metrics.counter('hr_ai_pdf_extraction_failures_total', 'PDF extractions that raised an error')
+metrics.gauge('hr_ai_sessions', 'Sessions currently stored', callback=lambda: sessions.stats()['entries'])
+
+@app.before_request
+def start_request_timer():
+    g.request_started = time.perf_counter()
+
+@app.after_request
+def observe_request_latency(response):
+    started = g.pop('request_started', None)
+    if started is not None:
+        route = request.url_rule.rule if request.url_rule else 'unmatched'
+        http_request_seconds.observe(time.perf_counter() - started, route=route, method=request.method, status=response.status_code)
+    return response
 
 def get_or_create_session(session_id):
-    if session_id not in sessions:
-        sessions[session_id] = {
-            'candidate_profile': None,
-            'interview_questions': [],
-            'interview_responses': [],
-            'interview_start_time': None,
-            'interview_end_time': None
-        }
-    return sessions[session_id]
+    return sessions.get_or_create(session_id)
 
 def extract_text_from_pdf(pdf_file):
+    started = time.perf_counter()
     try:
         reader = PdfReader(pdf_file)
-        return "".join(p.extract_text() or "" for p in reader.pages)
+        text = "".join(p.extract_text() or "" for p in reader.pages)
+        pdf_extraction_seconds.observe(time.perf_counter() - started, backend='pypdf2')
+        pdf_pages.observe(len(reader.pages))
+        return text
     except:
+        pdf_extraction_failures_total.inc()
         return ""
 
 def extract_json_from_response(text):
-    match = re.search(r'```(?:json)?\s*([\s\S]*?)\s*```', text)
-    if match:
-        try: return json.loads(match.group(1))
-        except: pass
-    if '{' in text:
-        try: return json.loads(text[text.find('{'):text.rfind('}')+1])
-        except: pass
-    return None
+    return extract_json_value(text)
 
 
-def generate_content_with_groq(prompt):
+def generate_content_with_groq(prompt, task='default'):
     if not client: return None
+    started = time.perf_counter()
+    resp = None
     try:
         resp = client.chat.completions.create(
             messages=[{"role": "system", "content": "Return only valid JSON."}, {"role": "user", "content": prompt}],
             model=GROQ_MODEL, temperature=0.7, max_tokens=4096
         )
+        groq_request_seconds.observe(time.perf_counter() - started, task=task, outcome='ok')
+        usage = getattr(resp, 'usage', None)
+        for kind in ('prompt', 'completion'):
+            tokens = getattr(usage, f'{kind}_tokens', None)
+            if tokens:
+                groq_tokens_total.inc(tokens, task=task, kind=kind)
         data = extract_json_from_response(resp.choices[0].message.content)
         return json.dumps(data) if data else None
     except Exception as e:
+        if resp is None:
+            groq_request_seconds.observe(time.perf_counter() - started, task=task, outcome='error')
         print(f"Groq Error: {e}")
         return None
 
@@ -101,7 +127,7 @@ def serve_assets(filename):
 @app.route('/upload_resume', methods=['POST'])
 def upload_resume():
     session_id = request.headers.get('X-User-Session-Id', str(uuid.uuid4()))
-    session = get_or_create_session(session_id)
+    get_or_create_session(session_id)
     
     if 'resume' not in request.files:
         return jsonify({'error': 'No resume file'}), 400
@@ -123,7 +149,7 @@ Return ONLY valid JSON: {{"name":"","email":"","experience":"","key_skills":[],"
 Resume text:
 {text[:8000]}'''
     
-    resp = generate_content_with_groq(prompt)
+    resp = generate_content_with_groq(prompt, task='resume')
     if resp:
         profile = json.loads(resp)
         if not isinstance(profile.get('key_skills'), list): profile['key_skills'] = []
@@ -133,17 +159,17 @@ Resume text:
             profile['experience'] = f"{exp.get('years', '')} years" if 'years' in exp else str(exp)
         elif isinstance(profile.get('experience'), list):
             profile['experience'] = ', '.join(str(e) for e in profile['experience'])
-        session['candidate_profile'] = profile
+        sessions.update(session_id, lambda s: s.update(candidate_profile=profile))
         return jsonify({'message': 'Success', 'candidate_profile': profile, 'session_id': session_id}), 200
     return jsonify({'error': 'AI failed'}), 500
 
 @app.route('/setup_interview', methods=['POST'])
 def setup_interview():
     session_id = request.headers.get('X-User-Session-Id')
-    if not session_id or session_id not in sessions:
+    session = sessions.get(session_id)
+    if session is None:
         return jsonify({'error': 'Invalid session'}), 400
     
-    session = sessions[session_id]
     data = request.get_json()
     position = data.get('position_role', '')
     profile = session.get('candidate_profile')
@@ -160,22 +186,24 @@ Skills: {skills}. Experience: {profile.get('experience','N/A')}.
 Generate: 10 Technical, 3 Soft Skills, 2 Communication {coding_text}
 Return: {{"questions":[{{"id":"q1","question":"...","tags":["technical"]}}]}}'''
     
-    resp = generate_content_with_groq(prompt)
+    resp = generate_content_with_groq(prompt, task='questions')
     if resp:
         result = json.loads(resp)
-        session['interview_questions'] = result.get('questions', [])
-        session['interview_responses'] = []
-        session['interview_start_time'] = datetime.now().isoformat()
+        sessions.update(session_id, lambda s: s.update(
+            interview_questions=result.get('questions', []),
+            interview_responses=[],
+            interview_start_time=datetime.now().isoformat()
+        ))
         return jsonify({'message': 'Generated', 'questions': result.get('questions', []), 'is_coding_role': is_coding}), 200
     return jsonify({'error': 'Failed'}), 500
 
 @app.route('/submit_answer', methods=['POST'])
 def submit_answer():
     session_id = request.headers.get('X-User-Session-Id')
-    if not session_id or session_id not in sessions:
+    session = sessions.get(session_id)
+    if session is None:
         return jsonify({'error': 'Invalid session'}), 400
     
-    session = sessions[session_id]
     data = request.get_json()
     qid = data.get('question_id')
     answer = data.get('response_text', '')
@@ -189,21 +217,21 @@ Q: {q['question']}
 A: {answer}
 Return: {{"technicalScore":85,"communicationScore":90,"relevanceScore":88,"feedback":"..."}}'''
     
-    resp = generate_content_with_groq(prompt)
+    resp = generate_content_with_groq(prompt, task='evaluation')
     if resp:
         ev = json.loads(resp)
         ev['score'] = round((ev.get('technicalScore',0)+ev.get('communicationScore',0)+ev.get('relevanceScore',0))/3)
-        session['interview_responses'].append({'question_id':qid,'question':q['question'],'tags':q.get('tags',[]),'response':answer,'duration':duration,'evaluation':ev})
+        sessions.update(session_id, lambda s: s['interview_responses'].append({'question_id':qid,'question':q['question'],'tags':q.get('tags',[]),'response':answer,'duration':duration,'evaluation':ev}))
         return jsonify({'message': 'Evaluated', 'evaluation': ev}), 200
     return jsonify({'error': 'Failed'}), 500
 
 @app.route('/get_assessment', methods=['GET'])
 def get_assessment():
     session_id = request.headers.get('X-User-Session-Id')
-    if not session_id or session_id not in sessions:
+    session = sessions.get(session_id)
+    if session is None:
         return jsonify({'error': 'Invalid session'}), 400
     
-    session = sessions[session_id]
     if not session.get('interview_responses'):
         return jsonify({'error': 'No responses'}), 400
     
@@ -216,7 +244,7 @@ def get_assessment():
 {summary}
 Return: {{"overallScore":85,"recommendation":"Recommended","keyStrengths":["..."],"areasForImprovement":["..."],"detailedScores":{{"technicalSkills":85,"communication":80,"softSkills":78}}}}'''
     
-    resp = generate_content_with_groq(prompt)
+    resp = generate_content_with_groq(prompt, task='assessment')
     if resp:
         a = json.loads(resp)
         a['detailedQuestionAnalysis'] = [{'question':r['question'],'score':r['evaluation']['score'],'technicalScore':r['evaluation'].get('technicalScore',0),'communicationScore':r['evaluation'].get('communicationScore',0),'relevanceScore':r['evaluation'].get('relevanceScore',0)} for r in responses]
@@ -227,6 +255,14 @@ Return: {{"overallScore":85,"recommendation":"Recommended","keyStrengths":["..."
 def log_security():
     return jsonify({'message': 'Logged'}), 200
 
+@app.route('/session_stats', methods=['GET'])
+def session_stats():
+    return jsonify(sessions.stats()), 200
+
+@app.route('/metrics', methods=['GET'])
+def metrics_endpoint():
+    return Response(metrics.render(), content_type=METRICS_CONTENT_TYPE)
+
 if __name__ == '__main__':
     port = int(os.environ.get('PORT', 7860))
     app.run(host='0.0.0.0', port=port, debug=False)
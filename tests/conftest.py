@@ -0,0 +1,10 @@
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'backend'))
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
+
+# app refuses to import without a Groq key; the tests never call Groq
+os.environ.setdefault('GROQ_API_KEY', 'gsk_test')
+os.environ.setdefault('LOG_LEVEL', 'ERROR')
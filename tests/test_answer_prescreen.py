@@ -0,0 +1,69 @@
+import pytest
+
+from answer_prescreen import AnswerPrescreen, classify_answer
+
+REAL_SHORT_ANSWERS = [
+    'Use a hash map.',
+    'O(n log n)',
+    'Binary search.',
+    'Use a queue.',
+    'LRU cache with TTL',
+    'Kafka',
+    'CQRS',
+    'def f(x): return x * 2',
+    'SELECT * FROM users WHERE id = 1;',
+    'for i in range(n): total += i',
+    'git rebase -i HEAD~3',
+    'pthread_mutex_lock',
+]
+
+
+@pytest.mark.parametrize('answer', REAL_SHORT_ANSWERS)
+def test_short_technical_answers_go_to_the_model(answer):
+    assert classify_answer(answer) is None
+
+
+@pytest.mark.parametrize('answer, reason', [
+    ('', 'empty'),
+    ('   ', 'empty'),
+    ('?!', 'empty'),
+    ("I don't know", 'dont_know'),
+    ('Sorry, no idea.', 'dont_know'),
+    ('um not sure', 'dont_know'),
+    ('pass', 'dont_know'),
+    ('asdfgh jklqwe', 'gibberish'),
+    ('qwrtp zxcvb mnbvc', 'gibberish'),
+    ('Asdfgh Jklqwe', 'gibberish'),
+    ('aaaa aaaa aaaa aaaa aaaa aaa', 'gibberish'),
+    ('yes', 'too_short'),
+    ('It depends.', 'too_short'),
+    ('I think it is good', 'too_short'),
+])
+def test_hopeless_answers_are_settled_locally(answer, reason):
+    assert classify_answer(answer) == reason
+
+
+def test_long_answers_go_to_the_model():
+    answer = 'I would profile the slow endpoint first, then add an index on the column used by the filter.'
+    assert classify_answer(answer) is None
+
+
+def test_screen_returns_evaluations_and_counts_outcomes():
+    prescreen = AnswerPrescreen(enabled=True, min_words=10)
+    assert prescreen.screen('Use a hash map.') is None
+    assert prescreen.screen('') == {'technicalScore': 0, 'communicationScore': 0, 'relevanceScore': 0,
+                                    'feedback': 'No answer was given.'}
+    assert prescreen.screen('asdfgh jklqwe')['technicalScore'] <= 10
+    short = prescreen.screen('It depends.')
+    assert short['technicalScore'] == 4 and '2 words' in short['feedback']
+
+    stats = prescreen.stats()
+    assert (stats['screened'], stats['sent_to_llm'], stats['prescreened']) == (4, 1, 3)
+    assert (stats['empty'], stats['gibberish'], stats['too_short']) == (1, 1, 1)
+    assert stats['hit_ratio'] == 0.75
+
+
+def test_disabled_prescreen_sends_everything_to_the_model():
+    prescreen = AnswerPrescreen(enabled=False)
+    assert prescreen.screen('') is None
+    assert prescreen.stats()['screened'] == 0
@@ -0,0 +1,204 @@
+import asyncio
+import io
+import json
+
+import httpx
+import pytest
+from groq import AsyncGroq, Groq
+
+import app
+import asgi
+from fake_services import FakeServices
+from groq_scheduler import GroqScheduler, SchedulerBusyError
+from pdf_corpus import RESUME_LINES, build_pdf
+
+INSTANT = {'dist': 'fixed', 'ms': 0}
+ANSWER = {'response_text': 'I would measure first and then design a cache with a TTL.', 'duration': '01:10'}
+
+
+@pytest.fixture(scope='module')
+def fakes():
+    services = FakeServices(config={'latency': {task: INSTANT for task in ('default', 'questions', 'assessment', 'evaluation')},
+                                    'zerogpt': {'latency': INSTANT}}).start()
+    yield services
+    services.stop()
+
+
+@pytest.fixture(autouse=True)
+def backend(fakes, monkeypatch):
+    """Points both servers at the fake Groq and ZeroGPT services, with a scheduler that never throttles."""
+    scheduler = GroqScheduler(rpm=100000, tpm=10 ** 9)
+    monkeypatch.setattr(app, 'client', Groq(api_key='gsk_test', base_url=fakes.url, max_retries=0))
+    monkeypatch.setattr(asgi, 'async_client', AsyncGroq(api_key='gsk_test', base_url=fakes.url, max_retries=0))
+    monkeypatch.setattr(app, 'groq_scheduler', scheduler)
+    monkeypatch.setattr(asgi, 'groq_scheduler', scheduler)
+    monkeypatch.setattr(app.zerogpt_client, 'url', fakes.url + '/detect')
+    return scheduler
+
+
+def run_asgi(test):
+    """Runs test(client) against asgi.app on a fresh event loop."""
+    async def main():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=asgi.app), base_url='http://testserver') as client:
+            try:
+                return await test(client)
+            finally:
+                # Both clients hold connections bound to this loop
+                await asgi.async_client.close()
+                await app.zerogpt_client.aclose()
+    return asyncio.run(main())
+
+
+def resume_pdf(name):
+    return build_pdf([[f'Candidate {name}'] + RESUME_LINES])
+
+
+def without(body, keys):
+    return {key: value for key, value in body.items() if key not in keys}
+
+
+def without_session(body):
+    return without(body, {'session_id'})
+
+
+def start_flask_interview(client, session_id):
+    headers = {'X-User-Session-Id': session_id}
+    client.post('/upload_resume', data={'resume': (io.BytesIO(resume_pdf(session_id)), 'resume.pdf')},
+                headers=headers, content_type='multipart/form-data')
+    questions = client.post('/setup_interview', json={'position_role': 'Backend Engineer'}, headers=headers).get_json()['questions']
+    return headers, questions
+
+
+async def start_asgi_interview(client, session_id):
+    headers = {'X-User-Session-Id': session_id}
+    await client.post('/upload_resume', files={'resume': ('resume.pdf', resume_pdf(session_id), 'application/pdf')}, headers=headers)
+    response = await client.post('/setup_interview', json={'position_role': 'Backend Engineer'}, headers=headers)
+    return headers, response.json()['questions']
+
+
+def test_native_routes_answer_like_the_flask_routes():
+    flask_client = app.app.test_client()
+    headers = {'X-User-Session-Id': 'flask-native'}
+    flask_upload = flask_client.post('/upload_resume', data={'resume': (io.BytesIO(resume_pdf('native')), 'resume.pdf')},
+                                     headers=headers, content_type='multipart/form-data')
+    flask_setup = flask_client.post('/setup_interview', json={'position_role': 'Backend Engineer'}, headers=headers)
+    flask_answer = flask_client.post('/submit_answer', json=dict(ANSWER, question_id='tech_1'), headers=headers)
+
+    async def test(client):
+        headers = {'X-User-Session-Id': 'asgi-native'}
+        upload = await client.post('/upload_resume', files={'resume': ('resume.pdf', resume_pdf('native'), 'application/pdf')}, headers=headers)
+        setup = await client.post('/setup_interview', json={'position_role': 'Backend Engineer'}, headers=headers)
+        answer = await client.post('/submit_answer', json=dict(ANSWER, question_id='tech_1'), headers=headers)
+        return upload, setup, answer
+
+    upload, setup, answer = run_asgi(test)
+    assert upload.status_code == flask_upload.status_code == 200
+    # The second upload of the same PDF is a resume-cache hit
+    assert without_session(upload.json()) == dict(without_session(flask_upload.get_json()), cached=True)
+    assert setup.status_code == flask_setup.status_code == 200
+    assert setup.json()['questions'] == flask_setup.get_json()['questions']
+    assert answer.status_code == flask_answer.status_code == 200
+    timings = {'stage_timings'}
+    assert answer.json().keys() == flask_answer.get_json().keys()
+    assert without(answer.json(), timings) == without(flask_answer.get_json(), timings)
+
+
+def test_other_routes_are_bridged_to_the_flask_app():
+    flask_client = app.app.test_client()
+    headers, questions = start_flask_interview(flask_client, 'flask-bridged')
+    flask_client.post('/submit_answer', json=dict(ANSWER, question_id=questions[0]['id']), headers=headers)
+    flask_progress = flask_client.get('/interview_progress', headers=headers)
+
+    async def test(client):
+        headers, questions = await start_asgi_interview(client, 'asgi-bridged')
+        await client.post('/submit_answer', json=dict(ANSWER, question_id=questions[0]['id']), headers=headers)
+        return await client.get('/interview_progress', headers=headers), await client.get('/no_such_route')
+
+    progress, missing = run_asgi(test)
+    assert progress.status_code == 200
+    assert progress.json() == flask_progress.get_json()
+    assert missing.status_code == 404
+
+
+def sse_events(body):
+    events = []
+    for block in body.strip().split('\n\n'):
+        lines = dict(line.split(': ', 1) for line in block.splitlines() if not line.startswith(':'))
+        events.append((lines['event'], json.loads(lines['data'])))
+    return events
+
+
+def test_assessment_stream_sends_the_same_events():
+    flask_client = app.app.test_client()
+    headers, questions = start_flask_interview(flask_client, 'flask-stream')
+    # An assessment needs at least eight answers
+    for question in questions[:8]:
+        flask_client.post('/submit_answer', json=dict(ANSWER, question_id=question['id']), headers=headers)
+    flask_events = sse_events(flask_client.get('/get_assessment_stream', headers=headers).get_data(as_text=True))
+
+    async def test(client):
+        headers, questions = await start_asgi_interview(client, 'asgi-stream')
+        for question in questions[:8]:
+            await client.post('/submit_answer', json=dict(ANSWER, question_id=question['id']), headers=headers)
+        async with client.stream('GET', '/get_assessment_stream', headers=headers) as response:
+            body = b''.join([chunk async for chunk in response.aiter_bytes()])
+        return response, body.decode()
+
+    response, body = run_asgi(test)
+    assert response.headers['content-type'].startswith('text/event-stream')
+    events = sse_events(body)
+    assert events[-1][0] == 'complete'
+    assert [name for name, _ in events] == [name for name, _ in flask_events]
+    assert events[-1][1] == flask_events[-1][1]
+
+
+def test_busy_scheduler_answers_429_with_retry_after(backend, monkeypatch):
+    def busy(*args, **kwargs):
+        raise SchedulerBusyError('queue full', 2.2)
+
+    async def busy_async(*args, **kwargs):
+        busy()
+
+    monkeypatch.setattr(backend, 'acquire', busy)
+    monkeypatch.setattr(backend, 'acquire_async', busy_async)
+    flask_client = app.app.test_client()
+    flask_headers = {'X-User-Session-Id': 'flask-busy'}
+    flask_response = flask_client.post('/upload_resume', data={'resume': (io.BytesIO(resume_pdf('busy flask')), 'resume.pdf')},
+                                       headers=flask_headers, content_type='multipart/form-data')
+
+    async def test(client):
+        return await client.post('/upload_resume', files={'resume': ('resume.pdf', resume_pdf('busy asgi'), 'application/pdf')},
+                                 headers={'X-User-Session-Id': 'asgi-busy'})
+
+    response = run_asgi(test)
+    assert response.status_code == flask_response.status_code == 429
+    assert response.headers['Retry-After'] == flask_response.headers['Retry-After'] == '3'
+    assert response.json() == flask_response.get_json()
+
+
+def test_oversized_body_is_rejected_before_it_is_buffered(monkeypatch):
+    monkeypatch.setitem(app.app.config, 'MAX_CONTENT_LENGTH', 1024)
+
+    async def test(client):
+        declared = await client.post('/submit_answer', content=b'x' * 2048, headers={'Content-Type': 'application/json'})
+
+        async def chunks():
+            for _ in range(4):
+                yield b'x' * 512
+
+        streamed = await client.post('/submit_answer', content=chunks(), headers={'Content-Type': 'application/json'})
+        return declared, streamed
+
+    declared, streamed = run_asgi(test)
+    assert declared.status_code == streamed.status_code == 413
+    assert declared.json() == {'error': 'The request body is larger than 1024 bytes'}
+
+
+def test_teardown_runs_for_native_views(monkeypatch):
+    torn_down = []
+    # The app has served requests already, so the handler is added to its registry directly
+    monkeypatch.setitem(app.app.teardown_request_funcs, None,
+                        [*app.app.teardown_request_funcs.get(None, []), lambda error: torn_down.append(error)])
+    response = run_asgi(lambda client: client.post('/submit_answer', json={}, headers={'X-User-Session-Id': 'asgi-teardown'}))
+    assert response.status_code == 400
+    assert torn_down == [None]
@@ -0,0 +1,90 @@
+import io
+
+import pytest
+from groq import Groq
+
+import app
+from batch_scoring import chunk_answers, parse_batch_evaluations
+from fake_services import FakeServices
+from groq_scheduler import GroqScheduler
+from pdf_corpus import RESUME_LINES, build_pdf
+
+INSTANT = {'dist': 'fixed', 'ms': 0}
+EVALUATION = {'technicalScore': 72, 'communicationScore': 80, 'relevanceScore': 76, 'feedback': 'Sound reasoning.'}
+
+
+def test_chunk_answers_respects_count_and_token_budget():
+    items = [(f'q{i}', 'Question?', 'word ' * 40) for i in range(5)]
+    assert [len(batch) for batch in chunk_answers(items, max_answers=2, max_tokens=10 ** 6)] == [2, 2, 1]
+    # Each item is far over a tiny budget, so each gets a batch of its own
+    assert [len(batch) for batch in chunk_answers(items, max_answers=10, max_tokens=1)] == [1] * 5
+    assert chunk_answers([]) == []
+    assert chunk_answers([('q0', 'Question?', None)]) == [[('q0', 'Question?', None)]]
+
+
+def test_parse_batch_evaluations_keeps_valid_entries_for_expected_ids():
+    payload = {'evaluations': [
+        dict(EVALUATION, question_id='q1', technicalScore=72.4, extra='dropped'),
+        dict(EVALUATION, question_id='q1', technicalScore=10),  # duplicate: the first one wins
+        dict(EVALUATION, question_id='q2', relevanceScore=101),  # out of range
+        dict(EVALUATION, question_id='q3', communicationScore=True),  # a bool is not a score
+        dict(EVALUATION, question_id='unknown'),
+        {'question_id': ['q4']},
+        'not an entry',
+        dict(EVALUATION, question_id='q4', feedback=None),
+    ]}
+    evaluations, missing = parse_batch_evaluations(payload, ['q1', 'q2', 'q3', 'q4', 'q5'])
+    assert evaluations == {'q1': dict(EVALUATION, technicalScore=72), 'q4': dict(EVALUATION, feedback='')}
+    assert missing == ['q2', 'q3', 'q5']
+
+
+@pytest.mark.parametrize('payload', [None, [], {'evaluations': 'none'}, {'other': []}])
+def test_parse_batch_evaluations_reports_everything_missing_for_bad_replies(payload):
+    assert parse_batch_evaluations(payload, ['q1', 'q2']) == ({}, ['q1', 'q2'])
+
+
+@pytest.fixture
+def fakes(monkeypatch):
+    services = FakeServices(config={'latency': {task: INSTANT for task in ('default', 'questions', 'evaluation', 'batch_evaluation')},
+                                    'zerogpt': {'latency': INSTANT}}).start()
+    monkeypatch.setattr(app, 'client', Groq(api_key='gsk_test', base_url=services.url, max_retries=0))
+    monkeypatch.setattr(app, 'groq_scheduler', GroqScheduler(rpm=100000, tpm=10 ** 9))
+    monkeypatch.setattr(app.zerogpt_client, 'url', services.url + '/detect')
+    yield services
+    services.stop()
+
+
+def start_interview(client, session_id):
+    headers = {'X-User-Session-Id': session_id}
+    pdf = build_pdf([[f'Candidate {session_id}'] + RESUME_LINES])
+    client.post('/upload_resume', data={'resume': (io.BytesIO(pdf), 'resume.pdf')}, headers=headers,
+                content_type='multipart/form-data')
+    questions = client.post('/setup_interview', json={'position_role': 'Backend Engineer'}, headers=headers).get_json()['questions']
+    return headers, questions
+
+
+@pytest.mark.parametrize('question_id', [['tech_1'], {'id': 'tech_1'}, 7])
+def test_batch_rejects_question_ids_that_are_not_strings(fakes, question_id):
+    client = app.app.test_client()
+    headers, _ = start_interview(client, 'batch-bad-id')
+    response = client.post('/submit_answers', json={'answers': [{'question_id': question_id, 'response_text': 'An answer.'}]},
+                           headers=headers)
+    assert response.status_code == 400
+
+
+def test_single_and_batch_submissions_store_the_same_evaluation(fakes):
+    answer = 'I would add an index on the filtered column and measure the query plan before and after.'
+    reply = dict(EVALUATION, technicalScore=72.4, strengths=['indexing'])
+    client = app.app.test_client()
+    stored = []
+    for session_id, path in (('single-path', '/submit_answer'), ('batch-path', '/submit_answers')):
+        headers, questions = start_interview(client, session_id)
+        question_id = questions[0]['id']
+        fakes.config['responses']['evaluation'] = reply
+        fakes.config['responses']['batch_evaluation'] = {'evaluations': [dict(reply, question_id=question_id)]}
+        body = {'question_id': question_id, 'response_text': answer}
+        response = client.post(path, json=body if path == '/submit_answer' else {'answers': [body]}, headers=headers)
+        assert response.status_code == 200
+        stored.append(app.sessions.get(headers['X-User-Session-Id'])['interview_responses'][0]['evaluation'])
+    assert stored[0] == stored[1]
+    assert stored[0]['technicalScore'] == 72 and 'strengths' not in stored[0]
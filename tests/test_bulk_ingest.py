@@ -0,0 +1,77 @@
+import io
+import threading
+import zipfile
+
+import pytest
+
+from bulk_ingest import BulkFileError, BulkIngestor, BulkUploadError, collect_batch
+
+PDF = b'%PDF-1.4 resume'
+
+
+def wait_for_job(ingestor, job_id):
+    version = 0
+    while True:
+        summary, _, version = ingestor.changes_since(job_id, version, 5)
+        if summary['status'] == 'completed':
+            return ingestor.status(job_id)
+
+
+def test_failing_files_do_not_fail_the_rest_of_the_batch():
+    def extract(pdf_bytes):
+        if b'scanned' in pdf_bytes:
+            raise BulkFileError('Could not extract text from the PDF.')
+        if b'crash' in pdf_bytes:
+            raise RuntimeError('worker died')
+        return None, {'text': pdf_bytes.decode()}
+
+    def analyze(context):
+        if 'bad-json' in context['text']:
+            raise ValueError('invalid JSON')
+        return {'name': context['text']}
+
+    archive = io.BytesIO()
+    with zipfile.ZipFile(archive, 'w') as zf:
+        zf.writestr('a.pdf', PDF + b' a')
+        zf.writestr('scanned.pdf', PDF + b' scanned')
+        zf.writestr('notes.txt', b'not a pdf')
+    archive.seek(0)
+    entries = collect_batch([
+        ('batch.zip', archive),
+        ('crash.pdf', io.BytesIO(PDF + b' crash')),
+        ('bad.pdf', io.BytesIO(PDF + b' bad-json')),
+        ('b.pdf', io.BytesIO(PDF + b' b')),
+    ])
+    ingestor = BulkIngestor(extract, analyze)
+    status = wait_for_job(ingestor, ingestor.submit(entries)['job_id'])
+
+    results = {f['filename']: (f['status'], f['error']) for f in status['files']}
+    assert results['a.pdf'] == ('done', None)
+    assert results['b.pdf'] == ('done', None)
+    assert results['scanned.pdf'] == ('failed', 'Could not extract text from the PDF.')
+    assert results['notes.txt'] == ('failed', 'Not a PDF file')
+    assert results['crash.pdf'] == ('failed', 'Extraction failed: worker died')
+    assert results['bad.pdf'] == ('failed', 'Analysis failed: invalid JSON')
+    assert status['counts']['done'] == 2 and status['counts']['failed'] == 4
+    assert ingestor.stats()['queued_bytes'] == 0
+
+
+def test_batches_over_the_queued_bytes_limit_are_rejected():
+    release = threading.Event()
+
+    def extract(pdf_bytes):
+        release.wait(5)
+        return {'name': 'cached'}, None
+
+    ingestor = BulkIngestor(extract, lambda context: None, extract_concurrency=1, max_queued_bytes=3 * len(PDF))
+    first = ingestor.submit([(f'{i}.pdf', PDF, None) for i in range(2)])
+    with pytest.raises(BulkUploadError) as rejected:
+        ingestor.submit([(f'{i}.pdf', PDF, None) for i in range(2)])
+    assert rejected.value.status == 429
+    assert ingestor.stats()['rejected_jobs'] == 1
+
+    release.set()
+    wait_for_job(ingestor, first['job_id'])
+    assert ingestor.stats()['queued_bytes'] == 0
+    second = ingestor.submit([(f'{i}.pdf', PDF, None) for i in range(2)])
+    assert wait_for_job(ingestor, second['job_id'])['counts']['done'] == 2
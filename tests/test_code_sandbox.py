@@ -0,0 +1,79 @@
+import pytest
+
+from code_sandbox import CodeSandbox, evaluation_from_report, harness_report, sandbox_available
+
+pytestmark = pytest.mark.skipif(not sandbox_available(), reason='the sandbox needs the POSIX resource module')
+
+SQUARE_TESTS = {'function_name': 'square', 'cases': [{'args': [2], 'expected': 4}, {'args': [3], 'expected': 9}]}
+
+
+@pytest.fixture(scope='module')
+def sandbox():
+    return CodeSandbox(max_workers=2, wall_seconds=2)
+
+
+def run(sandbox, body):
+    return sandbox.run_case('def solve():\n' + ''.join(f'    {line}\n' for line in body.splitlines()), 'solve', [])
+
+
+def test_passing_and_failing_cases(sandbox):
+    report = sandbox.run_tests('def square(x):\n    return x * x', SQUARE_TESTS)
+    assert (report['passed'], report['failed']) == (2, 0)
+
+    report = sandbox.run_tests('def square(x):\n    return x + 2', SQUARE_TESTS)
+    assert [case['status'] for case in report['cases']] == ['passed', 'failed']
+    evaluation = evaluation_from_report(report)
+    assert evaluation['overall_score'] == 50
+    assert 'Expected' not in evaluation['feedback']
+
+
+def test_syntax_error_is_reported_without_running(sandbox):
+    report = sandbox.run_tests('def square(x) return x', SQUARE_TESTS)
+    assert report['syntax_error'].startswith('SyntaxError')
+    assert evaluation_from_report(report)['syntax'] == 0
+
+
+def test_endless_loop_times_out(sandbox):
+    outcome = run(sandbox, 'while True:\n    pass')
+    assert outcome['status'] in ('timeout', 'error')
+    assert outcome['status'] == 'timeout' or 'CPU' in outcome['error']
+
+
+@pytest.mark.parametrize('body', [
+    "return open('/etc/hostname').read()",
+    "import os\nreturn os.listdir('/')",
+    "import os, sys\nreturn os.listdir(sys.prefix)",
+    "import socket\nreturn 1",
+    "import subprocess\nreturn 1",
+    "import os\nreturn os.system('true')",
+    "return open('out.txt', 'w').write('x')",
+    "import sys\nreturn str(sys._current_frames())",
+])
+def test_blocked_operations(sandbox, body):
+    outcome = run(sandbox, body)
+    assert outcome['status'] == 'error'
+    assert 'PermissionError' in outcome['error']
+
+
+def test_stdlib_imports_still_work(sandbox):
+    outcome = run(sandbox, "import collections, json, re\nreturn list(collections.namedtuple('P', 'a b')(1, 2))")
+    assert outcome == dict(outcome, status='ok', value=[1, 2])
+
+
+def test_forged_output_is_ignored(sandbox):
+    outcome = run(sandbox, "import os, sys\nsys.__stdout__.write('{\"value\": 99}')\nsys.__stdout__.flush()\nos._exit(0)")
+    assert outcome['status'] == 'error'
+    assert 'without a result' in outcome['error']
+
+    outcome = run(sandbox, "import sys\nsys.__stdout__.write('\\n{\"value\": 99, \"runtime_ms\": 0.1}\\n')\nreturn 1")
+    assert outcome['status'] == 'ok' and outcome['value'] == 1
+
+
+def test_report_must_be_well_formed():
+    nonce = 'n0nce'
+    assert harness_report('noise\nn0nce{"value": 3, "runtime_ms": 1.5}\n', nonce) == {'value': 3, 'runtime_ms': 1.5}
+    assert harness_report('{"value": 3, "runtime_ms": 1.5}', nonce) is None
+    assert harness_report('n0nce{"value": 3}', nonce) is None
+    assert harness_report('n0nce[1, 2]', nonce) is None
+    assert harness_report('n0nce{"error": 5}', nonce) is None
+    assert harness_report('n0nce{"value": 3, "runtime_ms": 1, "passed": true}', nonce) is None
@@ -0,0 +1,112 @@
+import threading
+import time
+
+import pytest
+
+from groq_scheduler import (PRIORITY_BULK, PRIORITY_INTERACTIVE, PRIORITY_STANDARD, GroqScheduler,
+                            SchedulerBusyError, _refill)
+
+
+def wait_until_queued(scheduler, count):
+    while sum(scheduler.stats()['queued'].values()) < count:
+        time.sleep(0.005)
+
+
+def test_refill_is_proportional_to_elapsed_time_and_capped():
+    state = {'requests': 0.0, 'tokens': 0.0, 'updated': 100.0, 'blocked_until': 0.0}
+    _refill(state, 103.0, rpm=60, tpm=600)
+    assert (state['requests'], state['tokens'], state['updated']) == (3.0, 30.0, 103.0)
+    _refill(state, 1000.0, rpm=60, tpm=600)
+    assert (state['requests'], state['tokens']) == (60, 600)
+
+
+def test_queued_calls_are_granted_by_priority():
+    scheduler = GroqScheduler(rpm=600, tpm=10 ** 6, queue_size=8, max_wait=5)
+    scheduler.throttled_upstream(0.3)
+    granted = []
+
+    def call(priority):
+        scheduler.acquire(10, priority)
+        granted.append(priority)
+
+    threads = []
+    for count, priority in enumerate((PRIORITY_BULK, PRIORITY_STANDARD, PRIORITY_INTERACTIVE), 1):
+        threads.append(threading.Thread(target=call, args=(priority,)))
+        threads[-1].start()
+        wait_until_queued(scheduler, count)
+    for thread in threads:
+        thread.join(5)
+    assert granted == [PRIORITY_INTERACTIVE, PRIORITY_STANDARD, PRIORITY_BULK]
+    assert scheduler.stats()['waited'] == 3
+
+
+def test_full_queue_rejects_with_retry_after():
+    scheduler = GroqScheduler(rpm=600, tpm=10 ** 6, queue_size=1, max_wait=5)
+    scheduler.throttled_upstream(0.3)
+    queued = threading.Thread(target=scheduler.acquire, args=(10, PRIORITY_STANDARD))
+    queued.start()
+    wait_until_queued(scheduler, 1)
+    with pytest.raises(SchedulerBusyError) as rejected:
+        scheduler.acquire(10, PRIORITY_STANDARD)
+    # One call queued ahead plus this one, at 600 requests a minute
+    assert rejected.value.retry_after == pytest.approx(0.2)
+    queued.join(5)
+    assert scheduler.stats()['rejected_queue_full'] == 1
+
+
+def test_lower_priority_call_is_evicted_from_a_full_queue():
+    scheduler = GroqScheduler(rpm=600, tpm=10 ** 6, queue_size=1, max_wait=5)
+    scheduler.throttled_upstream(0.3)
+    errors = []
+
+    def bulk_call():
+        try:
+            scheduler.acquire(10, PRIORITY_BULK)
+        except SchedulerBusyError as e:
+            errors.append(e)
+
+    bulk = threading.Thread(target=bulk_call)
+    bulk.start()
+    wait_until_queued(scheduler, 1)
+    assert scheduler.acquire(10, PRIORITY_INTERACTIVE).priority == PRIORITY_INTERACTIVE
+    bulk.join(5)
+    assert len(errors) == 1 and errors[0].retry_after > 0
+    assert scheduler.stats()['evicted'] == 1
+
+
+def test_call_that_cannot_be_granted_in_time_is_rejected():
+    scheduler = GroqScheduler(rpm=600, tpm=10 ** 6, max_wait=0.1)
+    scheduler.throttled_upstream(5)
+    with pytest.raises(SchedulerBusyError) as rejected:
+        scheduler.acquire(10)
+    assert 4 < rejected.value.retry_after <= 5
+    assert scheduler.stats()['rejected_timeout'] == 1
+
+
+def test_settle_refunds_unused_tokens_and_charges_overuse():
+    scheduler = GroqScheduler(rpm=600, tpm=6000)
+    reservation = scheduler.try_acquire(4000)
+    assert scheduler.stats()['tokens_available'] == pytest.approx(2000, abs=5)
+    reservation.used_tokens = 1000
+    scheduler.settle(reservation)
+    assert scheduler.stats()['tokens_available'] == pytest.approx(5000, abs=5)
+
+    overrun = scheduler.try_acquire(1000)
+    overrun.used_tokens = 3000
+    scheduler.settle(overrun)
+    assert scheduler.stats()['tokens_available'] == pytest.approx(2000, abs=5)
+
+
+def test_schedulers_sharing_a_sqlite_store_draw_from_one_budget(tmp_path):
+    db_path = str(tmp_path / 'groq.db')
+    first = GroqScheduler(rpm=2, tpm=10 ** 6, db_path=db_path)
+    second = GroqScheduler(rpm=2, tpm=10 ** 6, db_path=db_path)
+    assert first.stats()['shared']
+    assert first.try_acquire(10) is not None
+    assert second.try_acquire(10) is not None
+    # Both requests of the minute are spent, whichever scheduler asks
+    assert first.try_acquire(10) is None
+    assert second.try_acquire(10) is None
+
+    first.throttled_upstream(30)
+    assert second.stats()['blocked_seconds'] > 29
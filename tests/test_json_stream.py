@@ -0,0 +1,60 @@
+import json
+
+from json_stream import TopLevelFieldParser, extract_json_value
+
+
+def test_prefers_an_object_over_an_earlier_array():
+    assert extract_json_value('see [1] for {"a":1}') == {'a': 1}
+
+
+def test_skips_a_bracket_inside_quoted_prose():
+    assert extract_json_value('text with "quote { and" {"k": "v"}') == {'k': 'v'}
+
+
+def test_returns_an_array_when_there_is_no_object():
+    assert extract_json_value('```json\n[{"q": 1}, {"q": 2}]\n```') == [{'q': 1}, {'q': 2}]
+
+
+def test_prose_and_fences_around_an_object():
+    text = 'Sure! Here is the JSON:\n```json\n{"score": 85, "tags": ["a", "b"]}\n```\nLet me know.'
+    assert extract_json_value(text) == {'score': 85, 'tags': ['a', 'b']}
+
+
+def test_skips_a_span_that_does_not_decode():
+    assert extract_json_value('x {"a" is a key} "and more" {"k": 1}') == {'k': 1}
+
+
+def test_unclosed_prose_bracket_and_truncated_json():
+    assert extract_json_value('[see below {"a": 1}') == {'a': 1}
+    assert extract_json_value('{"a": {"b": 1}, "c": [1, 2') is None
+    assert extract_json_value('no json here') is None
+
+
+def test_field_parser_emits_fields_as_they_complete():
+    parser = TopLevelFieldParser()
+    assert parser.feed('Here: {"score": 8') == []
+    assert parser.feed('5, "tags": ["a"') == [('score', 85)]
+    assert parser.feed(']}') == [('tags', ['a'])]
+    assert parser.finished
+
+
+def test_field_parser_decodes_a_streamed_value_once_it_closes():
+    document = '{"assessment": "He said \\"use a {map}\\" \\\\ then [left]", "scores": {"a": [1, "]"], "b": {}}, "ok": true}'
+    parser = TopLevelFieldParser()
+    decoded = []
+    raw_decode = parser._decoder.raw_decode
+    parser._decoder.raw_decode = lambda text, start: decoded.append(start) or raw_decode(text, start)
+    fields = []
+    for char in document:
+        fields += parser.feed(char)
+    assert fields == list(json.loads(document).items())
+    # The string and bracketed values are decoded once each, not on every delta
+    assert decoded.count(document.index('"He')) == 1
+    assert decoded.count(document.index('{"a"')) == 1
+    assert parser.finished
+
+
+def test_field_parser_stops_at_a_balanced_value_that_is_not_json():
+    parser = TopLevelFieldParser()
+    assert parser.feed('{"a": [1 2], "b": 1}') == []
+    assert parser.finished
@@ -0,0 +1,92 @@
+import types
+
+import pytest
+
+import app
+import llm_cache
+from llm_cache import TASK_TTLS, LLMResponseCache, make_cache_key
+
+PARAMS = {'temperature': 0.2, 'max_tokens': 800}
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Replaces the cache's clock; set clock.now to move time."""
+    fake = types.SimpleNamespace(now=1000.0)
+    fake.time = lambda: fake.now
+    monkeypatch.setattr(llm_cache, 'time', fake)
+    return fake
+
+
+def test_key_covers_every_request_field():
+    key = make_cache_key('model', 'system', 'prompt', PARAMS)
+    assert len(key) == 64 and key == make_cache_key('model', 'system', 'prompt', dict(reversed(PARAMS.items())))
+    variants = [
+        make_cache_key('other model', 'system', 'prompt', PARAMS),
+        make_cache_key('model', 'other system', 'prompt', PARAMS),
+        make_cache_key('model', 'system', 'prompt ', PARAMS),
+        make_cache_key('model', 'system', 'prompt', dict(PARAMS, temperature=0.3)),
+    ]
+    assert len({key, *variants}) == 5
+
+
+def test_entries_expire_after_the_ttl_of_their_task(clock):
+    cache = LLMResponseCache(enabled=True, task_ttls={'evaluation': 60})
+    assert cache.ttl_for('resume') == TASK_TTLS['resume']
+    assert cache.ttl_for('unknown task') == TASK_TTLS['default']
+    cache.put('evaluation key', '{"score": 1}', 'evaluation')
+    cache.put('resume key', '{"name": "A"}', 'resume')
+
+    clock.now += 61
+    assert cache.get('evaluation key') is None
+    assert cache.get('resume key') == '{"name": "A"}'
+    stats = cache.stats()
+    assert (stats['expired'], stats['hits'], stats['misses'], stats['entries']) == (1, 1, 1, 1)
+
+
+def test_tasks_with_a_zero_ttl_are_not_cached():
+    cache = LLMResponseCache(enabled=True, task_ttls={'assessment': 0})
+    assert not cache.is_active('assessment')
+    cache.put('key', '{}', 'assessment')
+    assert cache.stats()['stores'] == 0 and cache.get('key') is None
+    assert not LLMResponseCache(enabled=False).is_active('resume')
+
+
+def test_memory_tier_evicts_least_recently_used_by_count_and_bytes():
+    cache = LLMResponseCache(enabled=True, max_entries=2, max_bytes=10)
+    cache.put('a', 'xxx', 'default')
+    cache.put('b', 'yyy', 'default')
+    cache.get('a')
+    cache.put('c', 'zzz', 'default')
+    assert cache.get('b') is None and cache.get('a') == 'xxx'
+    cache.put('d', 'w' * 8, 'default')
+    assert cache.stats()['bytes'] <= 10 and cache.get('d') == 'w' * 8
+    assert cache.stats()['evictions'] == 3
+
+
+def test_disk_hits_are_promoted_to_memory(tmp_path, clock):
+    db_path = str(tmp_path / 'llm.db')
+    LLMResponseCache(enabled=True, db_path=db_path).put('key', '{"score": 7}', 'evaluation')
+    # A fresh worker starts with an empty memory tier
+    reader = LLMResponseCache(enabled=True, db_path=db_path)
+    assert reader.get('key') == '{"score": 7}'
+    assert reader.get('key') == '{"score": 7}'
+    stats = reader.stats()
+    assert (stats['hits'], stats['disk_hits'], stats['entries']) == (2, 1, 1)
+
+    clock.now += TASK_TTLS['evaluation'] + 1
+    assert LLMResponseCache(enabled=True, db_path=db_path).get('key') is None
+    assert reader._db().execute('SELECT COUNT(*) FROM llm_cache').fetchone()[0] == 0
+
+
+def test_uncached_calls_skip_the_lookup_and_count_as_bypassed(monkeypatch):
+    cache = LLMResponseCache(enabled=True, task_ttls={'assessment': 0})
+    monkeypatch.setattr(app, 'llm_cache', cache)
+    assert app.llm_cache_lookup('prompt', 'evaluation', False, 0.0) == (None, None)
+    assert app.llm_cache_lookup('prompt', 'assessment', True, 0.0) == (None, None)
+    key, cached = app.llm_cache_lookup('prompt', 'evaluation', True, 0.0)
+    assert len(key) == 64 and cached is None
+    cache.put(key, '{"score": 9}', 'evaluation')
+    assert app.llm_cache_lookup('prompt', 'evaluation', True, 0.0) == (key, '{"score": 9}')
+    stats = cache.stats()
+    assert (stats['bypassed'], stats['misses'], stats['hits']) == (2, 1, 1)
@@ -0,0 +1,162 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+import llm_policy
+from llm_policy import AttemptSkipped, LLMCallPolicy
+
+
+class Retryable(Exception):
+    pass
+
+
+def make_policy(attempts, **kwargs):
+    kwargs.setdefault('hedge_enabled', False)
+    kwargs.setdefault('latency_slo', 0)
+    return LLMCallPolicy('primary', fallback_model='fallback', max_workers=4,
+                         on_attempt=lambda *attempt: attempts.append(attempt), **kwargs)
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(llm_policy, 'backoff_delay', lambda round_number: 0)
+
+
+def outcomes(attempts):
+    return [(kind, model, outcome) for _, kind, model, outcome, _ in attempts]
+
+
+def test_retryable_errors_are_retried():
+    attempts = []
+    calls = []
+
+    def send(model, kind):
+        calls.append(kind)
+        if len(calls) < 3:
+            raise Retryable()
+        return 'answer'
+
+    result = make_policy(attempts).call(send, is_retryable=lambda e: isinstance(e, Retryable))
+    assert result.value == 'answer'
+    assert calls == ['primary', 'retry', 'retry']
+    assert result.attempts == 3
+
+
+def test_non_retryable_errors_are_raised_at_once():
+    attempts = []
+    calls = []
+
+    def send(model, kind):
+        calls.append(kind)
+        raise ValueError('bad request')
+
+    with pytest.raises(ValueError):
+        make_policy(attempts).call(send, is_retryable=lambda e: isinstance(e, Retryable))
+    assert calls == ['primary']
+
+
+def test_last_retryable_error_is_raised_after_all_rounds():
+    attempts = []
+
+    def send(model, kind):
+        raise Retryable()
+
+    with pytest.raises(Retryable):
+        make_policy(attempts, max_attempts=2).call(send, is_retryable=lambda e: True)
+    assert outcomes(attempts) == [('primary', 'primary', 'error'), ('retry', 'primary', 'error')]
+
+
+def test_hedge_is_sent_after_the_latency_quantile():
+    attempts = []
+    policy = make_policy(attempts, hedge_enabled=True, hedge_min_delay=0.05)
+    for _ in range(llm_policy.MIN_HEDGE_SAMPLES):
+        policy._record_latency('default', 0.01)
+    assert policy.hedge_delay('default') == 0.05
+    release = threading.Event()
+
+    def send(model, kind):
+        if kind == 'primary':
+            release.wait(2)
+            return 'slow'
+        return 'hedged'
+
+    started = time.monotonic()
+    result = policy.call(send)
+    release.set()
+    assert result.value == 'hedged' and result.kind == 'hedge'
+    assert 0.05 <= time.monotonic() - started < 1
+
+
+def test_no_hedge_before_enough_samples():
+    assert make_policy([], hedge_enabled=True).hedge_delay('default') is None
+
+
+def test_fallback_model_answers_after_the_slo():
+    attempts = []
+    release = threading.Event()
+
+    def send(model, kind):
+        if model == 'primary':
+            release.wait(2)
+            return 'slow'
+        return 'fallback answer'
+
+    result = make_policy(attempts, latency_slo=0.05).call(send)
+    release.set()
+    assert (result.value, result.model, result.kind) == ('fallback answer', 'fallback', 'fallback')
+
+
+def test_skipped_extra_attempt_leaves_the_primary_to_answer():
+    attempts = []
+
+    def send(model, kind):
+        if kind == 'fallback':
+            raise AttemptSkipped('no headroom')
+        time.sleep(0.1)
+        return 'primary answer'
+
+    result = make_policy(attempts, latency_slo=0.02).call(send)
+    assert result.value == 'primary answer'
+    assert ('fallback', 'fallback', 'skipped') in outcomes(attempts)
+
+
+def test_async_fallback_cancels_the_losing_attempt():
+    attempts = []
+    cancelled = []
+
+    async def send(model, kind):
+        if model == 'primary':
+            try:
+                await asyncio.sleep(5)
+            except asyncio.CancelledError:
+                cancelled.append(kind)
+                raise
+        return f'{kind} answer'
+
+    async def run():
+        result = await make_policy(attempts, latency_slo=0.05).call_async(send)
+        # Let the cancellation reach the losing task
+        await asyncio.sleep(0)
+        return result
+
+    result = asyncio.run(run())
+    assert result.value == 'fallback answer'
+    assert cancelled == ['primary']
+    assert ('primary', 'primary', 'cancelled') in outcomes(attempts)
+
+
+def test_async_retries_retryable_errors():
+    attempts = []
+    calls = []
+
+    async def send(model, kind):
+        calls.append(kind)
+        if len(calls) == 1:
+            raise Retryable()
+        return 'answer'
+
+    result = asyncio.run(make_policy(attempts).call_async(send, is_retryable=lambda e: isinstance(e, Retryable)))
+    assert result.value == 'answer'
+    assert calls == ['primary', 'retry']
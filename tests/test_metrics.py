@@ -0,0 +1,23 @@
+from metrics import MetricsRegistry
+
+
+def test_per_scrape_sources_are_called_once_per_render():
+    registry = MetricsRegistry()
+    calls = []
+
+    def stats():
+        calls.append(1)
+        return {'entries': 3, 'bytes': 120}
+
+    source = registry.per_scrape(stats)
+    registry.gauge('entries', 'Entries', callback=lambda: source()['entries'])
+    registry.gauge('bytes', 'Bytes', callback=lambda: source()['bytes'])
+
+    text = registry.render()
+    assert 'entries 3' in text and 'bytes 120' in text
+    assert len(calls) == 1
+    registry.render()
+    assert len(calls) == 2
+    # Outside a scrape the source is a plain call
+    assert source()['entries'] == 3
+    assert len(calls) == 3
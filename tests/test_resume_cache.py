@@ -0,0 +1,40 @@
+import os
+
+import resume_cache
+from resume_cache import ResumeCache
+
+
+def disk_files(path):
+    return sorted(name for name in os.listdir(path) if name.endswith('.json'))
+
+
+def test_disk_tier_keeps_the_most_recently_used_files(tmp_path):
+    writer = ResumeCache(disk_dir=str(tmp_path))
+    for i in range(3):
+        writer.put({'name': f'candidate {i}'}, pdf_hash=f'h{i}')
+    # A fresh process indexes the files at startup; its disk hit makes h0 the most recently used
+    cache = ResumeCache(disk_dir=str(tmp_path), disk_max_entries=3)
+    assert cache.get_by_pdf('h0') == {'name': 'candidate 0'}
+    cache.put({'name': 'candidate 3'}, pdf_hash='h3')
+    assert disk_files(tmp_path) == ['pdf_h0.json', 'pdf_h2.json', 'pdf_h3.json']
+    assert cache.stats()['disk_evictions'] == 1
+
+
+def test_writes_do_not_list_the_directory(tmp_path, monkeypatch):
+    cache = ResumeCache(disk_dir=str(tmp_path), disk_max_entries=100, disk_rescan_writes=10)
+    scans = []
+    scandir = os.scandir
+    monkeypatch.setattr(resume_cache.os, 'scandir', lambda path: scans.append(path) or scandir(path))
+    for i in range(25):
+        cache.put({'name': f'candidate {i}'}, pdf_hash=f'h{i}')
+    assert len(scans) == 2
+
+
+def test_rescan_picks_up_files_from_other_workers(tmp_path):
+    other = ResumeCache(disk_dir=str(tmp_path))
+    cache = ResumeCache(disk_dir=str(tmp_path), disk_max_entries=2, disk_rescan_writes=1)
+    for i in range(3):
+        other.put({'name': f'candidate {i}'}, pdf_hash=f'h{i}')
+    cache.put({'name': 'mine'}, pdf_hash='mine')
+    assert len(disk_files(tmp_path)) == 2
+    assert 'pdf_mine.json' in disk_files(tmp_path)
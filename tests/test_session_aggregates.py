@@ -0,0 +1,46 @@
+import pytest
+
+import app
+from session_store import InMemorySessionBackend, SQLiteSessionBackend
+
+
+def legacy_session(store, session_id):
+    """A session stored before running aggregates existed."""
+    store.get_or_create(session_id)
+
+    def fill(s):
+        s['interview_questions'] = [{'id': f'q{i}'} for i in range(2)]
+        s['interview_responses'] = [{
+            'question_id': f'q{i}', 'question': f'Question {i}', 'response': 'An answer.', 'duration': '01:30',
+            'tags': ['python'],
+            'evaluation': {'score': 60 + 20 * i, 'technicalScore': 70, 'communicationScore': 70, 'relevanceScore': 70,
+                           'feedback': 'Fine.'},
+        } for i in range(2)]
+    store.update(session_id, fill)
+
+
+@pytest.fixture(params=['memory', 'sqlite'])
+def store(request, tmp_path, monkeypatch):
+    backend = InMemorySessionBackend() if request.param == 'memory' else SQLiteSessionBackend(db_path=str(tmp_path / 's.db'))
+    monkeypatch.setattr(app, 'sessions', backend)
+    return backend
+
+
+def test_progress_rebuilds_aggregates_through_the_store(store):
+    legacy_session(store, 's1')
+    response = app.app.test_client().get('/interview_progress', headers={'X-User-Session-Id': 's1'})
+    assert response.status_code == 200
+    assert response.get_json()['average_score'] == 70.0
+    assert response.get_json()['duration_seconds'] == 180
+    assert store.get('s1')['aggregates']['scored_count'] == 2
+
+
+def test_prepare_assessment_stores_end_time_and_aggregates(store):
+    legacy_session(store, 's1')
+    with app.app.test_request_context():
+        error_response, context = app.prepare_assessment('s1', store.get('s1'))
+    assert error_response is None
+    assert context['interview_duration'] == '3m 0s'
+    stored = store.get('s1')
+    assert stored['interview_end_time']
+    assert stored['aggregates']['duration_seconds'] == 180
@@ -0,0 +1,81 @@
+import sqlite3
+import time
+
+import pytest
+
+import session_store
+from session_store import InMemorySessionBackend, SessionBackend, SQLiteSessionBackend
+
+
+def test_backend_interface_is_abstract():
+    with pytest.raises(TypeError):
+        SessionBackend()
+
+
+def test_memory_reads_do_not_reserialize(monkeypatch):
+    store = InMemorySessionBackend()
+    store.get_or_create('s1')
+    store.update('s1', lambda s: s['interview_responses'].append({'response': 'x' * 100}))
+    measured = []
+    monkeypatch.setattr(session_store, 'estimate_session_bytes', lambda session: measured.append(1) or 0)
+    for _ in range(5):
+        assert store.get('s1') is not None
+    assert measured == []
+    store.update('s1', lambda s: None)
+    assert measured == [1]
+
+
+def test_memory_reads_refresh_recency():
+    store = InMemorySessionBackend(max_entries=2)
+    store.get_or_create('a')
+    store.get_or_create('b')
+    store.get('a')
+    store.get_or_create('c')
+    assert store.get('a') is not None
+    assert store.get('b') is None
+    assert store.stats()['evicted_lru'] == 1
+
+
+def test_sqlite_totals_follow_writes(tmp_path):
+    store = SQLiteSessionBackend(db_path=str(tmp_path / 'sessions.db'))
+    store.get_or_create('a')
+    store.get_or_create('b')
+    store.update('a', lambda s: s['interview_responses'].append({'response': 'x' * 500}))
+    stats = store.stats()
+    assert stats['entries'] == 2
+    conn = store._connection()
+    assert stats['bytes'] == conn.execute('SELECT SUM(size_bytes) FROM sessions').fetchone()[0]
+    store.delete('a')
+    assert store.stats()['entries'] == 1
+
+
+def test_sqlite_reads_touch_at_coarse_granularity(tmp_path, monkeypatch):
+    store = SQLiteSessionBackend(db_path=str(tmp_path / 'sessions.db'), touch_seconds=60)
+    now = [1000.0]
+    monkeypatch.setattr(session_store.time, 'time', lambda: now[0])
+    store.get_or_create('s1')
+
+    def last_access():
+        return store._connection().execute('SELECT last_access FROM sessions').fetchone()[0]
+
+    now[0] = 1030.0
+    assert store.get('s1') is not None
+    assert last_access() == 1000.0
+    now[0] = 1100.0
+    assert store.get('s1') is not None
+    assert last_access() == 1100.0
+
+
+def test_sqlite_stats_does_not_wait_for_writers(tmp_path):
+    path = str(tmp_path / 'sessions.db')
+    store = SQLiteSessionBackend(db_path=path)
+    store.get_or_create('a')
+    writer = sqlite3.connect(path, isolation_level=None, timeout=0)
+    writer.execute('BEGIN IMMEDIATE')
+    try:
+        started = time.monotonic()
+        assert store.stats()['entries'] == 1
+        assert time.monotonic() - started < 1
+    finally:
+        writer.execute('ROLLBACK')
+        writer.close()
@@ -0,0 +1,83 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from zerogpt_client import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpenError, ZeroGPTClient
+
+
+class StubDetector(BaseHTTPRequestHandler):
+    """Local stand-in for the ZeroGPT API; answers with the server's current status code."""
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        self.server.hits += 1
+        body = b'{"success": true, "data": {"fakePercentage": 12.5}}'
+        self.send_response(self.server.status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def stub():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubDetector)
+    server.status, server.hits = 200, 0
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_breaker_opens_half_opens_and_closes(stub):
+    breaker = CircuitBreaker(failure_threshold=2, recovery_seconds=0.1)
+    client = ZeroGPTClient(url=f'http://127.0.0.1:{stub.server_port}/detect', breaker=breaker)
+
+    stub.status = 503
+    client.detect('text')
+    assert breaker.state == CLOSED
+    client.detect('text')
+    assert breaker.state == OPEN
+
+    with pytest.raises(CircuitOpenError):
+        client.detect('text')
+    assert stub.hits == 2
+
+    time.sleep(0.15)
+    assert breaker.state == HALF_OPEN
+    assert breaker.allow()
+    # Only one probe goes out while half-open
+    assert not breaker.allow()
+    breaker.abandon()
+
+    stub.status = 200
+    assert client.detect('text').json()['data']['fakePercentage'] == 12.5
+    assert breaker.state == CLOSED
+    stats = client.stats()
+    assert (stats['successes'], stats['failures']) == (1, 2)
+    assert stats['circuit']['opened'] == 1 and stats['circuit']['closed'] == 1
+
+
+def test_failed_probe_reopens_the_circuit(stub):
+    breaker = CircuitBreaker(failure_threshold=1, recovery_seconds=0.05)
+    client = ZeroGPTClient(url=f'http://127.0.0.1:{stub.server_port}/detect', breaker=breaker)
+    stub.status = 500
+    client.detect('text')
+    time.sleep(0.08)
+    client.detect('text')
+    assert breaker.state == OPEN
+    assert breaker.stats()['opened'] == 2
+
+
+def test_client_errors_do_not_count_as_failures(stub):
+    breaker = CircuitBreaker(failure_threshold=1, recovery_seconds=30)
+    client = ZeroGPTClient(url=f'http://127.0.0.1:{stub.server_port}/detect', breaker=breaker)
+    stub.status = 400
+    client.detect('text')
+    assert breaker.state == CLOSED